@@ -1,10 +1,12 @@
 # /// script
 # requires-python = ">=3.11"
-# dependencies = ["psycopg[binary]", "httpx", "sniffio", "typing-extensions"]
+# dependencies = ["psycopg[binary]", "httpx[http2]", "sniffio", "typing-extensions"]
 # ///
+import importlib.util
 import os
-import time
+import sys
 from datetime import datetime, timezone
+from pathlib import Path
 
 import httpx
 import psycopg
@@ -15,6 +17,71 @@ PLAYER_MEASURE_TYPES = ["Base", "Advanced", "Misc", "Scoring"]
 TEAM_MEASURE_TYPES = ["Base", "Advanced", "Misc", "Scoring", "Opponent"]
 PLAYER_PER_MODES = ["Totals", "PerGame", "Per36", "Per100Possessions"]
 TEAM_PER_MODES = ["Totals", "PerGame"]
+# per_mode x measure_type requests in flight at once (16 player + 10 team).
+AGGREGATES_FETCH_CONCURRENCY = 6
+
+
+def _load_http_client_module():
+    # One shared instance per process so pooled connections are shared by every
+    # step in a run (HTTP telemetry stays per step, see begin_http_telemetry).
+    cached = sys.modules.get("nba_http_client")
+    if cached is not None:
+        return cached
+
+    candidates: list[Path] = []
+    if "__file__" in globals():
+        candidates.append(Path(__file__).with_name("http_client.py"))
+    candidates.append(Path("import_nba_data.flow/http_client.py"))
+
+    for path in candidates:
+        if not path.exists():
+            continue
+        spec = importlib.util.spec_from_file_location("nba_http_client", path)
+        if spec is None or spec.loader is None:
+            continue
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["nba_http_client"] = module
+        spec.loader.exec_module(module)
+        return module
+
+    raise FileNotFoundError("Unable to load http_client.py")
+
+
+_http_client = _load_http_client_module()
+http_get = _http_client.http_get
+pooled_client = _http_client.pooled_client
+http_telemetry = _http_client.http_telemetry
+begin_http_telemetry = _http_client.begin_http_telemetry
+ScopedThreadPoolExecutor = _http_client.ScopedThreadPoolExecutor
+
+
+def _load_dimension_cache_module():
+    # One shared instance per process so every step in a run sees the same cache.
+    cached = sys.modules.get("nba_dimension_cache")
+    if cached is not None:
+        return cached
+
+    candidates: list[Path] = []
+    if "__file__" in globals():
+        candidates.append(Path(__file__).with_name("dimension_cache.py"))
+    candidates.append(Path("import_nba_data.flow/dimension_cache.py"))
+
+    for path in candidates:
+        if not path.exists():
+            continue
+        spec = importlib.util.spec_from_file_location("nba_dimension_cache", path)
+        if spec is None or spec.loader is None:
+            continue
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["nba_dimension_cache"] = module
+        spec.loader.exec_module(module)
+        return module
+
+    raise FileNotFoundError("Unable to load dimension_cache.py")
+
+
+_dimension_cache = _load_dimension_cache_module()
+ensure_players = _dimension_cache.ensure_players
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -39,33 +106,15 @@ def request_json(
     client: httpx.Client,
     path: str,
     params: dict | None = None,
-    retries: int = 3,
+    retries: int | None = None,
     base_url: str = BASE_URL,
 ) -> dict:
     headers = {"X-NBA-Api-Key": os.environ["NBA_API_KEY"]}
-    url = f"{base_url}{path}"
-
-    for attempt in range(retries):
-        try:
-            resp = client.get(url, params=params, headers=headers)
-        except httpx.TimeoutException:
-            if attempt == retries - 1:
-                raise
-            time.sleep(1 + attempt)
-            continue
-
-        retryable_400 = resp.status_code == 400 and "Database Error" in resp.text
-        if resp.status_code in {429, 500, 502, 503, 504} or retryable_400:
-            if attempt == retries - 1:
-                resp.raise_for_status()
-            time.sleep(1 + attempt)
-            continue
-        if resp.status_code == 404:
-            return {}
-        resp.raise_for_status()
-        return resp.json()
-
-    raise RuntimeError(f"Failed to fetch {url}")
+    response = http_get(client, f"{base_url}{path}", params, headers, retries=retries)
+    if response.status_code == 404:
+        return {}
+    response.raise_for_status()
+    return response.json()
 
 
 def upsert(
@@ -288,30 +337,79 @@ def parse_float(value):
         return None
 
 
-def map_stats(stats: dict, mapping: dict, allowed_columns: set[str]) -> dict:
-    row: dict = {}
-    for key, value in stats.items():
-        column = mapping.get(key)
-        if not column:
-            column = "".join(["_" + c.lower() if c.isupper() else c for c in key]).lstrip("_")
+def stat_key_to_column(key: str, mapping: dict) -> str:
+    column = mapping.get(key)
+    if column:
+        return column
+    return "".join(["_" + c.lower() if c.isupper() else c for c in key]).lstrip("_")
+
+
+def compile_stat_plan(stat_keys, mapping: dict, allowed_columns: set[str]) -> tuple[tuple[str, str, bool, bool], ...]:
+    """Resolve payload stat keys to (key, column, is_int, scale_pct) once per response.
+
+    Every row of a per_mode/measure_type response carries the same stat keys,
+    so the camelCase -> column lookup and the allowed-column filter run once
+    instead of for every key of every row.
+    """
+    plan: list[tuple[str, str, bool, bool]] = []
+    for key in stat_keys:
+        column = stat_key_to_column(key, mapping)
         if column not in allowed_columns:
             continue
+        plan.append((key, column, column in AGG_INT_COLUMNS, column == "tm_tov_pct"))
+    return tuple(plan)
+
 
-        if column in AGG_INT_COLUMNS:
-            parsed = parse_int(value)
-        else:
-            parsed = parse_float(value)
+def apply_stat_plan(stats: dict, plan: tuple[tuple[str, str, bool, bool], ...]) -> dict:
+    row: dict = {}
+    for key, column, is_int, scale_pct in plan:
+        value = stats.get(key)
+        if value is None:
+            continue
 
+        parsed = parse_int(value) if is_int else parse_float(value)
         if parsed is None:
             continue
 
-        if column == "tm_tov_pct" and abs(parsed) > 1:
+        if scale_pct and abs(parsed) > 1:
             parsed = parsed / 100
 
         row[column] = parsed
     return row
 
 
+def compile_payload_stat_plan(items: list[dict], mapping: dict, allowed_columns: set[str]):
+    stat_keys: dict[str, None] = {}
+    for item in items:
+        stat_keys.update(dict.fromkeys(item.get("stats") or {}))
+    return compile_stat_plan(stat_keys, mapping, allowed_columns)
+
+
+def fetch_aggregate_payload(
+    client: httpx.Client,
+    job: tuple[str, str, str, str],
+    league_id: str,
+    season_label: str | None,
+    season_type: str,
+) -> tuple[dict | None, Exception | None]:
+    _, path, per_mode, measure_type = job
+    try:
+        payload = request_json(
+            client,
+            path,
+            {
+                "leagueId": league_id,
+                "season": season_label,
+                "seasonType": season_type,
+                "perMode": per_mode,
+                "measureType": measure_type,
+            },
+        )
+    except Exception as exc:
+        return None, exc
+    return payload, None
+
+
 def compute_fg2(row: dict):
     fgm = row.get("fgm")
     fga = row.get("fga")
@@ -363,6 +461,7 @@ def main(
     # mode/days_back/start_date/end_date/game_ids/only_final_games are accepted
     # for compatibility with flow input transforms and local runner params.
     _ = (mode, days_back, start_date, end_date, game_ids, only_final_games)
+    begin_http_telemetry()
 
     started_at = now_utc()
 
@@ -378,96 +477,88 @@ def main(
 
         conn = psycopg.connect(os.environ["POSTGRES_URL"])
 
-        with httpx.Client(timeout=60) as client:
-            # --- Player aggregates ---
-            for per_mode in PLAYER_PER_MODES:
-                for measure_type in PLAYER_MEASURE_TYPES:
-                    try:
-                        payload = request_json(
-                            client,
-                            "/api/stats/player",
-                            {
-                                "leagueId": league_id,
-                                "season": season_label_value,
-                                "seasonType": season_type,
-                                "perMode": per_mode,
-                                "measureType": measure_type,
-                            },
-                        )
-                    except Exception as exc:
-                        section_errors.append(
-                            f"player_aggregates per_mode={per_mode} measure={measure_type}: {exc}"
-                        )
+        # Requests run concurrently; responses are merged in the original
+        # per_mode/measure order so later measures still win on shared columns.
+        fetch_jobs = [
+            ("player", "/api/stats/player", per_mode, measure_type)
+            for per_mode in PLAYER_PER_MODES
+            for measure_type in PLAYER_MEASURE_TYPES
+        ] + [
+            ("team", "/api/stats/team", per_mode, measure_type)
+            for per_mode in TEAM_PER_MODES
+            for measure_type in TEAM_MEASURE_TYPES
+        ]
+
+        worker_count = max(1, AGGREGATES_FETCH_CONCURRENCY)
+        with pooled_client(BASE_URL) as client:
+            with ScopedThreadPoolExecutor(max_workers=worker_count) as executor:
+                results = list(
+                    executor.map(
+                        lambda job: fetch_aggregate_payload(client, job, league_id, season_label_value, season_type),
+                        fetch_jobs,
+                    )
+                )
+
+        for (kind, _, per_mode, measure_type), (payload, error) in zip(fetch_jobs, results):
+            if error is not None:
+                section_errors.append(
+                    f"{kind}_aggregates per_mode={per_mode} measure={measure_type}: {error}"
+                )
+                continue
+
+            if kind == "player":
+                # --- Player aggregates ---
+                players = payload.get("players") or []
+                plan = compile_payload_stat_plan(players, PLAYER_STAT_MAP, PLAYER_COLUMNS)
+                for player in players:
+                    stats = player.get("stats") or {}
+                    nba_id = player.get("personId")
+                    if nba_id is None:
                         continue
-
-                    players = payload.get("players") or []
-                    for player in players:
-                        stats = player.get("stats") or {}
-                        nba_id = player.get("personId")
-                        if nba_id is None:
-                            continue
-                        player_stats = map_stats(stats, PLAYER_STAT_MAP, PLAYER_COLUMNS)
-                        compute_fg2(player_stats)
-
-                        team_id = stats.get("teamId")
-                        row_season_type = stats.get("seasonType") or season_type
-                        key = (nba_id, team_id, season_year, row_season_type, per_mode)
-                        base_row = {
-                            "nba_id": nba_id,
-                            "team_id": team_id,
-                            "season_year": season_year,
-                            "season_label": stats.get("season") or season_label_value,
-                            "season_type": row_season_type,
-                            "per_mode": per_mode,
-                            "created_at": fetched_at,
-                            "updated_at": fetched_at,
-                            "fetched_at": fetched_at,
-                        }
-                        merge_aggregate_row(player_rows_by_key, key, base_row, player_stats)
+                    player_stats = apply_stat_plan(stats, plan)
+                    compute_fg2(player_stats)
+
+                    team_id = stats.get("teamId")
+                    row_season_type = stats.get("seasonType") or season_type
+                    key = (nba_id, team_id, season_year, row_season_type, per_mode)
+                    base_row = {
+                        "nba_id": nba_id,
+                        "team_id": team_id,
+                        "season_year": season_year,
+                        "season_label": stats.get("season") or season_label_value,
+                        "season_type": row_season_type,
+                        "per_mode": per_mode,
+                        "created_at": fetched_at,
+                        "updated_at": fetched_at,
+                        "fetched_at": fetched_at,
+                    }
+                    merge_aggregate_row(player_rows_by_key, key, base_row, player_stats)
+                continue
 
             # --- Team aggregates ---
-            for per_mode in TEAM_PER_MODES:
-                for measure_type in TEAM_MEASURE_TYPES:
-                    try:
-                        payload = request_json(
-                            client,
-                            "/api/stats/team",
-                            {
-                                "leagueId": league_id,
-                                "season": season_label_value,
-                                "seasonType": season_type,
-                                "perMode": per_mode,
-                                "measureType": measure_type,
-                            },
-                        )
-                    except Exception as exc:
-                        section_errors.append(
-                            f"team_aggregates per_mode={per_mode} measure={measure_type}: {exc}"
-                        )
-                        continue
-
-                    teams = payload.get("teams") or []
-                    for team in teams:
-                        stats = team.get("stats") or {}
-                        team_id = team.get("teamId")
-                        if team_id is None:
-                            continue
-                        team_stats = map_stats(stats, TEAM_STAT_MAP, TEAM_COLUMNS)
-                        compute_fg2(team_stats)
-
-                        row_season_type = stats.get("seasonType") or season_type
-                        key = (team_id, season_year, row_season_type, per_mode)
-                        base_row = {
-                            "team_id": team_id,
-                            "season_year": season_year,
-                            "season_label": stats.get("season") or season_label_value,
-                            "season_type": row_season_type,
-                            "per_mode": per_mode,
-                            "created_at": fetched_at,
-                            "updated_at": fetched_at,
-                            "fetched_at": fetched_at,
-                        }
-                        merge_aggregate_row(team_rows_by_key, key, base_row, team_stats)
+            teams = payload.get("teams") or []
+            plan = compile_payload_stat_plan(teams, TEAM_STAT_MAP, TEAM_COLUMNS)
+            for team in teams:
+                stats = team.get("stats") or {}
+                team_id = team.get("teamId")
+                if team_id is None:
+                    continue
+                team_stats = apply_stat_plan(stats, plan)
+                compute_fg2(team_stats)
+
+                row_season_type = stats.get("seasonType") or season_type
+                key = (team_id, season_year, row_season_type, per_mode)
+                base_row = {
+                    "team_id": team_id,
+                    "season_year": season_year,
+                    "season_label": stats.get("season") or season_label_value,
+                    "season_type": row_season_type,
+                    "per_mode": per_mode,
+                    "created_at": fetched_at,
+                    "updated_at": fetched_at,
+                    "fetched_at": fetched_at,
+                }
+                merge_aggregate_row(team_rows_by_key, key, base_row, team_stats)
 
         player_rows = list(player_rows_by_key.values())
         team_rows = list(team_rows_by_key.values())
@@ -475,6 +566,9 @@ def main(
         inserted_players = 0
         inserted_teams = 0
         if not dry_run:
+            # nba.player_stats_aggregated.nba_id references nba.players; this
+            # step runs beside game_data, so it adds its own placeholders.
+            ensure_players(conn, [parse_int(row["nba_id"]) for row in player_rows], league_id, fetched_at, upsert)
             inserted_players = upsert(
                 conn,
                 "nba.player_stats_aggregated",
@@ -501,6 +595,7 @@ def main(
                 {"table": "nba.player_stats_aggregated", "rows": len(player_rows), "upserted": inserted_players},
                 {"table": "nba.team_stats_aggregated", "rows": len(team_rows), "upserted": inserted_teams},
             ],
+            "telemetry": {"http": http_telemetry()},
             "errors": section_errors,
         }
     except Exception as exc:
@@ -511,6 +606,7 @@ def main(
             "started_at": started_at.isoformat(),
             "finished_at": now_utc().isoformat(),
             "tables": [],
+            "telemetry": {"http": http_telemetry()},
             "errors": [str(exc)],
         }
 
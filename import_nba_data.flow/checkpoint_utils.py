@@ -0,0 +1,133 @@
+from datetime import datetime, timezone
+from typing import Callable, Iterable
+
+import psycopg
+
+# nba.import_checkpoints journals which (step, endpoint, game_id) units have been
+# fetched *and* persisted. Season backfills read it to resume where a previous
+# run stopped instead of probing every target table.
+CHECKPOINT_TABLE = "nba.import_checkpoints"
+
+
+def fetch_checkpointed_game_ids(
+    conn: psycopg.Connection,
+    step: str,
+    endpoints: list[str],
+    game_ids: list[str],
+) -> dict[str, set[str]]:
+    checkpointed: dict[str, set[str]] = {endpoint: set() for endpoint in endpoints}
+    if not endpoints or not game_ids:
+        return checkpointed
+
+    with conn.cursor() as cur:
+        cur.execute(
+            f"""
+            SELECT endpoint, game_id
+            FROM {CHECKPOINT_TABLE}
+            WHERE step = %s
+              AND endpoint = ANY(%s::text[])
+              AND game_id = ANY(%s::text[])
+            """,
+            (step, list(endpoints), list(game_ids)),
+        )
+        for endpoint, game_id in cur.fetchall():
+            if endpoint and game_id:
+                checkpointed.setdefault(endpoint, set()).add(game_id)
+    return checkpointed
+
+
+def record_checkpoints(
+    conn: psycopg.Connection,
+    step: str,
+    endpoint_game_ids: dict[str, Iterable[str]],
+    league_id: str | None,
+    season_label: str | None,
+    season_type: str | None,
+    fetched_at: datetime,
+) -> int:
+    persisted_at = datetime.now(timezone.utc)
+    rows = [
+        (step, endpoint, game_id, league_id, season_label, season_type, fetched_at, persisted_at, persisted_at, persisted_at)
+        for endpoint, game_ids in endpoint_game_ids.items()
+        for game_id in sorted(set(game_ids))
+        if game_id
+    ]
+    if not rows:
+        return 0
+
+    with conn.cursor() as cur:
+        cur.executemany(
+            f"""
+            INSERT INTO {CHECKPOINT_TABLE} (
+                step, endpoint, game_id, league_id, season_label, season_type,
+                fetched_at, persisted_at, created_at, updated_at
+            )
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            ON CONFLICT (step, endpoint, game_id) DO UPDATE SET
+                league_id = EXCLUDED.league_id,
+                season_label = EXCLUDED.season_label,
+                season_type = EXCLUDED.season_type,
+                fetched_at = EXCLUDED.fetched_at,
+                persisted_at = EXCLUDED.persisted_at,
+                updated_at = EXCLUDED.updated_at
+            """,
+            rows,
+        )
+    conn.commit()
+    return len(rows)
+
+
+def resolve_pending_game_ids(
+    conn: psycopg.Connection,
+    step: str,
+    endpoint_probes: dict[str, Callable[[list[str]], set[str]] | None],
+    game_ids: list[str],
+    league_id: str | None,
+    season_label: str | None,
+    season_type: str | None,
+    seed_from_probes: bool = True,
+) -> tuple[dict[str, list[str]], dict]:
+    """Return the game ids each endpoint still needs, preferring the checkpoint journal.
+
+    Games with no checkpoint for an endpoint (e.g. games fetched before the
+    journal was introduced) fall back to that endpoint's table probe; probe hits
+    count as completed and are seeded into the journal so later runs skip them.
+    """
+    endpoints = list(endpoint_probes.keys())
+    checkpointed = fetch_checkpointed_game_ids(conn, step, endpoints, game_ids)
+
+    pending: dict[str, list[str]] = {}
+    seed: dict[str, set[str]] = {}
+    coverage = {
+        "source": {},
+        "completed": {},
+        "seeded_checkpoints": 0,
+    }
+
+    for endpoint, probe in endpoint_probes.items():
+        completed = set(checkpointed.get(endpoint) or set())
+        source = "checkpoints"
+        unchecked = [gid for gid in game_ids if gid not in completed]
+        if unchecked and probe is not None:
+            probed = probe(unchecked) & set(unchecked)
+            source = "table_probe" if not completed else "checkpoints+table_probe"
+            if probed:
+                completed |= probed
+                seed[endpoint] = probed
+
+        pending[endpoint] = [gid for gid in game_ids if gid not in completed]
+        coverage["source"][endpoint] = source
+        coverage["completed"][endpoint] = len(game_ids) - len(pending[endpoint])
+
+    if seed and seed_from_probes:
+        coverage["seeded_checkpoints"] = record_checkpoints(
+            conn,
+            step,
+            seed,
+            league_id,
+            season_label,
+            season_type,
+            datetime.now(timezone.utc),
+        )
+
+    return pending, coverage
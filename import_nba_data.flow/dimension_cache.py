@@ -0,0 +1,150 @@
+import threading
+from datetime import datetime
+from typing import Callable, Iterable
+
+import psycopg
+
+# Process-wide cache of nba.players / nba.teams ids that are known to exist.
+# Steps resolve FK placeholders against it instead of issuing their own
+# existence queries; ids the cache has not seen yet are checked with one bulk
+# ANY(%s) query and remembered, and ids a step inserts are added as it goes.
+# The loader in each step reuses one module instance per process, so a local
+# `all` run shares the cache across steps.
+DIMENSIONS = {
+    "players": ("nba.players", "nba_id"),
+    "teams": ("nba.teams", "team_id"),
+}
+
+_lock = threading.Lock()
+_known_ids: dict[str, set[int]] = {dimension: set() for dimension in DIMENSIONS}
+_stats: dict[str, dict[str, int]] = {
+    dimension: {"lookups": 0, "cache_hits": 0, "queried": 0, "inserted": 0}
+    for dimension in DIMENSIONS
+}
+
+
+def mark_known_ids(dimension: str, ids: Iterable[int | None]) -> None:
+    with _lock:
+        known = _known_ids[dimension]
+        for value in ids:
+            if value is not None:
+                known.add(value)
+
+
+def find_missing_ids(conn: psycopg.Connection, dimension: str, ids: Iterable[int | None]) -> list[int]:
+    table, key = DIMENSIONS[dimension]
+    requested = sorted({value for value in ids if value is not None})
+    if not requested:
+        return []
+
+    with _lock:
+        known = _known_ids[dimension]
+        unseen = [value for value in requested if value not in known]
+        _stats[dimension]["lookups"] += len(requested)
+        _stats[dimension]["cache_hits"] += len(requested) - len(unseen)
+    if not unseen:
+        return []
+
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT {key} FROM {table} WHERE {key} = ANY(%s::int[])", (unseen,))
+        found = {row[0] for row in cur.fetchall() if row and row[0] is not None}
+
+    mark_known_ids(dimension, found)
+    with _lock:
+        _stats[dimension]["queried"] += len(unseen)
+    return [value for value in unseen if value not in found]
+
+
+def filter_known_ids(conn: psycopg.Connection, dimension: str, ids: Iterable[int | None]) -> set[int]:
+    requested = {value for value in ids if value is not None}
+    missing = set(find_missing_ids(conn, dimension, requested))
+    return requested - missing
+
+
+def ensure_players(
+    conn: psycopg.Connection,
+    nba_ids: Iterable[int | None],
+    league_id: str,
+    fetched_at: datetime,
+    upsert: Callable[..., int],
+) -> tuple[int, int]:
+    """Insert placeholder nba.players rows for unknown ids; returns (missing, upserted)."""
+    missing = find_missing_ids(conn, "players", nba_ids)
+    if not missing:
+        return 0, 0
+
+    rows = [
+        {
+            "nba_id": nba_id,
+            "full_name": f"Unknown Player {nba_id}",
+            "is_active": None,
+            "status": "Unknown",
+            "league_id": league_id,
+            "created_at": fetched_at,
+            "updated_at": fetched_at,
+            "fetched_at": fetched_at,
+        }
+        for nba_id in missing
+    ]
+
+    upserted = upsert(conn, "nba.players", rows, ["nba_id"], update_exclude=["created_at"])
+    mark_known_ids("players", missing)
+    with _lock:
+        _stats["players"]["inserted"] += len(missing)
+    return len(missing), upserted
+
+
+def ensure_teams(
+    conn: psycopg.Connection,
+    team_ids: Iterable[int | None],
+    league_id: str,
+    fetched_at: datetime,
+    upsert: Callable[..., int],
+    seed_rows_by_id: dict[int, dict] | None = None,
+) -> tuple[int, int]:
+    """Insert nba.teams rows for unknown ids, preferring seed rows; returns (missing, upserted)."""
+    missing = find_missing_ids(conn, "teams", team_ids)
+    if not missing:
+        return 0, 0
+
+    seed_rows_by_id = seed_rows_by_id or {}
+    rows: list[dict] = []
+    for team_id in missing:
+        seed_row = seed_rows_by_id.get(team_id)
+        if seed_row:
+            rows.append(seed_row)
+            continue
+
+        rows.append(
+            {
+                "team_id": team_id,
+                "team_name": None,
+                "team_city": None,
+                "team_full_name": None,
+                "team_tricode": None,
+                "team_slug": None,
+                "league_id": league_id,
+                "conference": None,
+                "division": None,
+                "state": None,
+                "arena_name": None,
+                "arena_city": None,
+                "arena_state": None,
+                "arena_timezone": None,
+                "is_active": True,
+                "created_at": fetched_at,
+                "updated_at": fetched_at,
+                "fetched_at": fetched_at,
+            }
+        )
+
+    upserted = upsert(conn, "nba.teams", rows, ["team_id"], update_exclude=["created_at"])
+    mark_known_ids("teams", missing)
+    with _lock:
+        _stats["teams"]["inserted"] += len(missing)
+    return len(rows), upserted
+
+
+def cache_stats() -> dict[str, dict[str, int]]:
+    with _lock:
+        return {dimension: dict(values) for dimension, values in _stats.items()}
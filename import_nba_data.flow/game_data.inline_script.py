@@ -1,17 +1,23 @@
 # /// script
 # requires-python = ">=3.11"
-# dependencies = ["psycopg[binary]", "httpx", "sniffio", "typing-extensions", "tenacity"]
+# dependencies = ["psycopg[binary]", "httpx[http2]", "sniffio", "typing-extensions"]
 # ///
+import hashlib
+import importlib.util
+import json
 import os
+import queue
+import sys
+import threading
 import time
 import xml.etree.ElementTree as ET
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, wait
 from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
 
 import httpx
 import psycopg
 from psycopg.types.json import Json
-from tenacity import RetryCallState, retry, retry_if_exception, stop_after_attempt, wait_exponential
 
 BASE_URL = "https://api.nba.com/v0"
 HUSTLE_URL = "https://api.nba.com/v0/api/hustlestats"
@@ -20,6 +26,27 @@ QUERY_TOOL_URL = "https://api.nba.com/v0/api/querytool"
 GAME_DATA_CONCURRENCY = 4
 GAME_DATA_INCLUDE_PER_GAME_METRICS = False
 GAME_DATA_SKIP_EXISTING_ON_SEASON_BACKFILL = True
+# Completed games are flushed to Postgres by a writer thread in batches of this
+# many games; the queue bound applies backpressure to fetching so memory stays
+# flat during season backfills.
+GAME_DATA_WRITE_BATCH_GAMES = 25
+GAME_DATA_WRITE_QUEUE_MAX_BATCHES = 2
+# Play-by-play actions are always normalized into nba.play_by_play_events; the
+# raw /api/stats/pbp document is kept in nba.play_by_play.pbp_json only when set.
+GAME_DATA_STORE_RAW_PBP_JSON = True
+# mode="live": poll the scoreboard every interval for up to window seconds per
+# invocation, refetching only in-progress games whose status/period/clock/score
+# moved since the state stored in nba.live_game_state. Raw pbp/poc documents
+# are left to the refresh run that picks the game up once it is final.
+GAME_DATA_LIVE_POLL_INTERVAL_SECONDS = 15
+GAME_DATA_LIVE_WINDOW_SECONDS = 55
+GAME_DATA_LIVE_FETCH_PLAN = {
+    "traditional": True,
+    "pbp": True,
+    "poc": False,
+    "hustle_boxscore": False,
+    "hustle_events": False,
+}
 
 ADVANCED_PLAYER_BATCH_SIZE = 100
 ADVANCED_TEAM_BATCH_SIZE = 200
@@ -32,9 +59,103 @@ VIOLATIONS_BATCH_SIZE = 100
 VIOLATIONS_TEAM_BATCH_SIZE = 200
 
 HTTP_RETRYABLE_STATUSES = {403, 429, 500, 502, 503, 504}
-HTTP_RETRY_MAX_ATTEMPTS = 4
-HTTP_RETRY_MIN_WAIT_SECONDS = 1
-HTTP_RETRY_MAX_WAIT_SECONDS = 8
+
+CHECKPOINT_STEP = "game_data"
+LEGACY_CHECKPOINT_ENDPOINTS = ["traditional", "pbp", "poc", "hustle_boxscore", "hustle_events"]
+
+
+def _load_http_client_module():
+    # One shared instance per process so pooled connections are shared by every
+    # step in a run (HTTP telemetry stays per step, see begin_http_telemetry).
+    cached = sys.modules.get("nba_http_client")
+    if cached is not None:
+        return cached
+
+    candidates: list[Path] = []
+    if "__file__" in globals():
+        candidates.append(Path(__file__).with_name("http_client.py"))
+    candidates.append(Path("import_nba_data.flow/http_client.py"))
+
+    for path in candidates:
+        if not path.exists():
+            continue
+        spec = importlib.util.spec_from_file_location("nba_http_client", path)
+        if spec is None or spec.loader is None:
+            continue
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["nba_http_client"] = module
+        spec.loader.exec_module(module)
+        return module
+
+    raise FileNotFoundError("Unable to load http_client.py")
+
+
+_http_client = _load_http_client_module()
+http_get = _http_client.http_get
+pooled_client = _http_client.pooled_client
+http_telemetry = _http_client.http_telemetry
+begin_http_telemetry = _http_client.begin_http_telemetry
+ScopedThreadPoolExecutor = _http_client.ScopedThreadPoolExecutor
+
+
+def _load_checkpoint_utils_module():
+    # One shared instance per process so every step in a run uses the same module.
+    cached = sys.modules.get("nba_checkpoint_utils")
+    if cached is not None:
+        return cached
+
+    candidates: list[Path] = []
+    if "__file__" in globals():
+        candidates.append(Path(__file__).with_name("checkpoint_utils.py"))
+    candidates.append(Path("import_nba_data.flow/checkpoint_utils.py"))
+
+    for path in candidates:
+        if not path.exists():
+            continue
+        spec = importlib.util.spec_from_file_location("nba_checkpoint_utils", path)
+        if spec is None or spec.loader is None:
+            continue
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["nba_checkpoint_utils"] = module
+        spec.loader.exec_module(module)
+        return module
+
+    raise FileNotFoundError("Unable to load checkpoint_utils.py")
+
+
+_checkpoint_utils = _load_checkpoint_utils_module()
+record_checkpoints = _checkpoint_utils.record_checkpoints
+resolve_pending_game_ids = _checkpoint_utils.resolve_pending_game_ids
+
+
+def _load_dimension_cache_module():
+    # One shared instance per process so every step in a run sees the same cache.
+    cached = sys.modules.get("nba_dimension_cache")
+    if cached is not None:
+        return cached
+
+    candidates: list[Path] = []
+    if "__file__" in globals():
+        candidates.append(Path(__file__).with_name("dimension_cache.py"))
+    candidates.append(Path("import_nba_data.flow/dimension_cache.py"))
+
+    for path in candidates:
+        if not path.exists():
+            continue
+        spec = importlib.util.spec_from_file_location("nba_dimension_cache", path)
+        if spec is None or spec.loader is None:
+            continue
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["nba_dimension_cache"] = module
+        spec.loader.exec_module(module)
+        return module
+
+    raise FileNotFoundError("Unable to load dimension_cache.py")
+
+
+_dimension_cache = _load_dimension_cache_module()
+ensure_players = _dimension_cache.ensure_players
+dimension_cache_stats = _dimension_cache.cache_stats
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -173,83 +294,40 @@ def to_bool(value):
         return None
 
 
-def _is_retryable_response(response: httpx.Response) -> bool:
-    retryable_400 = response.status_code == 400 and "Database Error" in response.text
-    return response.status_code in HTTP_RETRYABLE_STATUSES or retryable_400
-
-
-def _is_retryable_http_exception(exc: Exception) -> bool:
-    if isinstance(exc, httpx.TimeoutException):
-        return True
-
-    if isinstance(exc, httpx.HTTPStatusError):
-        response = exc.response
-        if response is None:
-            return False
-        return _is_retryable_response(response)
-
-    if isinstance(exc, httpx.TransportError):
-        return True
-
-    return False
-
-
-def _before_sleep_http_retry(retry_state: RetryCallState) -> None:
-    outcome = retry_state.outcome
-    if outcome is None or not outcome.failed:
-        return
-
-    exc = outcome.exception()
-    if isinstance(exc, httpx.HTTPStatusError) and exc.response is not None:
-        if exc.response.status_code == 403:
-            # 403 usually means temporary upstream gating/throttling; pause longer.
-            extra_sleep = min(20, 5 * retry_state.attempt_number)
-            time.sleep(extra_sleep)
-
-
-@retry(
-    reraise=True,
-    retry=retry_if_exception(_is_retryable_http_exception),
-    stop=stop_after_attempt(HTTP_RETRY_MAX_ATTEMPTS),
-    wait=wait_exponential(
-        multiplier=HTTP_RETRY_MIN_WAIT_SECONDS,
-        min=HTTP_RETRY_MIN_WAIT_SECONDS,
-        max=HTTP_RETRY_MAX_WAIT_SECONDS,
-    ),
-    before_sleep=_before_sleep_http_retry,
-)
-def _http_get_with_retry(
-    client: httpx.Client,
-    url: str,
-    params: dict | None,
-    headers: dict,
-) -> httpx.Response:
-    response = client.get(url, params=params, headers=headers)
-    if _is_retryable_response(response):
-        response.raise_for_status()
-    return response
+def parse_clock_seconds(value: str | None):
+    """Return seconds remaining for an ISO 8601 PTmmMss.ccS game clock."""
+    if not value or not value.startswith("PT"):
+        return None
+    try:
+        body = value[2:]
+        minutes = 0
+        if "M" in body:
+            minutes_str, body = body.split("M", 1)
+            minutes = int(minutes_str)
+        seconds = float(body.rstrip("S")) if body.rstrip("S") else 0.0
+    except ValueError:
+        return None
+    return round(minutes * 60 + seconds, 2)
 
 
 def request_json(
     client: httpx.Client,
     path: str,
     params: dict | None = None,
-    retries: int = 3,
+    retries: int | None = None,
     base_url: str = BASE_URL,
 ) -> dict:
     headers = {"X-NBA-Api-Key": os.environ["NBA_API_KEY"]}
-    url = f"{base_url}{path}"
-
-    if retries <= 1:
-        response = client.get(url, params=params, headers=headers)
-        if _is_retryable_response(response):
-            response.raise_for_status()
-    else:
-        response = _http_get_with_retry(client, url, params, headers)
-
+    response = http_get(
+        client,
+        f"{base_url}{path}",
+        params,
+        headers,
+        retries=retries,
+        retryable_statuses=HTTP_RETRYABLE_STATUSES,
+    )
     if response.status_code == 404:
         return {}
-
     response.raise_for_status()
     return response.json()
 
@@ -258,31 +336,15 @@ def request_xml(
     client: httpx.Client,
     path: str,
     params: dict | None = None,
-    retries: int = 3,
+    retries: int | None = None,
     base_url: str = HUSTLE_URL,
 ) -> str | None:
     headers = {"X-NBA-Api-Key": os.environ["NBA_API_KEY"]}
-    url = f"{base_url}{path}"
-
-    for attempt in range(retries):
-        try:
-            resp = client.get(url, params=params, headers=headers)
-        except httpx.TimeoutException:
-            if attempt == retries - 1:
-                raise
-            time.sleep(1 + attempt)
-            continue
-        if resp.status_code in {429, 500, 502, 503, 504}:
-            if attempt == retries - 1:
-                resp.raise_for_status()
-            time.sleep(1 + attempt)
-            continue
-        if resp.status_code in {403, 404}:
-            return None
-        resp.raise_for_status()
-        return resp.text or None
-
-    raise RuntimeError(f"Failed to fetch {url}")
+    response = http_get(client, f"{base_url}{path}", params, headers, retries=retries)
+    if response.status_code in {403, 404}:
+        return None
+    response.raise_for_status()
+    return response.text or None
 
 
 def upsert(conn: psycopg.Connection, table: str, rows: list[dict], conflict_keys: list[str], update_exclude: list[str] | None = None) -> int:
@@ -316,45 +378,6 @@ def upsert(conn: psycopg.Connection, table: str, rows: list[dict], conflict_keys
     return len(rows)
 
 
-def upsert_missing_players_for_game_data(
-    conn: psycopg.Connection,
-    nba_ids: set[int],
-    league_id: str,
-    fetched_at: datetime,
-) -> tuple[int, int]:
-    if not nba_ids:
-        return 0, 0
-
-    ids = sorted(nba_ids)
-    with conn.cursor() as cur:
-        cur.execute(
-            "SELECT nba_id FROM nba.players WHERE nba_id = ANY(%s::int[])",
-            (ids,),
-        )
-        existing = {row[0] for row in cur.fetchall() if row and row[0] is not None}
-
-    missing = [nba_id for nba_id in ids if nba_id not in existing]
-    if not missing:
-        return 0, 0
-
-    rows = [
-        {
-            "nba_id": nba_id,
-            "full_name": f"Unknown Player {nba_id}",
-            "is_active": None,
-            "status": "Unknown",
-            "league_id": league_id,
-            "created_at": fetched_at,
-            "updated_at": fetched_at,
-            "fetched_at": fetched_at,
-        }
-        for nba_id in missing
-    ]
-
-    upserted = upsert(conn, "nba.players", rows, ["nba_id"], update_exclude=["created_at"])
-    return len(missing), upserted
-
-
 def fetch_existing_game_ids(
     conn: psycopg.Connection,
     table: str,
@@ -1319,6 +1342,85 @@ def get_attr(attrs: dict, *keys: str):
     return None
 
 
+def build_pbp_event_rows(pbp: dict | None, game_id: str, fetched_at: datetime) -> list[dict]:
+    if not pbp:
+        return []
+    actions = pbp.get("actions")
+    if actions is None:
+        actions = (pbp.get("game") or {}).get("actions")
+
+    rows: list[dict] = []
+    for action in actions or []:
+        action_number = parse_int(action.get("actionNumber"))
+        if action_number is None:
+            continue
+        clock = empty_to_none(action.get("clock"))
+        qualifiers = action.get("qualifiers")
+        rows.append(
+            {
+                "game_id": game_id,
+                "action_number": action_number,
+                "order_number": parse_int(action.get("orderNumber")),
+                "period": parse_int(action.get("period")),
+                "clock": clock,
+                "clock_seconds": parse_clock_seconds(clock),
+                "time_actual": parse_datetime(action.get("timeActual")),
+                "team_id": parse_int(action.get("teamId")) or None,
+                "team_tricode": empty_to_none(action.get("teamTricode")),
+                "nba_id": parse_int(action.get("personId")) or None,
+                "action_type": empty_to_none(action.get("actionType")),
+                "sub_type": empty_to_none(action.get("subType")),
+                "descriptor": empty_to_none(action.get("descriptor")),
+                "qualifiers": [str(q) for q in qualifiers] if isinstance(qualifiers, list) else None,
+                "x": parse_float(action.get("x")),
+                "y": parse_float(action.get("y")),
+                "side": empty_to_none(action.get("side")),
+                "shot_distance": parse_float(action.get("shotDistance")),
+                "shot_result": empty_to_none(action.get("shotResult")),
+                "is_field_goal": to_bool(action.get("isFieldGoal")),
+                "shot_action_number": parse_int(action.get("shotActionNumber")),
+                "possession_team_id": parse_int(action.get("possession")) or None,
+                "score_home": parse_int(action.get("scoreHome")),
+                "score_away": parse_int(action.get("scoreAway")),
+                "points_total": parse_int(action.get("pointsTotal")),
+                "location": empty_to_none(action.get("location")),
+                "assist_nba_id": parse_int(action.get("assistPersonId")) or None,
+                "block_nba_id": parse_int(action.get("blockPersonId")) or None,
+                "steal_nba_id": parse_int(action.get("stealPersonId")) or None,
+                "foul_drawn_nba_id": parse_int(action.get("foulDrawnPersonId")) or None,
+                "description": empty_to_none(action.get("description")),
+                "edited_at": parse_datetime(action.get("edited")),
+                "created_at": fetched_at,
+                "updated_at": fetched_at,
+                "fetched_at": fetched_at,
+            }
+        )
+    return rows
+
+
+def prune_pbp_events(conn: psycopg.Connection, event_rows: list[dict]) -> None:
+    """Delete stored actions that are no longer in a game's latest feed.
+
+    Live feeds renumber or retract actions; the delete runs in the same
+    transaction as the following upsert so readers never see a partial game.
+    """
+    action_numbers: dict[str, list[int]] = {}
+    for row in event_rows:
+        action_numbers.setdefault(row["game_id"], []).append(row["action_number"])
+    if not action_numbers:
+        return
+
+    with conn.cursor() as cur:
+        cur.executemany(
+            """
+            DELETE FROM nba.play_by_play_events
+            WHERE game_id = %s
+              AND action_number <> ALL(%s::int[])
+            """,
+            list(action_numbers.items()),
+        )
+
+
 def parse_hustle_boxscore(xml_text: str | None, game_id: str, fetched_at: datetime) -> tuple[list[dict], list[dict]]:
     if not xml_text:
         return [], []
@@ -1791,15 +1893,20 @@ def fetch_legacy_game_payloads(
     advanced_rows: list[dict] = []
     advanced_team_rows: list[dict] = []
     pbp_rows: list[dict] = []
+    pbp_event_rows: list[dict] = []
     poc_rows: list[dict] = []
     hustle_player_rows: list[dict] = []
     hustle_team_rows: list[dict] = []
     hustle_event_rows: list[dict] = []
     endpoint_errors: list[str] = []
+    # Sections whose payload parsed into rows. Empty answers (404 JSON, 403/404
+    # hustle XML) are often transient, so they stay out of the checkpoint journal
+    # and the next backfill retries them.
+    completed_sections: list[str] = []
 
     game_started_perf = time.perf_counter()
 
-    with httpx.Client(timeout=30) as client:
+    with pooled_client(BASE_URL) as client:
         # Traditional boxscore
         boxscore: dict = {}
         if fetch_traditional:
@@ -1872,6 +1979,9 @@ def fetch_legacy_game_payloads(
                     compute_fg2(row)
                     player_rows.append(row)
 
+            if player_rows or team_rows:
+                completed_sections.append("traditional")
+
         # Play-by-play
         if fetch_pbp:
             try:
@@ -1879,15 +1989,19 @@ def fetch_legacy_game_payloads(
                 pbp = request_json(client, "/api/stats/pbp", {"gameId": game_id_value})
                 api_calls["pbp"] += 1
                 api_duration_ms["pbp"] += elapsed_ms(call_started)
+                event_rows = build_pbp_event_rows(pbp, game_id_value, fetched_at)
+                pbp_event_rows.extend(event_rows)
                 pbp_rows.append(
                     {
                         "game_id": game_id_value,
-                        "pbp_json": Json(pbp) if pbp else None,
+                        "pbp_json": Json(pbp) if pbp and GAME_DATA_STORE_RAW_PBP_JSON else None,
                         "created_at": fetched_at,
                         "updated_at": fetched_at,
                         "fetched_at": fetched_at,
                     }
                 )
+                if event_rows:
+                    completed_sections.append("pbp")
             except Exception as exc:
                 endpoint_errors.append(f"pbp: {exc}")
 
@@ -1907,6 +2021,8 @@ def fetch_legacy_game_payloads(
                         "fetched_at": fetched_at,
                     }
                 )
+                if poc:
+                    completed_sections.append("poc")
             except Exception as exc:
                 endpoint_errors.append(f"poc: {exc}")
 
@@ -1920,6 +2036,8 @@ def fetch_legacy_game_payloads(
                 player_stats, team_stats = parse_hustle_boxscore(hustle_box, game_id_value, fetched_at)
                 hustle_player_rows.extend(player_stats)
                 hustle_team_rows.extend(team_stats)
+                if player_stats or team_stats:
+                    completed_sections.append("hustle_boxscore")
             except Exception as exc:
                 endpoint_errors.append(f"hustle_boxscore: {exc}")
 
@@ -1940,6 +2058,7 @@ def fetch_legacy_game_payloads(
                             "fetched_at": fetched_at,
                         }
                     )
+                    completed_sections.append("hustle_events")
             except Exception as exc:
                 endpoint_errors.append(f"hustle_events: {exc}")
 
@@ -1958,16 +2077,371 @@ def fetch_legacy_game_payloads(
         "advanced_rows": advanced_rows,
         "advanced_team_rows": advanced_team_rows,
         "pbp_rows": pbp_rows,
+        "pbp_event_rows": pbp_event_rows,
         "poc_rows": poc_rows,
         "hustle_player_rows": hustle_player_rows,
         "hustle_team_rows": hustle_team_rows,
         "hustle_event_rows": hustle_event_rows,
         "api_calls": api_calls,
         "api_duration_ms": api_duration_ms,
+        "completed_sections": completed_sections,
         "errors": endpoint_errors,
         "duration_ms": elapsed_ms(game_started_perf),
     }
 
+
+# Per-game payload sections flushed by the streaming writer, in FK-safe order.
+LEGACY_WRITE_TABLES = [
+    ("player_rows", "nba.boxscores_traditional", ["game_id", "nba_id"]),
+    ("team_rows", "nba.boxscores_traditional_team", ["game_id", "team_id"]),
+    ("pbp_rows", "nba.play_by_play", ["game_id"]),
+    ("pbp_event_rows", "nba.play_by_play_events", ["game_id", "action_number"]),
+    ("poc_rows", "nba.players_on_court", ["game_id"]),
+    ("hustle_player_rows", "nba.hustle_stats", ["game_id", "nba_id"]),
+    ("hustle_team_rows", "nba.hustle_stats_team", ["game_id", "team_id"]),
+    ("hustle_event_rows", "nba.hustle_events", ["game_id"]),
+]
+
+LEGACY_WRITE_PLAYER_ID_KEYS = ("player_rows", "hustle_player_rows")
+
+
+def new_legacy_write_batch() -> dict[str, list[dict]]:
+    return {key: [] for key, _, _ in LEGACY_WRITE_TABLES}
+
+
+def write_legacy_game_batch(
+    conn: psycopg.Connection,
+    batch: dict[str, list[dict]],
+    league_id: str,
+    fetched_at: datetime,
+) -> dict[str, int]:
+    player_ids: set[int] = set()
+    for key in LEGACY_WRITE_PLAYER_ID_KEYS:
+        for row in batch[key]:
+            nba_id = parse_int(row.get("nba_id"))
+            if nba_id is not None:
+                player_ids.add(nba_id)
+
+    placeholders_missing, placeholders_upserted = ensure_players(conn, player_ids, league_id, fetched_at, upsert)
+
+    upserted = {
+        "placeholder_players_missing": placeholders_missing,
+        "placeholder_players_upserted": placeholders_upserted,
+    }
+    for key, table, conflict_keys in LEGACY_WRITE_TABLES:
+        if table == "nba.play_by_play_events":
+            prune_pbp_events(conn, batch[key])
+        upserted[table] = upsert(conn, table, batch[key], conflict_keys, update_exclude=["created_at"])
+    return upserted
+
+
+def run_legacy_game_writer(
+    conn: psycopg.Connection,
+    write_queue: queue.Queue,
+    league_id: str,
+    season_label: str | None,
+    season_type: str | None,
+    fetched_at: datetime,
+    writer_state: dict,
+) -> None:
+    """Upsert completed-game batches from write_queue until a None sentinel arrives.
+
+    The writer owns `conn` until it is joined. After the first failed batch it
+    keeps draining the queue (so producers never block forever) but stops writing.
+    Checkpoints for a batch are recorded only after its rows are committed.
+    """
+    while True:
+        item = write_queue.get()
+        if item is None:
+            return
+        if writer_state["error"] is not None:
+            continue
+
+        write_started = time.perf_counter()
+        try:
+            upserted = write_legacy_game_batch(conn, item["rows"], league_id, fetched_at)
+            writer_state["checkpoints_recorded"] += record_checkpoints(
+                conn,
+                CHECKPOINT_STEP,
+                item["checkpoints"],
+                league_id,
+                season_label,
+                season_type,
+                fetched_at,
+            )
+        except Exception as exc:
+            conn.rollback()
+            writer_state["error"] = exc
+            continue
+
+        writer_state["batches_written"] += 1
+        writer_state["games_written"] += item["game_count"]
+        writer_state["write_duration_ms"] += elapsed_ms(write_started)
+        for key, value in upserted.items():
+            writer_state["upserted"][key] = writer_state["upserted"].get(key, 0) + value
+
+
+def row_content_hash(row: dict, exclude: tuple[str, ...] = ("created_at", "updated_at", "fetched_at")) -> str:
+    content = {key: value for key, value in row.items() if key not in exclude}
+    return hashlib.sha1(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def build_live_game_state(game: dict) -> dict | None:
+    game_id_value = game.get("gameId")
+    if not game_id_value:
+        return None
+    home_team = game.get("homeTeam") or {}
+    away_team = game.get("awayTeam") or {}
+    return {
+        "game_id": str(game_id_value),
+        "game_status": parse_int(game.get("gameStatus")),
+        "period": parse_int(game.get("period")),
+        "game_clock": empty_to_none(game.get("gameClock")),
+        "home_score": parse_int(home_team.get("score")),
+        "away_score": parse_int(away_team.get("score")),
+    }
+
+
+def live_state_key(state: dict) -> tuple:
+    return (
+        state.get("game_status"),
+        state.get("period"),
+        state.get("game_clock"),
+        state.get("home_score"),
+        state.get("away_score"),
+    )
+
+
+def fetch_live_game_states(conn: psycopg.Connection, game_ids: list[str]) -> dict[str, dict]:
+    if not game_ids:
+        return {}
+
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT game_id, game_status, period, game_clock, home_score, away_score, last_action_number, polled_at
+            FROM nba.live_game_state
+            WHERE game_id = ANY(%s::text[])
+            """,
+            (game_ids,),
+        )
+        return {
+            row[0]: {
+                "game_id": row[0],
+                "game_status": row[1],
+                "period": row[2],
+                "game_clock": row[3],
+                "home_score": row[4],
+                "away_score": row[5],
+                "last_action_number": row[6],
+                "polled_at": row[7],
+            }
+            for row in cur.fetchall()
+        }
+
+
+def select_pbp_event_deltas(
+    event_rows: list[dict],
+    last_action_number: int | None,
+    edited_since: datetime | None,
+) -> list[dict]:
+    """Actions newer than the last persisted one, plus earlier actions edited since the last poll."""
+    if last_action_number is None:
+        return list(event_rows)
+    return [
+        row
+        for row in event_rows
+        if row["action_number"] > last_action_number
+        or (edited_since is not None and row.get("edited_at") is not None and row["edited_at"] >= edited_since)
+    ]
+
+
+def run_live_polls(
+    conn: psycopg.Connection,
+    league_id: str,
+    dry_run: bool,
+    telemetry: dict,
+    errors: list[str],
+) -> dict[str, dict[str, int]]:
+    """Poll in-progress games until the live window closes; returns per-table row/upsert counts."""
+    live_telemetry = telemetry["live"]
+    table_counts = {
+        table: {"rows": 0, "upserted": 0}
+        for table in (
+            "nba.boxscores_traditional",
+            "nba.boxscores_traditional_team",
+            "nba.play_by_play_events",
+            "nba.live_game_state",
+        )
+    }
+    stored_states: dict[str, dict] = {}
+    # Boxscore rows written during this invocation, so later polls only send changed rows.
+    written_row_hashes: dict[tuple, str] = {}
+
+    window_started = time.perf_counter()
+    with pooled_client(BASE_URL) as client:
+        while True:
+            poll_started = time.perf_counter()
+            live_telemetry["polls"] += 1
+            fetched_at = now_utc()
+
+            # Late tip-offs are still listed under the previous ET game date.
+            today = fetched_at.date()
+            scoreboard_games: list[dict] = []
+            for day in (today - timedelta(days=1), today):
+                payload = request_json(
+                    client,
+                    "/api/scores/scoreboard/date",
+                    {"leagueId": league_id, "gameDate": day.isoformat()},
+                )
+                live_telemetry["scoreboard_calls"] += 1
+                scoreboard_games.extend((payload.get("scoreboard") or {}).get("games") or [])
+
+            states = [state for state in map(build_live_game_state, scoreboard_games) if state]
+            unseen_game_ids = [state["game_id"] for state in states if state["game_id"] not in stored_states]
+            stored_states.update(fetch_live_game_states(conn, unseen_game_ids))
+
+            changed: list[tuple[dict, dict | None]] = []
+            live_game_count = 0
+            for state in states:
+                stored = stored_states.get(state["game_id"])
+                in_progress = state["game_status"] == 2
+                # One last pass when a game we were tracking goes final.
+                just_finished = state["game_status"] == 3 and stored is not None and stored.get("game_status") == 2
+                if not (in_progress or just_finished):
+                    continue
+                live_game_count += 1
+                if stored is not None and live_state_key(stored) == live_state_key(state):
+                    live_telemetry["games_unchanged"] += 1
+                    continue
+                changed.append((state, stored))
+
+            live_telemetry["games_changed"] += len(changed)
+            results: list[tuple[dict, dict | None, dict]] = []
+            if changed:
+                worker_count = min(max(1, GAME_DATA_CONCURRENCY), len(changed))
+                with ScopedThreadPoolExecutor(max_workers=worker_count) as executor:
+                    futures = [
+                        executor.submit(
+                            fetch_legacy_game_payloads,
+                            state["game_id"],
+                            state["game_status"],
+                            False,
+                            fetched_at,
+                            GAME_DATA_LIVE_FETCH_PLAN,
+                        )
+                        for state, _ in changed
+                    ]
+                    for (state, stored), future in zip(changed, futures):
+                        try:
+                            results.append((state, stored, future.result()))
+                        except Exception as exc:
+                            errors.append(f"live game {state['game_id']}: {exc}")
+
+            for state, stored, result in results:
+                game_id_value = state["game_id"]
+                for key, value in result["api_calls"].items():
+                    live_telemetry["api_calls"][key] = live_telemetry["api_calls"].get(key, 0) + value
+                if result["errors"]:
+                    errors.extend([f"live game {game_id_value} {endpoint_error}" for endpoint_error in result["errors"]])
+                # Leave the stored state alone when a section failed so the next poll retries it.
+                if not {"traditional", "pbp"}.issubset(result["completed_sections"]):
+                    continue
+
+                boxscore_deltas: dict[str, list[dict]] = {"player_rows": [], "team_rows": []}
+                for key, row_key in (("player_rows", "nba_id"), ("team_rows", "team_id")):
+                    for row in result[key]:
+                        hash_key = (key, game_id_value, row.get(row_key))
+                        row_hash = row_content_hash(row)
+                        if written_row_hashes.get(hash_key) == row_hash:
+                            continue
+                        boxscore_deltas[key].append(row)
+                        written_row_hashes[hash_key] = row_hash
+
+                event_rows = result["pbp_event_rows"]
+                stored = stored or {}
+                event_deltas = select_pbp_event_deltas(
+                    event_rows,
+                    stored.get("last_action_number"),
+                    stored.get("polled_at"),
+                )
+                last_action_number = max(
+                    (row["action_number"] for row in event_rows),
+                    default=stored.get("last_action_number"),
+                )
+                state_row = {
+                    **state,
+                    "last_action_number": last_action_number,
+                    "polled_at": fetched_at,
+                    "changed_at": fetched_at,
+                    "created_at": fetched_at,
+                    "updated_at": fetched_at,
+                }
+
+                table_counts["nba.boxscores_traditional"]["rows"] += len(boxscore_deltas["player_rows"])
+                table_counts["nba.boxscores_traditional_team"]["rows"] += len(boxscore_deltas["team_rows"])
+                table_counts["nba.play_by_play_events"]["rows"] += len(event_deltas)
+                table_counts["nba.live_game_state"]["rows"] += 1
+                live_telemetry["pbp_actions_seen"] += len(event_rows)
+                live_telemetry["pbp_actions_written"] += len(event_deltas)
+
+                if not dry_run:
+                    ensure_players(
+                        conn,
+                        {row.get("nba_id") for row in boxscore_deltas["player_rows"]},
+                        league_id,
+                        fetched_at,
+                        upsert,
+                    )
+                    table_counts["nba.boxscores_traditional"]["upserted"] += upsert(
+                        conn,
+                        "nba.boxscores_traditional",
+                        boxscore_deltas["player_rows"],
+                        ["game_id", "nba_id"],
+                        update_exclude=["created_at"],
+                    )
+                    table_counts["nba.boxscores_traditional_team"]["upserted"] += upsert(
+                        conn,
+                        "nba.boxscores_traditional_team",
+                        boxscore_deltas["team_rows"],
+                        ["game_id", "team_id"],
+                        update_exclude=["created_at"],
+                    )
+                    # Retracted actions are pruned against the full feed; only deltas are written.
+                    prune_pbp_events(conn, event_rows)
+                    table_counts["nba.play_by_play_events"]["upserted"] += upsert(
+                        conn,
+                        "nba.play_by_play_events",
+                        event_deltas,
+                        ["game_id", "action_number"],
+                        update_exclude=["created_at"],
+                    )
+                    conn.commit()
+                    table_counts["nba.live_game_state"]["upserted"] += upsert(
+                        conn,
+                        "nba.live_game_state",
+                        [state_row],
+                        ["game_id"],
+                        update_exclude=["created_at"],
+                    )
+
+                stored_states[game_id_value] = state_row
+
+            live_telemetry["poll_duration_ms"].append(elapsed_ms(poll_started))
+            if live_game_count == 0:
+                live_telemetry["stopped_reason"] = "no_live_games"
+                break
+
+            remaining = GAME_DATA_LIVE_WINDOW_SECONDS - (time.perf_counter() - window_started)
+            sleep_seconds = max(0.0, GAME_DATA_LIVE_POLL_INTERVAL_SECONDS - (time.perf_counter() - poll_started))
+            if remaining <= sleep_seconds:
+                live_telemetry["stopped_reason"] = "window_elapsed"
+                break
+            time.sleep(sleep_seconds)
+
+    return table_counts
+
+
 def main(
     dry_run: bool = False,
     league_id: str = "00",
@@ -1980,6 +2454,7 @@ def main(
     game_ids: str | None = None,
     only_final_games: bool = True,
 ) -> dict:
+    begin_http_telemetry()
     started_at = now_utc()
     started_perf = time.perf_counter()
 
@@ -1988,6 +2463,8 @@ def main(
             "concurrency": GAME_DATA_CONCURRENCY,
             "include_per_game_metrics": GAME_DATA_INCLUDE_PER_GAME_METRICS,
             "skip_existing_on_season_backfill": GAME_DATA_SKIP_EXISTING_ON_SEASON_BACKFILL,
+            "write_batch_games": GAME_DATA_WRITE_BATCH_GAMES,
+            "write_queue_max_batches": GAME_DATA_WRITE_QUEUE_MAX_BATCHES,
             "advanced_player_batch_size": ADVANCED_PLAYER_BATCH_SIZE,
             "advanced_team_batch_size": ADVANCED_TEAM_BATCH_SIZE,
             "tracking_batch_size": TRACKING_BATCH_SIZE,
@@ -1997,6 +2474,9 @@ def main(
             "querytool_max_rows": TRACKING_MAX_ROWS_RETURNED,
             "querytool_truncation_threshold": QUERY_TOOL_TRUNCATION_THRESHOLD,
             "event_streams_extracted": True,
+            "store_raw_pbp_json": GAME_DATA_STORE_RAW_PBP_JSON,
+            "live_poll_interval_seconds": GAME_DATA_LIVE_POLL_INTERVAL_SECONDS,
+            "live_window_seconds": GAME_DATA_LIVE_WINDOW_SECONDS,
         },
         "game_selection": {
             "source": "",
@@ -2028,6 +2508,15 @@ def main(
                 "hustle_events": 0.0,
             },
             "coverage": {},
+            "write": {
+                "streaming": False,
+                "batches_enqueued": 0,
+                "batches_written": 0,
+                "games_written": 0,
+                "enqueue_wait_ms": 0.0,
+                "write_duration_ms": 0.0,
+                "checkpoints_recorded": 0,
+            },
             "per_game_metrics": [] if GAME_DATA_INCLUDE_PER_GAME_METRICS else None,
         },
         "querytool": {
@@ -2046,6 +2535,7 @@ def main(
             "executed": False,
             "placeholder_players_missing": 0,
             "placeholder_players_upserted": 0,
+            "checkpoints_recorded": 0,
             "duration_ms": 0.0,
         },
         "duration_ms": 0.0,
@@ -2061,15 +2551,41 @@ def main(
         conn = psycopg.connect(os.environ["POSTGRES_URL"])
 
         errors: list[str] = []
-        player_rows: list[dict] = []
-        team_rows: list[dict] = []
+
+        if normalized_mode == "live":
+            telemetry["live"] = {
+                "polls": 0,
+                "scoreboard_calls": 0,
+                "games_changed": 0,
+                "games_unchanged": 0,
+                "pbp_actions_seen": 0,
+                "pbp_actions_written": 0,
+                "api_calls": {},
+                "poll_duration_ms": [],
+                "stopped_reason": "",
+            }
+            live_table_counts = run_live_polls(conn, league_id, dry_run, telemetry, errors)
+            telemetry["upsert"]["executed"] = not dry_run
+            telemetry["upsert"]["dimension_cache"] = dimension_cache_stats()
+            conn.close()
+            telemetry["duration_ms"] = elapsed_ms(started_perf)
+            telemetry["http"] = http_telemetry()
+            return {
+                "dry_run": dry_run,
+                "started_at": started_at.isoformat(),
+                "finished_at": now_utc().isoformat(),
+                "tables": [
+                    {"table": table, "rows": counts["rows"], "upserted": counts["upserted"]}
+                    for table, counts in live_table_counts.items()
+                ],
+                "telemetry": telemetry,
+                "errors": errors,
+            }
+
+        legacy_row_counts = {table: 0 for _, table, _ in LEGACY_WRITE_TABLES}
+        legacy_traditional_player_keys: list[dict] = []
         advanced_rows: list[dict] = []
         advanced_team_rows: list[dict] = []
-        pbp_rows: list[dict] = []
-        poc_rows: list[dict] = []
-        hustle_player_rows: list[dict] = []
-        hustle_team_rows: list[dict] = []
-        hustle_event_rows: list[dict] = []
         tracking_rows: list[dict] = []
         defensive_rows: list[dict] = []
         violations_player_rows: list[dict] = []
@@ -2174,32 +2690,44 @@ def main(
         missing_hustle_boxscore = set(final_game_ids)
         missing_hustle_events = set(final_game_ids)
 
+        legacy_checkpoint_coverage: dict = {}
         if enable_skip_existing:
-            missing_traditional = set(selected_game_ids) - fetch_existing_game_ids(
+            legacy_pending, legacy_checkpoint_coverage = resolve_pending_game_ids(
                 conn,
-                "nba.boxscores_traditional_team",
-                selected_game_ids,
-            )
-            missing_pbp = set(selected_game_ids) - fetch_existing_game_ids(
-                conn,
-                "nba.play_by_play",
-                selected_game_ids,
-            )
-            missing_poc = set(selected_game_ids) - fetch_existing_game_ids(
-                conn,
-                "nba.players_on_court",
+                CHECKPOINT_STEP,
+                {
+                    "traditional": lambda ids: fetch_existing_game_ids(conn, "nba.boxscores_traditional_team", ids),
+                    "pbp": lambda ids: fetch_existing_game_ids(conn, "nba.play_by_play", ids),
+                    "poc": lambda ids: fetch_existing_game_ids(conn, "nba.players_on_court", ids),
+                },
                 selected_game_ids,
+                league_id,
+                season_label_value,
+                season_type_value,
+                seed_from_probes=not dry_run,
             )
-            missing_hustle_boxscore = set(final_game_ids) - fetch_existing_game_ids(
-                conn,
-                "nba.hustle_stats_team",
-                final_game_ids,
-            )
-            missing_hustle_events = set(final_game_ids) - fetch_existing_game_ids(
+            hustle_pending, hustle_checkpoint_coverage = resolve_pending_game_ids(
                 conn,
-                "nba.hustle_events",
+                CHECKPOINT_STEP,
+                {
+                    "hustle_boxscore": lambda ids: fetch_existing_game_ids(conn, "nba.hustle_stats_team", ids),
+                    "hustle_events": lambda ids: fetch_existing_game_ids(conn, "nba.hustle_events", ids),
+                },
                 final_game_ids,
+                league_id,
+                season_label_value,
+                season_type_value,
+                seed_from_probes=not dry_run,
             )
+            for key in ("source", "completed"):
+                legacy_checkpoint_coverage[key].update(hustle_checkpoint_coverage[key])
+            legacy_checkpoint_coverage["seeded_checkpoints"] += hustle_checkpoint_coverage["seeded_checkpoints"]
+
+            missing_traditional = set(legacy_pending["traditional"])
+            missing_pbp = set(legacy_pending["pbp"])
+            missing_poc = set(legacy_pending["poc"])
+            missing_hustle_boxscore = set(hustle_pending["hustle_boxscore"])
+            missing_hustle_events = set(hustle_pending["hustle_events"])
 
         legacy_game_plans: list[tuple[str, int | None, dict[str, bool]]] = []
         for gid, status in game_list:
@@ -2239,9 +2767,10 @@ def main(
                 "hustle_events": len(final_game_ids),
             },
             "section_to_fetch": legacy_section_fetch_counts,
+            "checkpoints": legacy_checkpoint_coverage,
         }
 
-        # --- Legacy per-game payloads (concurrent) ---
+        # --- Legacy per-game payloads (concurrent fetch, streaming write) ---
         legacy_started = time.perf_counter()
         worker_count = 1
         if legacy_game_plans:
@@ -2249,109 +2778,160 @@ def main(
         telemetry["legacy_fetch"]["worker_count"] = worker_count
         telemetry["legacy_fetch"]["scheduled_games"] = len(legacy_game_plans)
 
-        if worker_count <= 1:
-            for game_id_value, status, fetch_plan in legacy_game_plans:
-                try:
-                    result = fetch_legacy_game_payloads(
-                        game_id_value,
-                        status,
-                        allow_unknown_final,
-                        fetched_at,
-                        fetch_plan,
-                    )
-                except Exception as exc:
-                    telemetry["legacy_fetch"]["failed_games"] += 1
-                    errors.append(f"legacy game {game_id_value}: {exc}")
-                    continue
-
-                player_rows.extend(result["player_rows"])
-                team_rows.extend(result["team_rows"])
-                advanced_rows.extend(result["advanced_rows"])
-                advanced_team_rows.extend(result["advanced_team_rows"])
-                pbp_rows.extend(result["pbp_rows"])
-                poc_rows.extend(result["poc_rows"])
-                hustle_player_rows.extend(result["hustle_player_rows"])
-                hustle_team_rows.extend(result["hustle_team_rows"])
-                hustle_event_rows.extend(result["hustle_event_rows"])
+        write_telemetry = telemetry["legacy_fetch"]["write"]
+        write_queue: queue.Queue = queue.Queue(maxsize=max(1, GAME_DATA_WRITE_QUEUE_MAX_BATCHES))
+        writer_state = {
+            "error": None,
+            "batches_written": 0,
+            "games_written": 0,
+            "write_duration_ms": 0.0,
+            "checkpoints_recorded": 0,
+            "upserted": {},
+        }
+        writer_thread: threading.Thread | None = None
+        if not dry_run and legacy_game_plans:
+            writer_thread = threading.Thread(
+                target=run_legacy_game_writer,
+                args=(conn, write_queue, league_id, season_label_value, season_type_value, fetched_at, writer_state),
+                name="game-data-writer",
+                daemon=True,
+            )
+            writer_thread.start()
+        write_telemetry["streaming"] = writer_thread is not None
 
-                if result["errors"]:
-                    telemetry["legacy_fetch"]["endpoint_error_count"] += len(result["errors"])
-                    errors.extend(
-                        [f"legacy game {result['game_id']} {endpoint_error}" for endpoint_error in result["errors"]]
-                    )
+        pending_batch = new_legacy_write_batch()
+        pending_batch_checkpoints: dict[str, list[str]] = {endpoint: [] for endpoint in LEGACY_CHECKPOINT_ENDPOINTS}
+        pending_batch_games = 0
 
-                telemetry["legacy_fetch"]["completed_games"] += 1
-                for key, value in result["api_calls"].items():
-                    telemetry["legacy_fetch"]["api_calls"][key] += value
-                for key, value in result["api_duration_ms"].items():
-                    telemetry["legacy_fetch"]["api_duration_ms"][key] += value
+        try:
+            with ScopedThreadPoolExecutor(max_workers=worker_count) as executor:
+                # Keep a bounded window of games in flight so completed payloads
+                # never pile up faster than the writer can drain them.
+                plan_iter = iter(legacy_game_plans)
+                max_in_flight = worker_count * 2
+                in_flight: dict = {}
+
+                while True:
+                    while len(in_flight) < max_in_flight and writer_state["error"] is None:
+                        next_plan = next(plan_iter, None)
+                        if next_plan is None:
+                            break
+                        game_id_value, status, fetch_plan = next_plan
+                        future = executor.submit(
+                            fetch_legacy_game_payloads,
+                            game_id_value,
+                            status,
+                            allow_unknown_final,
+                            fetched_at,
+                            fetch_plan,
+                        )
+                        in_flight[future] = game_id_value
+
+                    if not in_flight:
+                        break
+
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        game_id_value = in_flight.pop(future)
+                        try:
+                            result = future.result()
+                        except Exception as exc:
+                            telemetry["legacy_fetch"]["failed_games"] += 1
+                            errors.append(f"legacy game {game_id_value}: {exc}")
+                            continue
 
-                if telemetry["legacy_fetch"]["per_game_metrics"] is not None:
-                    telemetry["legacy_fetch"]["per_game_metrics"].append(
+                        for key, table, _ in LEGACY_WRITE_TABLES:
+                            pending_batch[key].extend(result[key])
+                            legacy_row_counts[table] += len(result[key])
+                        advanced_rows.extend(result["advanced_rows"])
+                        advanced_team_rows.extend(result["advanced_team_rows"])
+                        pending_batch_games += 1
+                        # Only final games are journaled; live games must be refetched.
+                        if result["is_final"]:
+                            for section in result["completed_sections"]:
+                                pending_batch_checkpoints[section].append(result["game_id"])
+
+                        # Advanced DNP placeholders only need these keys; keep them
+                        # instead of the full traditional rows.
+                        for row in result["player_rows"]:
+                            legacy_traditional_player_keys.append(
+                                {
+                                    "game_id": row.get("game_id"),
+                                    "nba_id": row.get("nba_id"),
+                                    "team_id": row.get("team_id"),
+                                    "played": row.get("played"),
+                                    "minutes": row.get("minutes"),
+                                }
+                            )
+
+                        if result["errors"]:
+                            telemetry["legacy_fetch"]["endpoint_error_count"] += len(result["errors"])
+                            errors.extend(
+                                [f"legacy game {result['game_id']} {endpoint_error}" for endpoint_error in result["errors"]]
+                            )
+
+                        telemetry["legacy_fetch"]["completed_games"] += 1
+                        for key, value in result["api_calls"].items():
+                            telemetry["legacy_fetch"]["api_calls"][key] += value
+                        for key, value in result["api_duration_ms"].items():
+                            telemetry["legacy_fetch"]["api_duration_ms"][key] += value
+
+                        if telemetry["legacy_fetch"]["per_game_metrics"] is not None:
+                            telemetry["legacy_fetch"]["per_game_metrics"].append(
+                                {
+                                    "game_id": result["game_id"],
+                                    "is_final": result["is_final"],
+                                    "duration_ms": result["duration_ms"],
+                                    "fetch_plan": result.get("fetch_plan") or {},
+                                }
+                            )
+
+                    if pending_batch_games >= GAME_DATA_WRITE_BATCH_GAMES:
+                        if writer_thread is not None:
+                            enqueue_started = time.perf_counter()
+                            write_queue.put(
+                                {
+                                    "rows": pending_batch,
+                                    "checkpoints": pending_batch_checkpoints,
+                                    "game_count": pending_batch_games,
+                                }
+                            )
+                            write_telemetry["enqueue_wait_ms"] += elapsed_ms(enqueue_started)
+                        write_telemetry["batches_enqueued"] += 1
+                        pending_batch = new_legacy_write_batch()
+                        pending_batch_checkpoints = {endpoint: [] for endpoint in LEGACY_CHECKPOINT_ENDPOINTS}
+                        pending_batch_games = 0
+
+            if pending_batch_games:
+                if writer_thread is not None:
+                    enqueue_started = time.perf_counter()
+                    write_queue.put(
                         {
-                            "game_id": result["game_id"],
-                            "is_final": result["is_final"],
-                            "duration_ms": result["duration_ms"],
-                            "fetch_plan": result.get("fetch_plan") or {},
+                            "rows": pending_batch,
+                            "checkpoints": pending_batch_checkpoints,
+                            "game_count": pending_batch_games,
                         }
                     )
-        else:
-            with ThreadPoolExecutor(max_workers=worker_count) as executor:
-                future_map = {
-                    executor.submit(
-                        fetch_legacy_game_payloads,
-                        game_id_value,
-                        status,
-                        allow_unknown_final,
-                        fetched_at,
-                        fetch_plan,
-                    ): game_id_value
-                    for game_id_value, status, fetch_plan in legacy_game_plans
-                }
-
-                for future in as_completed(future_map):
-                    game_id_value = future_map[future]
-                    try:
-                        result = future.result()
-                    except Exception as exc:
-                        telemetry["legacy_fetch"]["failed_games"] += 1
-                        errors.append(f"legacy game {game_id_value}: {exc}")
-                        continue
-
-                    player_rows.extend(result["player_rows"])
-                    team_rows.extend(result["team_rows"])
-                    advanced_rows.extend(result["advanced_rows"])
-                    advanced_team_rows.extend(result["advanced_team_rows"])
-                    pbp_rows.extend(result["pbp_rows"])
-                    poc_rows.extend(result["poc_rows"])
-                    hustle_player_rows.extend(result["hustle_player_rows"])
-                    hustle_team_rows.extend(result["hustle_team_rows"])
-                    hustle_event_rows.extend(result["hustle_event_rows"])
-
-                    if result["errors"]:
-                        telemetry["legacy_fetch"]["endpoint_error_count"] += len(result["errors"])
-                        errors.extend(
-                            [f"legacy game {result['game_id']} {endpoint_error}" for endpoint_error in result["errors"]]
-                        )
-
-                    telemetry["legacy_fetch"]["completed_games"] += 1
-                    for key, value in result["api_calls"].items():
-                        telemetry["legacy_fetch"]["api_calls"][key] += value
-                    for key, value in result["api_duration_ms"].items():
-                        telemetry["legacy_fetch"]["api_duration_ms"][key] += value
-
-                    if telemetry["legacy_fetch"]["per_game_metrics"] is not None:
-                        telemetry["legacy_fetch"]["per_game_metrics"].append(
-                            {
-                                "game_id": result["game_id"],
-                                "is_final": result["is_final"],
-                                "duration_ms": result["duration_ms"],
-                                "fetch_plan": result.get("fetch_plan") or {},
-                            }
-                        )
-
+                    write_telemetry["enqueue_wait_ms"] += elapsed_ms(enqueue_started)
+                write_telemetry["batches_enqueued"] += 1
+                pending_batch = new_legacy_write_batch()
+                pending_batch_checkpoints = {endpoint: [] for endpoint in LEGACY_CHECKPOINT_ENDPOINTS}
+                pending_batch_games = 0
+        finally:
+            if writer_thread is not None:
+                write_queue.put(None)
+                writer_thread.join()
+
+        write_telemetry["enqueue_wait_ms"] = round(write_telemetry["enqueue_wait_ms"], 2)
+        write_telemetry["batches_written"] = writer_state["batches_written"]
+        write_telemetry["games_written"] = writer_state["games_written"]
+        write_telemetry["write_duration_ms"] = round(writer_state["write_duration_ms"], 2)
+        write_telemetry["checkpoints_recorded"] = writer_state["checkpoints_recorded"]
         telemetry["legacy_fetch"]["duration_ms"] = elapsed_ms(legacy_started)
 
+        if writer_state["error"] is not None:
+            raise writer_state["error"]
+
         # --- Query Tool batched tables (final games only) ---
         querytool_started = time.perf_counter()
         querytool_game_ids: list[str] = []
@@ -2366,25 +2946,37 @@ def main(
         violations_player_game_ids = list(querytool_game_ids)
         violations_team_game_ids = list(querytool_game_ids)
 
+        querytool_checkpoint_coverage: dict = {}
         if enable_skip_existing and querytool_game_ids:
-            existing_advanced_players = fetch_existing_game_ids(
+            querytool_pending, querytool_checkpoint_coverage = resolve_pending_game_ids(
                 conn,
-                "nba.boxscores_advanced",
+                CHECKPOINT_STEP,
+                {
+                    "advanced_player": lambda ids: fetch_existing_game_ids(
+                        conn,
+                        "nba.boxscores_advanced",
+                        ids,
+                        extra_where="COALESCE(minutes, 0) > 0",
+                    ),
+                    "advanced_team": lambda ids: fetch_existing_game_ids(conn, "nba.boxscores_advanced_team", ids),
+                    "tracking": lambda ids: fetch_existing_game_ids(conn, "nba.tracking_stats", ids),
+                    "defensive": lambda ids: fetch_existing_game_ids(conn, "nba.defensive_stats", ids),
+                    "violations_player": lambda ids: fetch_existing_game_ids(conn, "nba.violations_player", ids),
+                    "violations_team": lambda ids: fetch_existing_game_ids(conn, "nba.violations_team", ids),
+                },
                 querytool_game_ids,
-                extra_where="COALESCE(minutes, 0) > 0",
+                league_id,
+                season_label_value,
+                season_type_value,
+                seed_from_probes=not dry_run,
             )
-            existing_advanced_teams = fetch_existing_game_ids(conn, "nba.boxscores_advanced_team", querytool_game_ids)
-            existing_tracking = fetch_existing_game_ids(conn, "nba.tracking_stats", querytool_game_ids)
-            existing_defensive = fetch_existing_game_ids(conn, "nba.defensive_stats", querytool_game_ids)
-            existing_violations_player = fetch_existing_game_ids(conn, "nba.violations_player", querytool_game_ids)
-            existing_violations_team = fetch_existing_game_ids(conn, "nba.violations_team", querytool_game_ids)
-
-            advanced_player_game_ids = [gid for gid in querytool_game_ids if gid not in existing_advanced_players]
-            advanced_team_game_ids = [gid for gid in querytool_game_ids if gid not in existing_advanced_teams]
-            tracking_game_ids = [gid for gid in querytool_game_ids if gid not in existing_tracking]
-            defensive_game_ids = [gid for gid in querytool_game_ids if gid not in existing_defensive]
-            violations_player_game_ids = [gid for gid in querytool_game_ids if gid not in existing_violations_player]
-            violations_team_game_ids = [gid for gid in querytool_game_ids if gid not in existing_violations_team]
+
+            advanced_player_game_ids = querytool_pending["advanced_player"]
+            advanced_team_game_ids = querytool_pending["advanced_team"]
+            tracking_game_ids = querytool_pending["tracking"]
+            defensive_game_ids = querytool_pending["defensive"]
+            violations_player_game_ids = querytool_pending["violations_player"]
+            violations_team_game_ids = querytool_pending["violations_team"]
 
         telemetry["querytool"]["coverage"] = {
             "skip_existing_enabled": enable_skip_existing,
@@ -2397,10 +2989,11 @@ def main(
                 "violations_player": len(violations_player_game_ids),
                 "violations_team": len(violations_team_game_ids),
             },
+            "checkpoints": querytool_checkpoint_coverage,
         }
 
         if season_label_value and season_type_value:
-            with httpx.Client(timeout=60) as client:
+            with pooled_client(BASE_URL) as client:
                 if advanced_player_game_ids:
                     advanced_player_payload_rows, advanced_player_warnings, advanced_player_metrics = fetch_querytool_batched_rows(
                         client=client,
@@ -2425,10 +3018,10 @@ def main(
                             continue
                         advanced_rows.append(row)
 
-                    traditional_rows_for_placeholders = list(player_rows)
+                    traditional_rows_for_placeholders = list(legacy_traditional_player_keys)
                     fetched_traditional_game_ids = {
                         row.get("game_id")
-                        for row in player_rows
+                        for row in legacy_traditional_player_keys
                         if row.get("game_id")
                     }
                     missing_traditional_game_ids = [
@@ -2626,30 +3219,24 @@ def main(
 
         telemetry["querytool"]["duration_ms"] = elapsed_ms(querytool_started)
 
-        inserted_players = 0
-        inserted_teams = 0
+        legacy_upserted = writer_state["upserted"]
         inserted_advanced = 0
         inserted_advanced_team = 0
-        inserted_pbp = 0
-        inserted_poc = 0
-        inserted_hustle_players = 0
-        inserted_hustle_teams = 0
-        inserted_hustle_events = 0
         inserted_tracking = 0
         inserted_defensive = 0
         inserted_violations_player = 0
         inserted_violations_team = 0
-        placeholder_players_missing = 0
-        placeholder_players_upserted = 0
+        placeholder_players_missing = legacy_upserted.get("placeholder_players_missing", 0)
+        placeholder_players_upserted = legacy_upserted.get("placeholder_players_upserted", 0)
 
         upsert_started = time.perf_counter()
         if not dry_run:
             telemetry["upsert"]["executed"] = True
 
+            # Legacy per-game tables were already flushed by the streaming writer;
+            # only the Query Tool batched tables remain.
             player_id_rows = (
-                player_rows,
                 advanced_rows,
-                hustle_player_rows,
                 tracking_rows,
                 defensive_rows,
                 violations_player_rows,
@@ -2661,47 +3248,22 @@ def main(
                     if nba_id is not None:
                         all_player_ids.add(nba_id)
 
-            placeholder_players_missing, placeholder_players_upserted = upsert_missing_players_for_game_data(
+            querytool_placeholders_missing, querytool_placeholders_upserted = ensure_players(
                 conn,
                 all_player_ids,
                 league_id,
                 fetched_at,
+                upsert,
             )
+            placeholder_players_missing += querytool_placeholders_missing
+            placeholder_players_upserted += querytool_placeholders_upserted
             telemetry["upsert"]["placeholder_players_missing"] = placeholder_players_missing
             telemetry["upsert"]["placeholder_players_upserted"] = placeholder_players_upserted
 
-            inserted_players = upsert(conn, "nba.boxscores_traditional", player_rows, ["game_id", "nba_id"], update_exclude=["created_at"])
-            inserted_teams = upsert(conn, "nba.boxscores_traditional_team", team_rows, ["game_id", "team_id"], update_exclude=["created_at"])
             if advanced_rows:
                 inserted_advanced = upsert(conn, "nba.boxscores_advanced", advanced_rows, ["game_id", "nba_id"], update_exclude=["created_at"])
             if advanced_team_rows:
                 inserted_advanced_team = upsert(conn, "nba.boxscores_advanced_team", advanced_team_rows, ["game_id", "team_id"], update_exclude=["created_at"])
-            inserted_pbp = upsert(conn, "nba.play_by_play", pbp_rows, ["game_id"], update_exclude=["created_at"])
-            inserted_poc = upsert(conn, "nba.players_on_court", poc_rows, ["game_id"], update_exclude=["created_at"])
-            if hustle_player_rows:
-                inserted_hustle_players = upsert(
-                    conn,
-                    "nba.hustle_stats",
-                    hustle_player_rows,
-                    ["game_id", "nba_id"],
-                    update_exclude=["created_at"],
-                )
-            if hustle_team_rows:
-                inserted_hustle_teams = upsert(
-                    conn,
-                    "nba.hustle_stats_team",
-                    hustle_team_rows,
-                    ["game_id", "team_id"],
-                    update_exclude=["created_at"],
-                )
-            if hustle_event_rows:
-                inserted_hustle_events = upsert(
-                    conn,
-                    "nba.hustle_events",
-                    hustle_event_rows,
-                    ["game_id"],
-                    update_exclude=["created_at"],
-                )
             if tracking_rows:
                 inserted_tracking = upsert(
                     conn,
@@ -2734,12 +3296,38 @@ def main(
                     ["game_id", "team_id"],
                     update_exclude=["created_at"],
                 )
+
+            # Journal Query Tool sections by the final games that produced rows;
+            # games dropped from a skipped batch stay pending for the next run.
+            final_game_id_set = set(final_game_ids)
+            querytool_section_rows = {
+                "advanced_player": advanced_rows,
+                "advanced_team": advanced_team_rows,
+                "tracking": tracking_rows,
+                "defensive": defensive_rows,
+                "violations_player": violations_player_rows,
+                "violations_team": violations_team_rows,
+            }
+            telemetry["upsert"]["checkpoints_recorded"] = record_checkpoints(
+                conn,
+                CHECKPOINT_STEP,
+                {
+                    section: {row.get("game_id") for row in rows if row.get("game_id") in final_game_id_set}
+                    for section, rows in querytool_section_rows.items()
+                },
+                league_id,
+                season_label_value,
+                season_type_value,
+                fetched_at,
+            )
         telemetry["upsert"]["duration_ms"] = elapsed_ms(upsert_started)
+        telemetry["upsert"]["dimension_cache"] = dimension_cache_stats()
 
         if conn:
             conn.close()
 
         telemetry["duration_ms"] = elapsed_ms(started_perf)
+        telemetry["http"] = http_telemetry()
 
         return {
             "dry_run": dry_run,
@@ -2751,15 +3339,48 @@ def main(
                     "rows": placeholder_players_missing,
                     "upserted": placeholder_players_upserted,
                 },
-                {"table": "nba.boxscores_traditional", "rows": len(player_rows), "upserted": inserted_players},
-                {"table": "nba.boxscores_traditional_team", "rows": len(team_rows), "upserted": inserted_teams},
+                {
+                    "table": "nba.boxscores_traditional",
+                    "rows": legacy_row_counts["nba.boxscores_traditional"],
+                    "upserted": legacy_upserted.get("nba.boxscores_traditional", 0),
+                },
+                {
+                    "table": "nba.boxscores_traditional_team",
+                    "rows": legacy_row_counts["nba.boxscores_traditional_team"],
+                    "upserted": legacy_upserted.get("nba.boxscores_traditional_team", 0),
+                },
                 {"table": "nba.boxscores_advanced", "rows": len(advanced_rows), "upserted": inserted_advanced},
                 {"table": "nba.boxscores_advanced_team", "rows": len(advanced_team_rows), "upserted": inserted_advanced_team},
-                {"table": "nba.play_by_play", "rows": len(pbp_rows), "upserted": inserted_pbp},
-                {"table": "nba.players_on_court", "rows": len(poc_rows), "upserted": inserted_poc},
-                {"table": "nba.hustle_stats", "rows": len(hustle_player_rows), "upserted": inserted_hustle_players},
-                {"table": "nba.hustle_stats_team", "rows": len(hustle_team_rows), "upserted": inserted_hustle_teams},
-                {"table": "nba.hustle_events", "rows": len(hustle_event_rows), "upserted": inserted_hustle_events},
+                {
+                    "table": "nba.play_by_play",
+                    "rows": legacy_row_counts["nba.play_by_play"],
+                    "upserted": legacy_upserted.get("nba.play_by_play", 0),
+                },
+                {
+                    "table": "nba.play_by_play_events",
+                    "rows": legacy_row_counts["nba.play_by_play_events"],
+                    "upserted": legacy_upserted.get("nba.play_by_play_events", 0),
+                },
+                {
+                    "table": "nba.players_on_court",
+                    "rows": legacy_row_counts["nba.players_on_court"],
+                    "upserted": legacy_upserted.get("nba.players_on_court", 0),
+                },
+                {
+                    "table": "nba.hustle_stats",
+                    "rows": legacy_row_counts["nba.hustle_stats"],
+                    "upserted": legacy_upserted.get("nba.hustle_stats", 0),
+                },
+                {
+                    "table": "nba.hustle_stats_team",
+                    "rows": legacy_row_counts["nba.hustle_stats_team"],
+                    "upserted": legacy_upserted.get("nba.hustle_stats_team", 0),
+                },
+                {
+                    "table": "nba.hustle_events",
+                    "rows": legacy_row_counts["nba.hustle_events"],
+                    "upserted": legacy_upserted.get("nba.hustle_events", 0),
+                },
                 {"table": "nba.tracking_stats", "rows": len(tracking_rows), "upserted": inserted_tracking},
                 {"table": "nba.defensive_stats", "rows": len(defensive_rows), "upserted": inserted_defensive},
                 {"table": "nba.violations_player", "rows": len(violations_player_rows), "upserted": inserted_violations_player},
@@ -2773,6 +3394,7 @@ def main(
             conn.close()
 
         telemetry["duration_ms"] = elapsed_ms(started_perf)
+        telemetry["http"] = http_telemetry()
 
         return {
             "dry_run": dry_run,
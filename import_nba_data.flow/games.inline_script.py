@@ -1,10 +1,12 @@
 # /// script
 # requires-python = ">=3.11"
-# dependencies = ["psycopg[binary]", "httpx", "sniffio", "typing-extensions"]
+# dependencies = ["psycopg[binary]", "httpx[http2]", "sniffio", "typing-extensions"]
 # ///
+import importlib.util
 import os
-import time
+import sys
 from datetime import datetime, timezone, timedelta, date
+from pathlib import Path
 
 import httpx
 import psycopg
@@ -17,6 +19,72 @@ PLAYOFF_SERIES_ROUNDS = {
     3: 2,
     4: 1,
 }
+# Scoreboard days and playoff series summaries are independent requests; fetch
+# them concurrently and merge results back in request order.
+GAMES_FETCH_CONCURRENCY = 8
+
+
+def _load_http_client_module():
+    # One shared instance per process so pooled connections are shared by every
+    # step in a run (HTTP telemetry stays per step, see begin_http_telemetry).
+    cached = sys.modules.get("nba_http_client")
+    if cached is not None:
+        return cached
+
+    candidates: list[Path] = []
+    if "__file__" in globals():
+        candidates.append(Path(__file__).with_name("http_client.py"))
+    candidates.append(Path("import_nba_data.flow/http_client.py"))
+
+    for path in candidates:
+        if not path.exists():
+            continue
+        spec = importlib.util.spec_from_file_location("nba_http_client", path)
+        if spec is None or spec.loader is None:
+            continue
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["nba_http_client"] = module
+        spec.loader.exec_module(module)
+        return module
+
+    raise FileNotFoundError("Unable to load http_client.py")
+
+
+_http_client = _load_http_client_module()
+http_get = _http_client.http_get
+pooled_client = _http_client.pooled_client
+http_telemetry = _http_client.http_telemetry
+begin_http_telemetry = _http_client.begin_http_telemetry
+ScopedThreadPoolExecutor = _http_client.ScopedThreadPoolExecutor
+
+
+def _load_dimension_cache_module():
+    # One shared instance per process so every step in a run sees the same cache.
+    cached = sys.modules.get("nba_dimension_cache")
+    if cached is not None:
+        return cached
+
+    candidates: list[Path] = []
+    if "__file__" in globals():
+        candidates.append(Path(__file__).with_name("dimension_cache.py"))
+    candidates.append(Path("import_nba_data.flow/dimension_cache.py"))
+
+    for path in candidates:
+        if not path.exists():
+            continue
+        spec = importlib.util.spec_from_file_location("nba_dimension_cache", path)
+        if spec is None or spec.loader is None:
+            continue
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["nba_dimension_cache"] = module
+        spec.loader.exec_module(module)
+        return module
+
+    raise FileNotFoundError("Unable to load dimension_cache.py")
+
+
+_dimension_cache = _load_dimension_cache_module()
+ensure_teams = _dimension_cache.ensure_teams
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -119,23 +187,13 @@ def build_team_seed_row(team: dict, league_id: str, fetched_at: datetime) -> dic
     }
 
 
-def request_json(client: httpx.Client, path: str, params: dict | None = None, retries: int = 3) -> dict:
+def request_json(client: httpx.Client, path: str, params: dict | None = None, retries: int | None = None) -> dict:
     headers = {"X-NBA-Api-Key": os.environ["NBA_API_KEY"]}
-    url = f"{BASE_URL}{path}"
-
-    for attempt in range(retries):
-        resp = client.get(url, params=params, headers=headers)
-        if resp.status_code in {429, 500, 502, 503, 504}:
-            if attempt == retries - 1:
-                resp.raise_for_status()
-            time.sleep(1 + attempt)
-            continue
-        if resp.status_code == 404:
-            return {}
-        resp.raise_for_status()
-        return resp.json()
-
-    raise RuntimeError(f"Failed to fetch {url}")
+    response = http_get(client, f"{BASE_URL}{path}", params, headers, retries=retries)
+    if response.status_code == 404:
+        return {}
+    response.raise_for_status()
+    return response.json()
 
 
 def upsert(conn: psycopg.Connection, table: str, rows: list[dict], conflict_keys: list[str], update_exclude: list[str] | None = None) -> int:
@@ -233,6 +291,20 @@ def date_range(start: date, end: date):
         current += timedelta(days=1)
 
 
+def fetch_scoreboard_days(client: httpx.Client, league_id: str, days: list[date]) -> list[dict]:
+    with ScopedThreadPoolExecutor(max_workers=GAMES_FETCH_CONCURRENCY) as executor:
+        return list(
+            executor.map(
+                lambda day: request_json(
+                    client,
+                    "/api/scores/scoreboard/date",
+                    {"leagueId": league_id, "gameDate": day.isoformat()},
+                ),
+                days,
+            )
+        )
+
+
 def extract_broadcasters(broadcasters: dict | None, key: str) -> list[str] | None:
     if not broadcasters:
         return None
@@ -253,51 +325,62 @@ def fetch_playoff_series(
     season_year = parse_season_year(season_label)
     rows: list[dict] = []
 
-    for po_round, series_count in PLAYOFF_SERIES_ROUNDS.items():
-        for series_number in range(series_count):
-            payload = request_json(
-                client,
-                "/api/scores/playoff/seriessummary",
-                {
-                    "leagueId": league_id,
-                    "season": season_label,
-                    "series": series_number,
-                    "poRound": po_round,
-                },
-            )
-            series = payload.get("series") or {}
-            series_id = series.get("seriesId")
-            if not series_id:
-                continue
-            series_status = series.get("seriesStatus")
-            rows.append(
-                {
-                    "series_id": series_id,
-                    "league_id": league_id,
-                    "season_year": season_year,
-                    "season_label": season_label,
-                    "season_type": season_type,
-                    "round_number": series.get("roundNumber"),
-                    "series_number": series.get("seriesNumber"),
-                    "series_conference": series.get("seriesConference"),
-                    "series_text": series.get("seriesText"),
-                    "series_status": str(series_status) if series_status is not None else None,
-                    "high_seed_id": parse_int(series.get("highSeedId")),
-                    "low_seed_id": parse_int(series.get("lowSeedId")),
-                    "high_seed_rank": parse_int(series.get("highSeedRank")),
-                    "low_seed_rank": parse_int(series.get("lowSeedRank")),
-                    "high_seed_series_wins": parse_int(series.get("highSeedSeriesWins")),
-                    "low_seed_series_wins": parse_int(series.get("lowSeedSeriesWins")),
-                    "series_winner_team_id": parse_int(series.get("seriesWinner")),
-                    "next_series_id": series.get("nextSeriesId"),
-                    "next_game_id": series.get("nextGameId"),
-                    "series_game_id_prefix": series.get("seriesGameIdsFirst9Digits"),
-                    "series_json": Json(payload),
-                    "created_at": fetched_at,
-                    "updated_at": fetched_at,
-                    "fetched_at": fetched_at,
-                }
+    series_keys = [
+        (po_round, series_number)
+        for po_round, series_count in PLAYOFF_SERIES_ROUNDS.items()
+        for series_number in range(series_count)
+    ]
+    with ScopedThreadPoolExecutor(max_workers=GAMES_FETCH_CONCURRENCY) as executor:
+        payloads = list(
+            executor.map(
+                lambda key: request_json(
+                    client,
+                    "/api/scores/playoff/seriessummary",
+                    {
+                        "leagueId": league_id,
+                        "season": season_label,
+                        "series": key[1],
+                        "poRound": key[0],
+                    },
+                ),
+                series_keys,
             )
+        )
+
+    for payload in payloads:
+        series = payload.get("series") or {}
+        series_id = series.get("seriesId")
+        if not series_id:
+            continue
+        series_status = series.get("seriesStatus")
+        rows.append(
+            {
+                "series_id": series_id,
+                "league_id": league_id,
+                "season_year": season_year,
+                "season_label": season_label,
+                "season_type": season_type,
+                "round_number": series.get("roundNumber"),
+                "series_number": series.get("seriesNumber"),
+                "series_conference": series.get("seriesConference"),
+                "series_text": series.get("seriesText"),
+                "series_status": str(series_status) if series_status is not None else None,
+                "high_seed_id": parse_int(series.get("highSeedId")),
+                "low_seed_id": parse_int(series.get("lowSeedId")),
+                "high_seed_rank": parse_int(series.get("highSeedRank")),
+                "low_seed_rank": parse_int(series.get("lowSeedRank")),
+                "high_seed_series_wins": parse_int(series.get("highSeedSeriesWins")),
+                "low_seed_series_wins": parse_int(series.get("lowSeedSeriesWins")),
+                "series_winner_team_id": parse_int(series.get("seriesWinner")),
+                "next_series_id": series.get("nextSeriesId"),
+                "next_game_id": series.get("nextGameId"),
+                "series_game_id_prefix": series.get("seriesGameIdsFirst9Digits"),
+                "series_json": Json(payload),
+                "created_at": fetched_at,
+                "updated_at": fetched_at,
+                "fetched_at": fetched_at,
+            }
+        )
 
     return rows
 
@@ -316,6 +399,7 @@ def main(
     start_date: str | None = None,
     end_date: str | None = None,
 ) -> dict:
+    begin_http_telemetry()
     started_at = now_utc()
 
     try:
@@ -328,13 +412,10 @@ def main(
         desired_season_type = normalize_season_type(season_type)
         skipped_by_season_type = 0
 
-        with httpx.Client(timeout=30) as client:
-            for day in date_range(start_dt, end_dt):
-                payload = request_json(
-                    client,
-                    "/api/scores/scoreboard/date",
-                    {"leagueId": league_id, "gameDate": day.isoformat()},
-                )
+        with pooled_client(BASE_URL) as client:
+            days = list(date_range(start_dt, end_dt))
+            day_payloads = fetch_scoreboard_days(client, league_id, days)
+            for day, payload in zip(days, day_payloads):
                 scoreboard = payload.get("scoreboard") or {}
                 games = scoreboard.get("games") or []
                 league_id_value = scoreboard.get("leagueId") or league_id
@@ -442,65 +523,21 @@ def main(
         if not dry_run:
             conn = psycopg.connect(os.environ["POSTGRES_URL"])
             if rows:
-                referenced_team_ids = list(
-                    {
-                        team_id
-                        for row in rows
-                        for team_id in (row.get("home_team_id"), row.get("away_team_id"))
-                        if team_id is not None
-                    }
+                referenced_team_ids = {
+                    team_id
+                    for row in rows
+                    for team_id in (row.get("home_team_id"), row.get("away_team_id"))
+                    if team_id is not None
+                }
+                seeded_team_rows, inserted_seeded_teams = ensure_teams(
+                    conn,
+                    referenced_team_ids,
+                    league_id,
+                    fetched_at,
+                    upsert,
+                    seed_rows_by_id=team_seed_rows_by_id,
                 )
 
-                existing_team_ids: set[int] = set()
-                if referenced_team_ids:
-                    with conn.cursor() as cur:
-                        cur.execute(
-                            "SELECT team_id FROM nba.teams WHERE team_id = ANY(%s)",
-                            (referenced_team_ids,),
-                        )
-                        existing_team_ids = {row[0] for row in cur.fetchall()}
-
-                missing_team_ids = [team_id for team_id in referenced_team_ids if team_id not in existing_team_ids]
-                if missing_team_ids:
-                    seeded_rows: list[dict] = []
-                    for team_id in missing_team_ids:
-                        seed_row = team_seed_rows_by_id.get(team_id)
-                        if seed_row:
-                            seeded_rows.append(seed_row)
-                            continue
-
-                        seeded_rows.append(
-                            {
-                                "team_id": team_id,
-                                "team_name": None,
-                                "team_city": None,
-                                "team_full_name": None,
-                                "team_tricode": None,
-                                "team_slug": None,
-                                "league_id": league_id,
-                                "conference": None,
-                                "division": None,
-                                "state": None,
-                                "arena_name": None,
-                                "arena_city": None,
-                                "arena_state": None,
-                                "arena_timezone": None,
-                                "is_active": True,
-                                "created_at": fetched_at,
-                                "updated_at": fetched_at,
-                                "fetched_at": fetched_at,
-                            }
-                        )
-
-                    seeded_team_rows = len(seeded_rows)
-                    inserted_seeded_teams = upsert(
-                        conn,
-                        "nba.teams",
-                        seeded_rows,
-                        ["team_id"],
-                        update_exclude=["created_at"],
-                    )
-
                 inserted = upsert(conn, "nba.games", rows, ["game_id"], update_exclude=["created_at"])
 
             if series_rows:
@@ -535,6 +572,7 @@ def main(
                 },
             ],
             "skipped_games_by_season_type": skipped_by_season_type,
+            "telemetry": {"http": http_telemetry()},
             "errors": [],
         }
     except Exception as exc:
@@ -543,6 +581,7 @@ def main(
             "started_at": started_at.isoformat(),
             "finished_at": now_utc().isoformat(),
             "tables": [],
+            "telemetry": {"http": http_telemetry()},
             "errors": [str(exc)],
         }
 
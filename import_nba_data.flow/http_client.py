@@ -0,0 +1,280 @@
+import importlib.util
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, Iterator
+from urllib.parse import urlsplit
+
+import httpx
+
+# httpx only negotiates HTTP/2 when the optional h2 package is installed.
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# One pooled client per scheme://host:port for the whole process. Steps no
+# longer open their own httpx.Client per run/game/event type, so TLS handshakes
+# and connections are reused across requests (and across steps in a local `all`
+# run, where the loader reuses this module). With HTTP/2 most traffic to a host
+# multiplexes over a handful of connections.
+HTTP_TIMEOUT_SECONDS = 60
+HTTP_CONNECT_TIMEOUT_SECONDS = 10
+HTTP_POOL_MAX_CONNECTIONS = 32
+HTTP_POOL_MAX_KEEPALIVE_CONNECTIONS = 32
+HTTP_KEEPALIVE_EXPIRY_SECONDS = 60
+
+HTTP_RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+HTTP_RETRY_MAX_ATTEMPTS = 4
+HTTP_RETRY_MIN_WAIT_SECONDS = 1
+HTTP_RETRY_MAX_WAIT_SECONDS = 8
+# 403 from api.nba.com usually means temporary upstream gating; back off longer.
+HTTP_FORBIDDEN_MAX_WAIT_SECONDS = 20
+
+# Upper bounds (ms) of the per-endpoint latency histogram buckets.
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+# Path segments that carry ids (game ids, GUIDs) are collapsed in endpoint keys.
+_ID_SEGMENT = re.compile(r"\d{4,}|^[0-9a-f]{8}-[0-9a-f]{4}-", re.IGNORECASE)
+
+_lock = threading.Lock()
+_clients: dict[str, httpx.Client] = {}
+
+# Endpoint stats are collected per step, not per process: a local `all` run
+# executes steps side by side in threads of one process. Each step's main calls
+# begin_http_telemetry(), which installs a fresh collector in its context;
+# ScopedThreadPoolExecutor carries it into worker threads. Calls made outside
+# any step scope land in the process-wide default collector.
+_default_endpoint_stats: dict[str, dict] = {}
+_endpoint_stats_scope: ContextVar[dict[str, dict] | None] = ContextVar("nba_http_endpoint_stats", default=None)
+
+
+def _current_endpoint_stats() -> dict[str, dict]:
+    scoped = _endpoint_stats_scope.get()
+    return _default_endpoint_stats if scoped is None else scoped
+
+
+def begin_http_telemetry() -> None:
+    """Start a fresh telemetry collector for the calling step (its thread/context)."""
+    _endpoint_stats_scope.set({})
+
+
+def with_http_scope(fn: Callable) -> Callable:
+    """Bind fn to the caller's telemetry collector so calls it makes in another thread count there."""
+    scope = _endpoint_stats_scope.get()
+
+    @wraps(fn)
+    def run(*args, **kwargs):
+        token = _endpoint_stats_scope.set(scope)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _endpoint_stats_scope.reset(token)
+
+    return run
+
+
+class ScopedThreadPoolExecutor(ThreadPoolExecutor):
+    """ThreadPoolExecutor whose tasks record HTTP telemetry in the submitter's collector."""
+
+    def submit(self, fn, /, *args, **kwargs):
+        return super().submit(with_http_scope(fn), *args, **kwargs)
+
+
+def _host_key(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def endpoint_key(url: str) -> str:
+    """host + path with id-like segments collapsed, e.g. api.ngss.nba.com:10000/Games/{id}/rosters."""
+    parts = urlsplit(url)
+    segments = ["{id}" if _ID_SEGMENT.search(segment) else segment for segment in parts.path.split("/")]
+    return f"{parts.netloc}{'/'.join(segments)}"
+
+
+def client_for(url: str) -> httpx.Client:
+    """Return the process-wide pooled client for url's host, creating it on first use."""
+    key = _host_key(url)
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = httpx.Client(
+                http2=HTTP2_AVAILABLE,
+                timeout=httpx.Timeout(HTTP_TIMEOUT_SECONDS, connect=HTTP_CONNECT_TIMEOUT_SECONDS),
+                limits=httpx.Limits(
+                    max_connections=HTTP_POOL_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP_POOL_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS,
+                ),
+            )
+            _clients[key] = client
+        return client
+
+
+@contextmanager
+def pooled_client(url: str) -> Iterator[httpx.Client]:
+    """`with`-friendly access to the pooled client; leaving the block keeps it open."""
+    yield client_for(url)
+
+
+def close_clients() -> None:
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
+
+
+def _record(url: str, elapsed_ms: float | None, status: int | None, retried: bool, failed: bool) -> None:
+    key = endpoint_key(url)
+    endpoint_stats = _current_endpoint_stats()
+    with _lock:
+        stats = endpoint_stats.get(key)
+        if stats is None:
+            stats = {
+                "calls": 0,
+                "attempts": 0,
+                "retries": 0,
+                "errors": 0,
+                "statuses": {},
+                "latency_ms_total": 0.0,
+                "latency_ms_max": 0.0,
+                "latency_histogram": [0] * (len(LATENCY_BUCKETS_MS) + 1),
+            }
+            endpoint_stats[key] = stats
+
+        stats["attempts"] += 1
+        if retried:
+            stats["retries"] += 1
+        else:
+            stats["calls"] += 1
+        if failed:
+            stats["errors"] += 1
+        status_key = str(status) if status is not None else "exception"
+        stats["statuses"][status_key] = stats["statuses"].get(status_key, 0) + 1
+        if elapsed_ms is not None:
+            stats["latency_ms_total"] += elapsed_ms
+            stats["latency_ms_max"] = max(stats["latency_ms_max"], elapsed_ms)
+            bucket = next(
+                (index for index, bound in enumerate(LATENCY_BUCKETS_MS) if elapsed_ms <= bound),
+                len(LATENCY_BUCKETS_MS),
+            )
+            stats["latency_histogram"][bucket] += 1
+
+
+def _retry_wait_seconds(attempt: int, response: httpx.Response | None) -> float:
+    wait_seconds = min(HTTP_RETRY_MAX_WAIT_SECONDS, HTTP_RETRY_MIN_WAIT_SECONDS * 2 ** (attempt - 1))
+    if response is None:
+        return wait_seconds
+    if response.status_code == 403:
+        return min(HTTP_FORBIDDEN_MAX_WAIT_SECONDS, 5 * attempt)
+    retry_after = response.headers.get("Retry-After")
+    if retry_after and retry_after.strip().isdigit():
+        return min(HTTP_FORBIDDEN_MAX_WAIT_SECONDS, max(wait_seconds, float(retry_after.strip())))
+    return wait_seconds
+
+
+def is_retryable_response(response: httpx.Response, retryable_statuses: frozenset[int] | set[int]) -> bool:
+    retryable_400 = response.status_code == 400 and "Database Error" in response.text
+    return response.status_code in retryable_statuses or retryable_400
+
+
+def http_get(
+    client: httpx.Client,
+    url: str,
+    params: dict | None = None,
+    headers: dict | None = None,
+    retries: int | None = None,
+    retryable_statuses: frozenset[int] | set[int] = HTTP_RETRYABLE_STATUSES,
+    timeout: float | None = None,
+) -> httpx.Response:
+    """GET with the shared retry/backoff policy, recording per-endpoint metrics.
+
+    Timeouts, transport errors and retryable statuses (plus api.nba.com's
+    transient 400 "Database Error") are retried with exponential backoff,
+    honouring Retry-After. After the last attempt a retryable status raises
+    HTTPStatusError; any other response is returned for the caller to judge.
+    """
+    attempts = HTTP_RETRY_MAX_ATTEMPTS if retries is None else max(1, retries)
+    request_kwargs: dict = {"params": params, "headers": headers}
+    if timeout is not None:
+        request_kwargs["timeout"] = timeout
+
+    for attempt in range(1, attempts + 1):
+        last_attempt = attempt == attempts
+        started = time.perf_counter()
+        try:
+            response = client.get(url, **request_kwargs)
+        except httpx.TransportError:
+            _record(url, None, None, attempt > 1, last_attempt)
+            if last_attempt:
+                raise
+            time.sleep(_retry_wait_seconds(attempt, None))
+            continue
+
+        elapsed = (time.perf_counter() - started) * 1000
+        retryable = is_retryable_response(response, retryable_statuses)
+        failed = response.status_code >= 400 and response.status_code != 404 and (last_attempt or not retryable)
+        _record(url, elapsed, response.status_code, attempt > 1, failed)
+        if not retryable:
+            return response
+        if last_attempt:
+            response.raise_for_status()
+        time.sleep(_retry_wait_seconds(attempt, response))
+
+    raise RuntimeError(f"Failed to fetch {url}")
+
+
+def _percentile_ms(histogram: list[int], fraction: float) -> float | None:
+    total = sum(histogram)
+    if not total:
+        return None
+    threshold = total * fraction
+    running = 0
+    for index, count in enumerate(histogram):
+        running += count
+        if running >= threshold:
+            return float(LATENCY_BUCKETS_MS[index]) if index < len(LATENCY_BUCKETS_MS) else None
+    return None
+
+
+def http_telemetry() -> dict:
+    """Same-shaped HTTP telemetry for every step: totals plus per-endpoint counts and latency.
+
+    Covers the calls made since the step's begin_http_telemetry(). Percentiles
+    are histogram bucket upper bounds (None = beyond the last bucket).
+    """
+    endpoint_stats = _current_endpoint_stats()
+    with _lock:
+        endpoints = {
+            key: {
+                "calls": stats["calls"],
+                "attempts": stats["attempts"],
+                "retries": stats["retries"],
+                "errors": stats["errors"],
+                "statuses": dict(stats["statuses"]),
+                "latency_ms": {
+                    "avg": round(stats["latency_ms_total"] / stats["attempts"], 2) if stats["attempts"] else 0.0,
+                    "max": round(stats["latency_ms_max"], 2),
+                    "p50": _percentile_ms(stats["latency_histogram"], 0.5),
+                    "p95": _percentile_ms(stats["latency_histogram"], 0.95),
+                    "histogram": {
+                        **{f"le_{bound}": count for bound, count in zip(LATENCY_BUCKETS_MS, stats["latency_histogram"])},
+                        "gt_last": stats["latency_histogram"][-1],
+                    },
+                },
+            }
+            for key, stats in sorted(endpoint_stats.items())
+        }
+        pooled_hosts = sorted(_clients)
+
+    return {
+        "http2": HTTP2_AVAILABLE,
+        "pooled_hosts": pooled_hosts,
+        "calls": sum(stats["calls"] for stats in endpoints.values()),
+        "retries": sum(stats["retries"] for stats in endpoints.values()),
+        "errors": sum(stats["errors"] for stats in endpoints.values()),
+        "endpoints": endpoints,
+    }
@@ -1,5 +1,6 @@
 import time
-from typing import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator
 
 import httpx
 
@@ -18,6 +19,8 @@ LINEUP_GAME_BATCH_SIZE = {
 }
 # TeamId batching for /season/lineups. 10 tends to be reliable and fast.
 LINEUP_SEASON_TEAM_BATCH_SIZE = 10
+# Shared limit on concurrent Query Tool lineup requests across all jobs.
+LINEUP_FETCH_CONCURRENCY = 6
 
 LINEUP_STAT_COLUMNS = [
     "gp",
@@ -320,3 +323,42 @@ def fetch_querytool_batched_rows(
         all_rows.extend(rows)
 
     return all_rows, warnings
+
+
+def run_querytool_jobs(
+    client: httpx.Client,
+    request_json: Callable,
+    jobs: list[dict],
+    max_workers: int,
+    max_rows_returned: int,
+    truncation_threshold: int,
+) -> Iterator[dict]:
+    """Run independent Query Tool batch jobs concurrently; results are yielded in job order.
+
+    Each job carries `path`, `base_params`, `ids` (one batch) and `batch_param`.
+    A job that still fails after split/retry reports its exception in `error`
+    instead of failing the whole run.
+    """
+
+    def run_job(job: dict) -> dict:
+        try:
+            rows, warnings = fetch_querytool_batched_rows(
+                client=client,
+                request_json=request_json,
+                path=job["path"],
+                base_params=job["base_params"],
+                ids=job["ids"],
+                row_key=job.get("row_key", "lineups"),
+                batch_size=len(job["ids"]),
+                max_rows_returned=max_rows_returned,
+                truncation_threshold=truncation_threshold,
+                batch_param=job["batch_param"],
+            )
+        except Exception as exc:
+            return {"job": job, "rows": [], "warnings": [], "error": exc}
+        return {"job": job, "rows": rows, "warnings": warnings, "error": None}
+
+    if not jobs:
+        return
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs)))) as executor:
+        yield from executor.map(run_job, jobs)
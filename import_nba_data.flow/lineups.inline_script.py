@@ -1,10 +1,10 @@
 # /// script
 # requires-python = ">=3.11"
-# dependencies = ["psycopg[binary]", "httpx", "sniffio", "typing-extensions"]
+# dependencies = ["psycopg[binary]", "httpx[http2]", "sniffio", "typing-extensions"]
 # ///
 import importlib.util
 import os
-import time
+import sys
 from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 
@@ -14,6 +14,41 @@ import psycopg
 BASE_URL = "https://api.nba.com/v0"
 QUERY_TOOL_TRUNCATION_THRESHOLD = 9900
 LINEUPS_SKIP_EXISTING_ON_SEASON_BACKFILL = True
+CHECKPOINT_STEP = "lineups"
+
+
+def _load_http_client_module():
+    # One shared instance per process so pooled connections are shared by every
+    # step in a run (HTTP telemetry stays per step, see begin_http_telemetry).
+    cached = sys.modules.get("nba_http_client")
+    if cached is not None:
+        return cached
+
+    candidates: list[Path] = []
+    if "__file__" in globals():
+        candidates.append(Path(__file__).with_name("http_client.py"))
+    candidates.append(Path("import_nba_data.flow/http_client.py"))
+
+    for path in candidates:
+        if not path.exists():
+            continue
+        spec = importlib.util.spec_from_file_location("nba_http_client", path)
+        if spec is None or spec.loader is None:
+            continue
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["nba_http_client"] = module
+        spec.loader.exec_module(module)
+        return module
+
+    raise FileNotFoundError("Unable to load http_client.py")
+
+
+_http_client = _load_http_client_module()
+http_get = _http_client.http_get
+pooled_client = _http_client.pooled_client
+http_telemetry = _http_client.http_telemetry
+begin_http_telemetry = _http_client.begin_http_telemetry
+with_http_scope = _http_client.with_http_scope
 
 
 def _load_lineup_utils_module():
@@ -45,9 +80,41 @@ LINEUP_GROUPING = _lineup_utils.LINEUP_GROUPING
 LINEUP_GAME_BATCH_SIZE = _lineup_utils.LINEUP_GAME_BATCH_SIZE
 LINEUP_SEASON_TEAM_BATCH_SIZE = _lineup_utils.LINEUP_SEASON_TEAM_BATCH_SIZE
 LINEUP_STAT_COLUMNS = _lineup_utils.LINEUP_STAT_COLUMNS
+LINEUP_FETCH_CONCURRENCY = _lineup_utils.LINEUP_FETCH_CONCURRENCY
 map_lineup_stats = _lineup_utils.map_lineup_stats
 extract_lineup_player_ids = _lineup_utils.extract_lineup_player_ids
-fetch_querytool_batched_rows = _lineup_utils.fetch_querytool_batched_rows
+chunked = _lineup_utils.chunked
+run_querytool_jobs = _lineup_utils.run_querytool_jobs
+
+
+def _load_checkpoint_utils_module():
+    # One shared instance per process so every step in a run uses the same module.
+    cached = sys.modules.get("nba_checkpoint_utils")
+    if cached is not None:
+        return cached
+
+    candidates: list[Path] = []
+    if "__file__" in globals():
+        candidates.append(Path(__file__).with_name("checkpoint_utils.py"))
+    candidates.append(Path("import_nba_data.flow/checkpoint_utils.py"))
+
+    for path in candidates:
+        if not path.exists():
+            continue
+        spec = importlib.util.spec_from_file_location("nba_checkpoint_utils", path)
+        if spec is None or spec.loader is None:
+            continue
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["nba_checkpoint_utils"] = module
+        spec.loader.exec_module(module)
+        return module
+
+    raise FileNotFoundError("Unable to load checkpoint_utils.py")
+
+
+_checkpoint_utils = _load_checkpoint_utils_module()
+record_checkpoints = _checkpoint_utils.record_checkpoints
+resolve_pending_game_ids = _checkpoint_utils.resolve_pending_game_ids
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -180,33 +247,15 @@ def request_json(
     client: httpx.Client,
     path: str,
     params: dict | None = None,
-    retries: int = 3,
+    retries: int | None = None,
     base_url: str = BASE_URL,
 ) -> dict:
     headers = {"X-NBA-Api-Key": os.environ["NBA_API_KEY"]}
-    url = f"{base_url}{path}"
-
-    for attempt in range(retries):
-        try:
-            resp = client.get(url, params=params, headers=headers)
-        except httpx.TimeoutException:
-            if attempt == retries - 1:
-                raise
-            time.sleep(1 + attempt)
-            continue
-
-        retryable_400 = resp.status_code == 400 and "Database Error" in resp.text
-        if resp.status_code in {429, 500, 502, 503, 504} or retryable_400:
-            if attempt == retries - 1:
-                resp.raise_for_status()
-            time.sleep(1 + attempt)
-            continue
-        if resp.status_code == 404:
-            return {}
-        resp.raise_for_status()
-        return resp.json()
-
-    raise RuntimeError(f"Failed to fetch {url}")
+    response = http_get(client, f"{base_url}{path}", params, headers, retries=retries)
+    if response.status_code == 404:
+        return {}
+    response.raise_for_status()
+    return response.json()
 
 
 def upsert(
@@ -268,6 +317,10 @@ def fetch_existing_game_lineup_ids(
         return {row[0] for row in cur.fetchall() if row and row[0]}
 
 
+def game_lineup_checkpoint_endpoint(measure_type: str) -> str:
+    return f"game_lineups:{measure_type}"
+
+
 def fetch_existing_season_lineup_team_ids(
     conn: psycopg.Connection,
     team_ids: list[int],
@@ -295,6 +348,54 @@ def fetch_existing_season_lineup_team_ids(
         return {row[0] for row in cur.fetchall() if row and row[0] is not None}
 
 
+def build_lineup_row(
+    lineup: dict,
+    job: dict,
+    league_id: str,
+    season_label_value: str | None,
+    season_year: int | None,
+    season_type: str,
+    fetched_at: datetime,
+) -> dict | None:
+    player_ids = extract_lineup_player_ids(lineup)
+    if not player_ids:
+        return None
+    team_id = parse_int(lineup.get("teamId"))
+    if team_id is None:
+        return None
+
+    row: dict = {}
+    if job["section"] == "game_lineup":
+        row["game_id"] = lineup.get("gameId")
+        if not row["game_id"]:
+            return None
+
+    season_label_lineup = lineup.get("seasonYear") or season_label_value
+    season_year_lineup = parse_season_year(season_label_lineup) or season_year
+    row.update(
+        {
+            "league_id": lineup.get("leagueId") or league_id,
+            "season_year": season_year_lineup,
+            "season_label": season_label_lineup,
+            "season_type": lineup.get("seasonType") or season_type,
+            "team_id": team_id,
+            "player_ids": player_ids,
+            "per_mode": job["per_mode"],
+            "measure_type": job["measure_type"],
+            "created_at": fetched_at,
+            "updated_at": fetched_at,
+            "fetched_at": fetched_at,
+        }
+    )
+    for column in LINEUP_STAT_COLUMNS:
+        row[column] = None
+    row.update(map_lineup_stats(lineup.get("stats") or {}))
+    minutes = row.get("minutes")
+    if minutes is None or minutes <= 0:
+        return None
+    return row
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Main
 # ─────────────────────────────────────────────────────────────────────────────
@@ -312,6 +413,7 @@ def main(
     game_ids: str | None = None,
     only_final_games: bool = True,
 ) -> dict:
+    begin_http_telemetry()
     started_at = now_utc()
 
     conn: psycopg.Connection | None = None
@@ -333,11 +435,12 @@ def main(
             and not bool(game_ids)
         )
 
-        lineup_season_rows: list[dict] = []
-        lineup_game_rows: list[dict] = []
+        lineup_season_row_count = 0
+        lineup_game_row_count = 0
 
         conn = psycopg.connect(os.environ["POSTGRES_URL"])
         game_list: list[str] = []
+        final_game_id_set: set[str] = set()
         section_errors: list[str] = []
 
         if game_ids:
@@ -368,175 +471,166 @@ def main(
                 game_list = [gid for gid, status, _ in game_status_rows if status == 3]
             else:
                 game_list = [gid for gid, _, _ in game_status_rows]
-
-        with httpx.Client(timeout=60) as client:
-            # --- Season lineups ---
-            try:
-                if season_label_value and run_season_lineups:
-                    lineup_team_ids: list[int] = []
-
-                    # For refresh/date backfills, scope season lineups to teams that
-                    # actually appear in the selected game set.
-                    if normalized_mode != "season_backfill" and game_list:
-                        with conn.cursor() as cur:
-                            cur.execute(
-                                """
-                                SELECT DISTINCT team_id
-                                FROM (
-                                    SELECT home_team_id AS team_id
-                                    FROM nba.games
-                                    WHERE game_id = ANY(%s::text[])
-                                    UNION ALL
-                                    SELECT away_team_id AS team_id
-                                    FROM nba.games
-                                    WHERE game_id = ANY(%s::text[])
-                                ) teams
-                                WHERE team_id IS NOT NULL
-                                ORDER BY team_id
-                                """,
-                                (game_list, game_list),
-                            )
-                            lineup_team_ids = [row[0] for row in cur.fetchall() if row and row[0] is not None]
-
-                    if not lineup_team_ids:
-                        with conn.cursor() as cur:
-                            cur.execute(
-                                """
-                                SELECT team_id
-                                FROM nba.teams
+            final_game_id_set = {gid for gid, status, _ in game_status_rows if status == 3}
+
+        # Per-game lineups resume from the checkpoint journal; season lineups are
+        # team-scoped and keep their table probe.
+        pending_game_ids_by_measure: dict[str, list[str]] = {}
+        if enable_skip_existing and game_list:
+            pending_by_endpoint, _ = resolve_pending_game_ids(
+                conn,
+                CHECKPOINT_STEP,
+                {
+                    game_lineup_checkpoint_endpoint(measure_type): (
+                        lambda ids, measure_type=measure_type: fetch_existing_game_lineup_ids(conn, ids, measure_type)
+                    )
+                    for measure_type in LINEUP_MEASURE_TYPES
+                },
+                game_list,
+                league_id,
+                season_label_value,
+                season_type,
+                seed_from_probes=not dry_run,
+            )
+            pending_game_ids_by_measure = {
+                measure_type: pending_by_endpoint[game_lineup_checkpoint_endpoint(measure_type)]
+                for measure_type in LINEUP_MEASURE_TYPES
+            }
+
+        # Every /season/lineups and /game/lineups request is enumerated up front
+        # as an independent job, then run concurrently; results merge back in
+        # job order.
+        lineup_jobs: list[dict] = []
+
+        # --- Season lineups ---
+        try:
+            if season_label_value and run_season_lineups:
+                lineup_team_ids: list[int] = []
+
+                # For refresh/date backfills, scope season lineups to teams that
+                # actually appear in the selected game set.
+                if normalized_mode != "season_backfill" and game_list:
+                    with conn.cursor() as cur:
+                        cur.execute(
+                            """
+                            SELECT DISTINCT team_id
+                            FROM (
+                                SELECT home_team_id AS team_id
+                                FROM nba.games
+                                WHERE game_id = ANY(%s::text[])
+                                UNION ALL
+                                SELECT away_team_id AS team_id
+                                FROM nba.games
+                                WHERE game_id = ANY(%s::text[])
+                            ) teams
+                            WHERE team_id IS NOT NULL
+                            ORDER BY team_id
+                            """,
+                            (game_list, game_list),
+                        )
+                        lineup_team_ids = [row[0] for row in cur.fetchall() if row and row[0] is not None]
+
+                if not lineup_team_ids:
+                    with conn.cursor() as cur:
+                        cur.execute(
+                            """
+                            SELECT team_id
+                            FROM nba.teams
+                            WHERE league_id = %s
+                              AND COALESCE(is_active, true) = true
+                            ORDER BY team_id
+                            """,
+                            (league_id,),
+                        )
+                        lineup_team_ids = [row[0] for row in cur.fetchall() if row and row[0] is not None]
+
+                if not lineup_team_ids:
+                    with conn.cursor() as cur:
+                        cur.execute(
+                            """
+                            SELECT DISTINCT team_id
+                            FROM (
+                                SELECT home_team_id AS team_id
+                                FROM nba.games
                                 WHERE league_id = %s
-                                  AND COALESCE(is_active, true) = true
-                                ORDER BY team_id
-                                """,
-                                (league_id,),
-                            )
-                            lineup_team_ids = [row[0] for row in cur.fetchall() if row and row[0] is not None]
-
-                    if not lineup_team_ids:
-                        with conn.cursor() as cur:
-                            cur.execute(
-                                """
-                                SELECT DISTINCT team_id
-                                FROM (
-                                    SELECT home_team_id AS team_id
-                                    FROM nba.games
-                                    WHERE league_id = %s
-                                      AND (%s::text IS NULL OR season_label = %s)
-                                    UNION ALL
-                                    SELECT away_team_id AS team_id
-                                    FROM nba.games
-                                    WHERE league_id = %s
-                                      AND (%s::text IS NULL OR season_label = %s)
-                                ) teams
-                                WHERE team_id IS NOT NULL
-                                ORDER BY team_id
-                                """,
-                                (
-                                    league_id,
-                                    season_label_value,
-                                    season_label_value,
-                                    league_id,
-                                    season_label_value,
-                                    season_label_value,
-                                ),
-                            )
-                            lineup_team_ids = [row[0] for row in cur.fetchall() if row and row[0] is not None]
-
-                    if not lineup_team_ids:
-                        section_errors.append("lineup_season: no team ids found; skipping season lineup fetch")
-
-                    for per_mode in LINEUP_PER_MODES:
-                        for measure_type in LINEUP_MEASURE_TYPES:
-                            target_team_ids = list(lineup_team_ids)
-                            if enable_skip_existing and season_year is not None:
-                                existing_team_ids = fetch_existing_season_lineup_team_ids(
-                                    conn,
-                                    lineup_team_ids,
-                                    season_year,
-                                    season_type,
-                                    per_mode,
-                                    measure_type,
-                                )
-                                target_team_ids = [team_id for team_id in lineup_team_ids if team_id not in existing_team_ids]
-
-                            if not target_team_ids:
-                                continue
-
-                            lineup_payload_rows, lineup_warnings = fetch_querytool_batched_rows(
-                                client=client,
-                                request_json=request_json,
-                                path="/season/lineups",
-                                base_params={
-                                    "LeagueId": league_id,
-                                    "SeasonYear": season_label_value,
-                                    "SeasonType": season_type,
-                                    "PerMode": per_mode,
-                                    "Grouping": LINEUP_GROUPING,
-                                    "MeasureType": measure_type,
-                                    "LineupQuantity": LINEUP_QUANTITY,
-                                },
-                                ids=[str(team_id) for team_id in target_team_ids],
-                                row_key="lineups",
-                                batch_size=LINEUP_SEASON_TEAM_BATCH_SIZE,
-                                max_rows_returned=LINEUP_MAX_ROWS,
-                                truncation_threshold=QUERY_TOOL_TRUNCATION_THRESHOLD,
-                                batch_param="TeamId",
+                                  AND (%s::text IS NULL OR season_label = %s)
+                                UNION ALL
+                                SELECT away_team_id AS team_id
+                                FROM nba.games
+                                WHERE league_id = %s
+                                  AND (%s::text IS NULL OR season_label = %s)
+                            ) teams
+                            WHERE team_id IS NOT NULL
+                            ORDER BY team_id
+                            """,
+                            (
+                                league_id,
+                                season_label_value,
+                                season_label_value,
+                                league_id,
+                                season_label_value,
+                                season_label_value,
+                            ),
+                        )
+                        lineup_team_ids = [row[0] for row in cur.fetchall() if row and row[0] is not None]
+
+                if not lineup_team_ids:
+                    section_errors.append("lineup_season: no team ids found; skipping season lineup fetch")
+
+                for per_mode in LINEUP_PER_MODES:
+                    for measure_type in LINEUP_MEASURE_TYPES:
+                        target_team_ids = list(lineup_team_ids)
+                        if enable_skip_existing and season_year is not None:
+                            existing_team_ids = fetch_existing_season_lineup_team_ids(
+                                conn,
+                                lineup_team_ids,
+                                season_year,
+                                season_type,
+                                per_mode,
+                                measure_type,
                             )
-                            for warning in lineup_warnings:
-                                section_errors.append(
-                                    f"lineup_season per_mode={per_mode} measure={measure_type}: {warning}"
-                                )
-
-                            for lineup in lineup_payload_rows:
-                                player_ids = extract_lineup_player_ids(lineup)
-                                if not player_ids:
-                                    continue
-                                team_id = parse_int(lineup.get("teamId"))
-                                if team_id is None:
-                                    continue
-                                season_label_lineup = lineup.get("seasonYear") or season_label_value
-                                season_year_lineup = parse_season_year(season_label_lineup) or season_year
-                                row = {
-                                    "league_id": lineup.get("leagueId") or league_id,
-                                    "season_year": season_year_lineup,
-                                    "season_label": season_label_lineup,
-                                    "season_type": lineup.get("seasonType") or season_type,
-                                    "team_id": team_id,
-                                    "player_ids": player_ids,
+                            target_team_ids = [team_id for team_id in lineup_team_ids if team_id not in existing_team_ids]
+
+                        team_batches = chunked([str(team_id) for team_id in target_team_ids], LINEUP_SEASON_TEAM_BATCH_SIZE)
+                        for team_batch in team_batches:
+                            lineup_jobs.append(
+                                {
+                                    "section": "lineup_season",
                                     "per_mode": per_mode,
                                     "measure_type": measure_type,
-                                    "created_at": fetched_at,
-                                    "updated_at": fetched_at,
-                                    "fetched_at": fetched_at,
+                                    "path": "/season/lineups",
+                                    "base_params": {
+                                        "LeagueId": league_id,
+                                        "SeasonYear": season_label_value,
+                                        "SeasonType": season_type,
+                                        "PerMode": per_mode,
+                                        "Grouping": LINEUP_GROUPING,
+                                        "MeasureType": measure_type,
+                                        "LineupQuantity": LINEUP_QUANTITY,
+                                    },
+                                    "ids": team_batch,
+                                    "batch_param": "TeamId",
                                 }
-                                for column in LINEUP_STAT_COLUMNS:
-                                    row[column] = None
-                                row.update(map_lineup_stats(lineup.get("stats") or {}))
-                                minutes = row.get("minutes")
-                                if minutes is None or minutes <= 0:
-                                    continue
-                                lineup_season_rows.append(row)
-            except Exception as exc:
-                section_errors.append(f"lineup_season: {exc}")
-
-            # --- Per-game lineups (batched GameId) ---
-            if season_label_value and game_list:
-                for measure_type in LINEUP_MEASURE_TYPES:
-                    try:
-                        batch_size = LINEUP_GAME_BATCH_SIZE.get(measure_type, 100)
-                        target_game_ids = list(game_list)
-                        if enable_skip_existing:
-                            existing_game_ids = fetch_existing_game_lineup_ids(conn, game_list, measure_type)
-                            target_game_ids = [gid for gid in game_list if gid not in existing_game_ids]
-
-                        if not target_game_ids:
-                            continue
-
-                        lineup_payload_rows, lineup_warnings = fetch_querytool_batched_rows(
-                            client=client,
-                            request_json=request_json,
-                            path="/game/lineups",
-                            base_params={
+                            )
+        except Exception as exc:
+            section_errors.append(f"lineup_season: {exc}")
+
+        # --- Per-game lineups (batched GameId) ---
+        if season_label_value and game_list:
+            for measure_type in LINEUP_MEASURE_TYPES:
+                target_game_ids = list(game_list)
+                if enable_skip_existing:
+                    target_game_ids = pending_game_ids_by_measure.get(measure_type, target_game_ids)
+
+                game_batches = chunked(target_game_ids, LINEUP_GAME_BATCH_SIZE.get(measure_type, 100))
+                for game_batch in game_batches:
+                    lineup_jobs.append(
+                        {
+                            "section": "game_lineup",
+                            "per_mode": LINEUP_GAME_PER_MODE,
+                            "measure_type": measure_type,
+                            "path": "/game/lineups",
+                            "base_params": {
                                 "LeagueId": league_id,
                                 "SeasonYear": season_label_value,
                                 "SeasonType": season_type,
@@ -544,78 +638,96 @@ def main(
                                 "MeasureType": measure_type,
                                 "LineupQuantity": LINEUP_QUANTITY,
                             },
-                            ids=target_game_ids,
-                            row_key="lineups",
-                            batch_size=batch_size,
-                            max_rows_returned=LINEUP_MAX_ROWS,
-                            truncation_threshold=QUERY_TOOL_TRUNCATION_THRESHOLD,
-                        )
-                        for warning in lineup_warnings:
-                            section_errors.append(f"game_lineup {measure_type}: {warning}")
-
-                        for lineup in lineup_payload_rows:
-                            player_ids = extract_lineup_player_ids(lineup)
-                            if not player_ids:
-                                continue
-                            team_id = parse_int(lineup.get("teamId"))
-                            if team_id is None:
-                                continue
-                            season_label_lineup = lineup.get("seasonYear") or season_label_value
-                            season_year_lineup = parse_season_year(season_label_lineup) or season_year
-                            row = {
-                                "game_id": lineup.get("gameId"),
-                                "league_id": lineup.get("leagueId") or league_id,
-                                "season_year": season_year_lineup,
-                                "season_label": season_label_lineup,
-                                "season_type": lineup.get("seasonType") or season_type,
-                                "team_id": team_id,
-                                "player_ids": player_ids,
-                                "per_mode": LINEUP_GAME_PER_MODE,
-                                "measure_type": measure_type,
-                                "created_at": fetched_at,
-                                "updated_at": fetched_at,
-                                "fetched_at": fetched_at,
-                            }
-                            if not row["game_id"]:
-                                continue
-                            for column in LINEUP_STAT_COLUMNS:
-                                row[column] = None
-                            row.update(map_lineup_stats(lineup.get("stats") or {}))
-                            minutes = row.get("minutes")
-                            if minutes is None or minutes <= 0:
-                                continue
-                            lineup_game_rows.append(row)
-                    except Exception as exc:
-                        section_errors.append(f"game_lineup {measure_type}: {exc}")
+                            "ids": game_batch,
+                            "batch_param": "GameId",
+                        }
+                    )
 
         inserted_lineup_season = 0
         inserted_lineup_game = 0
 
-        if not dry_run:
-            if lineup_season_rows:
-                inserted_lineup_season = upsert(
-                    conn,
-                    "nba.lineup_stats_season",
-                    lineup_season_rows,
-                    [
-                        "league_id",
-                        "season_year",
-                        "season_type",
-                        "team_id",
-                        "player_ids",
-                        "per_mode",
-                        "measure_type",
-                    ],
-                    update_exclude=["created_at"],
-                )
-            if lineup_game_rows:
-                inserted_lineup_game = upsert(
+        # Each job is one Query Tool batch; its rows are written as soon as it
+        # finishes and its final games journaled right after, so an interrupted
+        # backfill resumes from the last written batch.
+        with pooled_client(BASE_URL) as client:
+            job_results = run_querytool_jobs(
+                client=client,
+                # Jobs run on lineup_utils' worker threads; bind them to this step's telemetry.
+                request_json=with_http_scope(request_json),
+                jobs=lineup_jobs,
+                max_workers=LINEUP_FETCH_CONCURRENCY,
+                max_rows_returned=LINEUP_MAX_ROWS,
+                truncation_threshold=QUERY_TOOL_TRUNCATION_THRESHOLD,
+            )
+            for job_result in job_results:
+                job = job_result["job"]
+                if job["section"] == "lineup_season":
+                    label = f"lineup_season per_mode={job['per_mode']} measure={job['measure_type']}"
+                else:
+                    label = f"game_lineup {job['measure_type']}"
+                if job_result["error"] is not None:
+                    section_errors.append(f"{label}: {job_result['error']}")
+                    continue
+                for warning in job_result["warnings"]:
+                    section_errors.append(f"{label}: {warning}")
+
+                job_rows: list[dict] = []
+                for lineup in job_result["rows"]:
+                    row = build_lineup_row(
+                        lineup,
+                        job,
+                        league_id,
+                        season_label_value,
+                        season_year,
+                        season_type,
+                        fetched_at,
+                    )
+                    if row is not None:
+                        job_rows.append(row)
+
+                if job["section"] == "lineup_season":
+                    lineup_season_row_count += len(job_rows)
+                    if not dry_run and job_rows:
+                        inserted_lineup_season += upsert(
+                            conn,
+                            "nba.lineup_stats_season",
+                            job_rows,
+                            [
+                                "league_id",
+                                "season_year",
+                                "season_type",
+                                "team_id",
+                                "player_ids",
+                                "per_mode",
+                                "measure_type",
+                            ],
+                            update_exclude=["created_at"],
+                        )
+                    continue
+
+                lineup_game_row_count += len(job_rows)
+                if dry_run or not job_rows:
+                    continue
+                inserted_lineup_game += upsert(
                     conn,
                     "nba.lineup_stats_game",
-                    lineup_game_rows,
+                    job_rows,
                     ["game_id", "team_id", "player_ids", "per_mode", "measure_type"],
                     update_exclude=["created_at"],
                 )
+                record_checkpoints(
+                    conn,
+                    CHECKPOINT_STEP,
+                    {
+                        game_lineup_checkpoint_endpoint(job["measure_type"]): {
+                            row["game_id"] for row in job_rows if row["game_id"] in final_game_id_set
+                        }
+                    },
+                    league_id,
+                    season_label_value,
+                    season_type,
+                    fetched_at,
+                )
 
         if conn:
             conn.close()
@@ -627,15 +739,16 @@ def main(
             "tables": [
                 {
                     "table": "nba.lineup_stats_season",
-                    "rows": len(lineup_season_rows),
+                    "rows": lineup_season_row_count,
                     "upserted": inserted_lineup_season,
                 },
                 {
                     "table": "nba.lineup_stats_game",
-                    "rows": len(lineup_game_rows),
+                    "rows": lineup_game_row_count,
                     "upserted": inserted_lineup_game,
                 },
             ],
+            "telemetry": {"http": http_telemetry()},
             "errors": section_errors,
         }
     except Exception as exc:
@@ -646,6 +759,7 @@ def main(
             "started_at": started_at.isoformat(),
             "finished_at": now_utc().isoformat(),
             "tables": [],
+            "telemetry": {"http": http_telemetry()},
             "errors": [str(exc)],
         }
 
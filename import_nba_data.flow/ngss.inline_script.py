@@ -1,10 +1,16 @@
 # /// script
 # requires-python = ">=3.11"
-# dependencies = ["psycopg[binary]", "httpx", "sniffio", "typing-extensions"]
+# dependencies = ["psycopg[binary]", "httpx[http2]", "sniffio", "typing-extensions"]
 # ///
+import importlib.util
 import os
+import queue
+import sys
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timezone, timedelta, date, time as dt_time
+from pathlib import Path
 
 import httpx
 import psycopg
@@ -38,6 +44,111 @@ WINNER_MAP = {
     "Away": 2,
 }
 
+NGSS_SKIP_EXISTING_ON_SEASON_BACKFILL = True
+# Games are fetched NGSS_CONCURRENCY at a time; each game's detail endpoints fan
+# out on a shared pool capped at NGSS_MAX_IN_FLIGHT_REQUESTS. Completed games
+# are flushed to Postgres by a writer thread, like game_data.
+NGSS_CONCURRENCY = 4
+NGSS_MAX_IN_FLIGHT_REQUESTS = 12
+NGSS_WRITE_BATCH_GAMES = 25
+NGSS_WRITE_QUEUE_MAX_BATCHES = 2
+
+CHECKPOINT_STEP = "ngss"
+CHECKPOINT_ENDPOINT = "game"
+
+
+def _load_http_client_module():
+    # One shared instance per process so pooled connections are shared by every
+    # step in a run (HTTP telemetry stays per step, see begin_http_telemetry).
+    cached = sys.modules.get("nba_http_client")
+    if cached is not None:
+        return cached
+
+    candidates: list[Path] = []
+    if "__file__" in globals():
+        candidates.append(Path(__file__).with_name("http_client.py"))
+    candidates.append(Path("import_nba_data.flow/http_client.py"))
+
+    for path in candidates:
+        if not path.exists():
+            continue
+        spec = importlib.util.spec_from_file_location("nba_http_client", path)
+        if spec is None or spec.loader is None:
+            continue
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["nba_http_client"] = module
+        spec.loader.exec_module(module)
+        return module
+
+    raise FileNotFoundError("Unable to load http_client.py")
+
+
+_http_client = _load_http_client_module()
+http_get = _http_client.http_get
+pooled_client = _http_client.pooled_client
+http_telemetry = _http_client.http_telemetry
+begin_http_telemetry = _http_client.begin_http_telemetry
+ScopedThreadPoolExecutor = _http_client.ScopedThreadPoolExecutor
+
+
+def _load_checkpoint_utils_module():
+    # One shared instance per process so every step in a run uses the same module.
+    cached = sys.modules.get("nba_checkpoint_utils")
+    if cached is not None:
+        return cached
+
+    candidates: list[Path] = []
+    if "__file__" in globals():
+        candidates.append(Path(__file__).with_name("checkpoint_utils.py"))
+    candidates.append(Path("import_nba_data.flow/checkpoint_utils.py"))
+
+    for path in candidates:
+        if not path.exists():
+            continue
+        spec = importlib.util.spec_from_file_location("nba_checkpoint_utils", path)
+        if spec is None or spec.loader is None:
+            continue
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["nba_checkpoint_utils"] = module
+        spec.loader.exec_module(module)
+        return module
+
+    raise FileNotFoundError("Unable to load checkpoint_utils.py")
+
+
+_checkpoint_utils = _load_checkpoint_utils_module()
+record_checkpoints = _checkpoint_utils.record_checkpoints
+resolve_pending_game_ids = _checkpoint_utils.resolve_pending_game_ids
+
+
+def _load_dimension_cache_module():
+    # One shared instance per process so every step in a run sees the same cache.
+    cached = sys.modules.get("nba_dimension_cache")
+    if cached is not None:
+        return cached
+
+    candidates: list[Path] = []
+    if "__file__" in globals():
+        candidates.append(Path(__file__).with_name("dimension_cache.py"))
+    candidates.append(Path("import_nba_data.flow/dimension_cache.py"))
+
+    for path in candidates:
+        if not path.exists():
+            continue
+        spec = importlib.util.spec_from_file_location("nba_dimension_cache", path)
+        if spec is None or spec.loader is None:
+            continue
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["nba_dimension_cache"] = module
+        spec.loader.exec_module(module)
+        return module
+
+    raise FileNotFoundError("Unable to load dimension_cache.py")
+
+
+_dimension_cache = _load_dimension_cache_module()
+ensure_players = _dimension_cache.ensure_players
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Helpers
@@ -276,7 +387,7 @@ def request_json(
     client: httpx.Client,
     path: str,
     params: dict | None = None,
-    retries: int = 3,
+    retries: int | None = None,
     base_url: str | None = None,
     api_key: str | None = None,
 ) -> dict | list:
@@ -289,19 +400,12 @@ def request_json(
     params = params.copy() if params else {}
     params.setdefault("Format", "Json")
 
-    for attempt in range(retries):
-        resp = client.get(url, params=params, headers=headers)
-        if resp.status_code in {429, 500, 502, 503, 504}:
-            if attempt == retries - 1:
-                resp.raise_for_status()
-            time.sleep(1 + attempt)
-            continue
-        if resp.status_code == 404:
-            return {}
-        resp.raise_for_status()
-        return resp.json()
+    response = http_get(client, url, params, headers, retries=retries)
+    if response.status_code == 404:
+        return {}
 
-    raise RuntimeError(f"Failed to fetch {url}")
+    response.raise_for_status()
+    return response.json()
 
 
 def upsert(conn: psycopg.Connection, table: str, rows: list[dict], conflict_keys: list[str], update_exclude: list[str] | None = None) -> int:
@@ -327,6 +431,23 @@ def upsert(conn: psycopg.Connection, table: str, rows: list[dict], conflict_keys
     return len(rows)
 
 
+def fetch_existing_ngss_game_ids(conn: psycopg.Connection, game_ids: list[str]) -> set[str]:
+    if not game_ids:
+        return set()
+
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT game_id
+            FROM nba.ngss_games
+            WHERE game_id = ANY(%s::text[])
+              AND game_status = %s
+            """,
+            (game_ids, GAME_STATUS_MAP["Finished"]),
+        )
+        return {row[0] for row in cur.fetchall() if row and row[0]}
+
+
 def extract_person_name(person: dict) -> tuple[str | None, str | None, str | None]:
     full_name = get_field(person, "name", "Name", "fullName", "FullName")
     first_name = get_field(person, "firstName", "FirstName")
@@ -434,6 +555,212 @@ def build_official_rows(
     return rows
 
 
+def build_ngss_game_row(game_id_value: str, game_payload: dict, ruleset_payload, fetched_at: datetime) -> dict:
+    arena = get_field(game_payload, "arena", "Arena") or {}
+    return {
+        "game_id": game_id_value,
+        "league_code": get_field(game_payload, "leagueCode", "LeagueCode"),
+        "league_name": get_field(game_payload, "leagueName", "LeagueName"),
+        "season_id": get_field(game_payload, "seasonId", "SeasonId"),
+        "season_name": get_field(game_payload, "seasonName", "SeasonName"),
+        "season_type": parse_enum_int(get_field(game_payload, "seasonType", "SeasonType"), SEASON_TYPE_MAP),
+        "game_status": parse_enum_int(get_field(game_payload, "gameStatus", "GameStatus"), GAME_STATUS_MAP),
+        "winner_type": parse_enum_int(get_field(game_payload, "winner", "Winner"), WINNER_MAP),
+        "game_date_local": parse_date(get_field(game_payload, "gameTimeLocal", "GameDateTimeLocal", "GameTimeLocal")),
+        "game_time_local": parse_time(get_field(game_payload, "gameTimeLocal", "GameTimeLocal")),
+        "game_date_time_local": parse_datetime(get_field(game_payload, "gameTimeLocal", "GameDateTimeLocal", "GameTimeHome")),
+        "game_date_time_utc": parse_datetime(get_field(game_payload, "gameTimeUTC", "GameDateTimeUtc", "GameTimeUTC")),
+        "game_time_home": parse_time(get_field(game_payload, "gameTimeHome", "GameTimeHome")),
+        "game_time_away": parse_time(get_field(game_payload, "gameTimeAway", "GameTimeAway")),
+        "game_time_et": parse_time(get_field(game_payload, "gameEt", "GameEt")),
+        "time_actual": parse_datetime(get_field(game_payload, "timeActual", "TimeActual")),
+        "time_end_actual": parse_datetime(get_field(game_payload, "timeEndActual", "TimeEndActual")),
+        "attendance": parse_int(get_field(game_payload, "attendance", "Attendance")),
+        "duration_minutes": parse_int(get_field(game_payload, "duration", "Duration")),
+        "home_team_id": parse_int(get_field(game_payload, "homeId", "HomeId")),
+        "home_score": parse_int(get_field(game_payload, "homeScore", "HomeScore")),
+        "away_team_id": parse_int(get_field(game_payload, "awayId", "AwayId")),
+        "away_score": parse_int(get_field(game_payload, "awayScore", "AwayScore")),
+        "arena_id": parse_int(get_field(arena, "arenaId", "ArenaId")),
+        "arena_name": get_field(arena, "arenaName", "ArenaName"),
+        "last_game_data_update": parse_datetime(get_field(game_payload, "lastGameDataUpdate", "LastGameDataUpdate")),
+        "needs_reprocessing": parse_datetime(get_field(game_payload, "needsReprocessing", "NeedsReprocessing")),
+        "is_sold_out": parse_yes_no(get_field(game_payload, "isSoldOut", "IsSoldOut")),
+        "memos": normalize_memos(get_field(game_payload, "memos", "Memos")),
+        "is_target_score_ending": to_bool(get_field(game_payload, "targetScoreEnding", "TargetScoreEnding")),
+        "target_score_period": parse_int(get_field(game_payload, "targetScorePeriod", "TargetScorePeriod")),
+        "ruleset_id": parse_int(get_field(ruleset_payload, "rulesetId", "RulesetId")) if isinstance(ruleset_payload, dict) else None,
+        "ruleset_json": Json(ruleset_payload) if ruleset_payload else None,
+        "game_json": Json(game_payload),
+        "created_at": fetched_at,
+        "updated_at": fetched_at,
+        "fetched_at": fetched_at,
+    }
+
+
+# Per-game detail endpoints fanned out after /Games/{id} confirms the game exists.
+NGSS_DETAIL_PATHS = {
+    "ruleset": "/Games/{game_id}/ruleset",
+    "rosters": "/Games/{game_id}/rosters",
+    "officials": "/Games/{game_id}/officials",
+    "boxscore": "/games/{game_id}/boxscore",
+    "pbp": "/games/{game_id}/playbyplay",
+}
+
+
+def fetch_ngss_game_payloads(
+    client: httpx.Client,
+    endpoint_executor: ThreadPoolExecutor,
+    game_id_value: str,
+    api_key: str,
+    fetched_at: datetime,
+) -> dict:
+    game_payload = unwrap_data(request_json(client, f"/Games/{game_id_value}", api_key=api_key))
+    result = {
+        "game_id": game_id_value,
+        "game_rows": [],
+        "roster_rows": [],
+        "boxscore_rows": [],
+        "pbp_rows": [],
+        "official_rows": [],
+        "api_calls": 1,
+    }
+    if not isinstance(game_payload, dict) or not game_payload:
+        return result
+
+    futures = {
+        name: endpoint_executor.submit(
+            request_json,
+            client,
+            path.format(game_id=game_id_value),
+            api_key=api_key,
+        )
+        for name, path in NGSS_DETAIL_PATHS.items()
+    }
+    payloads = {name: unwrap_data(future.result()) for name, future in futures.items()}
+    result["api_calls"] += len(futures)
+
+    result["game_rows"].append(build_ngss_game_row(game_id_value, game_payload, payloads["ruleset"], fetched_at))
+
+    roster_payload = payloads["rosters"]
+    if isinstance(roster_payload, dict):
+        result["roster_rows"].extend(
+            build_roster_rows(
+                get_field(roster_payload, "homeTeam", "HomeTeam") or {},
+                game_id_value,
+                fetched_at,
+            )
+        )
+        result["roster_rows"].extend(
+            build_roster_rows(
+                get_field(roster_payload, "awayTeam", "AwayTeam") or {},
+                game_id_value,
+                fetched_at,
+            )
+        )
+
+    officials_payload = payloads["officials"]
+    if isinstance(officials_payload, dict):
+        officials_list = get_field(officials_payload, "officials", "OfficialsList") or []
+        result["official_rows"].extend(build_official_rows(officials_list, game_id_value, fetched_at))
+
+    boxscore_payload = payloads["boxscore"]
+    if boxscore_payload:
+        result["boxscore_rows"].append(
+            {
+                "game_id": game_id_value,
+                "boxscore_json": Json(boxscore_payload),
+                "created_at": fetched_at,
+                "updated_at": fetched_at,
+                "fetched_at": fetched_at,
+            }
+        )
+
+    pbp_payload = payloads["pbp"]
+    if pbp_payload:
+        result["pbp_rows"].append(
+            {
+                "game_id": game_id_value,
+                "ngss_pbp_json": Json(pbp_payload),
+                "created_at": fetched_at,
+                "updated_at": fetched_at,
+                "fetched_at": fetched_at,
+            }
+        )
+
+    return result
+
+
+# Per-game payload sections flushed by the streaming writer, in FK-safe order.
+NGSS_WRITE_TABLES = [
+    ("game_rows", "nba.ngss_games", ["game_id"]),
+    ("roster_rows", "nba.ngss_rosters", ["game_id", "nba_id"]),
+    ("boxscore_rows", "nba.ngss_boxscores", ["game_id"]),
+    ("pbp_rows", "nba.ngss_pbp", ["game_id"]),
+    ("official_rows", "nba.ngss_officials", ["game_id", "nba_id"]),
+]
+
+
+def new_ngss_write_batch() -> dict[str, list[dict]]:
+    return {key: [] for key, _, _ in NGSS_WRITE_TABLES}
+
+
+def run_ngss_writer(
+    conn: psycopg.Connection,
+    write_queue: queue.Queue,
+    league_id: str,
+    season_label: str | None,
+    season_type: str | None,
+    fetched_at: datetime,
+    writer_state: dict,
+) -> None:
+    """Upsert completed-game batches from write_queue until a None sentinel arrives.
+
+    Mirrors game_data's writer: after the first failed batch it keeps draining
+    the queue but stops writing, and checkpoints follow committed rows only.
+    """
+    while True:
+        item = write_queue.get()
+        if item is None:
+            return
+        if writer_state["error"] is not None:
+            continue
+
+        write_started = time.perf_counter()
+        try:
+            # nba.ngss_rosters.nba_id references nba.players, and this step runs
+            # beside game_data, so placeholders for unknown players come first.
+            ensure_players(conn, [row.get("nba_id") for row in item["roster_rows"]], league_id, fetched_at, upsert)
+            for key, table, conflict_keys in NGSS_WRITE_TABLES:
+                writer_state["upserted"][table] = writer_state["upserted"].get(table, 0) + upsert(
+                    conn,
+                    table,
+                    item[key],
+                    conflict_keys,
+                    update_exclude=["created_at"],
+                )
+            record_checkpoints(
+                conn,
+                CHECKPOINT_STEP,
+                {
+                    CHECKPOINT_ENDPOINT: [
+                        row["game_id"] for row in item["game_rows"] if row.get("game_status") == GAME_STATUS_MAP["Finished"]
+                    ]
+                },
+                league_id,
+                season_label,
+                season_type,
+                fetched_at,
+            )
+        except Exception as exc:
+            conn.rollback()
+            writer_state["error"] = exc
+            continue
+
+        writer_state["batches_written"] += 1
+        writer_state["write_duration_ms"] += round((time.perf_counter() - write_started) * 1000, 2)
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Main
 # ─────────────────────────────────────────────────────────────────────────────
@@ -450,6 +777,7 @@ def main(
     game_ids: str | None = None,
     only_final_games: bool = True,
 ) -> dict:
+    begin_http_telemetry()
     started_at = now_utc()
 
     api_key = os.environ.get("NGSS_API_KEY")
@@ -459,6 +787,7 @@ def main(
             "started_at": started_at.isoformat(),
             "finished_at": now_utc().isoformat(),
             "tables": [],
+            "telemetry": {"http": http_telemetry()},
             "errors": ["NGSS_API_KEY must be set"],
         }
 
@@ -496,166 +825,108 @@ def main(
         if only_final_games:
             game_list = [(gid, status) for gid, status in game_list if status in (None, 3)]
 
-        fetched_at = now_utc()
+        enable_skip_existing = (
+            NGSS_SKIP_EXISTING_ON_SEASON_BACKFILL
+            and (mode or "refresh").strip().lower() == "season_backfill"
+            and not bool(game_ids)
+        )
+        if enable_skip_existing and game_list:
+            pending_by_endpoint, _ = resolve_pending_game_ids(
+                conn,
+                CHECKPOINT_STEP,
+                {CHECKPOINT_ENDPOINT: lambda ids: fetch_existing_ngss_game_ids(conn, ids)},
+                [gid for gid, _ in game_list],
+                league_id,
+                season_label,
+                season_type,
+                seed_from_probes=not dry_run,
+            )
+            pending_game_ids = set(pending_by_endpoint[CHECKPOINT_ENDPOINT])
+            game_list = [(gid, status) for gid, status in game_list if gid in pending_game_ids]
 
-        game_rows: list[dict] = []
-        roster_rows: list[dict] = []
-        boxscore_rows: list[dict] = []
-        pbp_rows: list[dict] = []
-        official_rows: list[dict] = []
-
-        with httpx.Client(timeout=30) as client:
-            for game_id_value, status in game_list:
-                game_response = request_json(client, f"/Games/{game_id_value}", api_key=api_key)
-                game_payload = unwrap_data(game_response)
-                if not isinstance(game_payload, dict) or not game_payload:
-                    continue
-
-                ruleset_response = request_json(
-                    client,
-                    f"/Games/{game_id_value}/ruleset",
-                    api_key=api_key,
-                )
-                ruleset_payload = unwrap_data(ruleset_response)
-                arena = get_field(game_payload, "arena", "Arena") or {}
-
-                game_rows.append(
-                    {
-                        "game_id": game_id_value,
-                        "league_code": get_field(game_payload, "leagueCode", "LeagueCode"),
-                        "league_name": get_field(game_payload, "leagueName", "LeagueName"),
-                        "season_id": get_field(game_payload, "seasonId", "SeasonId"),
-                        "season_name": get_field(game_payload, "seasonName", "SeasonName"),
-                        "season_type": parse_enum_int(get_field(game_payload, "seasonType", "SeasonType"), SEASON_TYPE_MAP),
-                        "game_status": parse_enum_int(get_field(game_payload, "gameStatus", "GameStatus"), GAME_STATUS_MAP),
-                        "winner_type": parse_enum_int(get_field(game_payload, "winner", "Winner"), WINNER_MAP),
-                        "game_date_local": parse_date(get_field(game_payload, "gameTimeLocal", "GameDateTimeLocal", "GameTimeLocal")),
-                        "game_time_local": parse_time(get_field(game_payload, "gameTimeLocal", "GameTimeLocal")),
-                        "game_date_time_local": parse_datetime(get_field(game_payload, "gameTimeLocal", "GameDateTimeLocal", "GameTimeHome")),
-                        "game_date_time_utc": parse_datetime(get_field(game_payload, "gameTimeUTC", "GameDateTimeUtc", "GameTimeUTC")),
-                        "game_time_home": parse_time(get_field(game_payload, "gameTimeHome", "GameTimeHome")),
-                        "game_time_away": parse_time(get_field(game_payload, "gameTimeAway", "GameTimeAway")),
-                        "game_time_et": parse_time(get_field(game_payload, "gameEt", "GameEt")),
-                        "time_actual": parse_datetime(get_field(game_payload, "timeActual", "TimeActual")),
-                        "time_end_actual": parse_datetime(get_field(game_payload, "timeEndActual", "TimeEndActual")),
-                        "attendance": parse_int(get_field(game_payload, "attendance", "Attendance")),
-                        "duration_minutes": parse_int(get_field(game_payload, "duration", "Duration")),
-                        "home_team_id": parse_int(get_field(game_payload, "homeId", "HomeId")),
-                        "home_score": parse_int(get_field(game_payload, "homeScore", "HomeScore")),
-                        "away_team_id": parse_int(get_field(game_payload, "awayId", "AwayId")),
-                        "away_score": parse_int(get_field(game_payload, "awayScore", "AwayScore")),
-                        "arena_id": parse_int(get_field(arena, "arenaId", "ArenaId")),
-                        "arena_name": get_field(arena, "arenaName", "ArenaName"),
-                        "last_game_data_update": parse_datetime(get_field(game_payload, "lastGameDataUpdate", "LastGameDataUpdate")),
-                        "needs_reprocessing": parse_datetime(get_field(game_payload, "needsReprocessing", "NeedsReprocessing")),
-                        "is_sold_out": parse_yes_no(get_field(game_payload, "isSoldOut", "IsSoldOut")),
-                        "memos": normalize_memos(get_field(game_payload, "memos", "Memos")),
-                        "is_target_score_ending": to_bool(get_field(game_payload, "targetScoreEnding", "TargetScoreEnding")),
-                        "target_score_period": parse_int(get_field(game_payload, "targetScorePeriod", "TargetScorePeriod")),
-                        "ruleset_id": parse_int(get_field(ruleset_payload, "rulesetId", "RulesetId")) if isinstance(ruleset_payload, dict) else None,
-                        "ruleset_json": Json(ruleset_payload) if ruleset_payload else None,
-                        "game_json": Json(game_payload),
-                        "created_at": fetched_at,
-                        "updated_at": fetched_at,
-                        "fetched_at": fetched_at,
-                    }
-                )
+        fetched_at = now_utc()
 
-                roster_response = request_json(
-                    client,
-                    f"/Games/{game_id_value}/rosters",
-                    api_key=api_key,
-                )
-                roster_payload = unwrap_data(roster_response)
-                if isinstance(roster_payload, dict):
-                    roster_rows.extend(
-                        build_roster_rows(
-                            get_field(roster_payload, "homeTeam", "HomeTeam") or {},
-                            game_id_value,
-                            fetched_at,
-                        )
-                    )
-                    roster_rows.extend(
-                        build_roster_rows(
-                            get_field(roster_payload, "awayTeam", "AwayTeam") or {},
+        row_counts = {table: 0 for _, table, _ in NGSS_WRITE_TABLES}
+        errors: list[str] = []
+
+        write_queue: queue.Queue = queue.Queue(maxsize=max(1, NGSS_WRITE_QUEUE_MAX_BATCHES))
+        writer_state = {"error": None, "batches_written": 0, "write_duration_ms": 0.0, "upserted": {}}
+        writer_thread: threading.Thread | None = None
+        if not dry_run and game_list:
+            writer_thread = threading.Thread(
+                target=run_ngss_writer,
+                args=(conn, write_queue, league_id, season_label, season_type, fetched_at, writer_state),
+                name="ngss-writer",
+                daemon=True,
+            )
+            writer_thread.start()
+
+        pending_batch = new_ngss_write_batch()
+        pending_batch_games = 0
+
+        worker_count = min(max(1, NGSS_CONCURRENCY), max(1, len(game_list)))
+        try:
+            with (
+                pooled_client(os.environ.get("NGSS_BASE_URL") or NGSS_BASE_URL) as client,
+                ScopedThreadPoolExecutor(max_workers=NGSS_MAX_IN_FLIGHT_REQUESTS) as endpoint_executor,
+                ScopedThreadPoolExecutor(max_workers=worker_count) as game_executor,
+            ):
+                # Bounded window of games in flight so completed payloads never
+                # pile up faster than the writer drains them.
+                game_iter = iter(game_list)
+                max_in_flight = worker_count * 2
+                in_flight: dict = {}
+
+                while True:
+                    while len(in_flight) < max_in_flight and writer_state["error"] is None:
+                        next_game = next(game_iter, None)
+                        if next_game is None:
+                            break
+                        game_id_value, _ = next_game
+                        future = game_executor.submit(
+                            fetch_ngss_game_payloads,
+                            client,
+                            endpoint_executor,
                             game_id_value,
+                            api_key,
                             fetched_at,
                         )
-                    )
-
-                officials_response = request_json(
-                    client,
-                    f"/Games/{game_id_value}/officials",
-                    api_key=api_key,
-                )
-                officials_payload = unwrap_data(officials_response)
-                if isinstance(officials_payload, dict):
-                    officials_list = get_field(officials_payload, "officials", "OfficialsList") or []
-                    official_rows.extend(build_official_rows(officials_list, game_id_value, fetched_at))
-
-                boxscore_response = request_json(
-                    client,
-                    f"/games/{game_id_value}/boxscore",
-                    api_key=api_key,
-                )
-                boxscore_payload = unwrap_data(boxscore_response)
-                if boxscore_payload:
-                    boxscore_rows.append(
-                        {
-                            "game_id": game_id_value,
-                            "boxscore_json": Json(boxscore_payload),
-                            "created_at": fetched_at,
-                            "updated_at": fetched_at,
-                            "fetched_at": fetched_at,
-                        }
-                    )
-
-                pbp_response = request_json(
-                    client,
-                    f"/games/{game_id_value}/playbyplay",
-                    api_key=api_key,
-                )
-                pbp_payload = unwrap_data(pbp_response)
-                if pbp_payload:
-                    pbp_rows.append(
-                        {
-                            "game_id": game_id_value,
-                            "ngss_pbp_json": Json(pbp_payload),
-                            "created_at": fetched_at,
-                            "updated_at": fetched_at,
-                            "fetched_at": fetched_at,
-                        }
-                    )
-
-        inserted_games = 0
-        inserted_rosters = 0
-        inserted_boxscores = 0
-        inserted_pbp = 0
-        inserted_officials = 0
-
-        if not dry_run:
-            if game_rows:
-                inserted_games = upsert(conn, "nba.ngss_games", game_rows, ["game_id"], update_exclude=["created_at"])
-            if roster_rows:
-                inserted_rosters = upsert(
-                    conn,
-                    "nba.ngss_rosters",
-                    roster_rows,
-                    ["game_id", "nba_id"],
-                    update_exclude=["created_at"],
-                )
-            if boxscore_rows:
-                inserted_boxscores = upsert(conn, "nba.ngss_boxscores", boxscore_rows, ["game_id"], update_exclude=["created_at"])
-            if pbp_rows:
-                inserted_pbp = upsert(conn, "nba.ngss_pbp", pbp_rows, ["game_id"], update_exclude=["created_at"])
-            if official_rows:
-                inserted_officials = upsert(
-                    conn,
-                    "nba.ngss_officials",
-                    official_rows,
-                    ["game_id", "nba_id"],
-                    update_exclude=["created_at"],
-                )
+                        in_flight[future] = game_id_value
+
+                    if not in_flight:
+                        break
+
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        game_id_value = in_flight.pop(future)
+                        try:
+                            result = future.result()
+                        except Exception as exc:
+                            errors.append(f"ngss game {game_id_value}: {exc}")
+                            continue
+
+                        for key, table, _ in NGSS_WRITE_TABLES:
+                            pending_batch[key].extend(result[key])
+                            row_counts[table] += len(result[key])
+                        pending_batch_games += 1
+
+                    if pending_batch_games >= NGSS_WRITE_BATCH_GAMES:
+                        if writer_thread is not None:
+                            write_queue.put(pending_batch)
+                        pending_batch = new_ngss_write_batch()
+                        pending_batch_games = 0
+
+            if pending_batch_games and writer_thread is not None:
+                write_queue.put(pending_batch)
+        finally:
+            if writer_thread is not None:
+                write_queue.put(None)
+                writer_thread.join()
+
+        if writer_state["error"] is not None:
+            raise writer_state["error"]
+
+        upserted = writer_state["upserted"]
 
         if conn:
             conn.close()
@@ -665,13 +936,11 @@ def main(
             "started_at": started_at.isoformat(),
             "finished_at": now_utc().isoformat(),
             "tables": [
-                {"table": "nba.ngss_games", "rows": len(game_rows), "upserted": inserted_games},
-                {"table": "nba.ngss_rosters", "rows": len(roster_rows), "upserted": inserted_rosters},
-                {"table": "nba.ngss_boxscores", "rows": len(boxscore_rows), "upserted": inserted_boxscores},
-                {"table": "nba.ngss_pbp", "rows": len(pbp_rows), "upserted": inserted_pbp},
-                {"table": "nba.ngss_officials", "rows": len(official_rows), "upserted": inserted_officials},
+                {"table": table, "rows": row_counts[table], "upserted": upserted.get(table, 0)}
+                for _, table, _ in NGSS_WRITE_TABLES
             ],
-            "errors": [],
+            "telemetry": {"http": http_telemetry()},
+            "errors": errors,
         }
     except Exception as exc:
         if conn:
@@ -681,6 +950,7 @@ def main(
             "started_at": started_at.isoformat(),
             "finished_at": now_utc().isoformat(),
             "tables": [],
+            "telemetry": {"http": http_telemetry()},
             "errors": [str(exc)],
         }
 
@@ -1,10 +1,12 @@
 # /// script
 # requires-python = ">=3.11"
-# dependencies = ["psycopg[binary]", "httpx", "sniffio", "typing-extensions"]
+# dependencies = ["psycopg[binary]", "httpx[http2]", "sniffio", "typing-extensions"]
 # ///
+import importlib.util
 import os
-import time
+import sys
 from datetime import datetime, timezone
+from pathlib import Path
 
 import httpx
 import psycopg
@@ -12,6 +14,68 @@ import psycopg
 BASE_URL = "https://api.nba.com/v0"
 
 
+def _load_http_client_module():
+    # One shared instance per process so pooled connections are shared by every
+    # step in a run (HTTP telemetry stays per step, see begin_http_telemetry).
+    cached = sys.modules.get("nba_http_client")
+    if cached is not None:
+        return cached
+
+    candidates: list[Path] = []
+    if "__file__" in globals():
+        candidates.append(Path(__file__).with_name("http_client.py"))
+    candidates.append(Path("import_nba_data.flow/http_client.py"))
+
+    for path in candidates:
+        if not path.exists():
+            continue
+        spec = importlib.util.spec_from_file_location("nba_http_client", path)
+        if spec is None or spec.loader is None:
+            continue
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["nba_http_client"] = module
+        spec.loader.exec_module(module)
+        return module
+
+    raise FileNotFoundError("Unable to load http_client.py")
+
+
+_http_client = _load_http_client_module()
+http_get = _http_client.http_get
+pooled_client = _http_client.pooled_client
+http_telemetry = _http_client.http_telemetry
+begin_http_telemetry = _http_client.begin_http_telemetry
+
+
+def _load_dimension_cache_module():
+    # One shared instance per process so every step in a run sees the same cache.
+    cached = sys.modules.get("nba_dimension_cache")
+    if cached is not None:
+        return cached
+
+    candidates: list[Path] = []
+    if "__file__" in globals():
+        candidates.append(Path(__file__).with_name("dimension_cache.py"))
+    candidates.append(Path("import_nba_data.flow/dimension_cache.py"))
+
+    for path in candidates:
+        if not path.exists():
+            continue
+        spec = importlib.util.spec_from_file_location("nba_dimension_cache", path)
+        if spec is None or spec.loader is None:
+            continue
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["nba_dimension_cache"] = module
+        spec.loader.exec_module(module)
+        return module
+
+    raise FileNotFoundError("Unable to load dimension_cache.py")
+
+
+_dimension_cache = _load_dimension_cache_module()
+mark_known_ids = _dimension_cache.mark_known_ids
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Helpers
 # ─────────────────────────────────────────────────────────────────────────────
@@ -33,21 +97,11 @@ def parse_date(value: str | None):
             return None
 
 
-def request_json(client: httpx.Client, path: str, params: dict | None = None, retries: int = 3) -> dict:
+def request_json(client: httpx.Client, path: str, params: dict | None = None, retries: int | None = None) -> dict:
     headers = {"X-NBA-Api-Key": os.environ["NBA_API_KEY"]}
-    url = f"{BASE_URL}{path}"
-
-    for attempt in range(retries):
-        resp = client.get(url, params=params, headers=headers)
-        if resp.status_code in {429, 500, 502, 503, 504}:
-            if attempt == retries - 1:
-                resp.raise_for_status()
-            time.sleep(1 + attempt)
-            continue
-        resp.raise_for_status()
-        return resp.json()
-
-    raise RuntimeError(f"Failed to fetch {url}")
+    response = http_get(client, f"{BASE_URL}{path}", params, headers, retries=retries)
+    response.raise_for_status()
+    return response.json()
 
 
 def upsert(conn: psycopg.Connection, table: str, rows: list[dict], conflict_keys: list[str], update_exclude: list[str] | None = None) -> int:
@@ -88,6 +142,7 @@ def main(
     league_id: str = "00",
     season_label: str | None = None,
 ) -> dict:
+    begin_http_telemetry()
     started_at = now_utc()
 
     try:
@@ -95,7 +150,7 @@ def main(
         if season_label:
             params["season"] = season_label
 
-        with httpx.Client(timeout=30) as client:
+        with pooled_client(BASE_URL) as client:
             payload = request_json(client, "/api/stats/player/index", params)
 
         players = payload.get("players") or payload.get("data", {}).get("players") or []
@@ -152,6 +207,7 @@ def main(
         if not dry_run and rows:
             conn = psycopg.connect(os.environ["POSTGRES_URL"])
             inserted = upsert(conn, "nba.players", rows, ["nba_id"], update_exclude=["created_at"])
+            mark_known_ids("players", [row["nba_id"] for row in rows])
             conn.close()
 
         return {
@@ -165,6 +221,7 @@ def main(
                     "upserted": inserted,
                 }
             ],
+            "telemetry": {"http": http_telemetry()},
             "errors": [],
         }
     except Exception as exc:
@@ -173,6 +230,7 @@ def main(
             "started_at": started_at.isoformat(),
             "finished_at": now_utc().isoformat(),
             "tables": [],
+            "telemetry": {"http": http_telemetry()},
             "errors": [str(exc)],
         }
 
@@ -1,17 +1,20 @@
 # /// script
 # requires-python = ">=3.11"
-# dependencies = ["psycopg[binary]", "httpx", "sniffio", "typing-extensions", "tenacity"]
+# dependencies = ["psycopg[binary]", "httpx[http2]", "sniffio", "typing-extensions"]
 # ///
+import importlib.util
 import os
+import sys
 import time
 from collections import deque
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, wait
 from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable
 
 import httpx
 import psycopg
 from psycopg.types.json import Json
-from tenacity import RetryCallState, retry, retry_if_exception, stop_after_attempt, wait_exponential
 
 BASE_URL = "https://api.nba.com/v0"
 QUERY_TOOL_URL = "https://api.nba.com/v0/api/querytool"
@@ -26,7 +29,10 @@ QUERYTOOL_EVENT_STREAM_BATCH_SIZES = {
     "TrackingPostUps": 200,
 }
 QUERYTOOL_EVENT_STREAM_TYPES = list(QUERYTOOL_EVENT_STREAM_BATCH_SIZES.keys())
-QUERYTOOL_EVENT_TYPE_CONCURRENCY = 2
+# Global cap on in-flight (event_type, game batch) requests. Every unit shares
+# one work queue and one pooled client, so a slow event type no longer holds
+# the step open while the others sit idle.
+QUERYTOOL_EVENT_STREAM_CONCURRENCY = 6
 
 QUERYTOOL_EVENT_STREAM_PER_MODE = "Totals"
 QUERYTOOL_EVENT_STREAM_SUM_SCOPE = "Event"
@@ -36,9 +42,72 @@ QUERYTOOL_EVENT_STREAM_SINGLE_BATCH_MAX_ATTEMPTS = 4
 QUERYTOOL_EVENT_STREAMS_SKIP_EXISTING_ON_SEASON_BACKFILL = True
 
 HTTP_RETRYABLE_STATUSES = {403, 429, 500, 502, 503, 504}
-HTTP_RETRY_MAX_ATTEMPTS = 4
-HTTP_RETRY_MIN_WAIT_SECONDS = 1
-HTTP_RETRY_MAX_WAIT_SECONDS = 8
+
+QUERYTOOL_EVENT_STREAMS_CHECKPOINT_STEP = "querytool_event_streams"
+
+
+def _load_http_client_module():
+    # One shared instance per process so pooled connections are shared by every
+    # step in a run (HTTP telemetry stays per step, see begin_http_telemetry).
+    cached = sys.modules.get("nba_http_client")
+    if cached is not None:
+        return cached
+
+    candidates: list[Path] = []
+    if "__file__" in globals():
+        candidates.append(Path(__file__).with_name("http_client.py"))
+    candidates.append(Path("import_nba_data.flow/http_client.py"))
+
+    for path in candidates:
+        if not path.exists():
+            continue
+        spec = importlib.util.spec_from_file_location("nba_http_client", path)
+        if spec is None or spec.loader is None:
+            continue
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["nba_http_client"] = module
+        spec.loader.exec_module(module)
+        return module
+
+    raise FileNotFoundError("Unable to load http_client.py")
+
+
+_http_client = _load_http_client_module()
+http_get = _http_client.http_get
+pooled_client = _http_client.pooled_client
+http_telemetry = _http_client.http_telemetry
+begin_http_telemetry = _http_client.begin_http_telemetry
+ScopedThreadPoolExecutor = _http_client.ScopedThreadPoolExecutor
+
+
+def _load_checkpoint_utils_module():
+    # One shared instance per process so every step in a run uses the same module.
+    cached = sys.modules.get("nba_checkpoint_utils")
+    if cached is not None:
+        return cached
+
+    candidates: list[Path] = []
+    if "__file__" in globals():
+        candidates.append(Path(__file__).with_name("checkpoint_utils.py"))
+    candidates.append(Path("import_nba_data.flow/checkpoint_utils.py"))
+
+    for path in candidates:
+        if not path.exists():
+            continue
+        spec = importlib.util.spec_from_file_location("nba_checkpoint_utils", path)
+        if spec is None or spec.loader is None:
+            continue
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["nba_checkpoint_utils"] = module
+        spec.loader.exec_module(module)
+        return module
+
+    raise FileNotFoundError("Unable to load checkpoint_utils.py")
+
+
+_checkpoint_utils = _load_checkpoint_utils_module()
+record_checkpoints = _checkpoint_utils.record_checkpoints
+resolve_pending_game_ids = _checkpoint_utils.resolve_pending_game_ids
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -171,82 +240,24 @@ def resolve_date_range(
     raise ValueError("mode must be one of: refresh, date_backfill, season_backfill")
 
 
-def _is_retryable_response(response: httpx.Response) -> bool:
-    retryable_400 = response.status_code == 400 and "Database Error" in response.text
-    return response.status_code in HTTP_RETRYABLE_STATUSES or retryable_400
-
-
-def _is_retryable_http_exception(exc: Exception) -> bool:
-    if isinstance(exc, httpx.TimeoutException):
-        return True
-
-    if isinstance(exc, httpx.HTTPStatusError):
-        response = exc.response
-        if response is None:
-            return False
-        return _is_retryable_response(response)
-
-    if isinstance(exc, httpx.TransportError):
-        return True
-
-    return False
-
-
-def _before_sleep_http_retry(retry_state: RetryCallState) -> None:
-    outcome = retry_state.outcome
-    if outcome is None or not outcome.failed:
-        return
-
-    exc = outcome.exception()
-    if isinstance(exc, httpx.HTTPStatusError) and exc.response is not None:
-        if exc.response.status_code == 403:
-            extra_sleep = min(20, 5 * retry_state.attempt_number)
-            time.sleep(extra_sleep)
-
-
-@retry(
-    reraise=True,
-    retry=retry_if_exception(_is_retryable_http_exception),
-    stop=stop_after_attempt(HTTP_RETRY_MAX_ATTEMPTS),
-    wait=wait_exponential(
-        multiplier=HTTP_RETRY_MIN_WAIT_SECONDS,
-        min=HTTP_RETRY_MIN_WAIT_SECONDS,
-        max=HTTP_RETRY_MAX_WAIT_SECONDS,
-    ),
-    before_sleep=_before_sleep_http_retry,
-)
-def _http_get_with_retry(
-    client: httpx.Client,
-    url: str,
-    params: dict | None,
-    headers: dict,
-) -> httpx.Response:
-    response = client.get(url, params=params, headers=headers)
-    if _is_retryable_response(response):
-        response.raise_for_status()
-    return response
-
-
 def request_json(
     client: httpx.Client,
     path: str,
     params: dict | None = None,
-    retries: int = 3,
+    retries: int | None = None,
     base_url: str = BASE_URL,
 ) -> dict:
     headers = {"X-NBA-Api-Key": os.environ["NBA_API_KEY"]}
-    url = f"{base_url}{path}"
-
-    if retries <= 1:
-        response = client.get(url, params=params, headers=headers)
-        if _is_retryable_response(response):
-            response.raise_for_status()
-    else:
-        response = _http_get_with_retry(client, url, params, headers)
-
+    response = http_get(
+        client,
+        f"{base_url}{path}",
+        params,
+        headers,
+        retries=retries,
+        retryable_statuses=HTTP_RETRYABLE_STATUSES,
+    )
     if response.status_code == 404:
         return {}
-
     response.raise_for_status()
     return response.json()
 
@@ -346,6 +357,7 @@ def init_event_type_metrics(batch_size: int) -> dict:
         "completed_batch_count": 0,
         "split_batch_count": 0,
         "single_batch_retry_count": 0,
+        "failed_batch_count": 0,
         "rows_seen": 0,
         "rows_emitted": 0,
         "truncation_warning_count": 0,
@@ -353,157 +365,237 @@ def init_event_type_metrics(batch_size: int) -> dict:
     }
 
 
-def fetch_querytool_event_stream_rows_for_event_type(
+def fetch_event_stream_batch(
+    client: httpx.Client,
     event_type: str,
-    target_game_ids: list[str],
+    batch: list[str],
     league_id: str,
     season_label_value: str,
     season_type: str,
-) -> tuple[list[dict], dict, list[str]]:
-    event_started = time.perf_counter()
-    batch_size = QUERYTOOL_EVENT_STREAM_BATCH_SIZES.get(event_type, 25)
+    delay_seconds: float = 0.0,
+) -> dict:
+    if delay_seconds > 0:
+        time.sleep(delay_seconds)
+
+    params = {
+        "LeagueId": league_id,
+        "SeasonYear": season_label_value,
+        "SeasonType": season_type,
+        "PerMode": QUERYTOOL_EVENT_STREAM_PER_MODE,
+        "SumScope": QUERYTOOL_EVENT_STREAM_SUM_SCOPE,
+        "Grouping": QUERYTOOL_EVENT_STREAM_GROUPING,
+        "TeamGrouping": QUERYTOOL_EVENT_STREAM_TEAM_GROUPING,
+        "EventType": event_type,
+        "GameId": ",".join(batch),
+        "MaxRowsReturned": QUERYTOOL_EVENT_STREAM_MAX_ROWS_RETURNED,
+    }
+    return request_json(
+        client,
+        "/event/player",
+        params,
+        retries=1,
+        base_url=QUERY_TOOL_URL,
+    )
+
+
+def build_event_stream_rows(event_type: str, batch: list[str], payload_rows: list[dict]) -> list[dict]:
+    grouped: dict[str, list[dict]] = {gid: [] for gid in batch}
+    for payload_row in payload_rows:
+        game_id_row = payload_row.get("gameId")
+        if not game_id_row or game_id_row not in grouped:
+            continue
+        grouped[game_id_row].append(reduce_querytool_event_row(payload_row))
+
+    fetched_at = now_utc()
+    return [
+        {
+            "game_id": gid,
+            "event_type": event_type,
+            "events_json": Json(grouped.get(gid) or []),
+            "created_at": fetched_at,
+            "updated_at": fetched_at,
+            "fetched_at": fetched_at,
+        }
+        for gid in batch
+    ]
+
+
+def interleave_event_type_batches(batches_by_event_type: dict[str, list[list[str]]]) -> list[tuple[str, list[str]]]:
+    """Round-robin the initial units so every event type starts making progress at once."""
+    units: list[tuple[str, list[str]]] = []
+    queues = {event_type: deque(batches) for event_type, batches in batches_by_event_type.items()}
+    while any(queues.values()):
+        for event_type, batches in queues.items():
+            if batches:
+                units.append((event_type, batches.popleft()))
+    return units
+
+
+def fetch_querytool_event_stream_rows(
+    event_type_game_ids: dict[str, list[str]],
+    league_id: str,
+    season_label_value: str,
+    season_type: str,
+    concurrency: int,
+    write_batch: Callable[[list[dict]], None] | None = None,
+) -> tuple[list[dict], dict[str, dict], list[str]]:
+    """Fetch every (event_type, game batch) unit from one queue under a global concurrency cap.
+
+    With write_batch, each completed batch's rows are handed to it as soon as
+    the batch finishes instead of being collected and returned.
+
+    Splits (HTTP 414/429/5xx, transport errors, suspected truncation) go back to
+    the front of the queue; single-game retries go to the back with a backoff
+    delay that is slept in the worker, so the scheduler never blocks.
+    """
     split_retry_statuses = {414, 429, 500, 502, 503, 504}
 
-    metrics = init_event_type_metrics(batch_size)
+    metrics_by_event_type: dict[str, dict] = {}
+    event_started: dict[str, float] = {}
+    batches_by_event_type: dict[str, list[list[str]]] = {}
+    for event_type, target_game_ids in event_type_game_ids.items():
+        batch_size = QUERYTOOL_EVENT_STREAM_BATCH_SIZES.get(event_type, 25)
+        metrics = init_event_type_metrics(batch_size)
+        metrics_by_event_type[event_type] = metrics
+        if not target_game_ids:
+            metrics["skipped"] = True
+            metrics["reason"] = "coverage_complete"
+            metrics["game_id_count"] = 0
+            continue
+        batches_by_event_type[event_type] = chunked(target_game_ids, batch_size)
+        metrics["initial_batch_count"] = len(batches_by_event_type[event_type])
 
     stream_rows: list[dict] = []
     errors: list[str] = []
+    pending: deque[tuple[str, list[str], float]] = deque(
+        (event_type, batch, 0.0) for event_type, batch in interleave_event_type_batches(batches_by_event_type)
+    )
+    if not pending:
+        return stream_rows, metrics_by_event_type, errors
+
+    worker_count = max(1, concurrency)
+    single_batch_attempts: dict[tuple[str, str], int] = {}
+
+    with pooled_client(BASE_URL) as client, ScopedThreadPoolExecutor(max_workers=worker_count) as executor:
+        in_flight: dict = {}
+        while pending or in_flight:
+            while pending and len(in_flight) < worker_count:
+                event_type, batch, delay_seconds = pending.popleft()
+                if not batch:
+                    continue
+                event_started.setdefault(event_type, time.perf_counter())
+                metrics_by_event_type[event_type]["batch_attempt_count"] += 1
+                future = executor.submit(
+                    fetch_event_stream_batch,
+                    client,
+                    event_type,
+                    batch,
+                    league_id,
+                    season_label_value,
+                    season_type,
+                    delay_seconds,
+                )
+                in_flight[future] = (event_type, batch)
 
-    if not target_game_ids:
-        metrics["skipped"] = True
-        metrics["reason"] = "coverage_complete"
-        metrics["game_id_count"] = 0
-        metrics["duration_ms"] = elapsed_ms(event_started)
-        return stream_rows, metrics, errors
-
-    pending_batches: deque[list[str]] = deque(chunked(target_game_ids, batch_size))
-    single_batch_attempts: dict[str, int] = {}
-    metrics["initial_batch_count"] = len(pending_batches)
-
-    with httpx.Client(timeout=60) as client:
-        while pending_batches:
-            batch = pending_batches.popleft()
-            if not batch:
+            if not in_flight:
                 continue
 
-            metrics["batch_attempt_count"] += 1
-            params = {
-                "LeagueId": league_id,
-                "SeasonYear": season_label_value,
-                "SeasonType": season_type,
-                "PerMode": QUERYTOOL_EVENT_STREAM_PER_MODE,
-                "SumScope": QUERYTOOL_EVENT_STREAM_SUM_SCOPE,
-                "Grouping": QUERYTOOL_EVENT_STREAM_GROUPING,
-                "TeamGrouping": QUERYTOOL_EVENT_STREAM_TEAM_GROUPING,
-                "EventType": event_type,
-                "GameId": ",".join(batch),
-                "MaxRowsReturned": QUERYTOOL_EVENT_STREAM_MAX_ROWS_RETURNED,
-            }
-
-            batch_key = ",".join(batch)
-            try:
-                payload = request_json(
-                    client,
-                    "/event/player",
-                    params,
-                    retries=1,
-                    base_url=QUERY_TOOL_URL,
-                )
-            except httpx.HTTPStatusError as exc:
-                status = exc.response.status_code if exc.response is not None else None
-                if status in split_retry_statuses and len(batch) > 1:
-                    left, right = split_batch(batch)
-                    pending_batches.appendleft(right)
-                    pending_batches.appendleft(left)
-                    metrics["split_batch_count"] += 1
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                event_type, batch = in_flight.pop(future)
+                metrics = metrics_by_event_type[event_type]
+                batch_key = (event_type, ",".join(batch))
+                try:
+                    payload = future.result()
+                except httpx.HTTPStatusError as exc:
+                    status = exc.response.status_code if exc.response is not None else None
+                    if status in split_retry_statuses and len(batch) > 1:
+                        left, right = split_batch(batch)
+                        pending.appendleft((event_type, right, 0.0))
+                        pending.appendleft((event_type, left, 0.0))
+                        metrics["split_batch_count"] += 1
+                    elif status in split_retry_statuses:
+                        attempts = single_batch_attempts.get(batch_key, 0) + 1
+                        single_batch_attempts[batch_key] = attempts
+                        if attempts < QUERYTOOL_EVENT_STREAM_SINGLE_BATCH_MAX_ATTEMPTS:
+                            pending.append((event_type, batch, float(min(5, attempts))))
+                            metrics["single_batch_retry_count"] += 1
+                        else:
+                            metrics["failed_batch_count"] += 1
+                            errors.append(
+                                f"querytool_event_streams {event_type}: batch ({batch[0]}...{batch[-1]}) "
+                                f"failed with HTTP {status} after {attempts} attempts; skipping"
+                            )
+                    else:
+                        metrics["failed_batch_count"] += 1
+                        errors.append(
+                            f"querytool_event_streams {event_type}: batch ({batch[0]}...{batch[-1]}) "
+                            f"failed: {exc}"
+                        )
                     continue
+                except httpx.HTTPError as exc:
+                    if len(batch) > 1:
+                        left, right = split_batch(batch)
+                        pending.appendleft((event_type, right, 0.0))
+                        pending.appendleft((event_type, left, 0.0))
+                        metrics["split_batch_count"] += 1
+                        continue
 
-                if status in split_retry_statuses:
                     attempts = single_batch_attempts.get(batch_key, 0) + 1
                     single_batch_attempts[batch_key] = attempts
                     if attempts < QUERYTOOL_EVENT_STREAM_SINGLE_BATCH_MAX_ATTEMPTS:
-                        time.sleep(min(5, attempts))
-                        pending_batches.append(batch)
+                        pending.append((event_type, batch, float(min(5, attempts))))
                         metrics["single_batch_retry_count"] += 1
                         continue
 
+                    metrics["failed_batch_count"] += 1
                     errors.append(
                         f"querytool_event_streams {event_type}: batch ({batch[0]}...{batch[-1]}) "
-                        f"failed with HTTP {status} after {attempts} attempts; skipping"
+                        f"transport error after {attempts} attempts; skipping: {exc}"
                     )
                     continue
-
-                raise
-            except httpx.HTTPError as exc:
-                if len(batch) > 1:
-                    left, right = split_batch(batch)
-                    pending_batches.appendleft(right)
-                    pending_batches.appendleft(left)
-                    metrics["split_batch_count"] += 1
-                    continue
-
-                attempts = single_batch_attempts.get(batch_key, 0) + 1
-                single_batch_attempts[batch_key] = attempts
-                if attempts < QUERYTOOL_EVENT_STREAM_SINGLE_BATCH_MAX_ATTEMPTS:
-                    time.sleep(min(5, attempts))
-                    pending_batches.append(batch)
-                    metrics["single_batch_retry_count"] += 1
+                except Exception as exc:
+                    metrics["failed_batch_count"] += 1
+                    errors.append(
+                        f"querytool_event_streams {event_type}: batch ({batch[0]}...{batch[-1]}) "
+                        f"unhandled fetch error: {exc}"
+                    )
                     continue
 
-                errors.append(
-                    f"querytool_event_streams {event_type}: batch ({batch[0]}...{batch[-1]}) "
-                    f"transport error after {attempts} attempts; skipping: {exc}"
-                )
-                continue
-
-            rows = payload.get("players") or []
-            rows_returned = parse_int((payload.get("meta") or {}).get("rowsReturned"))
-            metrics["rows_seen"] += len(rows)
-
-            suspicious = (
-                (rows_returned is not None and rows_returned >= QUERY_TOOL_TRUNCATION_THRESHOLD)
-                or len(rows) >= QUERY_TOOL_TRUNCATION_THRESHOLD
-            )
-
-            if suspicious and len(batch) > 1:
-                left, right = split_batch(batch)
-                pending_batches.appendleft(right)
-                pending_batches.appendleft(left)
-                metrics["split_batch_count"] += 1
-                continue
+                rows = payload.get("players") or []
+                rows_returned = parse_int((payload.get("meta") or {}).get("rowsReturned"))
+                metrics["rows_seen"] += len(rows)
 
-            if suspicious:
-                errors.append(
-                    f"querytool_event_streams {event_type}: batch for game {batch[0]} may be truncated "
-                    f"(rows={len(rows)}, rowsReturned={rows_returned})"
+                suspicious = (
+                    (rows_returned is not None and rows_returned >= QUERY_TOOL_TRUNCATION_THRESHOLD)
+                    or len(rows) >= QUERY_TOOL_TRUNCATION_THRESHOLD
                 )
-                metrics["truncation_warning_count"] += 1
 
-            grouped: dict[str, list[dict]] = {gid: [] for gid in batch}
-            for payload_row in rows:
-                game_id_row = payload_row.get("gameId")
-                if not game_id_row or game_id_row not in grouped:
+                if suspicious and len(batch) > 1:
+                    left, right = split_batch(batch)
+                    pending.appendleft((event_type, right, 0.0))
+                    pending.appendleft((event_type, left, 0.0))
+                    metrics["split_batch_count"] += 1
                     continue
-                grouped[game_id_row].append(reduce_querytool_event_row(payload_row))
-
-            fetched_at = now_utc()
-            for gid in batch:
-                stream_rows.append(
-                    {
-                        "game_id": gid,
-                        "event_type": event_type,
-                        "events_json": Json(grouped.get(gid) or []),
-                        "created_at": fetched_at,
-                        "updated_at": fetched_at,
-                        "fetched_at": fetched_at,
-                    }
-                )
 
-            metrics["rows_emitted"] += len(batch)
-            metrics["completed_batch_count"] += 1
+                if suspicious:
+                    errors.append(
+                        f"querytool_event_streams {event_type}: batch for game {batch[0]} may be truncated "
+                        f"(rows={len(rows)}, rowsReturned={rows_returned})"
+                    )
+                    metrics["truncation_warning_count"] += 1
+
+                batch_rows = build_event_stream_rows(event_type, batch, rows)
+                if write_batch is not None:
+                    write_batch(batch_rows)
+                else:
+                    stream_rows.extend(batch_rows)
+                metrics["rows_emitted"] += len(batch)
+                metrics["completed_batch_count"] += 1
+                # Last completion wins: duration spans first dispatch to final batch.
+                metrics["duration_ms"] = elapsed_ms(event_started[event_type])
 
-    metrics["duration_ms"] = elapsed_ms(event_started)
-    return stream_rows, metrics, errors
+    return stream_rows, metrics_by_event_type, errors
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -523,6 +615,7 @@ def main(
     game_ids: str | None = None,
     only_final_games: bool = True,
 ) -> dict:
+    begin_http_telemetry()
     started_at = now_utc()
     started_perf = time.perf_counter()
 
@@ -530,7 +623,7 @@ def main(
         "config": {
             "event_types": QUERYTOOL_EVENT_STREAM_TYPES,
             "batch_sizes": QUERYTOOL_EVENT_STREAM_BATCH_SIZES,
-            "event_type_concurrency": QUERYTOOL_EVENT_TYPE_CONCURRENCY,
+            "concurrency": QUERYTOOL_EVENT_STREAM_CONCURRENCY,
             "max_rows_returned": QUERYTOOL_EVENT_STREAM_MAX_ROWS_RETURNED,
             "truncation_threshold": QUERY_TOOL_TRUNCATION_THRESHOLD,
             "skip_existing_on_season_backfill": QUERYTOOL_EVENT_STREAMS_SKIP_EXISTING_ON_SEASON_BACKFILL,
@@ -546,7 +639,7 @@ def main(
         "event_types": {},
         "fetch": {
             "coverage": {},
-            "event_type_worker_count": 0,
+            "worker_count": 0,
             "total_batch_attempt_count": 0,
             "total_split_batch_count": 0,
             "total_truncation_warning_count": 0,
@@ -554,6 +647,7 @@ def main(
         },
         "upsert": {
             "executed": False,
+            "checkpoints_recorded": 0,
             "duration_ms": 0.0,
         },
         "duration_ms": 0.0,
@@ -564,7 +658,6 @@ def main(
         conn = psycopg.connect(os.environ["POSTGRES_URL"])
 
         errors: list[str] = []
-        stream_rows: list[dict] = []
 
         season_label_value = season_label
         normalized_mode = (mode or "refresh").strip().lower()
@@ -661,12 +754,24 @@ def main(
             for event_type in QUERYTOOL_EVENT_STREAM_TYPES
         }
 
+        checkpoint_coverage: dict = {}
         if enable_skip_existing and final_game_ids:
-            for event_type in QUERYTOOL_EVENT_STREAM_TYPES:
-                existing_game_ids = fetch_existing_event_stream_game_ids(conn, final_game_ids, event_type)
-                event_type_game_ids[event_type] = [
-                    gid for gid in final_game_ids if gid not in existing_game_ids
-                ]
+            # Checkpoint endpoints are the event types themselves.
+            event_type_game_ids, checkpoint_coverage = resolve_pending_game_ids(
+                conn,
+                QUERYTOOL_EVENT_STREAMS_CHECKPOINT_STEP,
+                {
+                    event_type: (
+                        lambda ids, event_type=event_type: fetch_existing_event_stream_game_ids(conn, ids, event_type)
+                    )
+                    for event_type in QUERYTOOL_EVENT_STREAM_TYPES
+                },
+                final_game_ids,
+                league_id,
+                season_label_value,
+                season_type,
+                seed_from_probes=not dry_run,
+            )
 
         telemetry["fetch"]["coverage"] = {
             "skip_existing_enabled": enable_skip_existing,
@@ -675,90 +780,73 @@ def main(
                 event_type: len(event_type_game_ids.get(event_type) or [])
                 for event_type in QUERYTOOL_EVENT_STREAM_TYPES
             },
+            "checkpoints": checkpoint_coverage,
         }
 
+        final_game_id_set = set(final_game_ids)
+        write_state = {"rows": 0, "upserted": 0}
+
+        def write_batch(batch_rows: list[dict]) -> None:
+            # One fetched batch: upsert its rows, then journal its final games,
+            # so an interrupted backfill resumes from the last written batch.
+            write_state["rows"] += len(batch_rows)
+            if dry_run or not batch_rows:
+                return
+            write_started = time.perf_counter()
+            telemetry["upsert"]["executed"] = True
+            write_state["upserted"] += upsert(
+                conn,
+                "nba.querytool_event_streams",
+                batch_rows,
+                ["game_id", "event_type"],
+                update_exclude=["created_at"],
+            )
+            checkpoint_game_ids: dict[str, set[str]] = {}
+            for row in batch_rows:
+                if row["game_id"] in final_game_id_set:
+                    checkpoint_game_ids.setdefault(row["event_type"], set()).add(row["game_id"])
+            telemetry["upsert"]["checkpoints_recorded"] += record_checkpoints(
+                conn,
+                QUERYTOOL_EVENT_STREAMS_CHECKPOINT_STEP,
+                checkpoint_game_ids,
+                league_id,
+                season_label_value,
+                season_type,
+                now_utc(),
+            )
+            telemetry["upsert"]["duration_ms"] += elapsed_ms(write_started)
+
         fetch_started = time.perf_counter()
         if final_game_ids and season_label_value:
-            event_types = list(QUERYTOOL_EVENT_STREAM_TYPES)
-            worker_count = min(max(1, QUERYTOOL_EVENT_TYPE_CONCURRENCY), len(event_types))
-            telemetry["fetch"]["event_type_worker_count"] = worker_count
-
-            event_results: dict[str, tuple[list[dict], dict, list[str]]] = {}
-
-            if worker_count <= 1:
-                for event_type in event_types:
-                    event_results[event_type] = fetch_querytool_event_stream_rows_for_event_type(
-                        event_type=event_type,
-                        target_game_ids=event_type_game_ids.get(event_type) or [],
-                        league_id=league_id,
-                        season_label_value=season_label_value,
-                        season_type=season_type,
-                    )
-            else:
-                with ThreadPoolExecutor(max_workers=worker_count) as executor:
-                    futures = {
-                        executor.submit(
-                            fetch_querytool_event_stream_rows_for_event_type,
-                            event_type,
-                            event_type_game_ids.get(event_type) or [],
-                            league_id,
-                            season_label_value,
-                            season_type,
-                        ): event_type
-                        for event_type in event_types
-                    }
-                    for future in as_completed(futures):
-                        event_type = futures[future]
-                        try:
-                            event_results[event_type] = future.result()
-                        except Exception as exc:
-                            failed_metrics = init_event_type_metrics(
-                                QUERYTOOL_EVENT_STREAM_BATCH_SIZES.get(event_type, 25)
-                            )
-                            failed_metrics["failed"] = True
-                            event_results[event_type] = (
-                                [],
-                                failed_metrics,
-                                [
-                                    f"querytool_event_streams {event_type}: unhandled fetch error: {exc}"
-                                ],
-                            )
+            telemetry["fetch"]["worker_count"] = max(1, QUERYTOOL_EVENT_STREAM_CONCURRENCY)
+            _, metrics_by_event_type, fetch_errors = fetch_querytool_event_stream_rows(
+                {
+                    event_type: event_type_game_ids.get(event_type) or []
+                    for event_type in QUERYTOOL_EVENT_STREAM_TYPES
+                },
+                league_id,
+                season_label_value,
+                season_type,
+                QUERYTOOL_EVENT_STREAM_CONCURRENCY,
+                write_batch=write_batch,
+            )
+            errors.extend(fetch_errors)
 
-            for event_type in event_types:
-                event_rows, metrics, event_errors = event_results.get(
-                    event_type,
-                    (
-                        [],
-                        init_event_type_metrics(QUERYTOOL_EVENT_STREAM_BATCH_SIZES.get(event_type, 25)),
-                        [f"querytool_event_streams {event_type}: missing fetch result"],
-                    ),
-                )
-                stream_rows.extend(event_rows)
-                errors.extend(event_errors)
+            for event_type in QUERYTOOL_EVENT_STREAM_TYPES:
+                metrics = metrics_by_event_type[event_type]
                 telemetry["event_types"][event_type] = metrics
                 telemetry["fetch"]["total_batch_attempt_count"] += metrics.get("batch_attempt_count", 0)
                 telemetry["fetch"]["total_split_batch_count"] += metrics.get("split_batch_count", 0)
                 telemetry["fetch"]["total_truncation_warning_count"] += metrics.get("truncation_warning_count", 0)
 
         telemetry["fetch"]["duration_ms"] = elapsed_ms(fetch_started)
-
-        inserted_stream_rows = 0
-        upsert_started = time.perf_counter()
-        if not dry_run and stream_rows:
-            telemetry["upsert"]["executed"] = True
-            inserted_stream_rows = upsert(
-                conn,
-                "nba.querytool_event_streams",
-                stream_rows,
-                ["game_id", "event_type"],
-                update_exclude=["created_at"],
-            )
-        telemetry["upsert"]["duration_ms"] = elapsed_ms(upsert_started)
+        telemetry["upsert"]["duration_ms"] = round(telemetry["upsert"]["duration_ms"], 2)
 
         if conn:
             conn.close()
 
         telemetry["duration_ms"] = elapsed_ms(started_perf)
+        telemetry["http"] = http_telemetry()
 
         return {
             "dry_run": dry_run,
@@ -767,8 +855,8 @@ def main(
             "tables": [
                 {
                     "table": "nba.querytool_event_streams",
-                    "rows": len(stream_rows),
-                    "upserted": inserted_stream_rows,
+                    "rows": write_state["rows"],
+                    "upserted": write_state["upserted"],
                 },
             ],
             "telemetry": telemetry,
@@ -779,6 +867,7 @@ def main(
             conn.close()
 
         telemetry["duration_ms"] = elapsed_ms(started_perf)
+        telemetry["http"] = http_telemetry()
 
         return {
             "dry_run": dry_run,
@@ -1,10 +1,12 @@
 # /// script
 # requires-python = ">=3.11"
-# dependencies = ["psycopg[binary]", "httpx", "sniffio", "typing-extensions"]
+# dependencies = ["psycopg[binary]", "httpx[http2]", "sniffio", "typing-extensions"]
 # ///
+import importlib.util
 import os
-import time
+import sys
 from datetime import datetime, timezone
+from pathlib import Path
 
 import httpx
 import psycopg
@@ -13,6 +15,39 @@ from psycopg.types.json import Json
 BASE_URL = "https://api.nba.com/v0"
 
 
+def _load_http_client_module():
+    # One shared instance per process so pooled connections are shared by every
+    # step in a run (HTTP telemetry stays per step, see begin_http_telemetry).
+    cached = sys.modules.get("nba_http_client")
+    if cached is not None:
+        return cached
+
+    candidates: list[Path] = []
+    if "__file__" in globals():
+        candidates.append(Path(__file__).with_name("http_client.py"))
+    candidates.append(Path("import_nba_data.flow/http_client.py"))
+
+    for path in candidates:
+        if not path.exists():
+            continue
+        spec = importlib.util.spec_from_file_location("nba_http_client", path)
+        if spec is None or spec.loader is None:
+            continue
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["nba_http_client"] = module
+        spec.loader.exec_module(module)
+        return module
+
+    raise FileNotFoundError("Unable to load http_client.py")
+
+
+_http_client = _load_http_client_module()
+http_get = _http_client.http_get
+pooled_client = _http_client.pooled_client
+http_telemetry = _http_client.http_telemetry
+begin_http_telemetry = _http_client.begin_http_telemetry
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Helpers
 # ─────────────────────────────────────────────────────────────────────────────
@@ -30,21 +65,11 @@ def parse_season_year(label: str | None) -> int | None:
         return None
 
 
-def request_json(client: httpx.Client, path: str, params: dict | None = None, retries: int = 3) -> dict:
+def request_json(client: httpx.Client, path: str, params: dict | None = None, retries: int | None = None) -> dict:
     headers = {"X-NBA-Api-Key": os.environ["NBA_API_KEY"]}
-    url = f"{BASE_URL}{path}"
-
-    for attempt in range(retries):
-        resp = client.get(url, params=params, headers=headers)
-        if resp.status_code in {429, 500, 502, 503, 504}:
-            if attempt == retries - 1:
-                resp.raise_for_status()
-            time.sleep(1 + attempt)
-            continue
-        resp.raise_for_status()
-        return resp.json()
-
-    raise RuntimeError(f"Failed to fetch {url}")
+    response = http_get(client, f"{BASE_URL}{path}", params, headers, retries=retries)
+    response.raise_for_status()
+    return response.json()
 
 
 def upsert(conn: psycopg.Connection, table: str, rows: list[dict], conflict_keys: list[str], update_exclude: list[str] | None = None) -> int:
@@ -79,6 +104,7 @@ def main(
     league_id: str = "00",
     season_label: str | None = None,
 ) -> dict:
+    begin_http_telemetry()
     started_at = now_utc()
 
     try:
@@ -87,7 +113,7 @@ def main(
         full_schedule = None
         broadcasters = None
 
-        with httpx.Client(timeout=30) as client:
+        with pooled_client(BASE_URL) as client:
             season_calendar = request_json(
                 client,
                 "/api/schedule/seasoncalendar",
@@ -149,6 +175,7 @@ def main(
                     "upserted": inserted,
                 }
             ],
+            "telemetry": {"http": http_telemetry()},
             "errors": [],
         }
     except Exception as exc:
@@ -157,6 +184,7 @@ def main(
             "started_at": started_at.isoformat(),
             "finished_at": now_utc().isoformat(),
             "tables": [],
+            "telemetry": {"http": http_telemetry()},
             "errors": [str(exc)],
         }
 
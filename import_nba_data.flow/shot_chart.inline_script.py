@@ -1,10 +1,16 @@
 # /// script
 # requires-python = ">=3.11"
-# dependencies = ["psycopg[binary]", "httpx", "sniffio", "typing-extensions"]
+# dependencies = ["psycopg[binary]", "httpx[http2]", "sniffio", "typing-extensions"]
 # ///
+import importlib.util
 import os
+import queue
+import sys
+import threading
 import time
+import zlib
 from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
 
 import httpx
 import psycopg
@@ -20,10 +26,80 @@ SHOT_CHART_TEAM_GROUPING = "Y"
 SHOT_CHART_MAX_ROWS = 10000
 SHOT_CHART_BATCH_SIZE = 50  # ~180 shots/game × 50 = ~9000, safely under 10k API limit
 SHOT_CHART_SINGLE_BATCH_MAX_ATTEMPTS = 4
-SHOT_CHART_UPSERT_CHUNK_SIZE = 0  # 0 disables chunking (single executemany)
+SHOT_CHART_UPSERT_CHUNK_SIZE = 5000  # rows per COPY into the staging table; 0 sends each write as one COPY
+# Writer connections run alongside the fetch loop; rows are partitioned by
+# game_id so concurrent merges never touch the same primary keys.
+SHOT_CHART_WRITER_CONNECTIONS = 2
+SHOT_CHART_WRITE_QUEUE_MAX_BATCHES = 4
+SHOT_CHART_STAGING_TABLE = "shot_chart_staging"
 SHOT_CHART_INCLUDE_BATCH_METRICS = True
 SHOT_CHART_SKIP_EXISTING_ON_SEASON_BACKFILL = True
 SHOT_CHART_SPLITTABLE_HTTP_STATUSES = {414, 429, 500, 502, 503, 504}
+SHOT_CHART_CHECKPOINT_STEP = "shot_chart"
+SHOT_CHART_CHECKPOINT_ENDPOINT = "shot_chart"
+
+
+def _load_http_client_module():
+    # One shared instance per process so pooled connections are shared by every
+    # step in a run (HTTP telemetry stays per step, see begin_http_telemetry).
+    cached = sys.modules.get("nba_http_client")
+    if cached is not None:
+        return cached
+
+    candidates: list[Path] = []
+    if "__file__" in globals():
+        candidates.append(Path(__file__).with_name("http_client.py"))
+    candidates.append(Path("import_nba_data.flow/http_client.py"))
+
+    for path in candidates:
+        if not path.exists():
+            continue
+        spec = importlib.util.spec_from_file_location("nba_http_client", path)
+        if spec is None or spec.loader is None:
+            continue
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["nba_http_client"] = module
+        spec.loader.exec_module(module)
+        return module
+
+    raise FileNotFoundError("Unable to load http_client.py")
+
+
+_http_client = _load_http_client_module()
+http_get = _http_client.http_get
+pooled_client = _http_client.pooled_client
+http_telemetry = _http_client.http_telemetry
+begin_http_telemetry = _http_client.begin_http_telemetry
+
+
+def _load_checkpoint_utils_module():
+    # One shared instance per process so every step in a run uses the same module.
+    cached = sys.modules.get("nba_checkpoint_utils")
+    if cached is not None:
+        return cached
+
+    candidates: list[Path] = []
+    if "__file__" in globals():
+        candidates.append(Path(__file__).with_name("checkpoint_utils.py"))
+    candidates.append(Path("import_nba_data.flow/checkpoint_utils.py"))
+
+    for path in candidates:
+        if not path.exists():
+            continue
+        spec = importlib.util.spec_from_file_location("nba_checkpoint_utils", path)
+        if spec is None or spec.loader is None:
+            continue
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["nba_checkpoint_utils"] = module
+        spec.loader.exec_module(module)
+        return module
+
+    raise FileNotFoundError("Unable to load checkpoint_utils.py")
+
+
+_checkpoint_utils = _load_checkpoint_utils_module()
+record_checkpoints = _checkpoint_utils.record_checkpoints
+resolve_pending_game_ids = _checkpoint_utils.resolve_pending_game_ids
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -186,42 +262,25 @@ def request_json(
     client: httpx.Client,
     path: str,
     params: dict | None = None,
-    retries: int = 3,
+    retries: int | None = None,
     base_url: str = BASE_URL,
 ) -> dict:
     headers = {"X-NBA-Api-Key": os.environ["NBA_API_KEY"]}
-    url = f"{base_url}{path}"
-
-    for attempt in range(retries):
-        try:
-            resp = client.get(url, params=params, headers=headers)
-        except httpx.TimeoutException:
-            if attempt == retries - 1:
-                raise
-            time.sleep(1 + attempt)
-            continue
-
-        retryable_400 = resp.status_code == 400 and "Database Error" in resp.text
-        if resp.status_code in {429, 500, 502, 503, 504} or retryable_400:
-            if attempt == retries - 1:
-                resp.raise_for_status()
-            time.sleep(1 + attempt)
-            continue
-        if resp.status_code == 404:
-            return {}
-        resp.raise_for_status()
-        return resp.json()
-
-    raise RuntimeError(f"Failed to fetch {url}")
+    response = http_get(client, f"{base_url}{path}", params, headers, retries=retries)
+    if response.status_code == 404:
+        return {}
+    response.raise_for_status()
+    return response.json()
 
 
-def upsert(
+def copy_upsert(
     conn: psycopg.Connection,
     table: str,
     rows: list[dict],
     conflict_keys: list[str],
     update_exclude: list[str] | None = None,
 ) -> int:
+    """COPY rows into a session temp table, then merge them with one INSERT ... ON CONFLICT."""
     if not rows:
         return 0
     update_exclude = update_exclude or []
@@ -236,22 +295,122 @@ def upsert(
 
     update_cols = [c for c in cols if c not in conflict_keys and c not in update_exclude]
 
-    placeholders = ", ".join(["%s"] * len(cols))
     col_list = ", ".join(cols)
     conflict = ", ".join(conflict_keys)
 
     if update_cols:
         updates = ", ".join([f"{c} = EXCLUDED.{c}" for c in update_cols])
-        sql = f"INSERT INTO {table} ({col_list}) VALUES ({placeholders}) ON CONFLICT ({conflict}) DO UPDATE SET {updates}"
+        on_conflict = f"ON CONFLICT ({conflict}) DO UPDATE SET {updates}"
     else:
-        sql = f"INSERT INTO {table} ({col_list}) VALUES ({placeholders}) ON CONFLICT ({conflict}) DO NOTHING"
+        on_conflict = f"ON CONFLICT ({conflict}) DO NOTHING"
 
     with conn.cursor() as cur:
-        cur.executemany(sql, [tuple(r.get(c) for c in cols) for r in rows])
+        cur.execute(
+            f"CREATE TEMP TABLE IF NOT EXISTS {SHOT_CHART_STAGING_TABLE} "
+            f"(LIKE {table} INCLUDING DEFAULTS, staging_seq bigint) ON COMMIT DELETE ROWS"
+        )
+        with cur.copy(f"COPY {SHOT_CHART_STAGING_TABLE} ({col_list}, staging_seq) FROM STDIN") as copy:
+            for seq, r in enumerate(rows):
+                copy.write_row((*(r.get(c) for c in cols), seq))
+        # DISTINCT ON keeps a re-fetched key from hitting the same row twice in one
+        # merge; ordering by staging_seq keeps the last fetched row, as executemany did.
+        cur.execute(
+            f"INSERT INTO {table} ({col_list}) "
+            f"SELECT DISTINCT ON ({conflict}) {col_list} FROM {SHOT_CHART_STAGING_TABLE} "
+            f"ORDER BY {conflict}, staging_seq DESC "
+            f"{on_conflict}"
+        )
     conn.commit()
     return len(rows)
 
 
+def writer_partition(game_id: str | None, writer_count: int) -> int:
+    if writer_count <= 1 or not game_id:
+        return 0
+    return zlib.crc32(game_id.encode()) % writer_count
+
+
+def rows_per_sec(rows: int, duration_ms: float) -> float:
+    if duration_ms <= 0:
+        return 0.0
+    return round(rows / (duration_ms / 1000), 1)
+
+
+def run_shot_chart_writer(
+    write_queue: queue.Queue,
+    writer_state: dict,
+    metrics_lock: threading.Lock,
+    upsert_chunk_size: int,
+    final_game_id_set: set[str],
+    league_id: str,
+    season_label: str | None,
+    season_type: str,
+) -> None:
+    """Merge queued batches on a dedicated connection until the None sentinel arrives.
+
+    Each item is one fetch batch's rows for this writer's game_id partition.
+    Checkpoints for final games are recorded only after their rows commit.
+    After the first error the writer keeps draining its queue without writing
+    so the fetch loop never blocks on a full queue.
+    """
+    conn: psycopg.Connection | None = None
+    try:
+        conn = psycopg.connect(os.environ["POSTGRES_URL"])
+        while True:
+            item = write_queue.get()
+            if item is None:
+                return
+            if writer_state["error"] is not None:
+                continue
+
+            write_started = time.perf_counter()
+            try:
+                upserted = 0
+                chunks = chunk_rows(item["rows"], upsert_chunk_size) if item["rows"] else []
+                for chunk in chunks:
+                    upserted += copy_upsert(
+                        conn,
+                        "nba.shot_chart",
+                        chunk,
+                        ["game_id", "event_number"],
+                        update_exclude=["created_at"],
+                    )
+                checkpoints = record_checkpoints(
+                    conn,
+                    SHOT_CHART_CHECKPOINT_STEP,
+                    {SHOT_CHART_CHECKPOINT_ENDPOINT: [gid for gid in item["game_ids"] if gid in final_game_id_set]},
+                    league_id,
+                    season_label,
+                    season_type,
+                    now_utc(),
+                )
+            except Exception as exc:
+                conn.rollback()
+                writer_state["error"] = exc
+                continue
+
+            write_ms = elapsed_ms(write_started)
+            with metrics_lock:
+                writer_state["upserted"] += upserted
+                writer_state["chunks"] += len(chunks)
+                writer_state["write_ms"] += write_ms
+                writer_state["checkpoints_recorded"] += checkpoints
+                batch_metric = item["batch_metric"]
+                batch_metric["write_ms"] = round(batch_metric.get("write_ms", 0.0) + write_ms, 2)
+                batch_metric["rows_written"] = batch_metric.get("rows_written", 0) + upserted
+                batch_metric["write_rows_per_sec"] = rows_per_sec(
+                    batch_metric["rows_written"], batch_metric["write_ms"]
+                )
+    except Exception as exc:
+        if writer_state["error"] is None:
+            writer_state["error"] = exc
+        while write_queue.get() is not None:
+            pass
+    finally:
+        if conn:
+            conn.close()
+
+
 def fetch_existing_shot_chart_game_ids(conn: psycopg.Connection, game_ids: list[str]) -> set[str]:
     if not game_ids:
         return set()
@@ -355,12 +514,14 @@ def main(
     game_ids: str | None = None,
     only_final_games: bool = True,
 ) -> dict:
+    begin_http_telemetry()
     started_at = now_utc()
     started_perf = time.perf_counter()
 
     shot_chart_batch_size = SHOT_CHART_BATCH_SIZE
     single_batch_max_attempts = SHOT_CHART_SINGLE_BATCH_MAX_ATTEMPTS
     upsert_chunk_size = SHOT_CHART_UPSERT_CHUNK_SIZE
+    writer_connections = max(1, SHOT_CHART_WRITER_CONNECTIONS)
     include_batch_metrics = SHOT_CHART_INCLUDE_BATCH_METRICS
 
     telemetry = {
@@ -370,6 +531,8 @@ def main(
             "truncation_threshold": QUERY_TOOL_TRUNCATION_THRESHOLD,
             "single_batch_max_attempts": single_batch_max_attempts,
             "upsert_chunk_size": upsert_chunk_size,
+            "writer_connections": writer_connections,
+            "write_queue_max_batches": SHOT_CHART_WRITE_QUEUE_MAX_BATCHES,
             "include_batch_metrics": include_batch_metrics,
             "skip_existing_on_season_backfill": SHOT_CHART_SKIP_EXISTING_ON_SEASON_BACKFILL,
         },
@@ -405,12 +568,17 @@ def main(
             "attempted_rows": 0,
             "chunks": 0,
             "duration_ms": 0.0,
+            "write_ms": 0.0,
+            "rows_per_sec": 0.0,
             "executed": False,
+            "checkpoints_recorded": 0,
         },
         "duration_ms": 0.0,
     }
 
     conn: psycopg.Connection | None = None
+    write_queues: list[queue.Queue] = []
+    writer_threads: list[threading.Thread] = []
     try:
         season_label_value = season_label
         desired_season_type = normalize_season_type(season_type)
@@ -418,7 +586,10 @@ def main(
 
         conn = psycopg.connect(os.environ["POSTGRES_URL"])
         game_list: list[str] = []
-        shot_chart_rows: list[dict] = []
+        # Games known to be final; only these are journaled as checkpoints.
+        final_game_id_set: set[str] = set()
+        writer_state = {"error": None, "upserted": 0, "chunks": 0, "write_ms": 0.0, "checkpoints_recorded": 0}
+        metrics_lock = threading.Lock()
         section_errors: list[str] = []
 
         # --- Resolve game list ---
@@ -463,6 +634,7 @@ def main(
                 game_list = [gid for gid, status, _ in game_status_rows if status == 3]
             else:
                 game_list = [gid for gid, _, _ in game_status_rows]
+            final_game_id_set = {gid for gid, status, _ in game_status_rows if status == 3}
 
             telemetry["game_selection"].update(
                 {
@@ -486,15 +658,26 @@ def main(
             and normalized_mode == "season_backfill"
             and not bool(game_ids)
         )
+        checkpoint_coverage: dict = {}
         if enable_skip_existing and fetch_game_ids:
-            existing_shot_chart_games = fetch_existing_shot_chart_game_ids(conn, fetch_game_ids)
-            fetch_game_ids = [gid for gid in fetch_game_ids if gid not in existing_shot_chart_games]
+            pending_by_endpoint, checkpoint_coverage = resolve_pending_game_ids(
+                conn,
+                SHOT_CHART_CHECKPOINT_STEP,
+                {SHOT_CHART_CHECKPOINT_ENDPOINT: lambda ids: fetch_existing_shot_chart_game_ids(conn, ids)},
+                fetch_game_ids,
+                league_id,
+                season_label_value,
+                season_type,
+                seed_from_probes=not dry_run,
+            )
+            fetch_game_ids = pending_by_endpoint[SHOT_CHART_CHECKPOINT_ENDPOINT]
 
         telemetry["fetch"]["coverage"] = {
             "skip_existing_enabled": enable_skip_existing,
             "selected_games": len(game_list),
             "games_to_fetch": len(fetch_game_ids),
             "games_skipped": len(game_list) - len(fetch_game_ids),
+            "checkpoints": checkpoint_coverage,
         }
 
         # --- Fetch + parse batched shot chart ---
@@ -504,8 +687,33 @@ def main(
             telemetry["fetch"]["initial_batch_count"] = len(pending_batches)
             single_batch_attempts: dict[str, int] = {}
 
-            with httpx.Client(timeout=60) as client:
+            # Writers merge each processed batch while the next one is fetched.
+            if not dry_run:
+                telemetry["upsert"]["executed"] = True
+                for _ in range(writer_connections):
+                    write_queue: queue.Queue = queue.Queue(maxsize=SHOT_CHART_WRITE_QUEUE_MAX_BATCHES)
+                    writer_thread = threading.Thread(
+                        target=run_shot_chart_writer,
+                        args=(
+                            write_queue,
+                            writer_state,
+                            metrics_lock,
+                            upsert_chunk_size,
+                            final_game_id_set,
+                            league_id,
+                            season_label_value,
+                            season_type,
+                        ),
+                        daemon=True,
+                    )
+                    writer_thread.start()
+                    write_queues.append(write_queue)
+                    writer_threads.append(writer_thread)
+
+            with pooled_client(BASE_URL) as client:
                 while pending_batches:
+                    if writer_state["error"] is not None:
+                        break
                     batch = pending_batches.pop(0)
                     if not batch:
                         continue
@@ -745,14 +953,28 @@ def main(
                             }
                         )
 
-                    shot_chart_rows.extend(batch_rows)
                     telemetry["fetch"]["rows_emitted"] += len(batch_rows)
                     telemetry["fetch"]["completed_batch_count"] += 1
 
                     batch_metric["parse_merge_ms"] = elapsed_ms(parse_started)
                     batch_metric["rows_emitted"] = len(batch_rows)
+                    batch_metric["rows_per_sec"] = rows_per_sec(
+                        len(batch_rows), batch_metric["fetch_total_ms"] + batch_metric["parse_merge_ms"]
+                    )
                     batch_metric["action"] = "processed"
 
+                    if write_queues:
+                        partitions = [{"rows": [], "game_ids": []} for _ in write_queues]
+                        for game_id_value in batch:
+                            partitions[writer_partition(game_id_value, len(write_queues))]["game_ids"].append(
+                                game_id_value
+                            )
+                        for row in batch_rows:
+                            partitions[writer_partition(row["game_id"], len(write_queues))]["rows"].append(row)
+                        for write_queue, partition in zip(write_queues, partitions):
+                            if partition["game_ids"] or partition["rows"]:
+                                write_queue.put({**partition, "batch_metric": batch_metric})
+
                     if include_batch_metrics:
                         telemetry["fetch"]["batch_metrics"].append(batch_metric)
         elif game_list and not season_label_value:
@@ -760,28 +982,30 @@ def main(
 
         telemetry["fetch"]["duration_ms"] = elapsed_ms(fetch_started)
 
-        inserted_shot_chart = 0
-        telemetry["upsert"]["attempted_rows"] = len(shot_chart_rows)
-
+        # Drain the writers; duration_ms is the tail left after the fetch loop.
         upsert_started = time.perf_counter()
-        if not dry_run and shot_chart_rows:
-            chunks = chunk_rows(shot_chart_rows, upsert_chunk_size)
-            telemetry["upsert"]["chunks"] = len(chunks)
-            telemetry["upsert"]["executed"] = True
-            for chunk in chunks:
-                inserted_shot_chart += upsert(
-                    conn,
-                    "nba.shot_chart",
-                    chunk,
-                    ["game_id", "event_number"],
-                    update_exclude=["created_at"],
-                )
+        for write_queue in write_queues:
+            write_queue.put(None)
+        for writer_thread in writer_threads:
+            writer_thread.join()
+        write_queues = []
         telemetry["upsert"]["duration_ms"] = elapsed_ms(upsert_started)
 
+        if writer_state["error"] is not None:
+            raise writer_state["error"]
+
+        inserted_shot_chart = writer_state["upserted"]
+        telemetry["upsert"]["attempted_rows"] = telemetry["fetch"]["rows_emitted"]
+        telemetry["upsert"]["chunks"] = writer_state["chunks"]
+        telemetry["upsert"]["write_ms"] = round(writer_state["write_ms"], 2)
+        telemetry["upsert"]["rows_per_sec"] = rows_per_sec(inserted_shot_chart, writer_state["write_ms"])
+        telemetry["upsert"]["checkpoints_recorded"] = writer_state["checkpoints_recorded"]
+
         if conn:
             conn.close()
 
         telemetry["duration_ms"] = elapsed_ms(started_perf)
+        telemetry["http"] = http_telemetry()
 
         return {
             "dry_run": dry_run,
@@ -790,7 +1014,7 @@ def main(
             "tables": [
                 {
                     "table": "nba.shot_chart",
-                    "rows": len(shot_chart_rows),
+                    "rows": telemetry["fetch"]["rows_emitted"],
                     "upserted": inserted_shot_chart,
                 },
             ],
@@ -798,10 +1022,15 @@ def main(
             "errors": section_errors,
         }
     except Exception as exc:
+        for write_queue in write_queues:
+            write_queue.put(None)
+        for writer_thread in writer_threads:
+            writer_thread.join()
         if conn:
             conn.close()
 
         telemetry["duration_ms"] = elapsed_ms(started_perf)
+        telemetry["http"] = http_telemetry()
 
         return {
             "dry_run": dry_run,
@@ -1,11 +1,14 @@
 # /// script
 # requires-python = ">=3.11"
-# dependencies = ["psycopg[binary]", "httpx", "sniffio", "typing-extensions"]
+# dependencies = ["psycopg[binary]", "httpx[http2]", "sniffio", "typing-extensions"]
 # ///
+import importlib.util
 import os
 import re
-import time
+import sys
+from concurrent.futures import as_completed
 from datetime import datetime, timezone
+from pathlib import Path
 
 import httpx
 import psycopg
@@ -15,6 +18,40 @@ BASE_URL = "https://api.nba.com/v0"
 CAMEL_TO_SNAKE_RE = re.compile(r"(?<!^)(?=[A-Z])")
 
 
+def _load_http_client_module():
+    # One shared instance per process so pooled connections are shared by every
+    # step in a run (HTTP telemetry stays per step, see begin_http_telemetry).
+    cached = sys.modules.get("nba_http_client")
+    if cached is not None:
+        return cached
+
+    candidates: list[Path] = []
+    if "__file__" in globals():
+        candidates.append(Path(__file__).with_name("http_client.py"))
+    candidates.append(Path("import_nba_data.flow/http_client.py"))
+
+    for path in candidates:
+        if not path.exists():
+            continue
+        spec = importlib.util.spec_from_file_location("nba_http_client", path)
+        if spec is None or spec.loader is None:
+            continue
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["nba_http_client"] = module
+        spec.loader.exec_module(module)
+        return module
+
+    raise FileNotFoundError("Unable to load http_client.py")
+
+
+_http_client = _load_http_client_module()
+http_get = _http_client.http_get
+pooled_client = _http_client.pooled_client
+http_telemetry = _http_client.http_telemetry
+begin_http_telemetry = _http_client.begin_http_telemetry
+ScopedThreadPoolExecutor = _http_client.ScopedThreadPoolExecutor
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Helpers
 # ─────────────────────────────────────────────────────────────────────────────
@@ -77,23 +114,13 @@ def parse_float(value):
         return None
 
 
-def request_json(client: httpx.Client, path: str, params: dict | None = None, retries: int = 3) -> dict:
+def request_json(client: httpx.Client, path: str, params: dict | None = None, retries: int | None = None) -> dict:
     headers = {"X-NBA-Api-Key": os.environ["NBA_API_KEY"]}
-    url = f"{BASE_URL}{path}"
-
-    for attempt in range(retries):
-        resp = client.get(url, params=params, headers=headers)
-        if resp.status_code in {429, 500, 502, 503, 504}:
-            if attempt == retries - 1:
-                resp.raise_for_status()
-            time.sleep(1 + attempt)
-            continue
-        if resp.status_code == 404:
-            return {}
-        resp.raise_for_status()
-        return resp.json()
-
-    raise RuntimeError(f"Failed to fetch {url}")
+    response = http_get(client, f"{BASE_URL}{path}", params, headers, retries=retries)
+    if response.status_code == 404:
+        return {}
+    response.raise_for_status()
+    return response.json()
 
 
 def upsert(conn: psycopg.Connection, table: str, rows: list[dict], conflict_keys: list[str], update_exclude: list[str] | None = None) -> int:
@@ -265,6 +292,165 @@ BOOL_FIELDS = {
 }
 
 BRACKET_STATES = ["PlayoffPicture", "PlayIn", "PlayoffBracket", "IST"]
+# League standings, one bracket request per state and IST are independent;
+# all of them are in flight at once.
+STANDINGS_FETCH_CONCURRENCY = len(BRACKET_STATES) + 2
+STANDINGS_PASSTHROUGH_KEYS = {
+    "teamId",
+    "teamCity",
+    "teamName",
+    "teamSlug",
+    "teamTricode",
+    "teamAbbreviation",
+    "conference",
+    "division",
+}
+
+
+def build_standings_rows(
+    payload: dict,
+    league_id: str,
+    season_label: str | None,
+    season_type: str,
+    fetched_at: datetime,
+) -> tuple[list[dict], str, object]:
+    """Return (rows, season_label_value, standing_date) for a /api/standings/league payload."""
+    meta_time = payload.get("meta", {}).get("time")
+    standing_dt = parse_datetime(meta_time)
+    standing_date = standing_dt.date() if standing_dt else now_utc().date()
+
+    league_standings = payload.get("leagueStandings", {})
+    teams = league_standings.get("teams") or []
+    season_label_value = season_label or league_standings.get("seasonYear") or ""
+    season_year = parse_season_year(season_label_value)
+
+    rows: list[dict] = []
+    for team in teams:
+        team_id = team.get("teamId")
+        if team_id is None:
+            continue
+
+        row = {
+            "league_id": league_id,
+            "season_year": season_year,
+            "season_label": season_label_value,
+            "season_type": season_type,
+            "team_id": team_id,
+            "standing_date": standing_date,
+            "team_city": team.get("teamCity"),
+            "team_name": team.get("teamName"),
+            "team_slug": team.get("teamSlug"),
+            "team_tricode": team.get("teamTricode") or team.get("teamAbbreviation"),
+            "conference": team.get("conference"),
+            "division": team.get("division"),
+            "created_at": fetched_at,
+            "updated_at": fetched_at,
+            "fetched_at": fetched_at,
+        }
+
+        for key, value in team.items():
+            if key in STANDINGS_PASSTHROUGH_KEYS:
+                continue
+            column = FIELD_MAP.get(key) or camel_to_snake(key)
+            if column not in STANDINGS_COLUMNS:
+                continue
+            if column in BOOL_FIELDS:
+                row[column] = to_bool(value)
+            else:
+                row[column] = value
+
+        rows.append(row)
+
+    return rows, season_label_value, standing_date
+
+
+def build_bracket_row(
+    bracket_payload: dict,
+    bracket_state: str,
+    league_id: str,
+    season_label: str,
+    standing_date,
+    fetched_at: datetime,
+) -> dict | None:
+    bracket = bracket_payload.get("bracket") or {}
+    if not bracket:
+        return None
+
+    bracket_meta_time = (bracket_payload.get("meta") or {}).get("time")
+    bracket_dt = parse_datetime(bracket_meta_time)
+    bracket_date = bracket_dt.date() if bracket_dt else standing_date
+    bracket_season_label = bracket.get("seasonYear") or season_label or ""
+
+    return {
+        "league_id": bracket.get("leagueId") or league_id,
+        "season_year": parse_season_year(bracket_season_label),
+        "season_label": bracket_season_label,
+        "bracket_state": bracket_state,
+        "bracket_type": bracket.get("bracketType"),
+        "standing_date": bracket_date,
+        "meta_time": bracket_dt,
+        "playoff_picture_series_count": len(bracket.get("playoffPictureSeries") or []),
+        "play_in_bracket_series_count": len(bracket.get("playInBracketSeries") or []),
+        "playoff_bracket_series_count": len(bracket.get("playoffBracketSeries") or []),
+        "ist_bracket_series_count": len(bracket.get("istBracketSeries") or []),
+        "bracket_json": Json(bracket),
+        "created_at": fetched_at,
+        "updated_at": fetched_at,
+        "fetched_at": fetched_at,
+    }
+
+
+def build_ist_rows(
+    ist_payload: dict,
+    league_id: str,
+    season_label: str,
+    standing_date,
+    fetched_at: datetime,
+) -> list[dict]:
+    ist_season_label = ist_payload.get("seasonYear") or season_label or ""
+    ist_season_year = parse_season_year(ist_season_label)
+
+    ist_rows: list[dict] = []
+    for team in ist_payload.get("teams") or []:
+        team_id = parse_int(team.get("teamId"))
+        if team_id is None:
+            continue
+
+        ist_rows.append(
+            {
+                "league_id": ist_payload.get("leagueId") or league_id,
+                "season_year": ist_season_year,
+                "season_label": ist_season_label,
+                "team_id": team_id,
+                "standing_date": standing_date,
+                "team_city": team.get("teamCity"),
+                "team_name": team.get("teamName"),
+                "team_tricode": team.get("teamTricode") or team.get("teamAbbreviation"),
+                "team_slug": team.get("teamSlug"),
+                "conference": team.get("conference"),
+                "ist_group": team.get("istGroup"),
+                "clinch_indicator": team.get("clinchIndicator"),
+                "is_clinched_ist_knockout": to_bool(team.get("clinchedIstKnockout")),
+                "is_clinched_ist_group": to_bool(team.get("clinchedIstGroup")),
+                "is_clinched_ist_wildcard": to_bool(team.get("clinchedIstWildcard")),
+                "ist_wildcard_rank": parse_int(team.get("istWildcardRank")),
+                "ist_group_rank": parse_int(team.get("istGroupRank")),
+                "ist_knockout_rank": parse_int(team.get("istKnockoutRank")),
+                "wins": parse_int(team.get("wins")),
+                "losses": parse_int(team.get("losses")),
+                "win_pct": parse_float(team.get("pct")),
+                "ist_group_gb": parse_float(team.get("istGroupGb")),
+                "ist_wildcard_gb": parse_float(team.get("istWildcardGb")),
+                "diff": parse_int(team.get("diff")),
+                "pts": parse_int(team.get("pts")),
+                "opp_pts": parse_int(team.get("oppPts")),
+                "games_json": Json(team.get("games") or []),
+                "created_at": fetched_at,
+                "updated_at": fetched_at,
+                "fetched_at": fetched_at,
+            }
+        )
+    return ist_rows
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -277,6 +463,7 @@ def main(
     season_label: str | None = None,
     season_type: str = "Regular Season",
 ) -> dict:
+    begin_http_telemetry()
     started_at = now_utc()
 
     try:
@@ -287,148 +474,78 @@ def main(
         bracket_rows: list[dict] = []
         ist_rows: list[dict] = []
 
-        with httpx.Client(timeout=30) as client:
+        with pooled_client(BASE_URL) as client, ScopedThreadPoolExecutor(
+            max_workers=STANDINGS_FETCH_CONCURRENCY
+        ) as executor:
             # League standings
-            payload = request_json(client, "/api/standings/league", params)
-
-            meta_time = payload.get("meta", {}).get("time")
-            standing_dt = parse_datetime(meta_time)
-            standing_date = standing_dt.date() if standing_dt else now_utc().date()
-
-            league_standings = payload.get("leagueStandings", {})
-            teams = league_standings.get("teams") or []
-            season_label_value = season_label or league_standings.get("seasonYear") or ""
-            season_year = parse_season_year(season_label_value)
-
-            for team in teams:
-                team_id = team.get("teamId")
-                if team_id is None:
-                    continue
-
-                row = {
-                    "league_id": league_id,
-                    "season_year": season_year,
-                    "season_label": season_label_value,
-                    "season_type": season_type,
-                    "team_id": team_id,
-                    "standing_date": standing_date,
-                    "team_city": team.get("teamCity"),
-                    "team_name": team.get("teamName"),
-                    "team_slug": team.get("teamSlug"),
-                    "team_tricode": team.get("teamTricode") or team.get("teamAbbreviation"),
-                    "conference": team.get("conference"),
-                    "division": team.get("division"),
-                    "created_at": fetched_at,
-                    "updated_at": fetched_at,
-                    "fetched_at": fetched_at,
+            league_future = executor.submit(request_json, client, "/api/standings/league", params)
+
+            def submit_dependents(dependent_season_label: str | None) -> dict:
+                # Playoff bracket snapshots by bracket state + in-season tournament standings
+                futures = {
+                    executor.submit(
+                        request_json,
+                        client,
+                        "/api/standings/playoff/bracket",
+                        {
+                            "leagueId": league_id,
+                            "season": dependent_season_label,
+                            "bracketState": bracket_state,
+                        },
+                    ): bracket_state
+                    for bracket_state in BRACKET_STATES
                 }
-
-                for key, value in team.items():
-                    if key in {"teamId", "teamCity", "teamName", "teamSlug", "teamTricode", "teamAbbreviation", "conference", "division"}:
-                        continue
-                    column = FIELD_MAP.get(key) or camel_to_snake(key)
-                    if column not in STANDINGS_COLUMNS:
-                        continue
-                    if column in BOOL_FIELDS:
-                        row[column] = to_bool(value)
-                    else:
-                        row[column] = value
-
-                rows.append(row)
-
-            # Playoff bracket snapshots by bracket state
-            for bracket_state in BRACKET_STATES:
-                bracket_payload = request_json(
-                    client,
-                    "/api/standings/playoff/bracket",
-                    {
-                        "leagueId": league_id,
-                        "season": season_label_value or season_label,
-                        "bracketState": bracket_state,
-                    },
-                )
-                bracket = bracket_payload.get("bracket") or {}
-                if not bracket:
-                    continue
-
-                bracket_meta_time = (bracket_payload.get("meta") or {}).get("time")
-                bracket_dt = parse_datetime(bracket_meta_time)
-                bracket_date = bracket_dt.date() if bracket_dt else standing_date
-                bracket_season_label = bracket.get("seasonYear") or season_label_value or season_label or ""
-
-                bracket_rows.append(
-                    {
-                        "league_id": bracket.get("leagueId") or league_id,
-                        "season_year": parse_season_year(bracket_season_label),
-                        "season_label": bracket_season_label,
-                        "bracket_state": bracket_state,
-                        "bracket_type": bracket.get("bracketType"),
-                        "standing_date": bracket_date,
-                        "meta_time": bracket_dt,
-                        "playoff_picture_series_count": len(bracket.get("playoffPictureSeries") or []),
-                        "play_in_bracket_series_count": len(bracket.get("playInBracketSeries") or []),
-                        "playoff_bracket_series_count": len(bracket.get("playoffBracketSeries") or []),
-                        "ist_bracket_series_count": len(bracket.get("istBracketSeries") or []),
-                        "bracket_json": Json(bracket),
-                        "created_at": fetched_at,
-                        "updated_at": fetched_at,
-                        "fetched_at": fetched_at,
-                    }
-                )
-
-            # In-season tournament standings snapshot
-            ist_payload = request_json(
-                client,
-                "/api/standings/ist",
-                {
-                    "leagueId": league_id,
-                    "season": season_label_value or season_label,
-                },
+                futures[
+                    executor.submit(
+                        request_json,
+                        client,
+                        "/api/standings/ist",
+                        {
+                            "leagueId": league_id,
+                            "season": dependent_season_label,
+                        },
+                    )
+                ] = None
+                return futures
+
+            # Without an explicit season the bracket/IST requests need the
+            # seasonYear reported by the league payload, so they wait for it.
+            dependent_futures = submit_dependents(season_label) if season_label else {}
+
+            rows, season_label_value, standing_date = build_standings_rows(
+                league_future.result(),
+                league_id,
+                season_label,
+                season_type,
+                fetched_at,
             )
-
-            ist_season_label = ist_payload.get("seasonYear") or season_label_value or season_label or ""
-            ist_season_year = parse_season_year(ist_season_label)
-            ist_standing_date = standing_date
-
-            for team in ist_payload.get("teams") or []:
-                team_id = parse_int(team.get("teamId"))
-                if team_id is None:
+            if not dependent_futures:
+                dependent_futures = submit_dependents(season_label_value or season_label)
+
+            for future in as_completed(dependent_futures):
+                bracket_state = dependent_futures[future]
+                if bracket_state is None:
+                    ist_rows = build_ist_rows(
+                        future.result(),
+                        league_id,
+                        season_label_value or season_label,
+                        standing_date,
+                        fetched_at,
+                    )
                     continue
 
-                ist_rows.append(
-                    {
-                        "league_id": ist_payload.get("leagueId") or league_id,
-                        "season_year": ist_season_year,
-                        "season_label": ist_season_label,
-                        "team_id": team_id,
-                        "standing_date": ist_standing_date,
-                        "team_city": team.get("teamCity"),
-                        "team_name": team.get("teamName"),
-                        "team_tricode": team.get("teamTricode") or team.get("teamAbbreviation"),
-                        "team_slug": team.get("teamSlug"),
-                        "conference": team.get("conference"),
-                        "ist_group": team.get("istGroup"),
-                        "clinch_indicator": team.get("clinchIndicator"),
-                        "is_clinched_ist_knockout": to_bool(team.get("clinchedIstKnockout")),
-                        "is_clinched_ist_group": to_bool(team.get("clinchedIstGroup")),
-                        "is_clinched_ist_wildcard": to_bool(team.get("clinchedIstWildcard")),
-                        "ist_wildcard_rank": parse_int(team.get("istWildcardRank")),
-                        "ist_group_rank": parse_int(team.get("istGroupRank")),
-                        "ist_knockout_rank": parse_int(team.get("istKnockoutRank")),
-                        "wins": parse_int(team.get("wins")),
-                        "losses": parse_int(team.get("losses")),
-                        "win_pct": parse_float(team.get("pct")),
-                        "ist_group_gb": parse_float(team.get("istGroupGb")),
-                        "ist_wildcard_gb": parse_float(team.get("istWildcardGb")),
-                        "diff": parse_int(team.get("diff")),
-                        "pts": parse_int(team.get("pts")),
-                        "opp_pts": parse_int(team.get("oppPts")),
-                        "games_json": Json(team.get("games") or []),
-                        "created_at": fetched_at,
-                        "updated_at": fetched_at,
-                        "fetched_at": fetched_at,
-                    }
+                bracket_row = build_bracket_row(
+                    future.result(),
+                    bracket_state,
+                    league_id,
+                    season_label_value or season_label,
+                    standing_date,
+                    fetched_at,
                 )
+                if bracket_row:
+                    bracket_rows.append(bracket_row)
+
+        bracket_rows.sort(key=lambda row: BRACKET_STATES.index(row["bracket_state"]))
 
         inserted = 0
         inserted_brackets = 0
@@ -482,6 +599,7 @@ def main(
                     "upserted": inserted_ist,
                 },
             ],
+            "telemetry": {"http": http_telemetry()},
             "errors": [],
         }
     except Exception as exc:
@@ -490,6 +608,7 @@ def main(
             "started_at": started_at.isoformat(),
             "finished_at": now_utc().isoformat(),
             "tables": [],
+            "telemetry": {"http": http_telemetry()},
             "errors": [str(exc)],
         }
 
@@ -1,13 +1,16 @@
 # /// script
 # requires-python = ">=3.11"
-# dependencies = ["psycopg[binary]", "httpx", "sniffio", "typing-extensions"]
+# dependencies = ["psycopg[binary]", "httpx[http2]", "sniffio", "typing-extensions"]
 # ///
 import hashlib
+import importlib.util
 import json
 import os
 import re
-import time
+import sys
+from concurrent.futures import as_completed
 from datetime import datetime, timezone, timedelta, date
+from pathlib import Path
 
 import httpx
 import psycopg
@@ -16,6 +19,78 @@ from psycopg.types.json import Json
 BASE_URL = "https://api.nba.com/v0"
 TRACKING_URL = "https://api.nba.com/v0/api/tracking"
 
+# Per-game alerts/storylines requests in flight at once.
+SUPPLEMENTAL_GAME_FETCH_CONCURRENCY = 8
+# endpoint key -> (path, extra params). The key is also the endpoint stored in
+# nba.supplemental_payload_hashes.
+SUPPLEMENTAL_GAME_ENDPOINTS = {
+    "alerts": ("/api/alerts/topNAlerts", {"alertCount": 10}),
+    "storylines": ("/api/alerts/topNPregameStorylines", {"storylineCount": 10}),
+}
+
+
+def _load_http_client_module():
+    # One shared instance per process so pooled connections are shared by every
+    # step in a run (HTTP telemetry stays per step, see begin_http_telemetry).
+    cached = sys.modules.get("nba_http_client")
+    if cached is not None:
+        return cached
+
+    candidates: list[Path] = []
+    if "__file__" in globals():
+        candidates.append(Path(__file__).with_name("http_client.py"))
+    candidates.append(Path("import_nba_data.flow/http_client.py"))
+
+    for path in candidates:
+        if not path.exists():
+            continue
+        spec = importlib.util.spec_from_file_location("nba_http_client", path)
+        if spec is None or spec.loader is None:
+            continue
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["nba_http_client"] = module
+        spec.loader.exec_module(module)
+        return module
+
+    raise FileNotFoundError("Unable to load http_client.py")
+
+
+_http_client = _load_http_client_module()
+http_get = _http_client.http_get
+pooled_client = _http_client.pooled_client
+http_telemetry = _http_client.http_telemetry
+begin_http_telemetry = _http_client.begin_http_telemetry
+ScopedThreadPoolExecutor = _http_client.ScopedThreadPoolExecutor
+
+
+def _load_dimension_cache_module():
+    # One shared instance per process so every step in a run sees the same cache.
+    cached = sys.modules.get("nba_dimension_cache")
+    if cached is not None:
+        return cached
+
+    candidates: list[Path] = []
+    if "__file__" in globals():
+        candidates.append(Path(__file__).with_name("dimension_cache.py"))
+    candidates.append(Path("import_nba_data.flow/dimension_cache.py"))
+
+    for path in candidates:
+        if not path.exists():
+            continue
+        spec = importlib.util.spec_from_file_location("nba_dimension_cache", path)
+        if spec is None or spec.loader is None:
+            continue
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["nba_dimension_cache"] = module
+        spec.loader.exec_module(module)
+        return module
+
+    raise FileNotFoundError("Unable to load dimension_cache.py")
+
+
+_dimension_cache = _load_dimension_cache_module()
+filter_known_ids = _dimension_cache.filter_known_ids
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Helpers
@@ -133,23 +208,13 @@ def stable_hash(payload: dict) -> str:
     return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
 
 
-def request_json(client: httpx.Client, path: str, params: dict | None = None, retries: int = 3, base_url: str = BASE_URL) -> dict:
+def request_json(client: httpx.Client, path: str, params: dict | None = None, retries: int | None = None, base_url: str = BASE_URL) -> dict:
     headers = {"X-NBA-Api-Key": os.environ["NBA_API_KEY"]}
-    url = f"{base_url}{path}"
-
-    for attempt in range(retries):
-        resp = client.get(url, params=params, headers=headers)
-        if resp.status_code in {429, 500, 502, 503, 504}:
-            if attempt == retries - 1:
-                resp.raise_for_status()
-            time.sleep(1 + attempt)
-            continue
-        if resp.status_code == 404:
-            return {}
-        resp.raise_for_status()
-        return resp.json()
-
-    raise RuntimeError(f"Failed to fetch {url}")
+    response = http_get(client, f"{base_url}{path}", params, headers, retries=retries)
+    if response.status_code == 404:
+        return {}
+    response.raise_for_status()
+    return response.json()
 
 
 def upsert(conn: psycopg.Connection, table: str, rows: list[dict], conflict_keys: list[str], update_exclude: list[str] | None = None) -> int:
@@ -329,6 +394,87 @@ def extract_storylines(payload: dict) -> list[dict]:
     return storylines
 
 
+def fetch_stored_payload_hashes(conn: psycopg.Connection, game_ids: list[str]) -> dict[tuple[str, str], str]:
+    if not game_ids:
+        return {}
+
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT endpoint, game_id, payload_hash
+            FROM nba.supplemental_payload_hashes
+            WHERE endpoint = ANY(%s::text[])
+              AND game_id = ANY(%s::text[])
+            """,
+            (list(SUPPLEMENTAL_GAME_ENDPOINTS.keys()), game_ids),
+        )
+        return {(endpoint, game_id): payload_hash for endpoint, game_id, payload_hash in cur.fetchall()}
+
+
+def fetch_game_supplemental_payload(client: httpx.Client, endpoint: str, game_id: str) -> tuple[dict, str]:
+    path, extra_params = SUPPLEMENTAL_GAME_ENDPOINTS[endpoint]
+    payload = request_json(client, path, {"gameId": game_id, **extra_params})
+    return payload, stable_hash(payload)
+
+
+def build_alert_rows(alerts_payload, game_id: str, game_context: dict | None, fetched_at: datetime) -> list[dict]:
+    rows: list[dict] = []
+    for alert in extract_alerts(alerts_payload):
+        alert_text = (
+            alert.get("alertText")
+            or alert.get("alert")
+            or alert.get("text")
+            or alert.get("description")
+        )
+        team_id = parse_int(alert.get("teamId") or alert.get("team_id"))
+        if team_id is None:
+            team_id = infer_team_id_from_text(alert_text, game_context)
+
+        rows.append(
+            {
+                "alert_id": build_alert_id(alert, game_id),
+                "game_id": str(alert.get("gameId") or game_id),
+                "team_id": team_id,
+                "alert_type": alert.get("alertType") or alert.get("type"),
+                "alert_text": alert_text,
+                "alert_priority": parse_int(alert.get("alertPriority") or alert.get("priority") or alert.get("_rank")),
+                "alert_json": Json(alert),
+                "created_at": fetched_at,
+                "updated_at": fetched_at,
+                "fetched_at": fetched_at,
+            }
+        )
+    return rows
+
+
+def build_storyline_rows(story_payload: dict, game_id: str, game_context: dict | None, fetched_at: datetime) -> list[dict]:
+    rows: list[dict] = []
+    for idx, storyline in enumerate(extract_storylines(story_payload), start=1):
+        storyline_text = storyline.get("storylineText") or storyline.get("text") or storyline.get("storyline")
+        if not storyline_text:
+            continue
+
+        team_id = parse_int(storyline.get("teamId") or storyline.get("team_id"))
+        if team_id is None:
+            team_id = infer_team_id_from_text(storyline_text, game_context)
+        if team_id is None:
+            continue
+
+        rows.append(
+            {
+                "game_id": str(game_id),
+                "team_id": team_id,
+                "storyline_text": storyline_text,
+                "storyline_order": parse_int(storyline.get("storylineOrder")) or idx,
+                "storyline_json": Json(storyline),
+                "created_at": fetched_at,
+                "updated_at": fetched_at,
+                "fetched_at": fetched_at,
+            }
+        )
+    return rows
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Main
 # ─────────────────────────────────────────────────────────────────────────────
@@ -344,6 +490,7 @@ def main(
     end_date: str | None = None,
     game_ids: str | None = None,
 ) -> dict:
+    begin_http_telemetry()
     started_at = now_utc()
 
     try:
@@ -371,7 +518,7 @@ def main(
                 )
                 team_ids = [row[0] for row in cur.fetchall()]
 
-            with httpx.Client(timeout=30) as client:
+            with pooled_client(BASE_URL) as client:
                 for team_id in team_ids:
                     payload = request_json(
                         client,
@@ -467,7 +614,7 @@ def main(
         tables.append({"table": "nba.team_roster_coaches", "rows": len(roster_coach_rows)})
 
         # Injuries: keep current snapshot table + additive status history
-        with httpx.Client(timeout=30) as client:
+        with pooled_client(BASE_URL) as client:
             injury_payload = request_json(client, "/api/stats/injury", {"leagueId": league_id})
         injuries = injury_payload.get("players") or []
         injury_rows = []
@@ -492,11 +639,8 @@ def main(
                 }
             )
 
-        with conn.cursor() as cur:
-            cur.execute("SELECT nba_id FROM nba.players")
-            valid_player_ids = {row[0] for row in cur.fetchall()}
-            cur.execute("SELECT team_id FROM nba.teams")
-            valid_team_ids = {row[0] for row in cur.fetchall()}
+        valid_player_ids = filter_known_ids(conn, "players", [row["nba_id"] for row in injury_rows])
+        valid_team_ids = filter_known_ids(conn, "teams", [row["team_id"] for row in injury_rows])
 
         injury_rows = [
             row for row in injury_rows
@@ -568,7 +712,7 @@ def main(
         tables.append({"table": "nba.injuries_history", "rows": len(injury_history_rows)})
 
         # Game data status log (incremental freshness + correction tracking)
-        with httpx.Client(timeout=30) as client:
+        with pooled_client(BASE_URL) as client:
             status_payload = request_json(client, "/api/stats/gamedatastatuslog", {"leagueId": league_id})
 
         status_rows: list[dict] = []
@@ -671,84 +815,19 @@ def main(
                         "away_team_tricode": away_team_tricode,
                     }
 
+        stored_hashes = fetch_stored_payload_hashes(conn, [str(gid) for gid in game_list])
+
         alert_rows: list[dict] = []
         storyline_rows: list[dict] = []
-        with httpx.Client(timeout=30) as client:
-            for game_id_value in game_list:
-                game_context = game_context_by_id.get(str(game_id_value))
-
-                alerts_payload = request_json(
-                    client,
-                    "/api/alerts/topNAlerts",
-                    {"gameId": game_id_value, "alertCount": 10},
-                )
-                for alert in extract_alerts(alerts_payload):
-                    alert_text = (
-                        alert.get("alertText")
-                        or alert.get("alert")
-                        or alert.get("text")
-                        or alert.get("description")
-                    )
-                    team_id = parse_int(alert.get("teamId") or alert.get("team_id"))
-                    if team_id is None:
-                        team_id = infer_team_id_from_text(alert_text, game_context)
-
-                    alert_rows.append(
-                        {
-                            "alert_id": build_alert_id(alert, game_id_value),
-                            "game_id": str(alert.get("gameId") or game_id_value),
-                            "team_id": team_id,
-                            "alert_type": alert.get("alertType") or alert.get("type"),
-                            "alert_text": alert_text,
-                            "alert_priority": parse_int(alert.get("alertPriority") or alert.get("priority") or alert.get("_rank")),
-                            "alert_json": Json(alert),
-                            "created_at": fetched_at,
-                            "updated_at": fetched_at,
-                            "fetched_at": fetched_at,
-                        }
-                    )
-
-                story_payload = request_json(
-                    client,
-                    "/api/alerts/topNPregameStorylines",
-                    {"gameId": game_id_value, "storylineCount": 10},
-                )
-                storylines = extract_storylines(story_payload)
-                for idx, storyline in enumerate(storylines, start=1):
-                    storyline_text = storyline.get("storylineText") or storyline.get("text") or storyline.get("storyline")
-                    if not storyline_text:
-                        continue
-
-                    team_id = parse_int(storyline.get("teamId") or storyline.get("team_id"))
-                    if team_id is None:
-                        team_id = infer_team_id_from_text(storyline_text, game_context)
-                    if team_id is None:
-                        continue
-
-                    storyline_rows.append(
-                        {
-                            "game_id": str(game_id_value),
-                            "team_id": team_id,
-                            "storyline_text": storyline_text,
-                            "storyline_order": parse_int(storyline.get("storylineOrder")) or idx,
-                            "storyline_json": Json(storyline),
-                            "created_at": fetched_at,
-                            "updated_at": fetched_at,
-                            "fetched_at": fetched_at,
-                        }
-                    )
-
-        if not dry_run:
-            upsert(conn, "nba.alerts", alert_rows, ["alert_id"], update_exclude=["created_at"])
-            upsert(conn, "nba.pregame_storylines", storyline_rows, ["game_id", "team_id", "storyline_order"], update_exclude=["created_at"])
-
-        tables.append({"table": "nba.alerts", "rows": len(alert_rows)})
-        tables.append({"table": "nba.pregame_storylines", "rows": len(storyline_rows)})
-
-        # Tracking streams
-        with httpx.Client(timeout=30) as client:
-            start_dt, end_dt = resolve_date_range(mode, days_back, start_date, end_date, season_label)
-            streams_payload = request_json(
+        changed_hash_rows: list[dict] = []
+        unchanged_payloads = {endpoint: 0 for endpoint in SUPPLEMENTAL_GAME_ENDPOINTS}
+        start_dt, end_dt = resolve_date_range(mode, days_back, start_date, end_date, season_label)
+        with pooled_client(BASE_URL) as client, ScopedThreadPoolExecutor(
+            max_workers=SUPPLEMENTAL_GAME_FETCH_CONCURRENCY
+        ) as executor:
+            # Tracking streams are a single date-range request; overlap it with the per-game fan-out.
+            streams_future = executor.submit(
+                request_json,
                 client,
                 "/game_streams",
                 {
@@ -758,6 +837,60 @@ def main(
                 base_url=TRACKING_URL,
             )
 
+            futures = {
+                executor.submit(fetch_game_supplemental_payload, client, endpoint, str(game_id_value)): (
+                    endpoint,
+                    str(game_id_value),
+                )
+                for game_id_value in game_list
+                for endpoint in SUPPLEMENTAL_GAME_ENDPOINTS
+            }
+            for future in as_completed(futures):
+                endpoint, game_id_value = futures[future]
+                payload, payload_hash = future.result()
+                if stored_hashes.get((endpoint, game_id_value)) == payload_hash:
+                    unchanged_payloads[endpoint] += 1
+                    continue
+
+                game_context = game_context_by_id.get(game_id_value)
+                if endpoint == "alerts":
+                    alert_rows.extend(build_alert_rows(payload, game_id_value, game_context, fetched_at))
+                else:
+                    storyline_rows.extend(build_storyline_rows(payload, game_id_value, game_context, fetched_at))
+                changed_hash_rows.append(
+                    {
+                        "endpoint": endpoint,
+                        "game_id": game_id_value,
+                        "payload_hash": payload_hash,
+                        "fetched_at": fetched_at,
+                        "created_at": fetched_at,
+                        "updated_at": fetched_at,
+                    }
+                )
+
+        if not dry_run:
+            upsert(conn, "nba.alerts", alert_rows, ["alert_id"], update_exclude=["created_at"])
+            upsert(conn, "nba.pregame_storylines", storyline_rows, ["game_id", "team_id", "storyline_order"], update_exclude=["created_at"])
+            # Hashes go last so a failed row write is retried on the next run.
+            upsert(
+                conn,
+                "nba.supplemental_payload_hashes",
+                changed_hash_rows,
+                ["endpoint", "game_id"],
+                update_exclude=["created_at"],
+            )
+
+        tables.append({"table": "nba.alerts", "rows": len(alert_rows), "unchanged_games": unchanged_payloads["alerts"]})
+        tables.append(
+            {
+                "table": "nba.pregame_storylines",
+                "rows": len(storyline_rows),
+                "unchanged_games": unchanged_payloads["storylines"],
+            }
+        )
+
+        # Tracking streams
+        streams_payload = streams_future.result()
         streams = streams_payload.get("game_streams") or []
         stream_rows = []
         for stream in streams:
@@ -823,6 +956,7 @@ def main(
             "started_at": started_at.isoformat(),
             "finished_at": now_utc().isoformat(),
             "tables": tables,
+            "telemetry": {"http": http_telemetry()},
             "errors": [],
         }
     except Exception as exc:
@@ -831,6 +965,7 @@ def main(
             "started_at": started_at.isoformat(),
             "finished_at": now_utc().isoformat(),
             "tables": [],
+            "telemetry": {"http": http_telemetry()},
             "errors": [str(exc)],
         }
 
@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, Iterable
+
+import psycopg
+from psycopg.pq import TransactionStatus
+from psycopg.types.json import Jsonb
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - falls back to json.dumps
+    orjson = None
+
+# One bounded pool of Postgres connections per process. In Windmill every step
+# is its own process and borrows a single connection; a local multi-source run
+# (scripts/test-sr-import.py all --source-api nba gleague ...) runs every
+# step of every source in one process, and they share at most SR_DB_POOL_SIZE
+# connections instead of each opening (and tearing down) its own.
+DB_POOL_SIZE_ENV = "SR_DB_POOL_SIZE"
+DEFAULT_DB_POOL_SIZE = 8
+
+_available = threading.Condition()
+_idle: list[psycopg.Connection] = []
+_open = 0
+_stats = {"connects": 0, "reuses": 0, "waits": 0}
+
+
+def get_db_pool_size() -> int:
+    try:
+        return max(1, int(os.environ.get(DB_POOL_SIZE_ENV) or DEFAULT_DB_POOL_SIZE))
+    except ValueError:
+        return DEFAULT_DB_POOL_SIZE
+
+
+def connect_db() -> psycopg.Connection:
+    """Borrow a connection, waiting for one to be released when the pool is full.
+
+    Pair with release_db(conn) in a finally block.
+    """
+    global _open
+    with _available:
+        while True:
+            while _idle:
+                conn = _idle.pop()
+                if not conn.closed:
+                    _stats["reuses"] += 1
+                    return conn
+                _open -= 1
+            if _open < get_db_pool_size():
+                _open += 1
+                break
+            _stats["waits"] += 1
+            _available.wait()
+
+    try:
+        conn = psycopg.connect(os.environ["POSTGRES_URL"])
+    except BaseException:
+        with _available:
+            _open -= 1
+            _available.notify()
+        raise
+    with _available:
+        _stats["connects"] += 1
+    return conn
+
+
+def release_db(conn: psycopg.Connection) -> None:
+    """Return a borrowed connection; uncommitted work is rolled back, broken connections dropped."""
+    global _open
+    if not conn.closed and conn.info.transaction_status != TransactionStatus.IDLE:
+        try:
+            conn.rollback()
+        except psycopg.Error:
+            conn.close()
+    with _available:
+        if conn.closed:
+            _open -= 1
+        else:
+            _idle.append(conn)
+        _available.notify()
+
+
+def close_db_pool() -> None:
+    global _open
+    with _available:
+        idle = list(_idle)
+        _idle.clear()
+        _open -= len(idle)
+    for conn in idle:
+        conn.close()
+
+
+def db_pool_stats() -> dict:
+    with _available:
+        return {"size": get_db_pool_size(), "open": _open, "idle": len(_idle), **_stats}
+
+
+# Upsert rows are plain dicts from the sr_extract builders. JSON columns are
+# passed as Jsonb, serialized once by orjson straight into the parameter
+# buffer (no json.dumps string per value), and rows go to executemany as
+# tuples read off the row dicts instead of being copied into fresh dicts.
+def dumps_json(value: Any) -> bytes | str:
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value)
+
+
+def _dumps_serialized(value: str) -> str:
+    return value
+
+
+def jsonb(value: Any) -> Jsonb | None:
+    """Adapt a JSON column value; strings are taken as already-serialized JSON."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return Jsonb(value, dumps=_dumps_serialized)
+    return Jsonb(value, dumps=dumps_json)
+
+
+@lru_cache(maxsize=256)
+def _layout_columns(layouts: frozenset[tuple[str, ...]]) -> tuple[str, ...]:
+    return tuple(sorted(set().union(*layouts)))
+
+
+def row_columns(rows: Iterable[dict]) -> list[str]:
+    """Sorted union of the rows' keys.
+
+    Rows from one builder share a key layout, so the union is computed once per
+    combination of layouts and cached, not rebuilt key by key on every upsert.
+    """
+    return list(_layout_columns(frozenset(map(tuple, rows))))
+
+
+def row_values(rows: list[dict], columns: list[str], json_columns: Iterable[str] = ()) -> list[tuple]:
+    """executemany parameters for rows in column order; missing keys become NULL."""
+    width = len(columns)
+    if width > 1 and all(len(row) == width for row in rows):
+        values = list(map(itemgetter(*columns), rows))
+    else:
+        values = [tuple(map(row.get, columns)) for row in rows]
+    json_indexes = [index for index, column in enumerate(columns) if column in json_columns]
+    if not json_indexes:
+        return values
+    adapted = []
+    for value in values:
+        value = list(value)
+        for index in json_indexes:
+            value[index] = jsonb(value[index])
+        adapted.append(tuple(value))
+    return adapted
+
+
+# Game-level steps (games, game_stats, pbp) skip games whose feed status has
+# not changed since they last imported them; sr.game_fetch_state holds that
+# status per (source_api, step, game_id).
+GAME_FETCH_STATE_TABLE = "sr.game_fetch_state"
+
+
+def fetch_game_fetch_state(
+    conn: psycopg.Connection,
+    source_api: str,
+    step: str,
+    game_ids: list[str],
+) -> dict[str, str | None]:
+    """Status each game's feed had when this step last imported it."""
+    if not game_ids:
+        return {}
+    with conn.cursor() as cur:
+        cur.execute(
+            f"SELECT game_id, status FROM {GAME_FETCH_STATE_TABLE} "
+            "WHERE source_api = %s AND step = %s AND game_id = ANY(%s::text[])",
+            (source_api, step, game_ids),
+        )
+        return {game_id: status for game_id, status in cur.fetchall()}
+
+
+def record_game_fetch_state(
+    conn: psycopg.Connection,
+    source_api: str,
+    step: str,
+    statuses: dict[str, str | None],
+) -> int:
+    """Upsert the status each game was imported with and commit."""
+    if not statuses:
+        return 0
+    fetched_at = datetime.now(timezone.utc)
+    with conn.cursor() as cur:
+        cur.executemany(
+            f"INSERT INTO {GAME_FETCH_STATE_TABLE} (fetched_at, game_id, source_api, status, step) "
+            "VALUES (%s, %s, %s, %s, %s) "
+            "ON CONFLICT (source_api, step, game_id) DO UPDATE SET "
+            "fetched_at = EXCLUDED.fetched_at, status = EXCLUDED.status",
+            [(fetched_at, game_id, source_api, status, step) for game_id, status in statuses.items()],
+        )
+    conn.commit()
+    return len(statuses)
+
+
+# Slowly changing feeds (injuries, rankings) are polled far more often than they
+# change. Their rows carry row_hash, a hash of the row as extracted; a sync
+# reads the stored hashes, writes only inserted, changed and removed rows and
+# logs each of those to sr.row_changes, so an unchanged poll is one SELECT.
+ROW_HASH_COLUMN = "row_hash"
+ROW_CHANGES_TABLE = "sr.row_changes"
+
+
+def row_hash(row: dict) -> str:
+    payload = json.dumps(row, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def _row_key(values: Iterable[Any]) -> tuple:
+    # Key columns are text in Postgres; compare extracted ints (e.g. week) as text too.
+    return tuple(None if value is None else str(value) for value in values)
+
+
+def fetch_row_hashes(
+    conn: psycopg.Connection,
+    table: str,
+    key_columns: list[str],
+    where: str,
+    params: tuple,
+    live_column: str | None = None,
+) -> dict[tuple, tuple[str | None, bool]]:
+    """(row_hash, live) per key of the stored rows matching where.
+
+    live is False for rows soft-deleted through live_column (e.g. is_active).
+    """
+    live = live_column or "true"
+    sql = f"SELECT {', '.join(key_columns)}, {ROW_HASH_COLUMN}, {live} FROM {table} WHERE {where}"
+    with conn.cursor() as cur:
+        cur.execute(sql, params)
+        return {_row_key(row[:-2]): (row[-2], row[-1] is not False) for row in cur.fetchall()}
+
+
+def diff_snapshot(
+    rows: list[dict],
+    stored: dict[tuple, tuple[str | None, bool]],
+    key_columns: list[str],
+    scope_columns: list[str] | None = None,
+) -> dict:
+    """Split extracted rows into inserts/updates against stored hashes and find deletions.
+
+    Sets row_hash on every row. A live stored row missing from rows is a
+    deletion; with scope_columns only rows sharing a scope (e.g. one poll week)
+    with the new snapshot can be deleted, so older weeks are left alone.
+    """
+    inserts: list[dict] = []
+    updates: list[dict] = []
+    unchanged = 0
+    seen: set[tuple] = set()
+    for row in rows:
+        digest = row_hash({column: value for column, value in row.items() if column != ROW_HASH_COLUMN})
+        row[ROW_HASH_COLUMN] = digest
+        key = _row_key(row.get(column) for column in key_columns)
+        seen.add(key)
+        previous = stored.get(key)
+        if previous is None:
+            inserts.append(row)
+        elif previous[0] != digest:
+            updates.append(row)
+        else:
+            unchanged += 1
+
+    scope_indexes = [key_columns.index(column) for column in scope_columns or []]
+    scopes = {tuple(key[index] for index in scope_indexes) for key in seen}
+    deletes = [
+        key
+        for key, (_, live) in stored.items()
+        if live and key not in seen and (not scope_indexes or tuple(key[index] for index in scope_indexes) in scopes)
+    ]
+    return {"inserts": inserts, "updates": updates, "deletes": deletes, "unchanged": unchanged}
+
+
+def diff_counts(diff: dict) -> dict[str, int]:
+    return {
+        "inserted": len(diff["inserts"]),
+        "updated": len(diff["updates"]),
+        "deleted": len(diff["deletes"]),
+        "unchanged": diff["unchanged"],
+    }
+
+
+def record_row_changes(
+    conn: psycopg.Connection,
+    table: str,
+    source_api: str,
+    diff: dict,
+    stored: dict[tuple, tuple[str | None, bool]],
+    key_columns: list[str],
+) -> int:
+    """Append the diff's inserts, updates and deletions to sr.row_changes (not committed)."""
+    changes = []
+    for change, rows in (("insert", diff["inserts"]), ("update", diff["updates"])):
+        for row in rows:
+            key = _row_key(row.get(column) for column in key_columns)
+            changes.append(
+                {
+                    "table_name": table,
+                    "source_api": source_api,
+                    "change": change,
+                    "row_key": dict(zip(key_columns, key)),
+                    "row_hash": row[ROW_HASH_COLUMN],
+                    "previous_hash": stored[key][0] if key in stored else None,
+                    "row_json": {column: value for column, value in row.items() if column != ROW_HASH_COLUMN},
+                }
+            )
+    for key in diff["deletes"]:
+        changes.append(
+            {
+                "table_name": table,
+                "source_api": source_api,
+                "change": "delete",
+                "row_key": dict(zip(key_columns, key)),
+                "row_hash": None,
+                "previous_hash": stored[key][0],
+                "row_json": None,
+            }
+        )
+    if not changes:
+        return 0
+    columns = row_columns(changes)
+    with conn.cursor() as cur:
+        cur.executemany(
+            f"INSERT INTO {ROW_CHANGES_TABLE} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})",
+            row_values(changes, columns, {"row_key", "row_json"}),
+        )
+    return len(changes)
+
+
+__all__ = [
+    "DB_POOL_SIZE_ENV",
+    "get_db_pool_size",
+    "connect_db",
+    "release_db",
+    "close_db_pool",
+    "db_pool_stats",
+    "dumps_json",
+    "jsonb",
+    "row_columns",
+    "row_values",
+    "GAME_FETCH_STATE_TABLE",
+    "fetch_game_fetch_state",
+    "record_game_fetch_state",
+    "ROW_HASH_COLUMN",
+    "ROW_CHANGES_TABLE",
+    "row_hash",
+    "fetch_row_hashes",
+    "diff_snapshot",
+    "diff_counts",
+    "record_row_changes",
+]
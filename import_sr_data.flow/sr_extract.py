@@ -9,7 +9,7 @@ import os
 import re
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 
 TEAM_STAT_MAP = [
@@ -549,6 +549,91 @@ def normalize_numeric(row: dict, int_fields: set[str], float_fields: set[str]) -
             row[key] = to_float(row.get(key))
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Precompiled stat plans
+# ─────────────────────────────────────────────────────────────────────────────
+#
+# apply_stat_map + normalize_numeric walk the whole mapping and every typed
+# field set for each player/team row. A stat plan does that work once per row
+# builder: the mapping is grouped into columns (output field, source keys in
+# priority order, type) and compiled into a straight-line function that reads
+# each source with one dict lookup and converts inline. Projecting a stats dict
+# gives the same values as apply_stat_map followed by normalize_numeric.
+
+StatPlan = Callable[[dict, dict], dict]
+
+_STAT_CONVERSIONS = {
+    "int": "value if type(value) is int else to_int(value)",
+    "float": "value if type(value) is float else to_float(value)",
+    "int_float": "to_float(to_int(value))",
+    None: "value",
+}
+
+
+def stat_plan_columns(
+    mapping: list[tuple[str, str]],
+    int_fields: set[str],
+    float_fields: set[str],
+    fields: set[str] | None = None,
+) -> list[tuple[str, tuple[str, ...], str | None]]:
+    sources: dict[str, list[str]] = {}
+    for src, dest in mapping:
+        if fields is not None and dest not in fields:
+            continue
+        sources.setdefault(dest, []).append(src)
+
+    columns = []
+    for dest, keys in sources.items():
+        if dest in int_fields and dest in float_fields:
+            kind = "int_float"
+        elif dest in int_fields:
+            kind = "int"
+        elif dest in float_fields:
+            kind = "float"
+        else:
+            kind = None
+        columns.append((dest, tuple(keys), kind))
+    return columns
+
+
+def compile_stat_plan(
+    mapping: list[tuple[str, str]],
+    int_fields: set[str],
+    float_fields: set[str],
+    fields: set[str] | None = None,
+) -> StatPlan:
+    """Build project(stats, row): write the typed mapped columns found in stats into row."""
+    lines = ["def project(stats, row):", "    get = stats.get"]
+    for dest, keys, kind in stat_plan_columns(mapping, int_fields, float_fields, fields):
+        lines.append(f"    value = get({keys[0]!r})")
+        for key in keys[1:]:
+            lines.append("    if value is None:")
+            lines.append(f"        value = get({key!r})")
+        lines.append("    if value is not None:")
+        lines.append(f"        row[{dest!r}] = {_STAT_CONVERSIONS[kind]}")
+    lines.append("    return row")
+
+    namespace: dict[str, Any] = {"to_int": to_int, "to_float": to_float}
+    exec(compile("\n".join(lines), "<sr_extract stat plan>", "exec"), namespace)
+    return namespace["project"]
+
+
+TEAM_GAME_STAT_PLAN = compile_stat_plan(TEAM_STAT_MAP, TEAM_INT_FIELDS, TEAM_FLOAT_FIELDS)
+PLAYER_GAME_STAT_PLAN = compile_stat_plan(PLAYER_STAT_MAP, PLAYER_INT_FIELDS, PLAYER_FLOAT_FIELDS)
+TEAM_SEASON_STAT_PLAN = compile_stat_plan(
+    TEAM_STAT_MAP, SEASON_TEAM_INT_FIELDS, SEASON_TEAM_FLOAT_FIELDS, SEASON_TEAM_STAT_FIELDS
+)
+PLAYER_SEASON_STAT_PLAN = compile_stat_plan(
+    PLAYER_STAT_MAP, SEASON_PLAYER_INT_FIELDS, SEASON_PLAYER_FLOAT_FIELDS, SEASON_PLAYER_STAT_FIELDS
+)
+TEAM_SPLIT_STAT_PLAN = compile_stat_plan(
+    TEAM_STAT_MAP, SEASON_TEAM_INT_FIELDS, SEASON_TEAM_FLOAT_FIELDS, TEAM_SPLIT_STAT_FIELDS
+)
+PLAYER_SPLIT_STAT_PLAN = compile_stat_plan(
+    PLAYER_STAT_MAP, SEASON_PLAYER_INT_FIELDS, SEASON_PLAYER_FLOAT_FIELDS, PLAYER_SPLIT_STAT_FIELDS
+)
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Extraction helpers
 # ─────────────────────────────────────────────────────────────────────────────
@@ -912,9 +997,8 @@ def extract_team_stats(
             "pts": extract_points(team, None, "home" if is_home else "away"),
             "minutes": stats.get("minutes"),
         }
-        row.update(apply_stat_map(stats, TEAM_STAT_MAP))
+        TEAM_GAME_STAT_PLAN(stats, row)
         compute_shooting_fields(row)
-        normalize_numeric(row, TEAM_INT_FIELDS, TEAM_FLOAT_FIELDS)
         rows.append(row)
     return rows
 
@@ -946,15 +1030,32 @@ def extract_player_stats(
             "minutes": minutes,
             "seconds_played": minutes_to_seconds(minutes),
         }
-        row.update(apply_stat_map(stats, PLAYER_STAT_MAP))
+        PLAYER_GAME_STAT_PLAN(stats, row)
         if row.get("is_played") is None:
             row["is_played"] = bool(minutes and minutes != "00:00")
         compute_shooting_fields(row)
-        normalize_numeric(row, PLAYER_INT_FIELDS, PLAYER_FLOAT_FIELDS)
         rows.append(row)
     return rows
 
 
+def extract_game_stats(summary: dict, source_api: str, game_id: str) -> dict[str, list[dict]]:
+    home_team = summary.get("home")
+    away_team = summary.get("away")
+    player_rows = extract_player_stats(summary, source_api, game_id, home_team)
+    player_rows.extend(extract_player_stats(summary, source_api, game_id, away_team))
+    return {
+        "sr.game_team_stats": extract_team_stats(summary, source_api, game_id, home_team, away_team),
+        "sr.game_player_stats": player_rows,
+        "sr.game_period_scores": extract_period_scores(
+            summary,
+            source_api,
+            game_id,
+            (home_team or {}).get("id"),
+            (away_team or {}).get("id"),
+        ),
+    }
+
+
 def extract_players(summary: dict, source_api: str) -> list[dict]:
     players: dict[str, dict] = {}
     for side in ("home", "away"):
@@ -1018,6 +1119,58 @@ def extract_players(summary: dict, source_api: str) -> list[dict]:
     return list(players.values())
 
 
+def extract_pbp_events(pbp_payload: dict, source_api: str, game_id: str) -> list[dict]:
+    pbp_game = pbp_payload.get("game") or pbp_payload
+    rows: list[dict] = []
+    for period in pbp_game.get("periods") or []:
+        number = to_int(period.get("number") or period.get("period"))
+        period_type = period.get("type") or period.get("period_type")
+        for event in period.get("events") or []:
+            event_id = event.get("id")
+            if not event_id:
+                continue
+            clock = event.get("clock_decimal") or event.get("clock")
+            statistics = event.get("statistics") or []
+            primary = statistics[0] if statistics and isinstance(statistics[0], dict) else {}
+            location = event.get("location") or {}
+            attribution = event.get("attribution") or primary.get("team") or {}
+            possession = event.get("possession") or {}
+            qualifiers = [
+                q.get("qualifier") if isinstance(q, dict) else q
+                for q in event.get("qualifiers") or []
+            ]
+            rows.append(
+                {
+                    "source_api": source_api,
+                    "game_id": game_id,
+                    "event_id": event_id,
+                    "period_number": number,
+                    "period_type": period_type,
+                    "sequence": to_int(event.get("sequence")),
+                    "clock": clock,
+                    "clock_seconds": minutes_to_seconds(event.get("clock")),
+                    "wall_clock": event.get("wall_clock"),
+                    "event_type": event.get("event_type"),
+                    "description": event.get("description"),
+                    "sr_team_id": attribution.get("id"),
+                    "sr_id": (primary.get("player") or {}).get("id"),
+                    "possession_sr_team_id": possession.get("id"),
+                    "stat_type": primary.get("type"),
+                    "is_made": primary.get("made"),
+                    "points": to_int(primary.get("points")),
+                    "shot_type": primary.get("shot_type"),
+                    "shot_distance": to_float(primary.get("shot_distance")),
+                    "coord_x": to_int(location.get("coord_x")),
+                    "coord_y": to_int(location.get("coord_y")),
+                    "home_pts": to_int(event.get("home_points")),
+                    "away_pts": to_int(event.get("away_points")),
+                    "qualifiers": [q for q in qualifiers if q] or None,
+                    "updated_at": event.get("updated"),
+                }
+            )
+    return rows
+
+
 def build_standings_row(
     team: dict,
     source_api: str,
@@ -1334,12 +1487,8 @@ def build_team_statistics_row(
         ),
         "statistics_json": stats,
     }
-    mapped = apply_stat_map(stats, TEAM_STAT_MAP)
-    for key in SEASON_TEAM_STAT_FIELDS:
-        if key in mapped:
-            row[key] = mapped[key]
+    TEAM_SEASON_STAT_PLAN(stats, row)
     compute_shooting_fields(row)
-    normalize_numeric(row, SEASON_TEAM_INT_FIELDS, SEASON_TEAM_FLOAT_FIELDS)
     return row
 
 
@@ -1415,12 +1564,8 @@ def build_player_statistics_row(
         "triple_doubles": to_int(extract_stat_value(stats, "triple_doubles", "triple_double")),
         "statistics_json": stats,
     }
-    mapped = apply_stat_map(stats, PLAYER_STAT_MAP)
-    for key in SEASON_PLAYER_STAT_FIELDS:
-        if key in mapped:
-            row[key] = mapped[key]
+    PLAYER_SEASON_STAT_PLAN(stats, row)
     compute_shooting_fields(row)
-    normalize_numeric(row, SEASON_PLAYER_INT_FIELDS, SEASON_PLAYER_FLOAT_FIELDS)
     return row
 
 
@@ -1558,7 +1703,6 @@ def build_team_split_row(
     if not isinstance(stats, dict) or not stats:
         return None
 
-    mapped = apply_stat_map(stats, TEAM_STAT_MAP)
     games_played = to_int(extract_stat_value(stats, "games_played", "games", "gp"))
     if games_played is None and wins is not None and losses is not None:
         games_played = wins + losses
@@ -1574,19 +1718,15 @@ def build_team_split_row(
         "wins": wins,
         "losses": losses,
         "win_pct": win_pct,
-        "pts": to_int(mapped.get("pts")),
+        "pts": None,
         "pts_avg": to_float(extract_stat_value(stats, "points_avg", "points_per_game", "ppg")),
         "reb_avg": to_float(extract_stat_value(stats, "rebounds_avg", "reb_avg")),
         "ast_avg": to_float(extract_stat_value(stats, "assists_avg", "ast_avg")),
         "tov_avg": to_float(extract_stat_value(stats, "turnovers_avg", "tov_avg")),
         "statistics_json": stats,
     }
-    for key in TEAM_SPLIT_STAT_FIELDS:
-        if key in mapped:
-            row[key] = mapped[key]
-
+    TEAM_SPLIT_STAT_PLAN(stats, row)
     compute_shooting_fields(row)
-    normalize_numeric(row, SEASON_TEAM_INT_FIELDS, SEASON_TEAM_FLOAT_FIELDS)
     return row
 
 
@@ -1615,7 +1755,6 @@ def build_player_split_row(
     if not isinstance(averages, dict):
         averages = {}
 
-    mapped = apply_stat_map(stats, PLAYER_STAT_MAP)
     row = {
         "source_api": source_api,
         "season_id": season_id,
@@ -1643,12 +1782,8 @@ def build_player_split_row(
         ),
         "statistics_json": stats,
     }
-    for key in PLAYER_SPLIT_STAT_FIELDS:
-        if key in mapped:
-            row[key] = mapped[key]
-
+    PLAYER_SPLIT_STAT_PLAN(stats, row)
     compute_shooting_fields(row)
-    normalize_numeric(row, SEASON_PLAYER_INT_FIELDS, SEASON_PLAYER_FLOAT_FIELDS)
     return row
 
 
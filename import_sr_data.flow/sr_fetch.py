@@ -1,12 +1,27 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import json
+import multiprocessing
 import os
+import shutil
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from datetime import datetime
-from typing import Any
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable
 
 import httpx
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: rate budget and cache fills stay per process
+    fcntl = None
+
 BASE_URLS = {
     "nba": "https://api.sportradar.com/nba/trial/v8",
     "gleague": "https://api.sportradar.com/nbdl/trial/v8",
@@ -18,6 +33,85 @@ DRAFT_BASE_URL = "https://api.sportradar.com/draft/nba/trial/v1"
 
 NCAA_POLL_NAMES = ["AP", "US"]
 
+# Run-scoped payload cache. Steps of one flow run share ./shared (same_worker),
+# so the first step to fetch a URL writes it under shared/sr_cache/<run id>/ and
+# every later step reads it back instead of spending API quota on it again.
+# Entries expire by endpoint type; summaries/pbp of closed games never change
+# and go to a permanent directory shared by all runs.
+CACHE_DIR_ENV = "SR_FETCH_CACHE_DIR"
+CACHE_RUN_ID_ENVS = ("SR_FETCH_RUN_ID", "WM_ROOT_FLOW_JOB_ID", "WM_FLOW_JOB_ID")
+DEFAULT_CACHE_DIR = "./shared/sr_cache"
+CACHE_RUN_RETENTION_SECONDS = 2 * 24 * 3600
+# (url suffix, ttl seconds); first match wins, None = default TTL.
+CACHE_TTL_SECONDS = [
+    ("/seasons.json", 24 * 3600),
+    ("/hierarchy.json", 24 * 3600),
+    ("/teams.json", 24 * 3600),
+    ("/competitions.json", 24 * 3600),
+    ("/profile.json", 6 * 3600),
+    ("/schedule.json", 15 * 60),
+    ("/summary.json", 5 * 60),
+    ("/pbp.json", 5 * 60),
+    ("/injuries.json", 5 * 60),
+    (None, 30 * 60),
+]
+CACHE_PERMANENT_SUFFIXES = ("/summary.json", "/pbp.json")
+CACHE_FINAL_STATUSES = {"closed"}
+# Parallel flow branches miss on the same URLs (schedule, seasons, summaries)
+# at the same time. A miss takes a lock file next to the run cache entry, so
+# one step fetches and the others wait for its entry instead of each spending
+# quota on the same request.
+CACHE_FILL_POLL_SECONDS = 0.05
+
+# Per-game steps skip games whose feed was already imported in the same status
+# (sr.game_fetch_state). These statuses do not change content without a status
+# transition; "complete" is left out because stats are still corrected until
+# SportRadar closes the game.
+GAME_SETTLED_STATUSES = {
+    "closed",
+    "cancelled",
+    "postponed",
+    "unnecessary",
+    "scheduled",
+    "created",
+    "time-tbd",
+    "if-necessary",
+}
+
+# Fetch, rate and cache counters are kept per step as well as per process. A
+# local multi-source run executes every source's steps in one process, so a
+# step's result reports only its own traffic: each step's main calls
+# begin_fetch_stats(), which installs a fresh collector in its context (event
+# loop tasks and to_thread calls inherit it), and fetch_stats() reads it back.
+CACHE_STAT_KEYS = ("hits", "permanent_hits", "misses", "writes", "expired")
+_stats_lock = threading.Lock()
+_cache_stats = dict.fromkeys(CACHE_STAT_KEYS, 0)
+_step_stats: ContextVar[dict | None] = ContextVar("sr_fetch_step_stats", default=None)
+
+# SportRadar limits each API key by requests per second (trial keys: 1 QPS),
+# not by concurrency. Every network request (cache hits are free) takes a token
+# from its key's bucket; a 429 pauses the whole bucket so all in-flight tasks
+# back off together instead of each retrying on its own schedule.
+# With a cache directory the bucket lives in <cache>/rate/<key hash>, so steps
+# running in parallel branches (separate processes on the flow's worker) draw
+# from one budget too. Within a process, requests are split into lanes by
+# source API: when several sources wait on one key, a token goes to the lane
+# that has been served least, so a backfill of one league can't starve the
+# others in a multi-source run.
+QPS_ENV = "SR_FETCH_QPS"
+DEFAULT_QPS = 1.0
+QPS_BURST = 1
+THROTTLE_DEFAULT_PAUSE_SECONDS = 2.0
+THROTTLE_MAX_PAUSE_SECONDS = 60.0
+
+# Parsing and row building for season-scale backfills is CPU-bound and ran on
+# the event loop thread. With SR_EXTRACT_WORKERS > 0 (or "auto", one per core)
+# steps fetch raw response bytes and ExtractPool parses and extracts them in
+# worker processes, so the loop keeps fetching and extraction scales with
+# cores. 0 (default) extracts inline. Parsed payloads are never sent to a
+# worker: pickling one costs several times more than extracting it.
+EXTRACT_WORKERS_ENV = "SR_EXTRACT_WORKERS"
+
 
 class FetchError(ValueError):
     pass
@@ -29,6 +123,16 @@ def get_base_url(source_api: str) -> str:
     return BASE_URLS[source_api]
 
 
+def source_for_url(url: str) -> str | None:
+    """source_api a request URL belongs to (its rate lane); draft URLs count as nba."""
+    for source_api, base_url in BASE_URLS.items():
+        if url.startswith(base_url):
+            return source_api
+    if url.startswith(DRAFT_BASE_URL):
+        return "nba"
+    return None
+
+
 def get_api_key() -> str:
     api_key = os.environ.get("SPORTRADAR_API_KEY")
     if not api_key:
@@ -80,21 +184,494 @@ def build_schedule_url(
     return schedule_url, schedule_suffix
 
 
-async def fetch_json(client: httpx.AsyncClient, url: str, params: dict, max_retries: int = 4) -> dict:
+def _new_rate_counters() -> dict:
+    return {
+        "requests": 0,
+        "throttle_events": 0,
+        "throttled_seconds": 0.0,
+        "waited_seconds": 0.0,
+        "lanes": {},
+        "first_request_at": None,
+        "last_request_at": None,
+    }
+
+
+def begin_fetch_stats() -> None:
+    """Start counting fetch_stats() for the calling step (its thread and the tasks it starts)."""
+    _step_stats.set({"cache": dict.fromkeys(CACHE_STAT_KEYS, 0), "rate": {}})
+
+
+def _count_cache(key: str) -> None:
+    step = _step_stats.get()
+    with _stats_lock:
+        _cache_stats[key] += 1
+        if step is not None:
+            step["cache"][key] += 1
+
+
+class RateGovernor:
+    """Token bucket shared by every task (and event loop) fetching with one API key."""
+
+    def __init__(self, qps: float, burst: int = QPS_BURST, shared_path: Path | None = None) -> None:
+        self.qps = qps
+        self.burst = max(1, burst)
+        self.shared_path = shared_path if fcntl is not None else None
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._totals = _new_rate_counters()
+        self._lane_waiting: dict[str, int] = {}
+        self._lane_served: dict[str, int] = {}
+
+    def _counters(self) -> list[dict]:
+        """Process totals plus the calling step's counters for this key; call under self._lock."""
+        step = _step_stats.get()
+        if step is None:
+            return [self._totals]
+        return [self._totals, step["rate"].setdefault(self, _new_rate_counters())]
+
+    def _lane_behind(self, lane: str) -> bool:
+        served = self._lane_served.get(lane, 0)
+        return any(
+            self._lane_served.get(other, 0) < served
+            for other, waiting in self._lane_waiting.items()
+            if waiting and other != lane
+        )
+
+    def _reserve(self, lane: str | None = None) -> float:
+        """Take a token and return 0, or return how long to wait before trying again."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+            if lane is not None and self._lane_behind(lane):
+                # Leave the next token to a lane that has been served less.
+                return 1 / self.qps
+            if self.shared_path is not None:
+                wait = self._update_shared(self._take_shared)
+                if wait > 0:
+                    return wait
+            else:
+                self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.qps)
+                self._refilled_at = now
+                if self._tokens < 1:
+                    return (1 - self._tokens) / self.qps
+                self._tokens -= 1
+            if lane is not None:
+                self._lane_served[lane] = self._lane_served.get(lane, 0) + 1
+            for counters in self._counters():
+                counters["requests"] += 1
+                if lane is not None:
+                    counters["lanes"][lane] = counters["lanes"].get(lane, 0) + 1
+                if counters["first_request_at"] is None:
+                    counters["first_request_at"] = now
+                counters["last_request_at"] = now
+            return 0.0
+
+    def _take_shared(self, next_at: float, now: float) -> tuple[float, float]:
+        # GCRA: next_at is when the key's next request is due; burst allows running ahead of it.
+        interval = 1 / self.qps
+        next_at = max(next_at, now)
+        wait = next_at - now - (self.burst - 1) * interval
+        if wait > 0:
+            return next_at, wait
+        return next_at + interval, 0.0
+
+    def _update_shared(self, update: Callable[[float, float], tuple[float, float]]) -> float:
+        """Apply update(next_at, now) to the shared bucket under an exclusive file lock."""
+        try:
+            self.shared_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.shared_path, "a+") as handle:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+                handle.seek(0)
+                try:
+                    next_at = float(handle.read() or 0)
+                except ValueError:
+                    next_at = 0.0
+                next_at, result = update(next_at, time.time())
+                handle.seek(0)
+                handle.truncate()
+                handle.write(repr(next_at))
+            return result
+        except OSError:
+            # Unwritable cache directory: fall back to this process's own bucket.
+            self.shared_path = None
+            return 0.0
+
+    async def acquire(self, lane: str | None = None) -> None:
+        if lane is not None:
+            with self._lock:
+                if not self._lane_waiting.get(lane):
+                    # A lane that was idle rejoins level with the least-served waiting
+                    # lane instead of claiming every token until it catches up.
+                    active = [
+                        self._lane_served.get(other, 0)
+                        for other, waiting in self._lane_waiting.items()
+                        if waiting and other != lane
+                    ]
+                    if active:
+                        self._lane_served[lane] = max(self._lane_served.get(lane, 0), min(active))
+                self._lane_waiting[lane] = self._lane_waiting.get(lane, 0) + 1
+        try:
+            while True:
+                wait = self._reserve(lane)
+                if wait <= 0:
+                    return
+                with self._lock:
+                    for counters in self._counters():
+                        counters["waited_seconds"] += wait
+                await asyncio.sleep(wait)
+        finally:
+            if lane is not None:
+                with self._lock:
+                    self._lane_waiting[lane] -= 1
+
+    def throttle(self, seconds: float) -> None:
+        """Pause the bucket after a 429; overlapping 429s extend one pause rather than stacking."""
+        seconds = min(max(seconds, 0.0), THROTTLE_MAX_PAUSE_SECONDS)
+        with self._lock:
+            now = time.monotonic()
+            until = now + seconds
+            counters = self._counters()
+            if until > self._paused_until:
+                for entry in counters:
+                    entry["throttled_seconds"] += until - max(now, self._paused_until)
+                self._paused_until = until
+            self._tokens = 0.0
+            self._refilled_at = until
+            for entry in counters:
+                entry["throttle_events"] += 1
+            if self.shared_path is not None:
+                self._update_shared(lambda next_at, now: (max(next_at, now + seconds), 0.0))
+
+    def stats(self, counters: dict | None = None) -> dict:
+        """Process totals for this key, or the given step's counters (see fetch_stats)."""
+        with self._lock:
+            counters = counters or self._totals
+            first, last = counters["first_request_at"], counters["last_request_at"]
+            span = last - first if first is not None and last is not None else 0.0
+            return {
+                "qps_limit": self.qps,
+                "requests": counters["requests"],
+                "achieved_qps": round(counters["requests"] / span, 3) if span > 0 else None,
+                "throttle_events": counters["throttle_events"],
+                "throttled_seconds": round(counters["throttled_seconds"], 2),
+                "waited_seconds": round(counters["waited_seconds"], 2),
+                "lanes": dict(counters["lanes"]) or None,
+            }
+
+
+_governors: dict[str, RateGovernor] = {}
+_governors_lock = threading.Lock()
+
+
+def get_qps() -> float:
+    try:
+        qps = float(os.environ.get(QPS_ENV) or DEFAULT_QPS)
+    except ValueError as exc:
+        raise FetchError(f"{QPS_ENV} must be a number") from exc
+    if qps <= 0:
+        raise FetchError(f"{QPS_ENV} must be positive")
+    return qps
+
+
+def get_rate_governor(params: dict) -> RateGovernor:
+    key = hashlib.sha1(str((params or {}).get("api_key") or "").encode()).hexdigest()
+    with _governors_lock:
+        governor = _governors.get(key)
+        if governor is None:
+            root = get_cache_root()
+            governor = RateGovernor(get_qps(), shared_path=root / "rate" / key if root is not None else None)
+            _governors[key] = governor
+        return governor
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def fetch_stats() -> dict:
+    """Rate and cache counters for a step's result; one API key is the norm.
+
+    Inside a step (after begin_fetch_stats) only that step's own requests and
+    cache lookups are counted; outside one, the process totals are returned.
+    """
+    step = _step_stats.get()
+    if step is None:
+        with _governors_lock:
+            rate = [governor.stats() for governor in _governors.values()]
+        cache = cache_stats()
+    else:
+        rate = [governor.stats(counters) for governor, counters in list(step["rate"].items())]
+        with _stats_lock:
+            cache = dict(step["cache"])
+    return {"rate": (rate[0] if len(rate) == 1 else rate) or None, "cache": cache}
+
+
+def get_cache_root() -> Path | None:
+    cache_dir = os.environ.get(CACHE_DIR_ENV, DEFAULT_CACHE_DIR)
+    if not cache_dir:
+        return None
+    return Path(cache_dir)
+
+
+def get_cache_run_id() -> str:
+    for name in CACHE_RUN_ID_ENVS:
+        value = os.environ.get(name)
+        if value:
+            return value
+    return "adhoc"
+
+
+def cache_key(url: str, params: dict) -> str:
+    # The API key is left out so rotating it doesn't invalidate cached payloads.
+    key_params = sorted((k, str(v)) for k, v in (params or {}).items() if k != "api_key")
+    return hashlib.sha1(json.dumps([url, key_params]).encode()).hexdigest()
+
+
+def cache_ttl_seconds(url: str) -> int:
+    path = url.split("?", 1)[0]
+    for suffix, ttl in CACHE_TTL_SECONDS:
+        if suffix is None or path.endswith(suffix):
+            return ttl
+    return 0
+
+
+def payload_status(payload: dict) -> str | None:
+    """Game status of a schedule entry or summary/pbp payload, across feed shapes."""
+    if not isinstance(payload, dict):
+        return None
+    return (
+        payload.get("status")
+        or (payload.get("sport_event_status") or {}).get("status")
+        or (payload.get("game") or {}).get("status")
+    )
+
+
+def payload_is_final(payload: dict) -> bool:
+    return payload_status(payload) in CACHE_FINAL_STATUSES
+
+
+def game_needs_fetch(schedule_status: str | None, stored_status: str | None) -> bool:
+    """Whether a game's per-game feed must be refetched given its last imported status.
+
+    New games (nothing stored), games whose status moved since the last import
+    and games still in a changing status (in progress, complete but not yet
+    closed, unknown) are fetched; everything else is already up to date.
+    """
+    if stored_status is None or schedule_status is None:
+        return True
+    if schedule_status != stored_status:
+        return True
+    return schedule_status not in GAME_SETTLED_STATUSES
+
+
+def prune_cache_runs(root: Path, keep: str) -> None:
+    """Remove run directories older than CACHE_RUN_RETENTION_SECONDS."""
+    runs_dir = root / "runs"
+    if not runs_dir.exists():
+        return
+    cutoff = time.time() - CACHE_RUN_RETENTION_SECONDS
+    for run_dir in runs_dir.iterdir():
+        if run_dir.name == keep or not run_dir.is_dir():
+            continue
+        try:
+            if run_dir.stat().st_mtime < cutoff:
+                shutil.rmtree(run_dir, ignore_errors=True)
+        except OSError:
+            continue
+
+
+def _cache_paths(url: str, params: dict) -> tuple[Path, Path] | None:
+    root = get_cache_root()
+    if root is None:
+        return None
+    key = cache_key(url, params)
+    run_id = get_cache_run_id()
+    run_dir = root / "runs" / run_id
+    if not run_dir.exists():
+        run_dir.mkdir(parents=True, exist_ok=True)
+        prune_cache_runs(root, run_id)
+    return run_dir / f"{key}.json", root / "permanent" / f"{key}.json"
+
+
+def _read_cache_file(path: Path, ttl: int | None) -> bytes | None:
+    try:
+        if ttl is not None and time.time() - path.stat().st_mtime > ttl:
+            _count_cache("expired")
+            return None
+        return path.read_bytes()
+    except OSError:
+        return None
+
+
+def _write_cache_file(path: Path, content: bytes) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, path)
+        _count_cache("writes")
+    except OSError:
+        # The cache is an optimization; a read-only or full disk just means refetching.
+        pass
+
+
+def read_cached_content(url: str, params: dict) -> bytes | None:
+    paths = _cache_paths(url, params)
+    if paths is None:
+        return None
+    run_path, permanent_path = paths
+    if url.endswith(CACHE_PERMANENT_SUFFIXES):
+        content = _read_cache_file(permanent_path, None)
+        if content is not None:
+            _count_cache("permanent_hits")
+            return content
+    content = _read_cache_file(run_path, cache_ttl_seconds(url))
+    if content is not None:
+        _count_cache("hits")
+    return content
+
+
+def read_cached_payload(url: str, params: dict) -> dict | None:
+    content = read_cached_content(url, params)
+    if content is None:
+        return None
+    try:
+        return json.loads(content)
+    except ValueError:
+        return None
+
+
+def write_cached_content(url: str, params: dict, content: bytes, final: bool = False) -> None:
+    paths = _cache_paths(url, params)
+    if paths is None:
+        return
+    run_path, permanent_path = paths
+    if url.endswith(CACHE_PERMANENT_SUFFIXES) and final:
+        _write_cache_file(permanent_path, content)
+    else:
+        _write_cache_file(run_path, content)
+
+
+def write_cached_payload(url: str, params: dict, payload: dict) -> None:
+    write_cached_content(url, params, json.dumps(payload).encode(), payload_is_final(payload))
+
+
+def cache_final_content(url: str, params: dict, content: bytes, status: str | None) -> None:
+    """Promote raw content fetched with fetch_bytes to the permanent cache once its status is known."""
+    if status not in CACHE_FINAL_STATUSES or not url.endswith(CACHE_PERMANENT_SUFFIXES):
+        return
+    paths = _cache_paths(url, params)
+    if paths is not None and not paths[1].exists():
+        write_cached_content(url, params, content, final=True)
+
+
+@asynccontextmanager
+async def cache_fill_lock(url: str, params: dict) -> AsyncIterator[bool]:
+    """Hold url's cache fill lock; yields whether another holder had to be waited for."""
+    paths = _cache_paths(url, params)
+    if paths is None or fcntl is None:
+        yield False
+        return
+    try:
+        handle = open(paths[0].with_suffix(".lock"), "a")
+    except OSError:
+        yield False
+        return
+    waited = False
+    try:
+        while True:
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                waited = True
+                await asyncio.sleep(CACHE_FILL_POLL_SECONDS)
+        yield waited
+    finally:
+        # Closing the handle releases the lock, also when the fetch failed.
+        handle.close()
+
+
+def cache_stats() -> dict[str, int]:
+    """Process-wide cache counters (fetch_stats()["cache"] has the step's own)."""
+    with _stats_lock:
+        return dict(_cache_stats)
+
+
+async def fetch_json(
+    client: httpx.AsyncClient,
+    url: str,
+    params: dict,
+    max_retries: int = 4,
+    use_cache: bool = True,
+) -> dict:
+    if use_cache and get_cache_root() is not None:
+        cached = read_cached_payload(url, params)
+        if cached is not None:
+            return cached
+        async with cache_fill_lock(url, params) as waited:
+            # Another step fetched it while this one waited for the lock.
+            cached = read_cached_payload(url, params) if waited else None
+            if cached is not None:
+                return cached
+            _count_cache("misses")
+            content = await fetch_bytes(client, url, params, max_retries, use_cache=False)
+            payload = json.loads(content)
+            write_cached_content(url, params, content, payload_is_final(payload))
+            return payload
+    return json.loads(await fetch_bytes(client, url, params, max_retries, use_cache=False))
+
+
+async def fetch_bytes(
+    client: httpx.AsyncClient,
+    url: str,
+    params: dict,
+    max_retries: int = 4,
+    use_cache: bool = True,
+) -> bytes:
+    """Raw response body, for callers that parse it off the event loop (ExtractPool).
+
+    Cached like fetch_json, but the payload status is unknown until parsed, so
+    misses go to the run cache; cache_final_content promotes closed games.
+    """
+    if use_cache and get_cache_root() is not None:
+        cached = read_cached_content(url, params)
+        if cached is not None:
+            return cached
+        async with cache_fill_lock(url, params) as waited:
+            cached = read_cached_content(url, params) if waited else None
+            if cached is not None:
+                return cached
+            _count_cache("misses")
+            content = await fetch_bytes(client, url, params, max_retries, use_cache=False)
+            write_cached_content(url, params, content)
+            return content
+
+    governor = get_rate_governor(params)
     last_error: Exception | None = None
     for attempt in range(max_retries):
         try:
+            await governor.acquire(source_for_url(url))
             response = await client.get(url, params=params, timeout=30.0)
             if response.status_code == 429:
-                retry_after = response.headers.get("Retry-After")
-                wait = float(retry_after) if retry_after else 2 ** attempt
-                await asyncio.sleep(wait)
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if retry_after is None:
+                    retry_after = max(THROTTLE_DEFAULT_PAUSE_SECONDS, 2 ** attempt)
+                governor.throttle(retry_after)
                 continue
             if response.status_code >= 500:
                 await asyncio.sleep(2 ** attempt)
                 continue
             response.raise_for_status()
-            return response.json()
+            return response.content
         except (httpx.RequestError, httpx.HTTPStatusError) as exc:
             last_error = exc
             await asyncio.sleep(2 ** attempt)
@@ -121,16 +698,198 @@ async def fetch_many(
     return results
 
 
+async def iter_fetch_many(
+    client: httpx.AsyncClient,
+    items: list[tuple[str, str]],
+    params: dict,
+    max_concurrency: int,
+    raw: bool = False,
+) -> AsyncIterator[tuple[str, Any]]:
+    """Yield (key, payload) in completion order with at most max_concurrency requests in flight.
+
+    Unlike fetch_many, payloads are never collected: the caller can extract and
+    write each one while the remaining fetches continue, and only in-flight
+    payloads are held. The first failed fetch cancels the rest and is raised.
+    With raw=True the unparsed response bytes are yielded (see ExtractPool).
+    """
+    fetch = fetch_bytes if raw else fetch_json
+    pending_items = iter(items)
+    in_flight: dict[asyncio.Task, str] = {}
+
+    def schedule_next() -> bool:
+        item = next(pending_items, None)
+        if item is None:
+            return False
+        key, url = item
+        in_flight[asyncio.create_task(fetch(client, url, params))] = key
+        return True
+
+    try:
+        while len(in_flight) < max(1, max_concurrency) and schedule_next():
+            pass
+        while in_flight:
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                key = in_flight.pop(task)
+                payload = task.result()
+                schedule_next()
+                yield key, payload
+    finally:
+        for task in in_flight:
+            task.cancel()
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
+
+
+def get_extract_workers() -> int:
+    value = os.environ.get(EXTRACT_WORKERS_ENV, "").strip().lower()
+    if value == "auto":
+        return os.cpu_count() or 1
+    try:
+        return max(0, int(value)) if value else 0
+    except ValueError:
+        return 0
+
+
+def pack_rows(rows: list[dict]) -> tuple[tuple[str, ...], list[tuple]]:
+    """(columns, value tuples): rows without a dict per row, so they pickle compactly."""
+    columns = tuple(sorted({key for row in rows for key in row}))
+    return columns, [tuple(row.get(column) for column in columns) for row in rows]
+
+
+def unpack_rows(packed: tuple[tuple[str, ...], list[tuple]]) -> list[dict]:
+    columns, values = packed
+    return [dict(zip(columns, value)) for value in values]
+
+
+def _pack_result(result: Any) -> tuple[str, Any]:
+    if isinstance(result, dict):
+        return "dict", {key: pack_rows(rows) for key, rows in result.items()}
+    if isinstance(result, tuple):
+        return "tuple", tuple(pack_rows(rows) for rows in result)
+    return "rows", pack_rows(result)
+
+
+def _unpack_result(packed: tuple[str, Any]) -> Any:
+    shape, value = packed
+    if shape == "dict":
+        return {key: unpack_rows(rows) for key, rows in value.items()}
+    if shape == "tuple":
+        return tuple(unpack_rows(rows) for rows in value)
+    return unpack_rows(value)
+
+
+def extract_content(extractor: Callable, content: bytes, args: tuple) -> tuple[str | None, Any]:
+    """Parse raw payload bytes and run extractor(payload, *args); returns (payload status, rows)."""
+    payload = json.loads(content)
+    return payload_status(payload), extractor(payload, *args)
+
+
+def _extract_packed(extractor: Callable, content: bytes, args: tuple) -> tuple[str | None, Any]:
+    status, result = extract_content(extractor, content, args)
+    return status, _pack_result(result)
+
+
+def _extract_mp_context():
+    # Never fork the step itself: it may already run threads (the sr_db pool,
+    # and in scripts/test-sr-import.py every other step), and a forked child can
+    # deadlock on a lock another thread held. forkserver forks workers from a
+    # clean single-threaded server; where it is missing, spawn them. Either way
+    # extractors are sr_extract functions, pickled by reference.
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+class ExtractPool:
+    """Run sr_extract extractors on raw payload bytes, in worker processes when enabled.
+
+    extractor must be a module-level function (pickled by reference) returning a
+    list of row dicts, a tuple of lists or a dict of lists. Workers parse the
+    JSON, extract and send rows back packed; with no workers (the default) the
+    same work runs inline on the event loop, as before.
+    """
+
+    def __init__(self, workers: int | None = None) -> None:
+        self.workers = get_extract_workers() if workers is None else max(0, workers)
+        self.payloads = 0
+        self.payload_bytes = 0
+        self._executor: ProcessPoolExecutor | None = None
+        if self.workers:
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=_extract_mp_context())
+            self._executor.submit(int).result()
+
+    def submit(self, extractor: Callable, content: bytes, *args: Any) -> asyncio.Future:
+        """Schedule extraction; the future resolves to (payload status, rows)."""
+        self.payloads += 1
+        self.payload_bytes += len(content)
+        if self._executor is None:
+            future = asyncio.get_running_loop().create_future()
+            try:
+                future.set_result(extract_content(extractor, content, args))
+            except Exception as exc:
+                future.set_exception(exc)
+            return future
+        return asyncio.ensure_future(self._run(extractor, content, args))
+
+    async def _run(self, extractor: Callable, content: bytes, args: tuple) -> tuple[str | None, Any]:
+        loop = asyncio.get_running_loop()
+        status, packed = await loop.run_in_executor(self._executor, _extract_packed, extractor, content, args)
+        return status, _unpack_result(packed)
+
+    def stats(self) -> dict:
+        return {"workers": self.workers, "payloads": self.payloads, "payload_bytes": self.payload_bytes}
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def __enter__(self) -> ExtractPool:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
 __all__ = [
     "BASE_URLS",
     "DRAFT_BASE_URL",
     "NCAA_POLL_NAMES",
     "FetchError",
     "get_base_url",
+    "source_for_url",
     "get_api_key",
     "get_seasons_url",
     "get_teams_url",
     "build_schedule_url",
+    "get_cache_root",
+    "get_cache_run_id",
+    "cache_key",
+    "cache_ttl_seconds",
+    "payload_status",
+    "payload_is_final",
+    "GAME_SETTLED_STATUSES",
+    "game_needs_fetch",
+    "read_cached_content",
+    "read_cached_payload",
+    "write_cached_content",
+    "write_cached_payload",
+    "cache_final_content",
+    "cache_fill_lock",
+    "begin_fetch_stats",
+    "cache_stats",
+    "RateGovernor",
+    "get_qps",
+    "get_rate_governor",
+    "fetch_stats",
     "fetch_json",
+    "fetch_bytes",
     "fetch_many",
+    "iter_fetch_many",
+    "get_extract_workers",
+    "pack_rows",
+    "unpack_rows",
+    "extract_content",
+    "ExtractPool",
 ]
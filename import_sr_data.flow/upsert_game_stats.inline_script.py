@@ -6,41 +6,59 @@
 Upsert sr.game_team_stats, sr.game_player_stats, sr.game_period_scores from SportRadar API.
 """
 import asyncio
-import os
 from datetime import datetime
 
 import httpx
-import psycopg
 
+from sr_db import (
+    connect_db,
+    fetch_game_fetch_state,
+    record_game_fetch_state,
+    release_db,
+    row_columns,
+    row_values,
+)
 from sr_extract import (
     extract_game_id,
-    extract_period_scores,
-    extract_player_stats,
+    extract_game_stats,
     extract_schedule_games,
-    extract_team_stats,
 )
 from sr_fetch import (
+    ExtractPool,
     FetchError,
+    begin_fetch_stats,
     build_schedule_url,
+    cache_final_content,
     fetch_json,
-    fetch_many,
+    fetch_stats,
+    game_needs_fetch,
     get_api_key,
     get_base_url,
+    iter_fetch_many,
+    payload_status,
 )
 
 
-def normalize_rows(rows: list[dict]) -> tuple[list[dict], list[str]]:
-    if not rows:
-        return [], []
-    columns = sorted({key for row in rows for key in row.keys()})
-    normalized = [{col: row.get(col) for col in columns} for row in rows]
-    return normalized, columns
+# Summaries are extracted as they arrive and written every WRITE_BATCH_GAMES
+# games, so a season backfill never holds more than one batch (plus the
+# requests in flight) in memory.
+WRITE_BATCH_GAMES = 50
+# Only fetch summaries of games that are new, live or changed status since this
+# step last imported them (sr.game_fetch_state); dry runs always fetch all.
+SKIP_EXISTING_GAMES = True
+FETCH_STATE_STEP = "game_stats"
+
+GAME_STATS_TABLES = {
+    "sr.game_team_stats": ["source_api", "game_id", "sr_team_id"],
+    "sr.game_player_stats": ["source_api", "game_id", "sr_id"],
+    "sr.game_period_scores": ["source_api", "game_id", "sr_team_id", "period_number", "period_type"],
+}
 
 
 def upsert(conn, table: str, rows: list[dict], conflict_keys: list[str]) -> int:
     if not rows:
         return 0
-    rows, columns = normalize_rows(rows)
+    columns = row_columns(rows)
     update_cols = [c for c in columns if c not in conflict_keys]
 
     placeholders = ", ".join(["%s"] * len(columns))
@@ -60,7 +78,7 @@ def upsert(conn, table: str, rows: list[dict], conflict_keys: list[str]) -> int:
         )
 
     with conn.cursor() as cur:
-        cur.executemany(sql, [tuple(row[col] for col in columns) for row in rows])
+        cur.executemany(sql, row_values(rows, columns))
     conn.commit()
     return len(rows)
 
@@ -121,6 +139,25 @@ def prep_period_scores(rows: list[dict]) -> list[dict]:
     ]
 
 
+def prep_game_stats_batch(batch: dict[str, list[dict]]) -> dict[str, list[dict]]:
+    return {
+        "sr.game_team_stats": prep_team_stats(batch["sr.game_team_stats"]),
+        "sr.game_player_stats": prep_player_stats(batch["sr.game_player_stats"]),
+        "sr.game_period_scores": prep_period_scores(batch["sr.game_period_scores"]),
+    }
+
+
+def write_game_stats_batch(
+    conn,
+    batch: dict[str, list[dict]],
+    source_api: str,
+    statuses: dict[str, str | None],
+) -> dict[str, int]:
+    written = {table: upsert(conn, table, batch[table], conflict_keys) for table, conflict_keys in GAME_STATS_TABLES.items()}
+    record_game_fetch_state(conn, source_api, FETCH_STATE_STEP, statuses)
+    return written
+
+
 def main(
     dry_run: bool = False,
     source_api: str = "nba",
@@ -132,86 +169,106 @@ def main(
     locale: str = "en",
     max_concurrency: int = 6,
 ) -> dict:
+    begin_fetch_stats()
     started_at = datetime.now().isoformat()
     errors: list[str] = []
-    tables: list[dict] = []
-
-    team_rows: list[dict] = []
-    player_rows: list[dict] = []
-    period_rows: list[dict] = []
+    counts = {table: 0 for table in GAME_STATS_TABLES}
+    write_failed = False
+    conn = None
+    skip_existing = {"enabled": SKIP_EXISTING_GAMES and not dry_run, "scheduled": 0, "skipped": 0}
+    # SR_EXTRACT_WORKERS > 0 parses and extracts summaries in worker processes.
+    extract_pool = ExtractPool()
 
     try:
         base_url = get_base_url(source_api)
         api_key = get_api_key()
         schedule_url, _ = build_schedule_url(base_url, locale, mode, date, season_year, season_type)
         params = {"api_key": api_key}
+        if not dry_run:
+            conn = connect_db()
+
+        async def flush(batch: dict[str, list[dict]], statuses: dict[str, str | None]) -> None:
+            nonlocal write_failed
+            batch = prep_game_stats_batch(batch)
+            if conn is None:
+                for table, rows in batch.items():
+                    counts[table] += len(rows)
+                return
+            try:
+                # Off the event loop so the remaining summary fetches keep going.
+                written = await asyncio.to_thread(write_game_stats_batch, conn, batch, source_api, statuses)
+            except Exception:
+                write_failed = True
+                raise
+            for table, count in written.items():
+                counts[table] += count
 
-        async def run_fetch() -> dict[str, dict]:
+        async def run_fetch() -> None:
             async with httpx.AsyncClient() as client:
                 schedule_payload = await fetch_json(client, schedule_url, params)
                 schedule_games = extract_schedule_games(schedule_payload)
                 summary_requests = []
+                schedule_statuses: dict[str, str | None] = {}
                 for game in schedule_games:
                     game_id = extract_game_id(game)
                     if not game_id:
                         continue
+                    schedule_statuses[game_id] = payload_status(game)
                     summary_requests.append(
                         (game_id, f"{base_url}/{locale}/games/{game_id}/summary.json")
                     )
-                if not summary_requests:
-                    return {}
-                return await fetch_many(client, summary_requests, params, max_concurrency)
-
-        summaries = asyncio.run(run_fetch())
-        for game_id, summary in summaries.items():
-            home_team = summary.get("home")
-            away_team = summary.get("away")
-            team_rows.extend(extract_team_stats(summary, source_api, game_id, home_team, away_team))
-            player_rows.extend(extract_player_stats(summary, source_api, game_id, home_team))
-            player_rows.extend(extract_player_stats(summary, source_api, game_id, away_team))
-            period_rows.extend(
-                extract_period_scores(
-                    summary,
-                    source_api,
-                    game_id,
-                    (home_team or {}).get("id"),
-                    (away_team or {}).get("id"),
-                )
-            )
-
-        team_rows = prep_team_stats(team_rows)
-        player_rows = prep_player_stats(player_rows)
-        period_rows = prep_period_scores(period_rows)
+
+                skip_existing["scheduled"] = len(summary_requests)
+                if skip_existing["enabled"]:
+                    stored = fetch_game_fetch_state(
+                        conn, source_api, FETCH_STATE_STEP, [game_id for game_id, _ in summary_requests]
+                    )
+                    summary_requests = [
+                        (game_id, url)
+                        for game_id, url in summary_requests
+                        if game_needs_fetch(schedule_statuses[game_id], stored.get(game_id))
+                    ]
+                    skip_existing["skipped"] = skip_existing["scheduled"] - len(summary_requests)
+
+                summary_urls = dict(summary_requests)
+                pending: dict[str, tuple[asyncio.Future, bytes]] = {}
+
+                async def flush_pending() -> None:
+                    batch: dict[str, list[dict]] = {table: [] for table in GAME_STATS_TABLES}
+                    statuses: dict[str, str | None] = {}
+                    for game_id, (extracted, content) in pending.items():
+                        status, game_rows = await extracted
+                        cache_final_content(summary_urls[game_id], params, content, status)
+                        for table, rows in game_rows.items():
+                            batch[table].extend(rows)
+                        statuses[game_id] = status or schedule_statuses.get(game_id)
+                    pending.clear()
+                    await flush(batch, statuses)
+
+                async for game_id, content in iter_fetch_many(
+                    client, summary_requests, params, max_concurrency, raw=True
+                ):
+                    extracted = extract_pool.submit(extract_game_stats, content, source_api, game_id)
+                    pending[game_id] = (extracted, content)
+                    if len(pending) >= WRITE_BATCH_GAMES:
+                        await flush_pending()
+                if pending:
+                    await flush_pending()
+
+        asyncio.run(run_fetch())
     except FetchError as exc:
         errors.append(str(exc))
     except Exception as exc:  # pragma: no cover - safety
         errors.append(str(exc))
+    finally:
+        extract_pool.close()
+        if conn is not None:
+            release_db(conn)
 
-    try:
-        if not dry_run:
-            conn = psycopg.connect(os.environ["POSTGRES_URL"])
-            try:
-                count = upsert(conn, "sr.game_team_stats", team_rows, ["source_api", "game_id", "sr_team_id"])
-                tables.append({"table": "sr.game_team_stats", "attempted": count, "success": True})
-
-                count = upsert(conn, "sr.game_player_stats", player_rows, ["source_api", "game_id", "sr_id"])
-                tables.append({"table": "sr.game_player_stats", "attempted": count, "success": True})
-
-                count = upsert(
-                    conn,
-                    "sr.game_period_scores",
-                    period_rows,
-                    ["source_api", "game_id", "sr_team_id", "period_number", "period_type"],
-                )
-                tables.append({"table": "sr.game_period_scores", "attempted": count, "success": True})
-            finally:
-                conn.close()
-        else:
-            tables.append({"table": "sr.game_team_stats", "attempted": len(team_rows), "success": True})
-            tables.append({"table": "sr.game_player_stats", "attempted": len(player_rows), "success": True})
-            tables.append({"table": "sr.game_period_scores", "attempted": len(period_rows), "success": True})
-    except Exception as exc:
-        errors.append(str(exc))
+    tables = [
+        {"table": table, "attempted": count, "success": not write_failed}
+        for table, count in counts.items()
+    ]
 
     return {
         "dry_run": dry_run,
@@ -219,5 +276,8 @@ def main(
         "started_at": started_at,
         "finished_at": datetime.now().isoformat(),
         "tables": tables,
+        "skip_existing": skip_existing,
+        "extract": extract_pool.stats(),
+        "fetch": fetch_stats(),
         "errors": errors,
     }
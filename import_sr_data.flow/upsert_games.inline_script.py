@@ -1,18 +1,23 @@
 # /// script
 # requires-python = ">=3.11"
-# dependencies = ["httpx", "psycopg[binary]", "typing-extensions"]
+# dependencies = ["httpx", "orjson", "psycopg[binary]", "typing-extensions"]
 # ///
 """
 Upsert sr.games from SportRadar API.
 """
 import asyncio
-import json
-import os
 from datetime import datetime
 
 import httpx
-import psycopg
 
+from sr_db import (
+    connect_db,
+    fetch_game_fetch_state,
+    record_game_fetch_state,
+    release_db,
+    row_columns,
+    row_values,
+)
 from sr_extract import (
     build_game_row_from_schedule,
     build_game_row_from_summary,
@@ -22,42 +27,29 @@ from sr_extract import (
 )
 from sr_fetch import (
     FetchError,
+    begin_fetch_stats,
     build_schedule_url,
     fetch_json,
     fetch_many,
+    fetch_stats,
+    game_needs_fetch,
     get_api_key,
     get_base_url,
+    payload_status,
 )
 
 JSON_COLUMNS = {"broadcast_json", "time_zones_json", "summary_json"}
-
-
-def normalize_json(value):
-    if value is None:
-        return None
-    if isinstance(value, str):
-        return value
-    return json.dumps(value)
-
-
-def normalize_rows(rows: list[dict]) -> tuple[list[dict], list[str]]:
-    if not rows:
-        return [], []
-    columns = sorted({key for row in rows for key in row.keys()})
-    normalized = []
-    for row in rows:
-        normalized_row = {col: row.get(col) for col in columns}
-        for col in JSON_COLUMNS:
-            if col in normalized_row:
-                normalized_row[col] = normalize_json(normalized_row[col])
-        normalized.append(normalized_row)
-    return normalized, columns
+# Only fetch summaries of games that are new, live or changed status since this
+# step last imported them (sr.game_fetch_state); dry runs always fetch all.
+# Schedule rows are still upserted for every game.
+SKIP_EXISTING_GAMES = True
+FETCH_STATE_STEP = "games"
 
 
 def upsert(conn, table: str, rows: list[dict], conflict_keys: list[str]) -> int:
     if not rows:
         return 0
-    rows, columns = normalize_rows(rows)
+    columns = row_columns(rows)
     update_cols = [c for c in columns if c not in conflict_keys]
 
     placeholders = ", ".join(["%s"] * len(columns))
@@ -77,7 +69,7 @@ def upsert(conn, table: str, rows: list[dict], conflict_keys: list[str]) -> int:
         )
 
     with conn.cursor() as cur:
-        cur.executemany(sql, [tuple(row[col] for col in columns) for row in rows])
+        cur.executemany(sql, row_values(rows, columns, JSON_COLUMNS))
     conn.commit()
     return len(rows)
 
@@ -93,29 +85,49 @@ def main(
     locale: str = "en",
     max_concurrency: int = 6,
 ) -> dict:
+    begin_fetch_stats()
     started_at = datetime.now().isoformat()
     errors: list[str] = []
     tables: list[dict] = []
     rows: list[dict] = []
+    schedule_rows: list[dict] = []
+    statuses: dict[str, str | None] = {}
+    conn = None
+    skip_existing = {"enabled": SKIP_EXISTING_GAMES and not dry_run, "scheduled": 0, "skipped": 0}
 
     try:
         base_url = get_base_url(source_api)
         api_key = get_api_key()
         schedule_url, _ = build_schedule_url(base_url, locale, mode, date, season_year, season_type)
         params = {"api_key": api_key}
+        if not dry_run:
+            conn = connect_db()
 
         async def run_fetch() -> tuple[dict, dict[str, dict]]:
             async with httpx.AsyncClient() as client:
                 schedule_payload = await fetch_json(client, schedule_url, params)
                 schedule_games = extract_schedule_games(schedule_payload)
                 summary_requests = []
+                schedule_statuses: dict[str, str | None] = {}
                 for game in schedule_games:
                     game_id = extract_game_id(game)
                     if not game_id:
                         continue
+                    schedule_statuses[game_id] = payload_status(game)
                     summary_requests.append(
                         (game_id, f"{base_url}/{locale}/games/{game_id}/summary.json")
                     )
+                skip_existing["scheduled"] = len(summary_requests)
+                if skip_existing["enabled"]:
+                    stored = fetch_game_fetch_state(
+                        conn, source_api, FETCH_STATE_STEP, [game_id for game_id, _ in summary_requests]
+                    )
+                    summary_requests = [
+                        (game_id, url)
+                        for game_id, url in summary_requests
+                        if game_needs_fetch(schedule_statuses[game_id], stored.get(game_id))
+                    ]
+                    skip_existing["skipped"] = skip_existing["scheduled"] - len(summary_requests)
                 summaries = {}
                 if summary_requests:
                     summaries = await fetch_many(client, summary_requests, params, max_concurrency)
@@ -138,25 +150,31 @@ def main(
             existing = games_by_id.get(game_id, {})
             existing.update({k: v for k, v in game_row.items() if v is not None})
             games_by_id[game_id] = existing
+            statuses[game_id] = existing.get("status") or payload_status(summary)
 
         rows = [row for row in games_by_id.values() if row.get("source_api") and row.get("game_id")]
+        # Games whose summary was skipped are written from the schedule alone, in
+        # their own upsert so the summary-only columns stored for them are kept.
+        schedule_rows = [row for row in rows if row["game_id"] not in summaries]
+        rows = [row for row in rows if row["game_id"] in summaries]
     except FetchError as exc:
         errors.append(str(exc))
     except Exception as exc:  # pragma: no cover - safety
         errors.append(str(exc))
 
     try:
-        if not dry_run and rows:
-            conn = psycopg.connect(os.environ["POSTGRES_URL"])
-            try:
-                count = upsert(conn, "sr.games", rows, ["source_api", "game_id"])
-                tables.append({"table": "sr.games", "attempted": count, "success": True})
-            finally:
-                conn.close()
+        if conn is not None and (rows or schedule_rows):
+            count = upsert(conn, "sr.games", rows, ["source_api", "game_id"])
+            count += upsert(conn, "sr.games", schedule_rows, ["source_api", "game_id"])
+            record_game_fetch_state(conn, source_api, FETCH_STATE_STEP, statuses)
+            tables.append({"table": "sr.games", "attempted": count, "success": True})
         else:
-            tables.append({"table": "sr.games", "attempted": len(rows), "success": True})
+            tables.append({"table": "sr.games", "attempted": len(rows) + len(schedule_rows), "success": True})
     except Exception as exc:
         errors.append(str(exc))
+    finally:
+        if conn is not None:
+            release_db(conn)
 
     return {
         "dry_run": dry_run,
@@ -164,5 +182,7 @@ def main(
         "started_at": started_at,
         "finished_at": datetime.now().isoformat(),
         "tables": tables,
+        "skip_existing": skip_existing,
+        "fetch": fetch_stats(),
         "errors": errors,
     }
@@ -6,28 +6,35 @@
 Upsert sr.injuries from SportRadar API.
 """
 import asyncio
-import os
 from datetime import datetime
 
 import httpx
-import psycopg
 
+from sr_db import (
+    ROW_CHANGES_TABLE,
+    connect_db,
+    diff_counts,
+    diff_snapshot,
+    fetch_row_hashes,
+    record_row_changes,
+    release_db,
+    row_columns,
+    row_values,
+)
 from sr_extract import extract_injuries
-from sr_fetch import FetchError, fetch_json, get_api_key, get_base_url
+from sr_fetch import FetchError, begin_fetch_stats, fetch_json, fetch_stats, get_api_key, get_base_url
 
-
-def normalize_rows(rows: list[dict]) -> tuple[list[dict], list[str]]:
-    if not rows:
-        return [], []
-    columns = sorted({key for row in rows for key in row.keys()})
-    normalized = [{col: row.get(col) for col in columns} for row in rows]
-    return normalized, columns
+# Compare each poll with the stored snapshot (row_hash) and write only new,
+# changed and dropped injuries, logged to sr.row_changes. Off = rewrite every
+# row and deactivate everything missing from the report, as before.
+SNAPSHOT_DIFF = True
+INJURY_KEY = ["source_api", "injury_id"]
 
 
 def upsert(conn, table: str, rows: list[dict], conflict_keys: list[str]) -> int:
     if not rows:
         return 0
-    rows, columns = normalize_rows(rows)
+    columns = row_columns(rows)
     update_cols = [c for c in columns if c not in conflict_keys]
 
     placeholders = ", ".join(["%s"] * len(columns))
@@ -47,7 +54,7 @@ def upsert(conn, table: str, rows: list[dict], conflict_keys: list[str]) -> int:
         )
 
     with conn.cursor() as cur:
-        cur.executemany(sql, [tuple(row[col] for col in columns) for row in rows])
+        cur.executemany(sql, row_values(rows, columns))
     conn.commit()
     return len(rows)
 
@@ -67,6 +74,33 @@ def mark_inactive(conn, source_api: str, injury_ids: list[str]) -> None:
     conn.commit()
 
 
+def deactivate_injuries(conn, source_api: str, injury_ids: list[str]) -> None:
+    """Players removed from the injury report; the cleared hash makes a return count as a change."""
+    if not injury_ids:
+        return
+    with conn.cursor() as cur:
+        cur.execute(
+            "UPDATE sr.injuries SET is_active = false, row_hash = NULL "
+            "WHERE source_api = %s AND injury_id = ANY(%s)",
+            (source_api, injury_ids),
+        )
+
+
+def sync_injuries(conn, source_api: str, rows: list[dict]) -> list[dict]:
+    stored = fetch_row_hashes(
+        conn, "sr.injuries", INJURY_KEY, "source_api = %s", (source_api,), live_column="is_active"
+    )
+    diff = diff_snapshot(rows, stored, INJURY_KEY)
+    deactivate_injuries(conn, source_api, [injury_id for _, injury_id in diff["deletes"]])
+    changes = record_row_changes(conn, "sr.injuries", source_api, diff, stored, INJURY_KEY)
+    count = upsert(conn, "sr.injuries", diff["inserts"] + diff["updates"], INJURY_KEY)
+    conn.commit()
+    return [
+        {"table": "sr.injuries", "attempted": count, "success": True, "snapshot": diff_counts(diff)},
+        {"table": ROW_CHANGES_TABLE, "attempted": changes, "success": True},
+    ]
+
+
 def main(
     dry_run: bool = False,
     source_api: str = "nba",
@@ -78,6 +112,7 @@ def main(
     locale: str = "en",
     max_concurrency: int = 6,
 ) -> dict:
+    begin_fetch_stats()
     started_at = datetime.now().isoformat()
     errors: list[str] = []
     tables: list[dict] = []
@@ -110,14 +145,17 @@ def main(
 
     try:
         if not dry_run and rows:
-            conn = psycopg.connect(os.environ["POSTGRES_URL"])
+            conn = connect_db()
             try:
-                count = upsert(conn, "sr.injuries", rows, ["source_api", "injury_id"])
-                tables.append({"table": "sr.injuries", "attempted": count, "success": True})
-                injury_ids = [row["injury_id"] for row in rows]
-                mark_inactive(conn, source_api, injury_ids)
+                if SNAPSHOT_DIFF:
+                    tables.extend(sync_injuries(conn, source_api, rows))
+                else:
+                    count = upsert(conn, "sr.injuries", rows, INJURY_KEY)
+                    tables.append({"table": "sr.injuries", "attempted": count, "success": True})
+                    injury_ids = [row["injury_id"] for row in rows]
+                    mark_inactive(conn, source_api, injury_ids)
             finally:
-                conn.close()
+                release_db(conn)
         else:
             tables.append({"table": "sr.injuries", "attempted": len(rows), "success": True})
     except Exception as exc:
@@ -129,5 +167,6 @@ def main(
         "started_at": started_at,
         "finished_at": datetime.now().isoformat(),
         "tables": tables,
+        "fetch": fetch_stats(),
         "errors": errors,
     }
@@ -6,33 +6,33 @@
 Upsert sr.competitions, sr.season_stages, sr.season_groups from SportRadar API.
 """
 import asyncio
-import os
 from datetime import datetime
 
 import httpx
-import psycopg
 
+from sr_db import connect_db, release_db, row_columns, row_values
 from sr_extract import (
     extract_competitions,
     extract_intl_season_hierarchy,
     normalize_records,
     parse_season_year,
 )
-from sr_fetch import FetchError, fetch_json, fetch_many, get_api_key, get_base_url, get_seasons_url
-
-
-def normalize_rows(rows: list[dict]) -> tuple[list[dict], list[str]]:
-    if not rows:
-        return [], []
-    columns = sorted({key for row in rows for key in row.keys()})
-    normalized = [{col: row.get(col) for col in columns} for row in rows]
-    return normalized, columns
+from sr_fetch import (
+    FetchError,
+    begin_fetch_stats,
+    fetch_json,
+    fetch_many,
+    fetch_stats,
+    get_api_key,
+    get_base_url,
+    get_seasons_url,
+)
 
 
 def upsert(conn, table: str, rows: list[dict], conflict_keys: list[str]) -> int:
     if not rows:
         return 0
-    rows, columns = normalize_rows(rows)
+    columns = row_columns(rows)
     update_cols = [c for c in columns if c not in conflict_keys]
 
     placeholders = ", ".join(["%s"] * len(columns))
@@ -52,7 +52,7 @@ def upsert(conn, table: str, rows: list[dict], conflict_keys: list[str]) -> int:
         )
 
     with conn.cursor() as cur:
-        cur.executemany(sql, [tuple(row[col] for col in columns) for row in rows])
+        cur.executemany(sql, row_values(rows, columns))
     conn.commit()
     return len(rows)
 
@@ -68,6 +68,7 @@ def main(
     locale: str = "en",
     max_concurrency: int = 6,
 ) -> dict:
+    begin_fetch_stats()
     started_at = datetime.now().isoformat()
     errors: list[str] = []
     tables: list[dict] = []
@@ -141,7 +142,7 @@ def main(
 
     try:
         if not dry_run:
-            conn = psycopg.connect(os.environ["POSTGRES_URL"])
+            conn = connect_db()
             try:
                 count = upsert(conn, "sr.competitions", competitions, ["source_api", "competition_id"])
                 tables.append({"table": "sr.competitions", "attempted": count, "success": True})
@@ -152,7 +153,7 @@ def main(
                 count = upsert(conn, "sr.season_groups", groups, ["source_api", "group_id"])
                 tables.append({"table": "sr.season_groups", "attempted": count, "success": True})
             finally:
-                conn.close()
+                release_db(conn)
         else:
             tables.append({"table": "sr.competitions", "attempted": len(competitions), "success": True})
             tables.append({"table": "sr.season_stages", "attempted": len(stages), "success": True})
@@ -166,5 +167,6 @@ def main(
         "started_at": started_at,
         "finished_at": datetime.now().isoformat(),
         "tables": tables,
+        "fetch": fetch_stats(),
         "errors": errors,
     }
@@ -6,35 +6,28 @@
 Upsert sr.league_leaders from SportRadar API.
 """
 import asyncio
-import os
 from datetime import datetime
 
 import httpx
-import psycopg
 
+from sr_db import connect_db, release_db, row_columns, row_values
 from sr_extract import extract_leaders, extract_seasons, resolve_season_year_type
 from sr_fetch import (
     FetchError,
+    begin_fetch_stats,
     build_schedule_url,
     fetch_json,
+    fetch_stats,
     get_api_key,
     get_base_url,
     get_seasons_url,
 )
 
 
-def normalize_rows(rows: list[dict]) -> tuple[list[dict], list[str]]:
-    if not rows:
-        return [], []
-    columns = sorted({key for row in rows for key in row.keys()})
-    normalized = [{col: row.get(col) for col in columns} for row in rows]
-    return normalized, columns
-
-
 def upsert(conn, table: str, rows: list[dict], conflict_keys: list[str]) -> int:
     if not rows:
         return 0
-    rows, columns = normalize_rows(rows)
+    columns = row_columns(rows)
     update_cols = [c for c in columns if c not in conflict_keys]
 
     placeholders = ", ".join(["%s"] * len(columns))
@@ -54,7 +47,7 @@ def upsert(conn, table: str, rows: list[dict], conflict_keys: list[str]) -> int:
         )
 
     with conn.cursor() as cur:
-        cur.executemany(sql, [tuple(row[col] for col in columns) for row in rows])
+        cur.executemany(sql, row_values(rows, columns))
     conn.commit()
     return len(rows)
 
@@ -70,6 +63,7 @@ def main(
     locale: str = "en",
     max_concurrency: int = 6,
 ) -> dict:
+    begin_fetch_stats()
     started_at = datetime.now().isoformat()
     errors: list[str] = []
     tables: list[dict] = []
@@ -128,12 +122,12 @@ def main(
 
     try:
         if not dry_run and rows:
-            conn = psycopg.connect(os.environ["POSTGRES_URL"])
+            conn = connect_db()
             try:
                 count = upsert(conn, "sr.league_leaders", rows, ["source_api", "leader_id"])
                 tables.append({"table": "sr.league_leaders", "attempted": count, "success": True})
             finally:
-                conn.close()
+                release_db(conn)
         else:
             tables.append({"table": "sr.league_leaders", "attempted": len(rows), "success": True})
     except Exception as exc:
@@ -145,5 +139,6 @@ def main(
         "started_at": started_at,
         "finished_at": datetime.now().isoformat(),
         "tables": tables,
+        "fetch": fetch_stats(),
         "errors": errors,
     }
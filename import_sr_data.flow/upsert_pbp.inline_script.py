@@ -1,60 +1,77 @@
 # /// script
 # requires-python = ">=3.11"
-# dependencies = ["httpx", "psycopg[binary]", "typing-extensions"]
+# dependencies = ["httpx", "orjson", "psycopg[binary]", "typing-extensions"]
 # ///
 """
 Upsert sr.pbp from SportRadar API.
 """
 import asyncio
-import json
-import os
 from datetime import datetime
 
 import httpx
-import psycopg
 
+from sr_db import (
+    connect_db,
+    fetch_game_fetch_state,
+    record_game_fetch_state,
+    release_db,
+    row_columns,
+    row_values,
+)
 from sr_extract import (
     extract_game_id,
     extract_home_away,
+    extract_pbp_events,
     extract_points,
     extract_schedule_games,
     to_int,
 )
 from sr_fetch import (
     FetchError,
+    begin_fetch_stats,
     build_schedule_url,
     fetch_json,
-    fetch_many,
+    fetch_stats,
+    game_needs_fetch,
     get_api_key,
     get_base_url,
+    iter_fetch_many,
+    payload_status,
 )
 
 
-def normalize_json(value):
-    if value is None:
-        return None
-    if isinstance(value, str):
-        return value
-    return json.dumps(value)
-
-
-def normalize_rows(rows: list[dict]) -> tuple[list[dict], list[str]]:
-    if not rows:
-        return [], []
-    columns = sorted({key for row in rows for key in row.keys()})
-    normalized = []
-    for row in rows:
-        normalized_row = {col: row.get(col) for col in columns}
-        if "pbp_json" in normalized_row:
-            normalized_row["pbp_json"] = normalize_json(normalized_row["pbp_json"])
-        normalized.append(normalized_row)
-    return normalized, columns
+# Events are always normalized into sr.pbp_events; the raw payload is kept in
+# sr.pbp.pbp_json only when set.
+STORE_RAW_PBP_JSON = True
+JSON_COLUMNS = {"pbp_json"}
+# pbp documents are extracted as they arrive and written every
+# WRITE_BATCH_GAMES games, overlapping the writes with the remaining fetches.
+WRITE_BATCH_GAMES = 50
+# Only fetch pbp of games that are new, live or changed status since this step
+# last imported them (sr.game_fetch_state); dry runs always fetch all.
+SKIP_EXISTING_GAMES = True
+FETCH_STATE_STEP = "pbp"
+
+
+def prune_pbp_events(conn, event_rows: list[dict]) -> None:
+    """Drop stored events missing from a game's latest feed (same transaction as the upsert)."""
+    event_ids: dict[tuple[str, str], list[str]] = {}
+    for row in event_rows:
+        event_ids.setdefault((row["source_api"], row["game_id"]), []).append(row["event_id"])
+    if not event_ids:
+        return
+    with conn.cursor() as cur:
+        cur.executemany(
+            "DELETE FROM sr.pbp_events "
+            "WHERE source_api = %s AND game_id = %s AND event_id <> ALL(%s::text[])",
+            [(source, game_id, ids) for (source, game_id), ids in event_ids.items()],
+        )
 
 
 def upsert(conn, table: str, rows: list[dict], conflict_keys: list[str]) -> int:
     if not rows:
         return 0
-    rows, columns = normalize_rows(rows)
+    columns = row_columns(rows)
     update_cols = [c for c in columns if c not in conflict_keys]
 
     placeholders = ", ".join(["%s"] * len(columns))
@@ -74,11 +91,45 @@ def upsert(conn, table: str, rows: list[dict], conflict_keys: list[str]) -> int:
         )
 
     with conn.cursor() as cur:
-        cur.executemany(sql, [tuple(row[col] for col in columns) for row in rows])
+        cur.executemany(sql, row_values(rows, columns, JSON_COLUMNS))
     conn.commit()
     return len(rows)
 
 
+def build_pbp_row(pbp_payload: dict, source_api: str, game_id: str) -> dict:
+    pbp_game = pbp_payload.get("game") or pbp_payload
+    status = pbp_payload.get("sport_event_status") or pbp_payload
+    home_team, away_team = extract_home_away(pbp_game)
+
+    pbp_clock = None
+    status_clock = status.get("clock") if isinstance(status, dict) else None
+    if isinstance(status_clock, dict):
+        pbp_clock = status_clock.get("remaining") or status_clock.get("played")
+    elif isinstance(status_clock, str):
+        pbp_clock = status_clock
+    if not pbp_clock:
+        pbp_clock = pbp_payload.get("clock")
+
+    return {
+        "source_api": source_api,
+        "game_id": game_id,
+        "status": status.get("status") or pbp_payload.get("status"),
+        "period": to_int(status.get("period") or status.get("quarter") or pbp_payload.get("period")),
+        "clock": pbp_clock,
+        "away_pts": extract_points(away_team, status, "away"),
+        "home_pts": extract_points(home_team, status, "home"),
+        "pbp_json": pbp_payload if STORE_RAW_PBP_JSON else None,
+    }
+
+
+def write_pbp_batch(conn, rows: list[dict], event_rows: list[dict], source_api: str) -> tuple[int, int]:
+    pbp_count = upsert(conn, "sr.pbp", rows, ["source_api", "game_id"])
+    prune_pbp_events(conn, event_rows)
+    event_count = upsert(conn, "sr.pbp_events", event_rows, ["source_api", "game_id", "event_id"])
+    record_game_fetch_state(conn, source_api, FETCH_STATE_STEP, {row["game_id"]: row.get("status") for row in rows})
+    return pbp_count, event_count
+
+
 def main(
     dry_run: bool = False,
     source_api: str = "nba",
@@ -90,10 +141,13 @@ def main(
     locale: str = "en",
     max_concurrency: int = 6,
 ) -> dict:
+    begin_fetch_stats()
     started_at = datetime.now().isoformat()
     errors: list[str] = []
-    tables: list[dict] = []
-    rows: list[dict] = []
+    counts = {"sr.pbp": 0, "sr.pbp_events": 0}
+    write_failed = False
+    conn = None
+    skip_existing = {"enabled": SKIP_EXISTING_GAMES and not dry_run, "scheduled": 0, "skipped": 0}
 
     if not include_pbp:
         return {
@@ -101,7 +155,10 @@ def main(
             "source_api": source_api,
             "started_at": started_at,
             "finished_at": datetime.now().isoformat(),
-            "tables": [{"table": "sr.pbp", "attempted": 0, "success": True}],
+            "tables": [
+                {"table": "sr.pbp", "attempted": 0, "success": True},
+                {"table": "sr.pbp_events", "attempted": 0, "success": True},
+            ],
             "errors": [],
         }
 
@@ -110,67 +167,76 @@ def main(
         api_key = get_api_key()
         schedule_url, _ = build_schedule_url(base_url, locale, mode, date, season_year, season_type)
         params = {"api_key": api_key}
-
-        async def run_fetch() -> dict[str, dict]:
+        if not dry_run:
+            conn = connect_db()
+
+        async def flush(rows: list[dict], event_rows: list[dict]) -> None:
+            nonlocal write_failed
+            rows = [row for row in rows if row.get("source_api") and row.get("game_id")]
+            if conn is None:
+                counts["sr.pbp"] += len(rows)
+                counts["sr.pbp_events"] += len(event_rows)
+                return
+            if not rows:
+                return
+            try:
+                # Off the event loop so the remaining pbp fetches keep going.
+                pbp_count, event_count = await asyncio.to_thread(write_pbp_batch, conn, rows, event_rows, source_api)
+            except Exception:
+                write_failed = True
+                raise
+            counts["sr.pbp"] += pbp_count
+            counts["sr.pbp_events"] += event_count
+
+        async def run_fetch() -> None:
             async with httpx.AsyncClient() as client:
                 schedule_payload = await fetch_json(client, schedule_url, params)
                 schedule_games = extract_schedule_games(schedule_payload)
                 pbp_requests = []
+                schedule_statuses: dict[str, str | None] = {}
                 for game in schedule_games:
                     game_id = extract_game_id(game)
                     if not game_id:
                         continue
+                    schedule_statuses[game_id] = payload_status(game)
                     pbp_requests.append((game_id, f"{base_url}/{locale}/games/{game_id}/pbp.json"))
-                if not pbp_requests:
-                    return {}
-                return await fetch_many(client, pbp_requests, params, max_concurrency)
-
-        pbp_payloads = asyncio.run(run_fetch())
-        for game_id, pbp_payload in pbp_payloads.items():
-            pbp_game = pbp_payload.get("game") or pbp_payload
-            status = pbp_payload.get("sport_event_status") or pbp_payload
-            home_team, away_team = extract_home_away(pbp_game)
-
-            pbp_clock = None
-            status_clock = status.get("clock") if isinstance(status, dict) else None
-            if isinstance(status_clock, dict):
-                pbp_clock = status_clock.get("remaining") or status_clock.get("played")
-            elif isinstance(status_clock, str):
-                pbp_clock = status_clock
-            if not pbp_clock:
-                pbp_clock = pbp_payload.get("clock")
-
-            rows.append(
-                {
-                    "source_api": source_api,
-                    "game_id": game_id,
-                    "status": status.get("status") or pbp_payload.get("status"),
-                    "period": to_int(status.get("period") or status.get("quarter") or pbp_payload.get("period")),
-                    "clock": pbp_clock,
-                    "away_pts": extract_points(away_team, status, "away"),
-                    "home_pts": extract_points(home_team, status, "home"),
-                    "pbp_json": pbp_payload,
-                }
-            )
-
-        rows = [row for row in rows if row.get("source_api") and row.get("game_id")]
+
+                skip_existing["scheduled"] = len(pbp_requests)
+                if skip_existing["enabled"]:
+                    stored = fetch_game_fetch_state(
+                        conn, source_api, FETCH_STATE_STEP, [game_id for game_id, _ in pbp_requests]
+                    )
+                    pbp_requests = [
+                        (game_id, url)
+                        for game_id, url in pbp_requests
+                        if game_needs_fetch(schedule_statuses[game_id], stored.get(game_id))
+                    ]
+                    skip_existing["skipped"] = skip_existing["scheduled"] - len(pbp_requests)
+
+                rows: list[dict] = []
+                event_rows: list[dict] = []
+                async for game_id, pbp_payload in iter_fetch_many(client, pbp_requests, params, max_concurrency):
+                    rows.append(build_pbp_row(pbp_payload, source_api, game_id))
+                    event_rows.extend(extract_pbp_events(pbp_payload, source_api, game_id))
+                    if len(rows) >= WRITE_BATCH_GAMES:
+                        await flush(rows, event_rows)
+                        rows, event_rows = [], []
+                if rows:
+                    await flush(rows, event_rows)
+
+        asyncio.run(run_fetch())
     except FetchError as exc:
         errors.append(str(exc))
     except Exception as exc:  # pragma: no cover - safety
         errors.append(str(exc))
+    finally:
+        if conn is not None:
+            release_db(conn)
 
-    try:
-        if not dry_run and rows:
-            conn = psycopg.connect(os.environ["POSTGRES_URL"])
-            try:
-                count = upsert(conn, "sr.pbp", rows, ["source_api", "game_id"])
-                tables.append({"table": "sr.pbp", "attempted": count, "success": True})
-            finally:
-                conn.close()
-        else:
-            tables.append({"table": "sr.pbp", "attempted": len(rows), "success": True})
-    except Exception as exc:
-        errors.append(str(exc))
+    tables = [
+        {"table": table, "attempted": count, "success": not write_failed}
+        for table, count in counts.items()
+    ]
 
     return {
         "dry_run": dry_run,
@@ -178,5 +244,7 @@ def main(
         "started_at": started_at,
         "finished_at": datetime.now().isoformat(),
         "tables": tables,
+        "skip_existing": skip_existing,
+        "fetch": fetch_stats(),
         "errors": errors,
     }
@@ -1,24 +1,24 @@
 # /// script
 # requires-python = ">=3.11"
-# dependencies = ["httpx", "psycopg[binary]", "typing-extensions"]
+# dependencies = ["httpx", "orjson", "psycopg[binary]", "typing-extensions"]
 # ///
 """
 Upsert sr.players from SportRadar API.
 """
 import asyncio
-import json
-import os
 from datetime import datetime
 
 import httpx
-import psycopg
 
+from sr_db import connect_db, release_db, row_columns, row_values
 from sr_extract import extract_game_id, extract_players, extract_schedule_games
 from sr_fetch import (
     FetchError,
+    begin_fetch_stats,
     build_schedule_url,
     fetch_json,
     fetch_many,
+    fetch_stats,
     get_api_key,
     get_base_url,
 )
@@ -26,32 +26,10 @@ from sr_fetch import (
 JSON_COLUMNS = {"references_json", "seasons_json"}
 
 
-def normalize_json(value):
-    if value is None:
-        return None
-    if isinstance(value, str):
-        return value
-    return json.dumps(value)
-
-
-def normalize_rows(rows: list[dict]) -> tuple[list[dict], list[str]]:
-    if not rows:
-        return [], []
-    columns = sorted({key for row in rows for key in row.keys()})
-    normalized = []
-    for row in rows:
-        normalized_row = {col: row.get(col) for col in columns}
-        for col in JSON_COLUMNS:
-            if col in normalized_row:
-                normalized_row[col] = normalize_json(normalized_row[col])
-        normalized.append(normalized_row)
-    return normalized, columns
-
-
 def upsert(conn, table: str, rows: list[dict], conflict_keys: list[str]) -> int:
     if not rows:
         return 0
-    rows, columns = normalize_rows(rows)
+    columns = row_columns(rows)
     update_cols = [c for c in columns if c not in conflict_keys]
 
     placeholders = ", ".join(["%s"] * len(columns))
@@ -71,7 +49,7 @@ def upsert(conn, table: str, rows: list[dict], conflict_keys: list[str]) -> int:
         )
 
     with conn.cursor() as cur:
-        cur.executemany(sql, [tuple(row[col] for col in columns) for row in rows])
+        cur.executemany(sql, row_values(rows, columns, JSON_COLUMNS))
     conn.commit()
     return len(rows)
 
@@ -87,6 +65,7 @@ def main(
     locale: str = "en",
     max_concurrency: int = 6,
 ) -> dict:
+    begin_fetch_stats()
     started_at = datetime.now().isoformat()
     errors: list[str] = []
     tables: list[dict] = []
@@ -135,12 +114,12 @@ def main(
 
     try:
         if not dry_run and rows:
-            conn = psycopg.connect(os.environ["POSTGRES_URL"])
+            conn = connect_db()
             try:
                 count = upsert(conn, "sr.players", rows, ["source_api", "sr_id"])
                 tables.append({"table": "sr.players", "attempted": count, "success": True})
             finally:
-                conn.close()
+                release_db(conn)
         else:
             tables.append({"table": "sr.players", "attempted": len(rows), "success": True})
     except Exception as exc:
@@ -152,5 +131,6 @@ def main(
         "started_at": started_at,
         "finished_at": datetime.now().isoformat(),
         "tables": tables,
+        "fetch": fetch_stats(),
         "errors": errors,
     }
@@ -6,36 +6,47 @@
 Upsert sr.rankings from SportRadar API.
 """
 import asyncio
-import os
 from datetime import datetime
 
 import httpx
-import psycopg
 
+from sr_db import (
+    ROW_CHANGES_TABLE,
+    connect_db,
+    diff_counts,
+    diff_snapshot,
+    fetch_row_hashes,
+    record_row_changes,
+    release_db,
+    row_columns,
+    row_values,
+)
 from sr_extract import extract_rankings, extract_seasons, resolve_season_year_type
 from sr_fetch import (
     FetchError,
     NCAA_POLL_NAMES,
+    begin_fetch_stats,
     build_schedule_url,
     fetch_json,
+    fetch_stats,
     get_api_key,
     get_base_url,
     get_seasons_url,
 )
 
-
-def normalize_rows(rows: list[dict]) -> tuple[list[dict], list[str]]:
-    if not rows:
-        return [], []
-    columns = sorted({key for row in rows for key in row.keys()})
-    normalized = [{col: row.get(col) for col in columns} for row in rows]
-    return normalized, columns
+# Compare each poll with the stored snapshot (row_hash) and write only new,
+# changed and dropped rankings, logged to sr.row_changes. A team is only
+# dropped from a (type, name, week) that this poll returned, so earlier weeks
+# stay as they were. Off = rewrite every row, as before.
+SNAPSHOT_DIFF = True
+RANKING_KEY = ["source_api", "season_id", "type", "name", "week", "sr_team_id"]
+RANKING_SCOPE = ["source_api", "season_id", "type", "name", "week"]
 
 
 def upsert(conn, table: str, rows: list[dict], conflict_keys: list[str]) -> int:
     if not rows:
         return 0
-    rows, columns = normalize_rows(rows)
+    columns = row_columns(rows)
     update_cols = [c for c in columns if c not in conflict_keys]
 
     placeholders = ", ".join(["%s"] * len(columns))
@@ -55,11 +66,35 @@ def upsert(conn, table: str, rows: list[dict], conflict_keys: list[str]) -> int:
         )
 
     with conn.cursor() as cur:
-        cur.executemany(sql, [tuple(row[col] for col in columns) for row in rows])
+        cur.executemany(sql, row_values(rows, columns))
     conn.commit()
     return len(rows)
 
 
+def delete_rankings(conn, keys: list[tuple]) -> None:
+    if not keys:
+        return
+    where = " AND ".join(f"{column} = %s" for column in RANKING_KEY)
+    with conn.cursor() as cur:
+        cur.executemany(f"DELETE FROM sr.rankings WHERE {where}", keys)
+
+
+def sync_rankings(conn, source_api: str, rows: list[dict]) -> list[dict]:
+    season_ids = sorted({row["season_id"] for row in rows})
+    stored = fetch_row_hashes(
+        conn, "sr.rankings", RANKING_KEY, "source_api = %s AND season_id = ANY(%s)", (source_api, season_ids)
+    )
+    diff = diff_snapshot(rows, stored, RANKING_KEY, RANKING_SCOPE)
+    delete_rankings(conn, diff["deletes"])
+    changes = record_row_changes(conn, "sr.rankings", source_api, diff, stored, RANKING_KEY)
+    count = upsert(conn, "sr.rankings", diff["inserts"] + diff["updates"], RANKING_KEY)
+    conn.commit()
+    return [
+        {"table": "sr.rankings", "attempted": count, "success": True, "snapshot": diff_counts(diff)},
+        {"table": ROW_CHANGES_TABLE, "attempted": changes, "success": True},
+    ]
+
+
 def main(
     dry_run: bool = False,
     source_api: str = "nba",
@@ -71,6 +106,7 @@ def main(
     locale: str = "en",
     max_concurrency: int = 6,
 ) -> dict:
+    begin_fetch_stats()
     started_at = datetime.now().isoformat()
     errors: list[str] = []
     tables: list[dict] = []
@@ -159,17 +195,15 @@ def main(
 
     try:
         if not dry_run and rows:
-            conn = psycopg.connect(os.environ["POSTGRES_URL"])
+            conn = connect_db()
             try:
-                count = upsert(
-                    conn,
-                    "sr.rankings",
-                    rows,
-                    ["source_api", "season_id", "type", "name", "week", "sr_team_id"],
-                )
-                tables.append({"table": "sr.rankings", "attempted": count, "success": True})
+                if SNAPSHOT_DIFF:
+                    tables.extend(sync_rankings(conn, source_api, rows))
+                else:
+                    count = upsert(conn, "sr.rankings", rows, RANKING_KEY)
+                    tables.append({"table": "sr.rankings", "attempted": count, "success": True})
             finally:
-                conn.close()
+                release_db(conn)
         else:
             tables.append({"table": "sr.rankings", "attempted": len(rows), "success": True})
     except Exception as exc:
@@ -181,5 +215,6 @@ def main(
         "started_at": started_at,
         "finished_at": datetime.now().isoformat(),
         "tables": tables,
+        "fetch": fetch_stats(),
         "errors": errors,
     }
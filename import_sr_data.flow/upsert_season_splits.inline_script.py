@@ -1,18 +1,16 @@
 # /// script
 # requires-python = ">=3.11"
-# dependencies = ["httpx", "psycopg[binary]", "typing-extensions"]
+# dependencies = ["httpx", "orjson", "psycopg[binary]", "typing-extensions"]
 # ///
 """
 Upsert sr.season_team_splits and sr.season_player_splits from SportRadar API.
 """
 import asyncio
-import json
-import os
 from datetime import datetime
 
 import httpx
-import psycopg
 
+from sr_db import connect_db, release_db, row_columns, row_values
 from sr_extract import (
     extract_home_away,
     extract_schedule_games,
@@ -22,45 +20,26 @@ from sr_extract import (
     resolve_season_year_type,
 )
 from sr_fetch import (
+    ExtractPool,
     FetchError,
+    begin_fetch_stats,
     build_schedule_url,
     fetch_json,
-    fetch_many,
+    fetch_stats,
     get_api_key,
     get_base_url,
     get_seasons_url,
     get_teams_url,
+    iter_fetch_many,
 )
 
 JSON_COLUMNS = {"statistics_json"}
 
 
-def normalize_json(value):
-    if value is None:
-        return None
-    if isinstance(value, str):
-        return value
-    return json.dumps(value)
-
-
-def normalize_rows(rows: list[dict]) -> tuple[list[dict], list[str]]:
-    if not rows:
-        return [], []
-    columns = sorted({key for row in rows for key in row.keys()})
-    normalized = []
-    for row in rows:
-        normalized_row = {col: row.get(col) for col in columns}
-        for col in JSON_COLUMNS:
-            if col in normalized_row:
-                normalized_row[col] = normalize_json(normalized_row[col])
-        normalized.append(normalized_row)
-    return normalized, columns
-
-
 def upsert(conn, table: str, rows: list[dict], conflict_keys: list[str]) -> int:
     if not rows:
         return 0
-    rows, columns = normalize_rows(rows)
+    columns = row_columns(rows)
     update_cols = [c for c in columns if c not in conflict_keys]
 
     placeholders = ", ".join(["%s"] * len(columns))
@@ -80,7 +59,7 @@ def upsert(conn, table: str, rows: list[dict], conflict_keys: list[str]) -> int:
         )
 
     with conn.cursor() as cur:
-        cur.executemany(sql, [tuple(row[col] for col in columns) for row in rows])
+        cur.executemany(sql, row_values(rows, columns, JSON_COLUMNS))
     conn.commit()
     return len(rows)
 
@@ -145,12 +124,15 @@ def main(
     locale: str = "en",
     max_concurrency: int = 6,
 ) -> dict:
+    begin_fetch_stats()
     started_at = datetime.now().isoformat()
     errors: list[str] = []
     tables: list[dict] = []
 
     team_rows: list[dict] = []
     player_rows: list[dict] = []
+    # SR_EXTRACT_WORKERS > 0 parses and extracts splits payloads in worker processes.
+    extract_pool = ExtractPool()
 
     try:
         base_url = get_base_url(source_api)
@@ -160,7 +142,7 @@ def main(
         schedule_url, _ = build_schedule_url(base_url, locale, mode, date, season_year, season_type)
         params = {"api_key": api_key}
 
-        async def run_fetch() -> tuple[dict, dict, dict, dict[str, dict]]:
+        async def run_fetch() -> list[tuple[list[dict], list[dict]]]:
             async with httpx.AsyncClient() as client:
                 seasons_payload = await fetch_json(client, seasons_url, params)
                 schedule_payload = await fetch_json(client, schedule_url, params)
@@ -171,7 +153,15 @@ def main(
                 )
                 team_ids = collect_team_ids(schedule_payload, teams_payload, source_api)
 
-                team_splits_payloads: dict[str, dict] = {}
+                seasons_rows = extract_seasons(seasons_payload, source_api)
+                season_lookup = {
+                    (row["season_year"], row["season_type"]): row["season_id"]
+                    for row in seasons_rows
+                    if row.get("season_year") is not None and row.get("season_type")
+                }
+
+                # Each splits payload is handed to the extract pool as it arrives.
+                extracted: list[asyncio.Future] = []
                 if (
                     resolved_year
                     and resolved_type
@@ -187,27 +177,17 @@ def main(
                                     f"{base_url}/{locale}/seasons/{resolved_year}/{resolved_type}/teams/{team_id}/splits/{split_kind}.json",
                                 )
                             )
-                    if split_requests:
-                        team_splits_payloads = await fetch_many(
-                            client, split_requests, params, max_concurrency
+                    async for key, content in iter_fetch_many(
+                        client, split_requests, params, max_concurrency, raw=True
+                    ):
+                        split_kind = key.split(":", 1)[1] if ":" in key else None
+                        extracted.append(
+                            extract_pool.submit(extract_splits, content, source_api, season_lookup, split_kind)
                         )
 
-                return seasons_payload, schedule_payload, teams_payload, team_splits_payloads
-
-        seasons_payload, _schedule_payload, _teams_payload, team_splits_payloads = asyncio.run(run_fetch())
-
-        seasons_rows = extract_seasons(seasons_payload, source_api)
-        season_lookup = {
-            (row["season_year"], row["season_type"]): row["season_id"]
-            for row in seasons_rows
-            if row.get("season_year") is not None and row.get("season_type")
-        }
+                return [result for _, result in await asyncio.gather(*extracted)]
 
-        for key, payload in team_splits_payloads.items():
-            split_kind = key.split(":", 1)[1] if ":" in key else None
-            team_split_rows, player_split_rows = extract_splits(
-                payload, source_api, season_lookup, split_kind
-            )
+        for team_split_rows, player_split_rows in asyncio.run(run_fetch()):
             team_rows.extend(team_split_rows)
             player_rows.extend(player_split_rows)
 
@@ -217,10 +197,12 @@ def main(
         errors.append(str(exc))
     except Exception as exc:  # pragma: no cover - safety
         errors.append(str(exc))
+    finally:
+        extract_pool.close()
 
     try:
         if not dry_run:
-            conn = psycopg.connect(os.environ["POSTGRES_URL"])
+            conn = connect_db()
             try:
                 count = upsert(
                     conn,
@@ -238,7 +220,7 @@ def main(
                 )
                 tables.append({"table": "sr.season_player_splits", "attempted": count, "success": True})
             finally:
-                conn.close()
+                release_db(conn)
         else:
             tables.append({"table": "sr.season_team_splits", "attempted": len(team_rows), "success": True})
             tables.append({"table": "sr.season_player_splits", "attempted": len(player_rows), "success": True})
@@ -251,5 +233,7 @@ def main(
         "started_at": started_at,
         "finished_at": datetime.now().isoformat(),
         "tables": tables,
+        "extract": extract_pool.stats(),
+        "fetch": fetch_stats(),
         "errors": errors,
     }
@@ -1,18 +1,16 @@
 # /// script
 # requires-python = ">=3.11"
-# dependencies = ["httpx", "psycopg[binary]", "typing-extensions"]
+# dependencies = ["httpx", "orjson", "psycopg[binary]", "typing-extensions"]
 # ///
 """
 Upsert sr.season_team_statistics and sr.season_player_statistics from SportRadar API.
 """
 import asyncio
-import json
-import os
 from datetime import datetime
 
 import httpx
-import psycopg
 
+from sr_db import connect_db, release_db, row_columns, row_values
 from sr_extract import (
     extract_home_away,
     extract_schedule_games,
@@ -24,45 +22,26 @@ from sr_extract import (
     resolve_season_year_type,
 )
 from sr_fetch import (
+    ExtractPool,
     FetchError,
+    begin_fetch_stats,
     build_schedule_url,
     fetch_json,
-    fetch_many,
+    fetch_stats,
     get_api_key,
     get_base_url,
     get_seasons_url,
     get_teams_url,
+    iter_fetch_many,
 )
 
 JSON_COLUMNS = {"statistics_json"}
 
 
-def normalize_json(value):
-    if value is None:
-        return None
-    if isinstance(value, str):
-        return value
-    return json.dumps(value)
-
-
-def normalize_rows(rows: list[dict]) -> tuple[list[dict], list[str]]:
-    if not rows:
-        return [], []
-    columns = sorted({key for row in rows for key in row.keys()})
-    normalized = []
-    for row in rows:
-        normalized_row = {col: row.get(col) for col in columns}
-        for col in JSON_COLUMNS:
-            if col in normalized_row:
-                normalized_row[col] = normalize_json(normalized_row[col])
-        normalized.append(normalized_row)
-    return normalized, columns
-
-
 def upsert(conn, table: str, rows: list[dict], conflict_target: str, conflict_columns: list[str]) -> int:
     if not rows:
         return 0
-    rows, columns = normalize_rows(rows)
+    columns = row_columns(rows)
     update_cols = [c for c in columns if c not in conflict_columns]
 
     placeholders = ", ".join(["%s"] * len(columns))
@@ -81,7 +60,7 @@ def upsert(conn, table: str, rows: list[dict], conflict_target: str, conflict_co
         )
 
     with conn.cursor() as cur:
-        cur.executemany(sql, [tuple(row[col] for col in columns) for row in rows])
+        cur.executemany(sql, row_values(rows, columns, JSON_COLUMNS))
     conn.commit()
     return len(rows)
 
@@ -166,12 +145,15 @@ def main(
     locale: str = "en",
     max_concurrency: int = 6,
 ) -> dict:
+    begin_fetch_stats()
     started_at = datetime.now().isoformat()
     errors: list[str] = []
     tables: list[dict] = []
 
     team_rows: list[dict] = []
     player_rows: list[dict] = []
+    # SR_EXTRACT_WORKERS > 0 parses and extracts statistics payloads in worker processes.
+    extract_pool = ExtractPool()
 
     try:
         base_url = get_base_url(source_api)
@@ -181,15 +163,7 @@ def main(
         schedule_url, _ = build_schedule_url(base_url, locale, mode, date, season_year, season_type)
         params = {"api_key": api_key}
 
-        async def run_fetch() -> tuple[
-            dict,
-            dict,
-            dict,
-            dict[str, dict],
-            dict[str, dict],
-            int | None,
-            str | None,
-        ]:
+        async def run_fetch() -> list[tuple[list[dict], list[dict]]]:
             async with httpx.AsyncClient() as client:
                 seasons_payload = await fetch_json(client, seasons_url, params)
                 schedule_payload = await fetch_json(client, schedule_url, params)
@@ -200,7 +174,15 @@ def main(
                 )
                 team_ids = collect_team_ids(schedule_payload, teams_payload, source_api)
 
-                team_statistics_payloads: dict[str, dict] = {}
+                seasons_rows = extract_seasons(seasons_payload, source_api)
+                season_lookup = {
+                    (row["season_year"], row["season_type"]): row["season_id"]
+                    for row in seasons_rows
+                    if row.get("season_year") is not None and row.get("season_type")
+                }
+
+                # Each statistics payload is handed to the extract pool as it arrives.
+                extracted: list[asyncio.Future] = []
                 if (
                     resolved_year
                     and resolved_type
@@ -214,13 +196,14 @@ def main(
                         )
                         for team_id in team_ids
                     ]
-                    if stats_requests:
-                        team_statistics_payloads = await fetch_many(
-                            client, stats_requests, params, max_concurrency
+                    async for _, content in iter_fetch_many(
+                        client, stats_requests, params, max_concurrency, raw=True
+                    ):
+                        extracted.append(
+                            extract_pool.submit(extract_team_statistics_payload, content, source_api, season_lookup)
                         )
 
                 series_payload = None
-                series_stats_payloads: dict[str, dict] = {}
                 if resolved_year and resolved_type and source_api in {"nba", "gleague"}:
                     series_url = f"{base_url}/{locale}/series/{resolved_year}/{resolved_type}/schedule.json"
                     series_payload = await fetch_json(client, series_url, params)
@@ -246,55 +229,19 @@ def main(
                                     f"{base_url}/{locale}/series/{series_id}/teams/{team_id}/statistics.json",
                                 )
                             )
-                    if series_requests:
-                        series_stats_payloads = await fetch_many(
-                            client, series_requests, params, max_concurrency
+                    async for key, content in iter_fetch_many(
+                        client, series_requests, params, max_concurrency, raw=True
+                    ):
+                        series_id = key.split(":", 1)[0] if ":" in key else None
+                        extracted.append(
+                            extract_pool.submit(
+                                extract_team_statistics_payload, content, source_api, season_lookup, series_id
+                            )
                         )
 
-                return (
-                    seasons_payload,
-                    teams_payload,
-                    schedule_payload,
-                    team_statistics_payloads,
-                    series_stats_payloads,
-                    resolved_year,
-                    resolved_type,
-                )
-
-        (
-            seasons_payload,
-            _teams_payload,
-            _schedule_payload,
-            team_statistics_payloads,
-            series_stats_payloads,
-            _resolved_year,
-            _resolved_type,
-        ) = asyncio.run(run_fetch())
-
-        seasons_rows = extract_seasons(seasons_payload, source_api)
-        season_lookup = {
-            (row["season_year"], row["season_type"]): row["season_id"]
-            for row in seasons_rows
-            if row.get("season_year") is not None and row.get("season_type")
-        }
-
-        for payload in team_statistics_payloads.values():
-            team_stat_rows, player_stat_rows = extract_team_statistics_payload(
-                payload,
-                source_api,
-                season_lookup,
-            )
-            team_rows.extend(team_stat_rows)
-            player_rows.extend(player_stat_rows)
+                return [result for _, result in await asyncio.gather(*extracted)]
 
-        for key, payload in series_stats_payloads.items():
-            series_id = key.split(":", 1)[0] if ":" in key else None
-            team_stat_rows, player_stat_rows = extract_team_statistics_payload(
-                payload,
-                source_api,
-                season_lookup,
-                series_id=series_id,
-            )
+        for team_stat_rows, player_stat_rows in asyncio.run(run_fetch()):
             team_rows.extend(team_stat_rows)
             player_rows.extend(player_stat_rows)
 
@@ -304,13 +251,15 @@ def main(
         errors.append(str(exc))
     except Exception as exc:  # pragma: no cover - safety
         errors.append(str(exc))
+    finally:
+        extract_pool.close()
 
     team_base, team_series, team_tournament = split_team_rows(team_rows)
     player_base, player_series, player_tournament = split_player_rows(player_rows)
 
     try:
         if not dry_run:
-            conn = psycopg.connect(os.environ["POSTGRES_URL"])
+            conn = connect_db()
             try:
                 if team_base:
                     count = upsert(
@@ -368,7 +317,7 @@ def main(
                     )
                     tables.append({"table": "sr.season_player_statistics", "attempted": count, "success": True})
             finally:
-                conn.close()
+                release_db(conn)
         else:
             if team_base:
                 tables.append({"table": "sr.season_team_statistics", "attempted": len(team_base), "success": True})
@@ -391,5 +340,7 @@ def main(
         "started_at": started_at,
         "finished_at": datetime.now().isoformat(),
         "tables": tables,
+        "extract": extract_pool.stats(),
+        "fetch": fetch_stats(),
         "errors": errors,
     }
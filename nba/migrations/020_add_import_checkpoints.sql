@@ -0,0 +1,31 @@
+-- Checkpoint journal for resumable season backfills.
+--
+-- Game-level NBA steps (game_data, shot_chart, lineups, querytool_event_streams,
+-- ngss) record one row per (step, endpoint, game_id) once that unit has been
+-- fetched *and* persisted. season_backfill runs read this journal to skip
+-- completed work instead of probing every target table, so a run that dies
+-- halfway resumes exactly where it stopped.
+
+CREATE TABLE IF NOT EXISTS nba.import_checkpoints (
+    step text NOT NULL,
+    endpoint text NOT NULL,
+    game_id text NOT NULL,
+    league_id text,
+    season_label text,
+    season_type text,
+    fetched_at timestamptz,
+    persisted_at timestamptz,
+    created_at timestamptz,
+    updated_at timestamptz,
+    PRIMARY KEY (step, endpoint, game_id)
+);
+
+CREATE INDEX IF NOT EXISTS import_checkpoints_game_id_idx ON nba.import_checkpoints (game_id);
+CREATE INDEX IF NOT EXISTS import_checkpoints_season_idx ON nba.import_checkpoints (step, season_label, season_type);
+
+COMMENT ON TABLE nba.import_checkpoints IS
+    'Resume journal for NBA flow steps. One row per (step, endpoint, game_id) fetched and persisted; read by season_backfill runs instead of probing target tables.';
+COMMENT ON COLUMN nba.import_checkpoints.endpoint IS
+    'Step-specific unit of work (e.g. pbp, hustle_events, TrackingPasses, game_lineups:Base).';
+COMMENT ON COLUMN nba.import_checkpoints.persisted_at IS
+    'When the rows for this unit were committed to their target table(s).';
@@ -0,0 +1,138 @@
+-- Normalized play-by-play: one row per /api/stats/pbp action.
+--
+-- nba.play_by_play keeps one JSONB document per game, so any event-level
+-- question (all corner threes, every substitution in Q4, ...) has to unnest the
+-- whole document at query time. game_data now also writes each action into
+-- nba.play_by_play_events with typed columns and plain btree indexes.
+--
+-- Person/team ids are intentionally not foreign keys: the feed references
+-- officials, coaches and team-level actions (teamId = 0) that have no row in
+-- nba.players / nba.teams.
+
+CREATE TABLE IF NOT EXISTS nba.play_by_play_events (
+    game_id text REFERENCES nba.games(game_id),
+    action_number integer NOT NULL,
+    order_number integer,
+    period integer,
+    clock text,
+    clock_seconds numeric(6,2),
+    time_actual timestamptz,
+    team_id integer,
+    team_tricode text,
+    nba_id integer,
+    action_type text,
+    sub_type text,
+    descriptor text,
+    qualifiers text[],
+    x numeric(8,4),
+    y numeric(8,4),
+    side text,
+    shot_distance numeric(6,2),
+    shot_result text,
+    is_field_goal boolean,
+    shot_action_number integer,
+    possession_team_id integer,
+    score_home integer,
+    score_away integer,
+    points_total integer,
+    location text,
+    assist_nba_id integer,
+    block_nba_id integer,
+    steal_nba_id integer,
+    foul_drawn_nba_id integer,
+    description text,
+    edited_at timestamptz,
+    created_at timestamptz,
+    updated_at timestamptz,
+    fetched_at timestamptz,
+    PRIMARY KEY (game_id, action_number)
+);
+
+CREATE INDEX IF NOT EXISTS play_by_play_events_game_order_idx ON nba.play_by_play_events (game_id, period, order_number);
+CREATE INDEX IF NOT EXISTS play_by_play_events_nba_id_idx ON nba.play_by_play_events (nba_id) WHERE nba_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS play_by_play_events_team_id_idx ON nba.play_by_play_events (team_id) WHERE team_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS play_by_play_events_action_type_idx ON nba.play_by_play_events (action_type, sub_type);
+
+COMMENT ON TABLE nba.play_by_play_events IS
+    'One row per play-by-play action from /api/stats/pbp, normalized at ingest by game_data. Replaces JSONB unnesting of nba.play_by_play.pbp_json for event-level queries.';
+COMMENT ON COLUMN nba.play_by_play_events.clock IS
+    'Raw game clock (ISO 8601 PTmmMss.ccS).';
+COMMENT ON COLUMN nba.play_by_play_events.clock_seconds IS
+    'Seconds remaining in the period, parsed from clock.';
+COMMENT ON COLUMN nba.play_by_play_events.possession_team_id IS
+    'Team with offensive possession after the action (NULL when the feed reports 0).';
+COMMENT ON COLUMN nba.play_by_play_events.score_home IS
+    'Home score after the action.';
+COMMENT ON COLUMN nba.play_by_play_events.score_away IS
+    'Away score after the action.';
+
+-- Backfill from games already stored as raw documents.
+INSERT INTO nba.play_by_play_events (
+    game_id, action_number, order_number, period, clock, time_actual,
+    team_id, team_tricode, nba_id, action_type, sub_type, descriptor, qualifiers,
+    x, y, side, shot_distance, shot_result, is_field_goal, shot_action_number,
+    possession_team_id, score_home, score_away, points_total, location,
+    assist_nba_id, block_nba_id, steal_nba_id, foul_drawn_nba_id, description,
+    created_at, updated_at, fetched_at
+)
+SELECT
+    p.game_id,
+    (a->>'actionNumber')::integer,
+    (a->>'orderNumber')::integer,
+    (a->>'period')::integer,
+    NULLIF(a->>'clock', ''),
+    (NULLIF(a->>'timeActual', ''))::timestamptz,
+    NULLIF((a->>'teamId')::integer, 0),
+    NULLIF(a->>'teamTricode', ''),
+    NULLIF((a->>'personId')::integer, 0),
+    NULLIF(a->>'actionType', ''),
+    NULLIF(a->>'subType', ''),
+    NULLIF(a->>'descriptor', ''),
+    CASE WHEN jsonb_typeof(a->'qualifiers') = 'array'
+        THEN ARRAY(SELECT jsonb_array_elements_text(a->'qualifiers'))
+    END,
+    (a->>'x')::numeric,
+    (a->>'y')::numeric,
+    NULLIF(a->>'side', ''),
+    (a->>'shotDistance')::numeric,
+    NULLIF(a->>'shotResult', ''),
+    (a->>'isFieldGoal')::integer = 1,
+    (a->>'shotActionNumber')::integer,
+    NULLIF((a->>'possession')::integer, 0),
+    (NULLIF(a->>'scoreHome', ''))::integer,
+    (NULLIF(a->>'scoreAway', ''))::integer,
+    (a->>'pointsTotal')::integer,
+    NULLIF(a->>'location', ''),
+    NULLIF((a->>'assistPersonId')::integer, 0),
+    NULLIF((a->>'blockPersonId')::integer, 0),
+    NULLIF((a->>'stealPersonId')::integer, 0),
+    NULLIF((a->>'foulDrawnPersonId')::integer, 0),
+    NULLIF(a->>'description', ''),
+    p.created_at,
+    p.updated_at,
+    p.fetched_at
+FROM nba.play_by_play p
+CROSS JOIN LATERAL jsonb_array_elements(
+    COALESCE(p.pbp_json->'actions', p.pbp_json->'game'->'actions', '[]'::jsonb)
+) a
+WHERE p.pbp_json IS NOT NULL
+  AND a ? 'actionNumber'
+ON CONFLICT (game_id, action_number) DO NOTHING;
+
+UPDATE nba.play_by_play_events
+SET clock_seconds = (
+    COALESCE(NULLIF(substring(clock FROM '^PT(\d+)M'), ''), '0')::numeric * 60
+    + COALESCE(NULLIF(substring(clock FROM '(\d+(?:\.\d+)?)S$'), ''), '0')::numeric
+)
+WHERE clock_seconds IS NULL
+  AND clock LIKE 'PT%';
+
+-- The raw documents are still written (GAME_DATA_STORE_RAW_PBP_JSON) but are no
+-- longer the query path; prefer lz4 TOAST compression where the server has it.
+DO $$
+BEGIN
+    ALTER TABLE nba.play_by_play ALTER COLUMN pbp_json SET COMPRESSION lz4;
+EXCEPTION
+    WHEN feature_not_supported OR invalid_parameter_value OR syntax_error THEN
+        RAISE NOTICE 'lz4 compression unavailable; leaving nba.play_by_play.pbp_json compression unchanged';
+END $$;
@@ -0,0 +1,23 @@
+-- Content hashes for per-game supplemental payloads (alerts, pregame storylines).
+--
+-- supplemental re-polls every game in the refresh window on each run. It now
+-- hashes each raw payload (stable_hash) and compares it with the hash stored
+-- here; unchanged payloads skip row building and the nba.alerts /
+-- nba.pregame_storylines writes entirely.
+
+CREATE TABLE IF NOT EXISTS nba.supplemental_payload_hashes (
+    endpoint text NOT NULL,
+    game_id text NOT NULL,
+    payload_hash text NOT NULL,
+    fetched_at timestamptz,
+    created_at timestamptz,
+    updated_at timestamptz,
+    PRIMARY KEY (endpoint, game_id)
+);
+
+COMMENT ON TABLE nba.supplemental_payload_hashes IS
+    'Last persisted content hash per (endpoint, game_id) for supplemental per-game payloads; used to skip unchanged alerts/storylines.';
+COMMENT ON COLUMN nba.supplemental_payload_hashes.endpoint IS
+    'Supplemental endpoint key (alerts, storylines).';
+COMMENT ON COLUMN nba.supplemental_payload_hashes.payload_hash IS
+    'sha1 of the sorted-key JSON payload, written only after its rows were committed.';
@@ -0,0 +1,29 @@
+-- Last polled state of in-progress games for game_data `live` mode.
+--
+-- Live mode reads one scoreboard per poll and compares each in-progress game's
+-- status/period/clock/score with the row stored here. Only games whose state
+-- advanced are refetched. Only play-by-play actions after last_action_number
+-- (or ones edited since polled_at) and boxscore rows that changed are upserted.
+
+CREATE TABLE IF NOT EXISTS nba.live_game_state (
+    game_id text PRIMARY KEY REFERENCES nba.games(game_id),
+    game_status integer,
+    period integer,
+    game_clock text,
+    home_score integer,
+    away_score integer,
+    last_action_number integer,
+    polled_at timestamptz,
+    changed_at timestamptz,
+    created_at timestamptz,
+    updated_at timestamptz
+);
+
+CREATE INDEX IF NOT EXISTS live_game_state_game_status_idx ON nba.live_game_state (game_status);
+
+COMMENT ON TABLE nba.live_game_state IS
+    'Per-game state last written by game_data live mode; used to skip unchanged in-progress games between polls.';
+COMMENT ON COLUMN nba.live_game_state.last_action_number IS
+    'Highest play-by-play actionNumber persisted to nba.play_by_play_events for the game.';
+COMMENT ON COLUMN nba.live_game_state.polled_at IS
+    'When the state was last refetched; pbp actions edited at or after this time are rewritten on the next change.';
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.11"
+# ///
+"""
+Microbenchmark for the sr_extract stat row builders over recorded payloads.
+
+Replays the SportRadar responses captured in sr/samples/postman.sql.txt
+(summary.json and season/series/tournament statistics.json) through the game
+and season statistics extractors and reports rows/sec per payload type.
+
+Usage:
+    uv run scripts/bench-sr-extract.py
+    uv run scripts/bench-sr-extract.py --repeat 500 --json
+    uv run scripts/bench-sr-extract.py --dump /tmp/rows.json
+"""
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+FLOW_DIR = BASE_DIR / "import_sr_data.flow"
+SAMPLES_PATH = BASE_DIR / "sr" / "samples" / "postman.sql.txt"
+
+sys.path.insert(0, str(FLOW_DIR))
+
+from sr_extract import (  # noqa: E402
+    extract_period_scores,
+    extract_player_stats,
+    extract_team_statistics_payload,
+    extract_team_stats,
+)
+
+# One VALUES row of the TablePlus dump: ('api', 'endpoint', 'json', ...
+ROW_PATTERN = re.compile(r"^\('([^']*)', '([^']*)', '((?:[^']|'')*)'")
+# Season ids are resolved from the payload itself; the lookup only backs it up.
+SEASON_LOOKUP: dict[tuple[int, str], str] = {}
+
+
+def load_samples(path: Path) -> list[tuple[str, str, dict]]:
+    samples = []
+    for line in path.read_text().splitlines():
+        match = ROW_PATTERN.match(line)
+        if not match:
+            continue
+        api, endpoint, data = match.groups()
+        try:
+            payload = json.loads(data.replace("''", "'"))
+        except json.JSONDecodeError:
+            continue
+        if isinstance(payload, dict):
+            samples.append((api, endpoint, payload))
+    return samples
+
+
+def run_summary(api: str, payload: dict) -> list[dict]:
+    game_id = payload.get("id")
+    home_team = payload.get("home")
+    away_team = payload.get("away")
+    rows = extract_team_stats(payload, api, game_id, home_team, away_team)
+    rows.extend(extract_player_stats(payload, api, game_id, home_team))
+    rows.extend(extract_player_stats(payload, api, game_id, away_team))
+    rows.extend(
+        extract_period_scores(payload, api, game_id, (home_team or {}).get("id"), (away_team or {}).get("id"))
+    )
+    return rows
+
+
+def run_statistics(api: str, payload: dict) -> list[dict]:
+    team_rows, player_rows = extract_team_statistics_payload(payload, api, SEASON_LOOKUP)
+    return team_rows + player_rows
+
+
+BENCHMARKS = {
+    "summary": ("/summary.json", "/games/", run_summary),
+    "statistics": ("/statistics.json", "/teams/", run_statistics),
+}
+
+
+def select_payloads(samples: list[tuple[str, str, dict]], suffix: str, marker: str) -> list[tuple[str, dict]]:
+    return [(api, payload) for api, endpoint, payload in samples if endpoint.endswith(suffix) and marker in endpoint]
+
+
+def bench(runner, payloads: list[tuple[str, dict]], repeat: int) -> dict:
+    rows = sum(len(runner(api, payload)) for api, payload in payloads)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for api, payload in payloads:
+            runner(api, payload)
+    elapsed = time.perf_counter() - started
+    return {
+        "payloads": len(payloads),
+        "rows_per_pass": rows,
+        "repeat": repeat,
+        "seconds": round(elapsed, 4),
+        "rows_per_sec": round(rows * repeat / elapsed) if elapsed else None,
+        "us_per_payload": round(elapsed / (repeat * len(payloads)) * 1e6, 1) if payloads else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark sr_extract stat row builders")
+    parser.add_argument("--samples", default=str(SAMPLES_PATH))
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--only", choices=sorted(BENCHMARKS), action="append")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--dump", help="Write every extracted row to this JSON file (for diffing builders)")
+    args = parser.parse_args()
+
+    samples = load_samples(Path(args.samples))
+    results = {}
+    dumped = {}
+    for name in args.only or sorted(BENCHMARKS):
+        suffix, marker, runner = BENCHMARKS[name]
+        payloads = select_payloads(samples, suffix, marker)
+        results[name] = bench(runner, payloads, args.repeat)
+        if args.dump:
+            dumped[name] = [runner(api, payload) for api, payload in payloads]
+
+    if args.dump:
+        Path(args.dump).write_text(json.dumps(dumped, indent=1, sort_keys=True, default=str))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for name, result in results.items():
+        print(
+            f"{name:<12} payloads={result['payloads']:<3} rows/pass={result['rows_per_pass']:<5} "
+            f"{result['rows_per_sec']} rows/s  {result['us_per_payload']} us/payload"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 # /// script
 # requires-python = ">=3.11"
-# dependencies = ["psycopg[binary]", "httpx", "tenacity"]
+# dependencies = ["psycopg[binary]", "httpx[http2]"]
 # ///
 """
 Test runner for NBA import scripts.
@@ -10,6 +10,7 @@ Usage:
     uv run scripts/test-nba-import.py teams
     uv run scripts/test-nba-import.py games --run-mode date_backfill --start-date 2024-10-01 --end-date 2024-10-02 --write
     uv run scripts/test-nba-import.py all --run-mode season_backfill --season-label 2023-24 --write
+    uv run scripts/test-nba-import.py all --max-parallel 8 --write
 """
 
 import argparse
@@ -17,6 +18,9 @@ import importlib.util
 import inspect
 import json
 import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 
 SCRIPTS = {
@@ -34,8 +38,31 @@ SCRIPTS = {
     "ngss": "ngss.inline_script.py",
 }
 
+# Dependency graph for `all`, mirroring the branches in flow.yaml: a script starts
+# as soon as every script it depends on has finished. Game-level families only
+# read nba.games, so after games they all run side by side.
+GRAPH = {
+    "teams": [],
+    "players": ["teams"],
+    "schedules": ["teams"],
+    "standings": ["teams"],
+    "games": ["players", "schedules", "standings"],
+    "game_data": ["games"],
+    "querytool_event_streams": ["games"],
+    "aggregates": ["games"],
+    "lineups": ["games"],
+    "shot_chart": ["games"],
+    "supplemental": ["games"],
+    "ngss": ["games"],
+}
+
+# Overall concurrency budget for `all` (scripts running at once).
+DEFAULT_MAX_PARALLEL = 4
+
 SCRIPT_DIR = Path("import_nba_data.flow")
 
+_print_lock = threading.Lock()
+
 
 def load_script(name: str):
     """Dynamically load a script and return its main function."""
@@ -60,13 +87,14 @@ def build_params(args: argparse.Namespace) -> dict:
     }
 
 
-def run_script(name: str, dry_run: bool, params: dict):
+def run_script(name: str, dry_run: bool, params: dict, main=None):
     """Run a single import script."""
-    print(f"\n{'=' * 60}")
-    print(f"Running: {name} (dry_run={dry_run})")
-    print(f"{'=' * 60}\n")
+    with _print_lock:
+        print(f"\n{'=' * 60}")
+        print(f"Running: {name} (dry_run={dry_run})")
+        print(f"{'=' * 60}\n")
 
-    main = load_script(name)
+    main = main or load_script(name)
     script_params = params.copy()
     script_params["dry_run"] = dry_run
 
@@ -74,10 +102,55 @@ def run_script(name: str, dry_run: bool, params: dict):
     filtered_params = {k: v for k, v in script_params.items() if k in accepted}
 
     result = main(**filtered_params)
-    print(json.dumps(result, indent=2))
+    with _print_lock:
+        print(f"\n--- {name} result ---")
+        print(json.dumps(result, indent=2))
     return result
 
 
+def run_graph(dry_run: bool, params: dict, max_parallel: int) -> dict[str, dict]:
+    """Run every script in GRAPH order with at most max_parallel running at once.
+
+    A script whose dependency raised is skipped; scripts that merely return
+    errors still unblock their dependents, as in the flow.
+    """
+    # Load up front so shared helper modules (dimension cache etc.) are
+    # registered once, not raced by worker threads.
+    mains = {name: load_script(name) for name in GRAPH}
+    results: dict[str, dict] = {}
+    remaining = {name: set(deps) for name, deps in GRAPH.items()}
+    in_flight = {}
+    started_perf = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max(1, max_parallel)) as executor:
+        while remaining or in_flight:
+            ready = [name for name, deps in remaining.items() if not deps]
+            for name in ready[: max(1, max_parallel) - len(in_flight)]:
+                del remaining[name]
+                future = executor.submit(run_script, name, dry_run, params, mains[name])
+                in_flight[future] = name
+
+            if not in_flight:
+                # Everything left depends on a script that failed.
+                for name in list(remaining):
+                    results[name] = {"skipped": True, "tables": [], "errors": ["skipped: dependency failed"]}
+                    del remaining[name]
+                break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = in_flight.pop(future)
+                try:
+                    results[name] = future.result()
+                    results[name]["elapsed_s"] = round(time.perf_counter() - started_perf, 1)
+                    for deps in remaining.values():
+                        deps.discard(name)
+                except Exception as exc:
+                    results[name] = {"tables": [], "errors": [f"{type(exc).__name__}: {exc}"]}
+
+    return {name: results[name] for name in GRAPH}
+
+
 def main():
     parser = argparse.ArgumentParser(description="Test NBA import scripts")
     parser.add_argument(
@@ -123,6 +196,12 @@ def main():
         default=True,
         help="Only fetch final games for game-data style endpoints",
     )
+    parser.add_argument(
+        "--max-parallel",
+        type=int,
+        default=DEFAULT_MAX_PARALLEL,
+        help="Scripts to run at once for 'all' (1 = sequential)",
+    )
 
     args = parser.parse_args()
 
@@ -159,9 +238,7 @@ def main():
     params = build_params(args)
 
     if args.script == "all":
-        results = {}
-        for name in SCRIPTS:
-            results[name] = run_script(name, dry_run=dry_run, params=params)
+        results = run_graph(dry_run=dry_run, params=params, max_parallel=args.max_parallel)
 
         print(f"\n{'=' * 60}")
         print("SUMMARY")
@@ -170,7 +247,8 @@ def main():
             errors = result.get("errors", [])
             tables = result.get("tables", [])
             status = "✓" if not errors else "✗"
-            print(f"{status} {name}: {len(tables)} tables, {len(errors)} errors")
+            finished = f" (done at {result['elapsed_s']}s)" if "elapsed_s" in result else ""
+            print(f"{status} {name}: {len(tables)} tables, {len(errors)} errors{finished}")
     else:
         run_script(args.script, dry_run=dry_run, params=params)
 
@@ -10,11 +10,16 @@ Usage:
     uv run scripts/test-sr-import.py games --source-api nba --date 2026-01-28
     uv run scripts/test-sr-import.py games --dry-run
     uv run scripts/test-sr-import.py all --write
+    uv run scripts/test-sr-import.py all --max-parallel 1 --write
+    uv run scripts/test-sr-import.py all --source-api nba gleague ncaa intl --max-parallel 8 --write
 """
 import argparse
 import importlib.util
 import json
 import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parents[1]
@@ -43,6 +48,36 @@ SCRIPTS = {
     "intl_hierarchy": "upsert_intl_hierarchy.inline_script.py",
 }
 
+# Dependency graph for `all`, mirroring the branches in flow.yaml: a script starts
+# as soon as every script it depends on has finished. Steps only share cached
+# payloads, not tables; games -> game_stats -> players is kept in order so the
+# later two read the summaries games fetched from the cache.
+GRAPH = {
+    "seasons": [],
+    "teams": ["seasons"],
+    "games": ["teams"],
+    "game_stats": ["games"],
+    "players": ["game_stats"],
+    "pbp": ["teams"],
+    "standings": ["teams"],
+    "rankings": ["teams"],
+    "injuries": ["teams"],
+    "season_stats": ["teams"],
+    "season_splits": ["teams"],
+    "series": ["teams"],
+    "tournaments": ["teams"],
+    "leaders": ["teams"],
+    "draft": ["teams"],
+    "intl_hierarchy": ["teams"],
+}
+
+# Overall concurrency budget for `all` (scripts running at once, across every
+# source). Requests from every running script draw from one SR_FETCH_QPS bucket
+# per API key, shared fairly between sources, and writes share sr_db's pool.
+DEFAULT_MAX_PARALLEL = 4
+
+_print_lock = threading.Lock()
+
 
 def load_script(name: str):
     script_path = FLOW_DIR / SCRIPTS[name]
@@ -63,12 +98,14 @@ def run_script(
     include_pbp: bool,
     locale: str,
     max_concurrency: int,
+    main=None,
 ):
-    print(f"\n{'='*60}")
-    print(f"Running: {name} (dry_run={dry_run})")
-    print(f"{'='*60}\n")
+    with _print_lock:
+        print(f"\n{'='*60}")
+        print(f"Running: {name} [{source_api}] (dry_run={dry_run})")
+        print(f"{'='*60}\n")
 
-    main = load_script(name)
+    main = main or load_script(name)
 
     result = main(
         dry_run=dry_run,
@@ -82,10 +119,82 @@ def run_script(
         max_concurrency=max_concurrency,
     )
 
-    print(json.dumps(result, indent=2))
+    with _print_lock:
+        print(f"\n--- {name} [{source_api}] result ---")
+        print(json.dumps(result, indent=2))
     return result
 
 
+def source_fetch_summary(source_results: dict[str, dict]) -> str:
+    """Requests and cache hits/misses summed over one source's step results (fetch_stats is per step)."""
+    requests = hits = misses = 0
+    for result in source_results.values():
+        fetch = result.get("fetch") or {}
+        rate = fetch.get("rate") or []
+        for governor in rate if isinstance(rate, list) else [rate]:
+            requests += governor.get("requests", 0)
+        cache = fetch.get("cache") or {}
+        hits += cache.get("hits", 0) + cache.get("permanent_hits", 0)
+        misses += cache.get("misses", 0)
+    return f"{requests} requests, cache {hits} hits / {misses} misses"
+
+
+def run_graph(sources: list[str], names: list[str], max_parallel: int, **kwargs) -> dict[str, dict[str, dict]]:
+    """Run names for every source in GRAPH order with at most max_parallel running at once.
+
+    Each source gets its own copy of the graph. A free slot goes to a ready
+    script of the source with the fewest scripts running, so sources progress
+    side by side. Dependencies outside names are treated as met. A script whose
+    dependency raised is skipped; scripts that merely return errors still
+    unblock their dependents, as in the flow.
+    """
+    # Load up front so sr_fetch/sr_extract are imported once, not raced by worker threads.
+    mains = {name: load_script(name) for name in names}
+    results: dict[tuple[str, str], dict] = {}
+    remaining = {
+        (source, name): {(source, dep) for dep in GRAPH[name] if dep in names}
+        for source in sources
+        for name in names
+    }
+    running = {source: 0 for source in sources}
+    in_flight = {}
+    started_perf = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max(1, max_parallel)) as executor:
+        while remaining or in_flight:
+            while len(in_flight) < max(1, max_parallel):
+                ready = [node for node, deps in remaining.items() if not deps]
+                if not ready:
+                    break
+                node = min(ready, key=lambda ready_node: running[ready_node[0]])
+                source, name = node
+                del remaining[node]
+                running[source] += 1
+                future = executor.submit(run_script, name, source_api=source, main=mains[name], **kwargs)
+                in_flight[future] = node
+
+            if not in_flight:
+                # Everything left depends on a script that failed.
+                for node in list(remaining):
+                    results[node] = {"skipped": True, "tables": [], "errors": ["skipped: dependency failed"]}
+                    del remaining[node]
+                break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                node = in_flight.pop(future)
+                running[node[0]] -= 1
+                try:
+                    results[node] = future.result()
+                    results[node]["elapsed_s"] = round(time.perf_counter() - started_perf, 1)
+                    for deps in remaining.values():
+                        deps.discard(node)
+                except Exception as exc:
+                    results[node] = {"tables": [], "errors": [f"{type(exc).__name__}: {exc}"]}
+
+    return {source: {name: results[(source, name)] for name in names} for source in sources}
+
+
 def main():
     os.chdir(BASE_DIR)
 
@@ -108,9 +217,10 @@ def main():
     )
     parser.add_argument(
         "--source-api",
-        default="nba",
+        nargs="+",
+        default=["nba"],
         choices=["nba", "ncaa", "gleague", "intl"],
-        help="SportRadar source API",
+        help="SportRadar source API(s); several run side by side",
     )
     parser.add_argument(
         "--mode",
@@ -129,59 +239,66 @@ def main():
     )
     parser.add_argument("--locale", default="en", help="Locale for SportRadar")
     parser.add_argument("--max-concurrency", type=int, default=6, help="Max concurrent HTTP requests")
+    parser.add_argument(
+        "--max-parallel",
+        type=int,
+        default=DEFAULT_MAX_PARALLEL,
+        help="Scripts to run at once across all sources (1 = sequential)",
+    )
 
     args = parser.parse_args()
     dry_run = not args.write
 
-    if args.script == "all":
-        results = {}
-        for name in (
-            "seasons",
-            "teams",
-            "players",
-            "games",
-            "game_stats",
-            "pbp",
-            "standings",
-            "rankings",
-            "injuries",
-            "season_stats",
-            "season_splits",
-            "series",
-            "tournaments",
-            "leaders",
-            "draft",
-            "intl_hierarchy",
-        ):
-            if name == "pbp" and not args.include_pbp:
-                continue
-            results[name] = run_script(
-                name,
-                dry_run=dry_run,
-                source_api=args.source_api,
-                mode=args.mode,
-                date=args.date,
-                season_year=args.season_year,
-                season_type=args.season_type,
-                include_pbp=args.include_pbp,
-                locale=args.locale,
-                max_concurrency=args.max_concurrency,
-            )
+    # One payload-cache scope per invocation, like one flow run in Windmill.
+    os.environ.setdefault("SR_FETCH_RUN_ID", f"local-{int(time.time())}")
+
+    source_apis = list(dict.fromkeys(args.source_api))
+    if args.script == "all" or len(source_apis) > 1:
+        if args.script == "all":
+            names = [name for name in GRAPH if args.include_pbp or name != "pbp"]
+        else:
+            names = [args.script]
+        results = run_graph(
+            source_apis,
+            names,
+            max_parallel=args.max_parallel,
+            dry_run=dry_run,
+            mode=args.mode,
+            date=args.date,
+            season_year=args.season_year,
+            season_type=args.season_type,
+            include_pbp=args.include_pbp,
+            locale=args.locale,
+            max_concurrency=args.max_concurrency,
+        )
 
         print(f"\n{'='*60}")
         print("SUMMARY")
         print(f"{'='*60}")
-        for name, result in results.items():
-            errors = result.get("errors", [])
-            tables = result.get("tables", [])
-            status = "✓" if not errors else "✗"
-            table_count = len(tables) if tables else 0
-            print(f"{status} {name}: {table_count} tables, {len(errors)} errors")
+        for source_api, source_results in results.items():
+            source_errors = sum(len(result.get("errors", [])) for result in source_results.values())
+            print(f"\n[{source_api}] {len(source_results)} scripts, {source_errors} errors, {source_fetch_summary(source_results)}")
+            for name, result in source_results.items():
+                errors = result.get("errors", [])
+                tables = result.get("tables", [])
+                status = "✓" if not errors else "✗"
+                table_count = len(tables) if tables else 0
+                finished = f" (done at {result['elapsed_s']}s)" if "elapsed_s" in result else ""
+                print(f"{status} {name}: {table_count} tables, {len(errors)} errors{finished}")
+
+        import sr_db
+        import sr_fetch
+
+        # Outside a step, fetch_stats() reports the whole process (every source).
+        print(f"\npayload cache (all sources): {sr_fetch.cache_stats()}")
+        print(f"rate (all sources): {sr_fetch.fetch_stats()['rate']}")
+        print(f"db pool: {sr_db.db_pool_stats()}")
+        sr_db.close_db_pool()
     else:
         run_script(
             args.script,
             dry_run=dry_run,
-            source_api=args.source_api,
+            source_api=source_apis[0],
             mode=args.mode,
             date=args.date,
             season_year=args.season_year,
@@ -0,0 +1,58 @@
+BEGIN;
+
+-- One row per play-by-play event, normalized at ingest by upsert_pbp so
+-- event-level queries use btree indexes instead of unnesting sr.pbp.pbp_json.
+CREATE TABLE IF NOT EXISTS sr.pbp_events (
+  source_api text NOT NULL,
+  game_id text NOT NULL,
+  event_id text NOT NULL,
+  period_number integer,
+  period_type text,
+  sequence bigint,
+  clock text,
+  clock_seconds integer,
+  wall_clock timestamptz,
+  event_type text,
+  description text,
+  sr_team_id text,
+  sr_id text,
+  possession_sr_team_id text,
+  stat_type text,
+  is_made boolean,
+  points integer,
+  shot_type text,
+  shot_distance numeric(6,2),
+  coord_x integer,
+  coord_y integer,
+  home_pts integer,
+  away_pts integer,
+  qualifiers text[],
+  updated_at timestamptz,
+  PRIMARY KEY (source_api, game_id, event_id)
+);
+
+CREATE INDEX IF NOT EXISTS pbp_events_game_sequence_idx
+  ON sr.pbp_events (source_api, game_id, sequence);
+
+CREATE INDEX IF NOT EXISTS pbp_events_player_idx
+  ON sr.pbp_events (source_api, sr_id)
+  WHERE sr_id IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS pbp_events_team_idx
+  ON sr.pbp_events (source_api, sr_team_id)
+  WHERE sr_team_id IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS pbp_events_event_type_idx
+  ON sr.pbp_events (source_api, event_type);
+
+COMMIT;
+
+-- sr.pbp.pbp_json stays as the full-fidelity snapshot; prefer lz4 TOAST
+-- compression where the server supports it.
+DO $$
+BEGIN
+  ALTER TABLE sr.pbp ALTER COLUMN pbp_json SET COMPRESSION lz4;
+EXCEPTION
+  WHEN feature_not_supported OR invalid_parameter_value OR syntax_error THEN
+    RAISE NOTICE 'lz4 compression unavailable; leaving sr.pbp.pbp_json compression unchanged';
+END $$;
@@ -0,0 +1,22 @@
+BEGIN;
+
+-- Status of each game's per-game feed (summary/pbp) when a step last imported
+-- it. upsert_games, upsert_game_stats and upsert_pbp compare it with the
+-- schedule and only fetch games that are new, live or changed status since,
+-- so backfills and daily runs cost roughly the number of new games.
+-- Rows are written only after the step's own rows for the game were committed.
+CREATE TABLE IF NOT EXISTS sr.game_fetch_state (
+  source_api text NOT NULL,
+  game_id text NOT NULL,
+  step text NOT NULL,
+  status text,
+  fetched_at timestamptz,
+  PRIMARY KEY (source_api, step, game_id)
+);
+
+COMMENT ON TABLE sr.game_fetch_state IS
+  'Last imported per-game feed status per (source_api, step, game_id); used to skip unchanged games.';
+COMMENT ON COLUMN sr.game_fetch_state.step IS
+  'Importing step (games, game_stats, pbp); each step tracks its own feed.';
+
+COMMIT;
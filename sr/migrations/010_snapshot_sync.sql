@@ -0,0 +1,38 @@
+BEGIN;
+
+-- Injuries and rankings are polled far more often than they change.
+-- upsert_injuries and upsert_rankings store a hash of each row as extracted
+-- and, on every poll, write only rows whose hash changed, rows that are new
+-- and rows that left the feed, instead of rewriting the whole snapshot.
+ALTER TABLE sr.injuries ADD COLUMN IF NOT EXISTS row_hash text;
+ALTER TABLE sr.rankings ADD COLUMN IF NOT EXISTS row_hash text;
+
+COMMENT ON COLUMN sr.injuries.row_hash IS
+  'Hash of the row as last extracted; NULL once the injury left the report (is_active = false).';
+COMMENT ON COLUMN sr.rankings.row_hash IS
+  'Hash of the row as last extracted; unchanged hashes are not rewritten.';
+
+-- Every insert, update and deletion a snapshot sync applied, newest last.
+CREATE TABLE IF NOT EXISTS sr.row_changes (
+  change_id bigint GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+  changed_at timestamptz NOT NULL DEFAULT now(),
+  table_name text NOT NULL,
+  source_api text NOT NULL,
+  change text NOT NULL CHECK (change IN ('insert', 'update', 'delete')),
+  row_key jsonb NOT NULL,
+  row_hash text,
+  previous_hash text,
+  row_json jsonb
+);
+
+CREATE INDEX IF NOT EXISTS row_changes_table_source_changed_idx
+  ON sr.row_changes (table_name, source_api, changed_at);
+
+COMMENT ON TABLE sr.row_changes IS
+  'Change history of snapshot-synced SR tables (sr.injuries, sr.rankings).';
+COMMENT ON COLUMN sr.row_changes.row_key IS
+  'Primary key columns of the changed row.';
+COMMENT ON COLUMN sr.row_changes.row_json IS
+  'Row as written for inserts and updates; NULL for deletions.';
+
+COMMIT;